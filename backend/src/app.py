@@ -1,5 +1,6 @@
 import json
 import time
+from contextlib import asynccontextmanager
 from typing import Optional
 from uuid import uuid4
 
@@ -19,9 +20,14 @@ from modules.api.safety_endpoints import SafetyAPI
 from modules.api.scales_endpoints import ClinicalScalesAPI
 from modules.api.tests_endpoints import InteractiveTestsAPI
 from modules.api.tools_endpoints import HealingToolsAPI
+from modules.memory.config import load_memory_retrieval_config
+from modules.memory.consolidation import MemoryCompactionJob
+from modules.memory.service import MemoryService
+from modules.model_gateway.http_client import aclose_shared_http_clients
 from modules.onboarding.service import OnboardingService
 from modules.observability.http_audit import decode_json_payload, sanitize_mapping
 from modules.observability.models import APIAuditLogRecord
+from modules.prompt.assembly import tokenizer_available
 from modules.storage import build_application_store
 
 store = build_application_store()
@@ -30,19 +36,39 @@ onboarding_service = OnboardingService(store)
 onboarding_api = OnboardingAPI(service=onboarding_service)
 user_auth_api = UserAuthAPI(store=store, onboarding_service=onboarding_service)
 interactive_tests_api = InteractiveTestsAPI(store=store)
-coach_api = CoachAPI(store=store)
+memory_service = MemoryService(store)
+coach_api = CoachAPI(store=store, memory_service=memory_service)
 healing_tools_api = HealingToolsAPI(store=store)
 billing_api = BillingAPI(store=store)
-compliance_api = DataGovernanceAPI(store=store)
+compliance_api = DataGovernanceAPI(store=store, memory_service=memory_service)
 safety_api = SafetyAPI(store=store)
 scales_api = ClinicalScalesAPI()
 prompt_api = PromptRegistryAPI()
 observability_api = ObservabilityAPI(store=store)
+memory_compaction_job = MemoryCompactionJob(
+    memory_service=memory_service,
+    interval_seconds=load_memory_retrieval_config().compaction_interval_seconds,
+)
+
+
+@asynccontextmanager
+async def _lifespan(_: FastAPI):
+    # Load the tokenizer vocabulary before serving so the first chat turn does
+    # not pay for it; without tiktoken this falls back to the heuristic counter.
+    tokenizer_available()
+    memory_compaction_job.start()
+    try:
+        yield
+    finally:
+        memory_compaction_job.stop()
+        await aclose_shared_http_clients()
+
 
 app = FastAPI(
     title="MiMind Prototype API",
     version="0.1.0",
     description="Constitution-aligned prototype backend for MiMind",
+    lifespan=_lifespan,
 )
 
 api_rate_limiter = APIRateLimiter(config=RateLimitConfig.from_env())
@@ -219,6 +245,42 @@ def admin_override_user_triage(user_id: str, request: Request, payload: dict = B
     return _unwrap(status, body)
 
 
+@app.post("/api/admin/safety/backfill")
+def admin_start_safety_backfill(request: Request, response: Response, payload: dict = Body(...)) -> dict:
+    session_id = request.cookies.get(admin_api.service.cookie_name())
+    status, body = admin_api.post_safety_backfill(session_id=session_id, payload=payload)
+    response.status_code = status
+    return _unwrap(status, body)
+
+
+@app.get("/api/admin/safety/backfill")
+def admin_safety_backfill_runs(request: Request) -> dict:
+    session_id = request.cookies.get(admin_api.service.cookie_name())
+    status, body = admin_api.get_safety_backfill_runs(session_id=session_id)
+    return _unwrap(status, body)
+
+
+@app.get("/api/admin/safety/backfill/{run_id}")
+def admin_safety_backfill_run(run_id: str, request: Request) -> dict:
+    session_id = request.cookies.get(admin_api.service.cookie_name())
+    status, body = admin_api.get_safety_backfill_run(session_id=session_id, run_id=run_id)
+    return _unwrap(status, body)
+
+
+@app.get("/api/admin/safety/slo")
+def admin_safety_slo(request: Request, reset: bool = Query(default=False)) -> dict:
+    session_id = request.cookies.get(admin_api.service.cookie_name())
+    status, body = admin_api.get_safety_slo(session_id=session_id, reset=reset)
+    return _unwrap(status, body)
+
+
+@app.post("/api/admin/safety/detect-batch")
+def admin_safety_detect_batch(request: Request, payload: dict = Body(...)) -> dict:
+    session_id = request.cookies.get(admin_api.service.cookie_name())
+    status, body = admin_api.post_safety_detect_batch(session_id=session_id, payload=payload)
+    return _unwrap(status, body)
+
+
 @app.post("/api/register")
 def register(payload: dict = Body(...)) -> dict:
     status, body = onboarding_api.post_register(payload)
@@ -385,9 +447,10 @@ def get_model_invocations(
 
 @app.get("/api/observability/model-invocations/summary")
 def get_model_invocation_summary(
-    limit: int = Query(200, ge=1, le=2000),
+    limit: Optional[int] = Query(None, ge=1, le=2000),
     task_type: str = Query("", alias="task_type"),
     provider: str = Query("", alias="provider"),
+    window_seconds: Optional[int] = Query(None, ge=1),
 ) -> dict:
     normalized_task = task_type.strip() or None
     normalized_provider = provider.strip() or None
@@ -395,10 +458,17 @@ def get_model_invocation_summary(
         limit=limit,
         task_type=normalized_task,
         provider=normalized_provider,
+        window_seconds=window_seconds,
     )
     return _unwrap(status, body)
 
 
+@app.get("/api/observability/model-gateway")
+def get_model_gateway_status() -> dict:
+    status, body = observability_api.get_model_gateway_status()
+    return _unwrap(status, body)
+
+
 @app.get("/api/observability/http-audit")
 def get_http_audit_logs(
     limit: int = Query(100, ge=1, le=1000),
@@ -456,54 +526,30 @@ def start_coach_session(user_id: str, payload: dict = Body(...)) -> dict:
 
 
 @app.post("/api/coach/{session_id}/chat")
-def chat_with_coach(session_id: str, payload: dict = Body(...)) -> dict:
-    status, body = coach_api.post_chat(session_id=session_id, payload=payload)
+async def chat_with_coach(session_id: str, payload: dict = Body(...)) -> dict:
+    status, body = await coach_api.apost_chat(session_id=session_id, payload=payload)
     return _unwrap(status, body)
 
 
 @app.post("/api/coach/{session_id}/chat/stream")
 def stream_chat_with_coach(session_id: str, payload: dict = Body(...)) -> StreamingResponse:
-    status, body = coach_api.post_chat_stream(session_id=session_id, payload=payload)
+    status, body = coach_api.open_chat_stream(session_id=session_id, payload=payload)
     if status >= 400:
         raise HTTPException(status_code=status, detail=body.get("error", "request failed"))
 
-    data = body.get("data", {})
-    coach_message = str(data.get("coach_message", ""))
+    chat_stream = body["data"]
 
     def _sse_event(event: str, content: dict) -> str:
         return f"event: {event}\ndata: {json.dumps(content, ensure_ascii=False)}\n\n"
 
-    def _stream():
-        yield _sse_event(
-            "meta",
-            {
-                "mode": data.get("mode"),
-                "halted": data.get("halted"),
-            },
-        )
-
-        chunk_size = 4
-        for index in range(0, len(coach_message), chunk_size):
-            chunk = coach_message[index:index + chunk_size]
-            yield _sse_event(
-                "token",
-                {
-                    "delta": chunk,
-                    "index": index // chunk_size,
-                },
-            )
-
-        yield _sse_event(
-            "done",
-            {
-                "coach_message": coach_message,
-                "triage": data.get("triage"),
-                "safety": data.get("safety"),
-                "model": data.get("model"),
-                "mode": data.get("mode"),
-                "halted": data.get("halted"),
-            },
-        )
+    async def _stream():
+        try:
+            yield _sse_event("meta", chat_stream.meta)
+            async for item in chat_stream.events:
+                yield _sse_event(item["event"], item["data"])
+        finally:
+            # Persists whatever was generated if the client disconnected mid-reply.
+            await chat_stream.aclose()
 
     return StreamingResponse(_stream(), media_type="text/event-stream")
 
@@ -640,9 +686,14 @@ def safety_assess(user_id: str, payload: dict = Body(...)) -> dict:
 
 
 @app.get("/api/safety/hotline-cache")
-def safety_hotline_cache() -> dict:
-    status, body = safety_api.get_hotline_cache()
-    return _unwrap(status, body)
+def safety_hotline_cache(request: Request) -> Response:
+    status, body, headers = safety_api.get_hotline_cache_resource(
+        if_none_match=request.headers.get("if-none-match"),
+        accept_encoding=request.headers.get("accept-encoding"),
+    )
+    if status == 304:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, status_code=status, headers=headers, media_type="application/json")
 
 
 @app.get("/api/compliance/{user_id}/export")
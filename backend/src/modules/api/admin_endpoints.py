@@ -1,19 +1,31 @@
 from typing import Any, Dict, Optional, Tuple
 
 from modules.admin.service import AdminAuthService
+from modules.safety.backfill.service import SafetyBackfillJob
+from modules.safety.slo import SafetyLatencyMonitor, get_shared_safety_latency_monitor
 from modules.storage.in_memory import InMemoryStore
 from modules.triage.models import TriageChannel, TriageDecision
 
 
 class AdminAPI:
-    def __init__(self, store: Optional[InMemoryStore] = None) -> None:
+    def __init__(
+        self,
+        store: Optional[InMemoryStore] = None,
+        safety_monitor: Optional[SafetyLatencyMonitor] = None,
+    ) -> None:
         self._store = store or InMemoryStore()
         self._service = AdminAuthService(self._store)
+        self._backfill = SafetyBackfillJob(self._store)
+        self._safety_monitor = safety_monitor or get_shared_safety_latency_monitor()
 
     @property
     def service(self) -> AdminAuthService:
         return self._service
 
+    @property
+    def backfill(self) -> SafetyBackfillJob:
+        return self._backfill
+
     def post_login(self, payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any], Optional[str]]:
         try:
             username = str(payload.get("username", "")).strip()
@@ -118,3 +130,73 @@ class AdminAPI:
                 "updated_by": session.username,
             }
         }
+
+    def post_safety_backfill(self, session_id: Optional[str], payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        session = self._service.get_valid_session(session_id=session_id)
+        if session is None:
+            return 401, {"error": "Admin session required"}
+
+        try:
+            sources = payload.get("sources")
+            if sources is not None and not isinstance(sources, list):
+                raise ValueError("sources must be a list")
+            limit = payload.get("limit")
+            if limit is not None and int(limit) <= 0:
+                raise ValueError("limit must be greater than 0")
+            run = self._backfill.start(
+                sources=[str(item) for item in sources] if sources else None,
+                resume_run_id=str(payload["resume_run_id"]) if payload.get("resume_run_id") else None,
+                limit=int(limit) if limit is not None else None,
+            )
+        except ValueError as error:
+            return 400, {"error": str(error)}
+        return 202, {"data": run.to_dict()}
+
+    def get_safety_backfill_runs(self, session_id: Optional[str]) -> Tuple[int, Dict[str, Any]]:
+        session = self._service.get_valid_session(session_id=session_id)
+        if session is None:
+            return 401, {"error": "Admin session required"}
+
+        items = [run.to_dict() for run in self._store.list_safety_backfill_runs()]
+        return 200, {"data": {"count": len(items), "items": items}}
+
+    def get_safety_backfill_run(self, session_id: Optional[str], run_id: str) -> Tuple[int, Dict[str, Any]]:
+        session = self._service.get_valid_session(session_id=session_id)
+        if session is None:
+            return 401, {"error": "Admin session required"}
+
+        run = self._store.get_safety_backfill_run(run_id)
+        if run is None:
+            return 404, {"error": "Unknown backfill run_id"}
+        return 200, {"data": run.to_dict()}
+
+    def post_safety_detect_batch(self, session_id: Optional[str], payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        session = self._service.get_valid_session(session_id=session_id)
+        if session is None:
+            return 401, {"error": "Admin session required"}
+
+        items = payload.get("items")
+        if not isinstance(items, list) or not items:
+            return 400, {"error": "items must be a non-empty list"}
+        if len(items) > 500:
+            return 400, {"error": "items must contain at most 500 entries"}
+
+        pairs = []
+        for item in items:
+            text = str(item.get("text", "")).strip() if isinstance(item, dict) else ""
+            if not text:
+                return 400, {"error": "every item requires text"}
+            pairs.append((text, str(item.get("locale") or "en-US")))
+
+        detections = self._backfill.detector.detect_batch(pairs)
+        return 200, {"data": {"count": len(detections), "items": [item.to_dict() for item in detections]}}
+
+    def get_safety_slo(self, session_id: Optional[str], reset: bool = False) -> Tuple[int, Dict[str, Any]]:
+        session = self._service.get_valid_session(session_id=session_id)
+        if session is None:
+            return 401, {"error": "Admin session required"}
+
+        snapshot = self._safety_monitor.snapshot()
+        if reset:
+            self._safety_monitor.reset()
+        return 200, {"data": snapshot}
@@ -1,13 +1,14 @@
 from typing import Any, Dict, Optional, Tuple
 
 from modules.coach.session_service import CoachSessionService
+from modules.memory.service import MemoryService
 from modules.storage.in_memory import InMemoryStore
 
 
 class CoachAPI:
-    def __init__(self, store: Optional[InMemoryStore] = None) -> None:
+    def __init__(self, store: Optional[InMemoryStore] = None, memory_service: Optional[MemoryService] = None) -> None:
         self._store = store or InMemoryStore()
-        self._service = CoachSessionService(self._store)
+        self._service = CoachSessionService(self._store, memory_service=memory_service)
 
     @property
     def store(self) -> InMemoryStore:
@@ -45,9 +46,41 @@ class CoachAPI:
         except ValueError as error:
             return 400, {"error": str(error)}
 
+    async def apost_chat(self, session_id: str, payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        try:
+            user_message = str(payload.get("user_message", "")).strip()
+            if not user_message:
+                raise ValueError("user_message is required")
+
+            dialogue_risk = self._service.parse_dialogue_risk(payload.get("dialogue_risk"))
+            data = await self._service.achat(
+                session_id=session_id,
+                user_message=user_message,
+                dialogue_risk=dialogue_risk,
+            )
+            return 200, {"data": data}
+        except ValueError as error:
+            return 400, {"error": str(error)}
+
     def post_chat_stream(self, session_id: str, payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
         return self.post_chat(session_id=session_id, payload=payload)
 
+    def open_chat_stream(self, session_id: str, payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        try:
+            user_message = str(payload.get("user_message", "")).strip()
+            if not user_message:
+                raise ValueError("user_message is required")
+
+            dialogue_risk = self._service.parse_dialogue_risk(payload.get("dialogue_risk"))
+            stream = self._service.open_chat_stream(
+                session_id=session_id,
+                user_message=user_message,
+                dialogue_risk=dialogue_risk,
+            )
+            return 200, {"data": stream}
+        except ValueError as error:
+            return 400, {"error": str(error)}
+
     def post_end_session(self, session_id: str) -> Tuple[int, Dict[str, Any]]:
         try:
             data = self._service.end_session(session_id=session_id)
@@ -1,13 +1,14 @@
 from typing import Any, Dict, Optional, Tuple
 
 from modules.compliance.data_governance_service import DataGovernanceService
+from modules.memory.service import MemoryService
 from modules.storage.in_memory import InMemoryStore
 
 
 class DataGovernanceAPI:
-    def __init__(self, store: Optional[InMemoryStore] = None) -> None:
+    def __init__(self, store: Optional[InMemoryStore] = None, memory_service: Optional[MemoryService] = None) -> None:
         self._store = store or InMemoryStore()
-        self._service = DataGovernanceService(self._store)
+        self._service = DataGovernanceService(self._store, memory_service=memory_service)
 
     def get_export(self, user_id: str) -> Tuple[int, Dict[str, Any]]:
         try:
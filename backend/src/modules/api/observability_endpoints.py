@@ -33,26 +33,38 @@ class ObservabilityAPI:
 
     def get_model_invocation_summary(
         self,
-        limit: int = 200,
+        limit: Optional[int] = None,
         task_type: Optional[str] = None,
         provider: Optional[str] = None,
+        window_seconds: Optional[int] = None,
     ) -> Tuple[int, Dict[str, Any]]:
         try:
-            safe_limit = int(limit)
-            if safe_limit <= 0:
-                raise ValueError("limit must be greater than 0")
-            if safe_limit > 2000:
-                raise ValueError("limit must be <= 2000")
+            safe_limit = None
+            if limit is not None:
+                safe_limit = int(limit)
+                if safe_limit <= 0:
+                    raise ValueError("limit must be greater than 0")
+                if safe_limit > 2000:
+                    raise ValueError("limit must be <= 2000")
+            safe_window = None
+            if window_seconds is not None:
+                safe_window = int(window_seconds)
+                if safe_window <= 0:
+                    raise ValueError("window_seconds must be greater than 0")
 
             summary = self._service.summarize_model_invocations(
                 limit=safe_limit,
                 task_type=task_type,
                 provider=provider,
+                window_seconds=safe_window,
             )
             return 200, {"data": summary}
         except ValueError as error:
             return 400, {"error": str(error)}
 
+    def get_model_gateway_status(self) -> Tuple[int, Dict[str, Any]]:
+        return 200, {"data": self._service.model_gateway_status()}
+
     def get_api_audit_logs(
         self,
         limit: int = 100,
@@ -1,5 +1,6 @@
 from typing import Any, Dict, Optional, Tuple
 
+from modules.safety.hotline.catalog import get_hotline_catalog
 from modules.safety.hotline.resolver import HotlineResolver
 from modules.safety.service import SafetyRuntimeService
 from modules.storage.in_memory import InMemoryStore
@@ -44,6 +45,18 @@ class SafetyAPI:
     def get_hotline_cache(self) -> Tuple[int, Dict[str, Any]]:
         return 200, {"data": self._hotline.local_cache_payload()}
 
+    def get_hotline_cache_resource(
+        self,
+        if_none_match: Optional[str] = None,
+        accept_encoding: Optional[str] = None,
+    ) -> Tuple[int, bytes, Dict[str, str]]:
+        """Serve the precomputed catalog bytes, or 304 when the client's ETag is current."""
+        catalog = get_hotline_catalog()
+        if catalog.not_modified(if_none_match):
+            return 304, b"", catalog.http_headers()
+        body, encoding = catalog.encode(accept_encoding)
+        return 200, body, catalog.http_headers(encoding)
+
     @staticmethod
     def _parse_override(payload: Any) -> Optional[DialogueRiskSignal]:
         if payload is None:
@@ -0,0 +1,33 @@
+import os
+from dataclasses import dataclass
+
+
+def _parse_bool(raw: str) -> bool:
+    return raw.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _parse_int(raw: str, default: int, *, minimum: int, maximum: int) -> int:
+    try:
+        value = int(raw.strip())
+    except ValueError:
+        value = default
+    return min(max(value, minimum), maximum)
+
+
+@dataclass
+class CoachPipelineConfig:
+    # Start memory retrieval and context building alongside safety detection.
+    speculative_preparation: bool = True
+    preparation_workers: int = 8
+
+
+def load_coach_pipeline_config() -> CoachPipelineConfig:
+    return CoachPipelineConfig(
+        speculative_preparation=_parse_bool(os.getenv("MINDCOACH_COACH_SPECULATIVE_PREPARATION", "true")),
+        preparation_workers=_parse_int(
+            os.getenv("MINDCOACH_COACH_PREPARATION_WORKERS", "8"),
+            8,
+            minimum=1,
+            maximum=256,
+        ),
+    )
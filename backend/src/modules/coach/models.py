@@ -1,6 +1,6 @@
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 
 @dataclass
@@ -32,3 +32,31 @@ class CoachSession:
             "halted_for_safety": self.halted_for_safety,
             "turn_count": len(self.turns),
         }
+
+
+@dataclass
+class CoachTurnContext:
+    """Everything the coach model call needs that does not depend on the safety verdict."""
+
+    locale: str
+    metadata: Dict[str, Any]
+    relevant_memories: List[str] = field(default_factory=list)
+    retrieval_error: Optional[str] = None
+
+
+@dataclass
+class CoachChatStream:
+    """A chat turn whose safety decision is known and whose reply is still being generated.
+
+    ``meta`` is available immediately; ``events`` yields ``{"event", "data"}``
+    dicts (``token`` deltas, then one ``done``) and persists the coach turn when
+    it completes or is closed early.
+    """
+
+    meta: Dict[str, Any]
+    events: AsyncIterator[Dict[str, Any]]
+
+    async def aclose(self) -> None:
+        closer = getattr(self.events, "aclose", None)
+        if closer is not None:
+            await closer()
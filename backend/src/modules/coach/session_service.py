@@ -1,31 +1,68 @@
+import asyncio
+import threading
 import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Optional, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 
+from modules.assessment.models import AssessmentScoreSet
 from modules.coach.access_guard import CoachAccessGuard
-from modules.coach.models import CoachSession, CoachTurn
+from modules.coach.config import CoachPipelineConfig, load_coach_pipeline_config
+from modules.coach.models import CoachChatStream, CoachSession, CoachTurn, CoachTurnContext
 from modules.coach.summary_service import CoachSummaryService
 from modules.memory.service import MemoryService
-from modules.model_gateway.models import ModelTaskType
+from modules.model_gateway.models import ModelGatewayRequest, ModelGatewayResponse, ModelTaskType
 from modules.model_gateway.service import ModelGatewayService
+from modules.prompt.assembly.prefix import (
+    build_prompt_prefix,
+    compose_system_prompt,
+    extract_prefix_inputs,
+)
 from modules.prompt.context.builder import build_context_prompt
 from modules.prompt.registry.runtime import get_prompt_registry
 from modules.prompt.styles.registry import get_style_prompt
 from modules.prompt.system.prompt import get_system_prompt
 from modules.safety.service import SafetyRuntimeService
 from modules.storage.in_memory import InMemoryStore
-from modules.triage.models import DialogueRiskSignal, RiskLevel
+from modules.triage.models import DialogueRiskSignal, RiskLevel, TriageDecision
 from modules.triage.triage_service import TriageService
 
+PendingTurnContext = Union["Future[CoachTurnContext]", "asyncio.Future[CoachTurnContext]"]
+
+_EXECUTORS: Dict[int, ThreadPoolExecutor] = {}
+_EXECUTORS_LOCK = threading.Lock()
+
+
+def get_shared_preparation_executor(max_workers: int) -> ThreadPoolExecutor:
+    with _EXECUTORS_LOCK:
+        executor = _EXECUTORS.get(max_workers)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="coach-prepare")
+            _EXECUTORS[max_workers] = executor
+        return executor
+
 
 class CoachSessionService:
-    def __init__(self, store: InMemoryStore) -> None:
+    """Coach sessions and chat turns.
+
+    Memory retrieval and context building do not depend on the safety verdict,
+    so with ``speculative_preparation`` enabled they start alongside safety
+    detection and are discarded when safety halts or pauses the turn.
+    """
+
+    def __init__(
+        self,
+        store: InMemoryStore,
+        config: Optional[CoachPipelineConfig] = None,
+        memory_service: Optional[MemoryService] = None,
+    ) -> None:
         self._store = store
+        self._config = config or load_coach_pipeline_config()
         self._access_guard = CoachAccessGuard(store)
         self._triage_service = TriageService()
         self._safety_runtime = SafetyRuntimeService(store)
         self._summary_service = CoachSummaryService()
-        self._memory_service = MemoryService(store)
+        self._memory_service = memory_service or MemoryService(store)
         self._model_gateway = ModelGatewayService(audit_store=store)
 
     def start_session(self, user_id: str, style_id: str, subscription_active: bool) -> dict:
@@ -58,6 +95,147 @@ class CoachSessionService:
         }
 
     def chat(self, session_id: str, user_message: str, dialogue_risk: Optional[DialogueRiskSignal]) -> dict:
+        session, user_message, locale, scores = self._open_turn(session_id, user_message)
+        pending = self._start_preparation(session, user_message)
+        try:
+            safety, triage = self._assess_turn(session, user_message, locale, scores, dialogue_risk)
+            halted = self._apply_safety_action(session, safety, triage)
+        except BaseException:
+            self._discard_preparation(pending)
+            raise
+        if halted is not None:
+            self._discard_preparation(pending)
+            return halted
+
+        context = pending.result() if pending is not None else self._prepare_turn_context(session, user_message)
+        reply, model_info = self._generate_coach_reply(session=session, user_message=user_message, context=context)
+        return self._complete_turn(session, reply, model_info, safety, triage)
+
+    async def achat(
+        self,
+        session_id: str,
+        user_message: str,
+        dialogue_risk: Optional[DialogueRiskSignal],
+    ) -> dict:
+        # Store reads and writes are blocking (SQLite), so they run in worker threads like retrieval.
+        session, user_message, locale, scores = await asyncio.to_thread(self._open_turn, session_id, user_message)
+        pending = self._astart_preparation(session, user_message)
+        try:
+            safety, triage = await self._aassess_turn(session, user_message, locale, scores, dialogue_risk)
+            halted = await asyncio.to_thread(self._apply_safety_action, session, safety, triage)
+        except BaseException:
+            self._discard_preparation(pending)
+            raise
+        if halted is not None:
+            self._discard_preparation(pending)
+            return halted
+
+        context = await self._aresolve_turn_context(session, user_message, pending)
+        reply, model_info = await self._agenerate_coach_reply(session=session, user_message=user_message, context=context)
+        return await asyncio.to_thread(self._complete_turn, session, reply, model_info, safety, triage)
+
+    def open_chat_stream(
+        self,
+        session_id: str,
+        user_message: str,
+        dialogue_risk: Optional[DialogueRiskSignal],
+    ) -> CoachChatStream:
+        session, user_message, locale, scores = self._open_turn(session_id, user_message)
+        pending = self._start_preparation(session, user_message)
+        try:
+            safety, triage = self._assess_turn(session, user_message, locale, scores, dialogue_risk)
+            halted = self._apply_safety_action(session, safety, triage)
+        except BaseException:
+            self._discard_preparation(pending)
+            raise
+        if halted is not None:
+            self._discard_preparation(pending)
+            return CoachChatStream(
+                meta={"mode": halted["mode"], "halted": halted["halted"]},
+                events=self._replay_result(halted),
+            )
+
+        return CoachChatStream(
+            meta={"mode": "coaching", "halted": False},
+            events=self._stream_coach_reply(session, user_message, safety, triage, pending),
+        )
+
+    @staticmethod
+    async def _replay_result(result: dict) -> AsyncIterator[Dict[str, Any]]:
+        yield {"event": "token", "data": {"delta": result["coach_message"], "index": 0}}
+        yield {"event": "done", "data": dict(result, model=result.get("model"))}
+
+    async def _stream_coach_reply(
+        self,
+        session: CoachSession,
+        user_message: str,
+        safety: dict,
+        triage: TriageDecision,
+        pending: Optional[PendingTurnContext] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        deltas: List[str] = []
+        completed = False
+        try:
+            context = await self._aresolve_turn_context(session, user_message, pending)
+            relevant_memories, retrieval_error = context.relevant_memories, context.retrieval_error
+            request = ModelGatewayRequest(
+                task_type=ModelTaskType.COACH_GENERATION,
+                text=user_message,
+                locale=context.locale,
+                timeout_ms=4000,
+                metadata=context.metadata,
+            )
+
+            response: Optional[ModelGatewayResponse] = None
+            stream_error: Optional[Exception] = None
+            try:
+                async for event in self._model_gateway.astream(request):
+                    if event.response is not None:
+                        response = event.response
+                    elif event.delta:
+                        deltas.append(event.delta)
+                        yield {"event": "token", "data": {"delta": event.delta, "index": len(deltas) - 1}}
+                if response is None:
+                    raise RuntimeError("Gateway stream ended without a final response")
+                reply, model_info = self._accept_coach_response(response, relevant_memories, retrieval_error)
+            except Exception as error:
+                stream_error = error
+
+            if stream_error is not None and deltas:
+                # The user already saw part of the reply; keep it rather than switching text mid-turn.
+                reply = "".join(deltas).strip()
+                model_info = {
+                    "provider": "partial-stream",
+                    "trace_id": None,
+                    "task_type": ModelTaskType.COACH_GENERATION,
+                    "latency_ms": 0.0,
+                    "error": str(stream_error),
+                    "relevant_memory_count": len(relevant_memories),
+                }
+            elif stream_error is not None:
+                reply, model_info = self._fallback_generation(
+                    session,
+                    user_message,
+                    stream_error,
+                    relevant_memories,
+                    retrieval_error,
+                )
+                yield {"event": "token", "data": {"delta": reply, "index": 0}}
+
+            result = await asyncio.to_thread(self._complete_turn, session, reply, model_info, safety, triage)
+            completed = True
+            yield {"event": "done", "data": result}
+        finally:
+            if not completed:
+                self._persist_aborted_reply(session, "".join(deltas).strip())
+
+    def _persist_aborted_reply(self, session: CoachSession, partial_reply: str) -> None:
+        if not partial_reply:
+            return
+        session.turns.append(CoachTurn(role="coach", message=partial_reply))
+        self._store.save_coach_session(session)
+
+    def _open_turn(self, session_id: str, user_message: str) -> Tuple[CoachSession, str, str, AssessmentScoreSet]:
         session = self._store.get_coach_session(session_id)
         if session is None:
             raise ValueError("Session not found")
@@ -77,6 +255,16 @@ class CoachSessionService:
 
         user = self._store.get_user(session.user_id)
         locale = user.locale if user else "en-US"
+        return session, user_message, locale, scores
+
+    def _assess_turn(
+        self,
+        session: CoachSession,
+        user_message: str,
+        locale: str,
+        scores: AssessmentScoreSet,
+        dialogue_risk: Optional[DialogueRiskSignal],
+    ) -> Tuple[dict, TriageDecision]:
         safety = self._safety_runtime.assess_and_respond(
             user_id=session.user_id,
             locale=locale,
@@ -84,7 +272,32 @@ class CoachSessionService:
             override_signal=dialogue_risk,
             legal_policy_enabled=False,
         )
-
+        return safety, self._triage_turn(user_message, scores, safety, dialogue_risk)
+
+    async def _aassess_turn(
+        self,
+        session: CoachSession,
+        user_message: str,
+        locale: str,
+        scores: AssessmentScoreSet,
+        dialogue_risk: Optional[DialogueRiskSignal],
+    ) -> Tuple[dict, TriageDecision]:
+        safety = await self._safety_runtime.aassess_and_respond(
+            user_id=session.user_id,
+            locale=locale,
+            text=user_message,
+            override_signal=dialogue_risk,
+            legal_policy_enabled=False,
+        )
+        return safety, self._triage_turn(user_message, scores, safety, dialogue_risk)
+
+    def _triage_turn(
+        self,
+        user_message: str,
+        scores: AssessmentScoreSet,
+        safety: dict,
+        dialogue_risk: Optional[DialogueRiskSignal],
+    ) -> TriageDecision:
         level_map = {
             "low": RiskLevel.LOW,
             "medium": RiskLevel.MEDIUM,
@@ -97,8 +310,9 @@ class CoachSessionService:
             text=user_message,
             is_joke=dialogue_risk.is_joke if dialogue_risk is not None else False,
         )
-        triage = self._triage_service.evaluate(scores=scores, dialogue_risk=effective_signal)
+        return self._triage_service.evaluate(scores=scores, dialogue_risk=effective_signal)
 
+    def _apply_safety_action(self, session: CoachSession, safety: dict, triage: TriageDecision) -> Optional[dict]:
         action = safety["action"]
         if action["stop_coaching"]:
             hotline = safety.get("hotline")
@@ -128,7 +342,16 @@ class CoachSessionService:
                 "safety": safety,
             }
 
-        reply, model_info = self._generate_coach_reply(session=session, user_message=user_message)
+        return None
+
+    def _complete_turn(
+        self,
+        session: CoachSession,
+        reply: str,
+        model_info: dict,
+        safety: dict,
+        triage: TriageDecision,
+    ) -> dict:
         session.turns.append(CoachTurn(role="coach", message=reply))
         self._store.save_coach_session(session)
         return {
@@ -206,15 +429,90 @@ class CoachSessionService:
             is_joke=bool(payload.get("is_joke", False)),
         )
 
-    def _generate_coach_reply(self, session: CoachSession, user_message: str) -> Tuple[str, dict]:
-        user = self._store.get_user(session.user_id)
-        locale = user.locale if user else "en-US"
+    def _generate_coach_reply(
+        self,
+        session: CoachSession,
+        user_message: str,
+        context: CoachTurnContext,
+    ) -> Tuple[str, dict]:
+        relevant_memories, retrieval_error = context.relevant_memories, context.retrieval_error
+        try:
+            response = self._model_gateway.run(
+                task_type=ModelTaskType.COACH_GENERATION,
+                text=user_message,
+                locale=context.locale,
+                timeout_ms=4000,
+                metadata=context.metadata,
+            )
+            return self._accept_coach_response(response, relevant_memories, retrieval_error)
+        except Exception as error:
+            return self._fallback_generation(session, user_message, error, relevant_memories, retrieval_error)
+
+    async def _agenerate_coach_reply(
+        self,
+        session: CoachSession,
+        user_message: str,
+        context: CoachTurnContext,
+    ) -> Tuple[str, dict]:
+        relevant_memories, retrieval_error = context.relevant_memories, context.retrieval_error
+        try:
+            response = await self._model_gateway.arun(
+                task_type=ModelTaskType.COACH_GENERATION,
+                text=user_message,
+                locale=context.locale,
+                timeout_ms=4000,
+                metadata=context.metadata,
+            )
+            return self._accept_coach_response(response, relevant_memories, retrieval_error)
+        except Exception as error:
+            return self._fallback_generation(session, user_message, error, relevant_memories, retrieval_error)
 
-        style_prompt = get_style_prompt(session.style_id)
-        context_prompt = build_context_prompt(self._store, session.user_id)
-        system_prompt = self._compose_system_prompt(context_prompt)
-        retrieval_error = None
-        relevant_memories = []
+    def _start_preparation(self, session: CoachSession, user_message: str) -> Optional["Future[CoachTurnContext]"]:
+        if not self._config.speculative_preparation:
+            return None
+        executor = get_shared_preparation_executor(self._config.preparation_workers)
+        return executor.submit(self._prepare_turn_context, session, user_message)
+
+    def _astart_preparation(
+        self,
+        session: CoachSession,
+        user_message: str,
+    ) -> Optional["asyncio.Future[CoachTurnContext]"]:
+        if not self._config.speculative_preparation:
+            return None
+        return asyncio.ensure_future(asyncio.to_thread(self._prepare_turn_context, session, user_message))
+
+    async def _aresolve_turn_context(
+        self,
+        session: CoachSession,
+        user_message: str,
+        pending: Optional[PendingTurnContext],
+    ) -> CoachTurnContext:
+        if pending is None:
+            # Retrieval may call a remote embedding provider synchronously; keep it off the event loop.
+            return await asyncio.to_thread(self._prepare_turn_context, session, user_message)
+        return await asyncio.wrap_future(pending)
+
+    @staticmethod
+    def _discard_preparation(pending: Optional[PendingTurnContext]) -> None:
+        if pending is None or pending.cancel():
+            return
+        if pending.done() and not pending.cancelled():
+            # Retrieve a speculative failure so it is not reported as unhandled; a still-running
+            # preparation finishes in the background and its result is dropped.
+            pending.exception()
+
+    def _prepare_turn_context(self, session: CoachSession, user_message: str) -> CoachTurnContext:
+        relevant_memories, retrieval_error = self._retrieve_memories(session, user_message)
+        locale, metadata = self._build_generation_metadata(session, relevant_memories)
+        return CoachTurnContext(
+            locale=locale,
+            metadata=metadata,
+            relevant_memories=relevant_memories,
+            retrieval_error=retrieval_error,
+        )
+
+    def _retrieve_memories(self, session: CoachSession, user_message: str) -> Tuple[List[str], Optional[str]]:
         try:
             relevant_memories = self._memory_service.retrieve_relevant(
                 user_id=session.user_id,
@@ -222,87 +520,81 @@ class CoachSessionService:
                 limit=3,
             )
         except Exception as error:
-            retrieval_error = str(error)
+            return [], str(error)
+        return list(relevant_memories), None
+
+    def _build_generation_metadata(
+        self,
+        session: CoachSession,
+        relevant_memories: List[str],
+    ) -> Tuple[str, dict]:
+        user = self._store.get_user(session.user_id)
+        locale = user.locale if user else "en-US"
 
+        context_prompt = build_context_prompt(self._store, session.user_id)
+        prefix = build_prompt_prefix(session.style_id, context_prompt)
         if relevant_memories:
             context_prompt["relevant_memory_summaries"] = list(relevant_memories)
 
-        try:
-            response = self._model_gateway.run(
-                task_type=ModelTaskType.COACH_GENERATION,
-                text=user_message,
-                locale=locale,
-                timeout_ms=4000,
-                metadata={
-                    "session_id": session.session_id,
-                    "user_id": session.user_id,
-                    "style_id": session.style_id,
-                    "system_prompt": system_prompt,
-                    "style_prompt": style_prompt,
-                    "context_prompt": context_prompt,
-                    "relevant_memories": list(relevant_memories),
-                },
-            )
-            if not response.output_text or not response.output_text.strip():
-                raise ValueError("Gateway returned empty coach output_text")
-
-            model_info = {
-                "provider": response.provider,
-                "trace_id": response.trace_id,
-                "task_type": response.task_type,
-                "latency_ms": round(response.latency_ms, 3),
-                "relevant_memory_count": len(relevant_memories),
-            }
-            if retrieval_error:
-                model_info["memory_retrieval_error"] = retrieval_error
+        return locale, {
+            "session_id": session.session_id,
+            "user_id": session.user_id,
+            "style_id": session.style_id,
+            "system_prompt": prefix.system_prompt,
+            "style_prompt": dict(prefix.style_prompt),
+            "prompt_pack_version": prefix.pack_version,
+            "prompt_prefix_id": prefix.prefix_id,
+            "context_prompt": context_prompt,
+            "relevant_memories": list(relevant_memories),
+        }
 
-            return response.output_text.strip(), model_info
-        except Exception as error:
-            fallback = self._fallback_coach_reply(style_id=session.style_id, user_message=user_message)
-            model_info = {
-                "provider": "fallback-local-template",
-                "trace_id": None,
-                "task_type": ModelTaskType.COACH_GENERATION,
-                "latency_ms": 0.0,
-                "error": str(error),
-                "relevant_memory_count": len(relevant_memories),
-            }
-            if retrieval_error:
-                model_info["memory_retrieval_error"] = retrieval_error
+    @staticmethod
+    def _accept_coach_response(
+        response: ModelGatewayResponse,
+        relevant_memories: List[str],
+        retrieval_error: Optional[str],
+    ) -> Tuple[str, dict]:
+        if not response.output_text or not response.output_text.strip():
+            raise ValueError("Gateway returned empty coach output_text")
+
+        model_info = {
+            "provider": response.provider,
+            "trace_id": response.trace_id,
+            "task_type": response.task_type,
+            "latency_ms": round(response.latency_ms, 3),
+            "relevant_memory_count": len(relevant_memories),
+        }
+        if retrieval_error:
+            model_info["memory_retrieval_error"] = retrieval_error
+
+        return response.output_text.strip(), model_info
+
+    def _fallback_generation(
+        self,
+        session: CoachSession,
+        user_message: str,
+        error: Exception,
+        relevant_memories: List[str],
+        retrieval_error: Optional[str],
+    ) -> Tuple[str, dict]:
+        fallback = self._fallback_coach_reply(style_id=session.style_id, user_message=user_message)
+        model_info = {
+            "provider": "fallback-local-template",
+            "trace_id": None,
+            "task_type": ModelTaskType.COACH_GENERATION,
+            "latency_ms": 0.0,
+            "error": str(error),
+            "relevant_memory_count": len(relevant_memories),
+        }
+        if retrieval_error:
+            model_info["memory_retrieval_error"] = retrieval_error
 
-            return fallback, model_info
+        return fallback, model_info
 
     @staticmethod
     def _compose_system_prompt(context_prompt: dict) -> str:
-        base_prompt = get_system_prompt()
-        expert_qa = context_prompt.get("expert_qa")
-        expert_policy = None
-        if isinstance(expert_qa, dict):
-            policy_candidate = expert_qa.get("policy")
-            if isinstance(policy_candidate, str):
-                expert_policy = policy_candidate.strip()
-
-        composed_prompt = base_prompt
-        if expert_policy:
-            composed_prompt = (
-                f"{composed_prompt}\n\n"
-                "Additional expert educational Q&A guidance:\n"
-                f"{expert_policy}"
-            )
-
-        fragments = context_prompt.get("neurodiversity_prompt_fragments")
-        if not isinstance(fragments, list):
-            return composed_prompt
-
-        cleaned = [str(item).strip() for item in fragments if str(item).strip()]
-        if not cleaned:
-            return composed_prompt
-
-        return (
-            f"{composed_prompt}\n\n"
-            "Additional neurodiversity adaptation guidance:\n"
-            "\n\n".join(cleaned)
-        )
+        expert_policy, fragments = extract_prefix_inputs(context_prompt)
+        return compose_system_prompt(get_system_prompt(), expert_policy, fragments)
 
     @staticmethod
     def _fallback_coach_reply(style_id: str, user_message: str) -> str:
@@ -1,12 +1,14 @@
 from datetime import datetime, timezone
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
+from modules.memory.service import MemoryService
 from modules.storage.in_memory import InMemoryStore
 
 
 class DataGovernanceService:
-    def __init__(self, store: InMemoryStore) -> None:
+    def __init__(self, store: InMemoryStore, memory_service: Optional[MemoryService] = None) -> None:
         self._store = store
+        self._memory_service = memory_service
 
     def export_user_bundle(self, user_id: str) -> Dict[str, Any]:
         if not user_id:
@@ -25,6 +27,9 @@ class DataGovernanceService:
 
         existed_before = self._store.get_user(user_id) is not None
         deleted = self._store.erase_user_data(user_id)
+        if self._memory_service is not None:
+            # The reranker keeps memory text in process memory; it must go with the stored copy.
+            self._memory_service.erase_user(user_id)
 
         return {
             "user_id": user_id,
@@ -4,13 +4,10 @@ from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional
 
 from modules.journal.models import JournalEntry
+from modules.safety.lexicon.compiled import get_safety_lexicon
 from modules.storage.in_memory import InMemoryStore
 
 
-HIGH_RISK_KEYWORDS = ["kill myself", "end my life", "suicide", "self-harm"]
-MEDIUM_RISK_KEYWORDS = ["hopeless", "can't go on", "worthless"]
-
-
 class JournalService:
     def __init__(self, store: InMemoryStore) -> None:
         self._store = store
@@ -31,7 +28,8 @@ class JournalService:
         )
         self._store.save_journal_entry(entry)
 
-        risk_signal = self._detect_risk(entry)
+        user = self._store.get_user(user_id)
+        risk_signal = self._detect_risk(entry, locale=user.locale if user is not None else None)
         if risk_signal is not None:
             self._store.save_tool_event(
                 user_id,
@@ -79,20 +77,14 @@ class JournalService:
         }
 
     @staticmethod
-    def _detect_risk(entry: JournalEntry) -> Optional[Dict[str, str]]:
-        text = f"{entry.mood} {entry.note}".lower()
-
-        for keyword in HIGH_RISK_KEYWORDS:
-            if keyword in text:
-                return {
-                    "risk_level": "high",
-                    "reason": f"keyword:{keyword}",
-                }
+    def _detect_risk(entry: JournalEntry, locale: Optional[str] = None) -> Optional[Dict[str, str]]:
+        scan = get_safety_lexicon(locale).scan(f"{entry.mood} {entry.note}")
 
-        for keyword in MEDIUM_RISK_KEYWORDS:
-            if keyword in text:
+        for tier in ("high", "medium"):
+            keyword = scan.first("journal", tier)
+            if keyword is not None:
                 return {
-                    "risk_level": "medium",
+                    "risk_level": tier,
                     "reason": f"keyword:{keyword}",
                 }
 
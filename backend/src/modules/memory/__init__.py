@@ -1,8 +1,9 @@
 from modules.memory.config import MemoryRetrievalConfig, load_memory_retrieval_config
-from modules.memory.models import MemoryVectorRecord
+from modules.memory.models import MemoryVectorRecord, SparseEmbedding
 
 __all__ = [
     "MemoryRetrievalConfig",
     "MemoryVectorRecord",
+    "SparseEmbedding",
     "load_memory_retrieval_config",
 ]
@@ -2,6 +2,22 @@ import os
 from dataclasses import dataclass
 
 
+def _parse_float(raw: str, default: float, *, minimum: float, maximum: float) -> float:
+    try:
+        value = float(raw.strip())
+    except ValueError:
+        value = default
+    return min(max(value, minimum), maximum)
+
+
+def _parse_int(raw: str, default: int, *, minimum: int, maximum: int) -> int:
+    try:
+        value = int(raw.strip())
+    except ValueError:
+        value = default
+    return min(max(value, minimum), maximum)
+
+
 @dataclass
 class MemoryRetrievalConfig:
     embedder_provider: str = "local"
@@ -9,6 +25,14 @@ class MemoryRetrievalConfig:
     openai_api_key: str = ""
     openai_base_url: str = "https://api.openai.com/v1"
     openai_embedding_model: str = "text-embedding-3-small"
+    openai_embedding_batch_size: int = 64
+    openai_embedding_max_connections: int = 8
+    openai_embedding_batch_window_ms: int = 5
+    local_embedding_dimension: int = 4096
+    max_items_per_user: int = 200
+    dedup_similarity_threshold: float = 0.8
+    recency_half_life_days: float = 30.0
+    compaction_interval_seconds: int = 3600
 
 
 def load_memory_retrieval_config() -> MemoryRetrievalConfig:
@@ -18,4 +42,52 @@ def load_memory_retrieval_config() -> MemoryRetrievalConfig:
         openai_api_key=os.getenv("OPENAI_API_KEY", "").strip(),
         openai_base_url=os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1").strip(),
         openai_embedding_model=os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small").strip(),
+        openai_embedding_batch_size=_parse_int(
+            os.getenv("MINDCOACH_MEMORY_EMBED_BATCH_SIZE", "64"),
+            64,
+            minimum=1,
+            maximum=2048,
+        ),
+        openai_embedding_max_connections=_parse_int(
+            os.getenv("MINDCOACH_MEMORY_EMBED_MAX_CONNECTIONS", "8"),
+            8,
+            minimum=1,
+            maximum=100,
+        ),
+        openai_embedding_batch_window_ms=_parse_int(
+            os.getenv("MINDCOACH_MEMORY_EMBED_BATCH_WINDOW_MS", "5"),
+            5,
+            minimum=0,
+            maximum=100,
+        ),
+        local_embedding_dimension=_parse_int(
+            os.getenv("MINDCOACH_MEMORY_LOCAL_EMBED_DIM", "4096"),
+            4096,
+            minimum=64,
+            maximum=1 << 20,
+        ),
+        max_items_per_user=_parse_int(
+            os.getenv("MINDCOACH_MEMORY_MAX_ITEMS_PER_USER", "200"),
+            200,
+            minimum=1,
+            maximum=100000,
+        ),
+        dedup_similarity_threshold=_parse_float(
+            os.getenv("MINDCOACH_MEMORY_DEDUP_THRESHOLD", "0.8"),
+            0.8,
+            minimum=0.5,
+            maximum=1.0,
+        ),
+        recency_half_life_days=_parse_float(
+            os.getenv("MINDCOACH_MEMORY_RECENCY_HALF_LIFE_DAYS", "30"),
+            30.0,
+            minimum=0.1,
+            maximum=3650.0,
+        ),
+        compaction_interval_seconds=_parse_int(
+            os.getenv("MINDCOACH_MEMORY_COMPACTION_INTERVAL_SECONDS", "3600"),
+            3600,
+            minimum=0,
+            maximum=7 * 24 * 3600,
+        ),
     )
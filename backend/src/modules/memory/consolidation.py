@@ -0,0 +1,239 @@
+import struct
+import threading
+from datetime import datetime, timezone
+from hashlib import shake_128
+from typing import Dict, List, Optional, Protocol, Set, Tuple
+
+from modules.memory.models import MemoryVectorRecord
+from modules.memory.tokenizer import tokenize_for_retrieval
+
+_HASH_MASK = (1 << 32) - 1
+
+
+class MinHasher:
+    def __init__(self, num_perm: int = 64, shingle_size: int = 3, seed: int = 20260201) -> None:
+        self._num_perm = max(4, int(num_perm))
+        self._shingle_size = max(1, int(shingle_size))
+        self._salt = str(seed).encode("utf-8") + b":"
+        self._layout = struct.Struct(f"<{self._num_perm}I")
+
+    @property
+    def num_perm(self) -> int:
+        return self._num_perm
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        raw_tokens = tokenize_for_retrieval(text)
+        if not raw_tokens:
+            return tuple([_HASH_MASK] * self._num_perm)
+
+        # Numbers are masked inside shingles and kept as standalone features, so a
+        # changed counter in a templated summary costs one feature, not a window of them.
+        tokens = ["#" if token.isdigit() else token for token in raw_tokens]
+        size = min(self._shingle_size, len(tokens))
+        shingles = {" ".join(tokens[start:start + size]) for start in range(len(tokens) - size + 1)}
+        shingles.update(f"#{token}" for token in raw_tokens if token.isdigit())
+        # One SHAKE-128 digest per shingle yields all num_perm hash values at once;
+        # the signature is the element-wise minimum across shingles.
+        hash_rows = [
+            self._layout.unpack(shake_128(self._salt + shingle.encode("utf-8")).digest(self._layout.size))
+            for shingle in shingles
+        ]
+        return tuple(map(min, zip(*hash_rows)))
+
+    @staticmethod
+    def similarity(left: Tuple[int, ...], right: Tuple[int, ...]) -> float:
+        size = min(len(left), len(right))
+        if size == 0:
+            return 0.0
+        matches = sum(1 for index in range(size) if left[index] == right[index])
+        return matches / size
+
+
+class MinHashLSHIndex:
+    def __init__(self, bands: int, rows: int) -> None:
+        self._bands = max(1, int(bands))
+        self._rows = max(1, int(rows))
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Set[str]] = {}
+
+    def add(self, key: str, signature: Tuple[int, ...]) -> None:
+        for bucket in self._band_keys(signature):
+            self._buckets.setdefault(bucket, set()).add(key)
+
+    def remove(self, key: str, signature: Tuple[int, ...]) -> None:
+        for bucket in self._band_keys(signature):
+            members = self._buckets.get(bucket)
+            if members is None:
+                continue
+            members.discard(key)
+            if not members:
+                self._buckets.pop(bucket, None)
+
+    def candidates(self, signature: Tuple[int, ...]) -> Set[str]:
+        found: Set[str] = set()
+        for bucket in self._band_keys(signature):
+            found.update(self._buckets.get(bucket, ()))
+        return found
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+        return [
+            (band, tuple(signature[band * self._rows:(band + 1) * self._rows]))
+            for band in range(self._bands)
+            if band * self._rows < len(signature)
+        ]
+
+
+class MemoryConsolidator:
+    """Near-duplicate merging and capped retention for per-user memory records.
+
+    A new record supersedes any stored record whose MinHash similarity meets
+    the threshold (the survivor inherits merge and retrieval counts). When a
+    user exceeds the cap, records with the lowest recency x relevance score
+    are evicted.
+    """
+
+    def __init__(
+        self,
+        similarity_threshold: float = 0.8,
+        max_items_per_user: int = 200,
+        recency_half_life_days: float = 30.0,
+        num_perm: int = 64,
+        bands: int = 16,
+    ) -> None:
+        self._threshold = min(max(float(similarity_threshold), 0.0), 1.0)
+        self._max_items = max(1, int(max_items_per_user))
+        self._half_life_days = max(float(recency_half_life_days), 0.001)
+        self._hasher = MinHasher(num_perm=num_perm)
+        self._bands = max(1, min(int(bands), self._hasher.num_perm))
+        self._rows = max(1, self._hasher.num_perm // self._bands)
+
+    @property
+    def max_items_per_user(self) -> int:
+        return self._max_items
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        return self._hasher.signature(text)
+
+    def find_near_duplicate(
+        self,
+        record: MemoryVectorRecord,
+        existing: List[MemoryVectorRecord],
+    ) -> Optional[MemoryVectorRecord]:
+        signature = self._ensure_signature(record)
+        index = MinHashLSHIndex(bands=self._bands, rows=self._rows)
+        by_id: Dict[str, MemoryVectorRecord] = {}
+        for item in existing:
+            index.add(item.memory_id, self._ensure_signature(item))
+            by_id[item.memory_id] = item
+        return self._best_match(signature, index.candidates(signature), by_id)
+
+    def merge_into(self, survivor: MemoryVectorRecord, superseded: MemoryVectorRecord) -> None:
+        survivor.merged_count += superseded.merged_count
+        survivor.retrieval_hits += superseded.retrieval_hits
+
+    def consolidate(
+        self,
+        records: List[MemoryVectorRecord],
+        now: Optional[datetime] = None,
+    ) -> Tuple[List[MemoryVectorRecord], int, int]:
+        ordered = sorted(records, key=lambda item: item.created_at)
+        index = MinHashLSHIndex(bands=self._bands, rows=self._rows)
+        kept: Dict[str, MemoryVectorRecord] = {}
+        merged = 0
+        for record in ordered:
+            signature = self._ensure_signature(record)
+            duplicate = self._best_match(signature, index.candidates(signature), kept)
+            if duplicate is not None:
+                self.merge_into(record, duplicate)
+                index.remove(duplicate.memory_id, self._ensure_signature(duplicate))
+                kept.pop(duplicate.memory_id, None)
+                merged += 1
+            index.add(record.memory_id, signature)
+            kept[record.memory_id] = record
+
+        survivors = sorted(kept.values(), key=lambda item: item.created_at)
+        retained = self.enforce_cap(survivors, now=now)
+        return retained, merged, len(survivors) - len(retained)
+
+    def enforce_cap(
+        self,
+        records: List[MemoryVectorRecord],
+        now: Optional[datetime] = None,
+    ) -> List[MemoryVectorRecord]:
+        if len(records) <= self._max_items:
+            return list(records)
+        reference = now or datetime.now(timezone.utc)
+        ranked = sorted(records, key=lambda item: self.retention_score(item, reference), reverse=True)
+        keep_ids = {item.memory_id for item in ranked[:self._max_items]}
+        return [item for item in records if item.memory_id in keep_ids]
+
+    def retention_score(self, record: MemoryVectorRecord, now: datetime) -> float:
+        age_days = max((now - record.created_at).total_seconds(), 0.0) / 86400.0
+        recency = 0.5 ** (age_days / self._half_life_days)
+        relevance = 1.0 + record.retrieval_hits + 0.5 * (record.merged_count - 1)
+        return recency * relevance
+
+    def _ensure_signature(self, record: MemoryVectorRecord) -> Tuple[int, ...]:
+        if len(record.minhash) != self._hasher.num_perm:
+            record.minhash = self._hasher.signature(record.text)
+        return record.minhash
+
+    def _best_match(
+        self,
+        signature: Tuple[int, ...],
+        candidate_ids: Set[str],
+        records_by_id: Dict[str, MemoryVectorRecord],
+    ) -> Optional[MemoryVectorRecord]:
+        best: Optional[MemoryVectorRecord] = None
+        best_score = self._threshold
+        for memory_id in candidate_ids:
+            candidate = records_by_id.get(memory_id)
+            if candidate is None:
+                continue
+            score = MinHasher.similarity(signature, self._ensure_signature(candidate))
+            if score >= best_score:
+                best, best_score = candidate, score
+        return best
+
+
+class CompactableMemoryService(Protocol):
+    def compact_all(self) -> dict:
+        ...
+
+
+class MemoryCompactionJob:
+    def __init__(self, memory_service: CompactableMemoryService, interval_seconds: int) -> None:
+        self._memory_service = memory_service
+        self._interval_seconds = max(0, int(interval_seconds))
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_report: Optional[dict] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._interval_seconds > 0
+
+    def start(self) -> None:
+        if not self.enabled or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="memory-compaction", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        thread = self._thread
+        self._thread = None
+        if thread is not None:
+            thread.join(timeout=5)
+
+    def run_once(self) -> dict:
+        self.last_report = self._memory_service.compact_all()
+        return self.last_report
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval_seconds):
+            try:
+                self.run_once()
+            except Exception:
+                # Compaction is best effort; the next tick retries.
+                continue
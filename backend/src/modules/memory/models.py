@@ -1,22 +1,68 @@
+import math
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import List
+from typing import Dict, List, Tuple, Union
 from uuid import uuid4
 
 
+@dataclass(frozen=True)
+class SparseEmbedding:
+    dimension: int
+    weights: Dict[int, float] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return self.dimension
+
+    def dot(self, other: "SparseEmbedding") -> float:
+        small, large = (self.weights, other.weights)
+        if len(small) > len(large):
+            small, large = large, small
+        return sum(value * large.get(index, 0.0) for index, value in small.items())
+
+    def norm(self) -> float:
+        return math.sqrt(sum(value * value for value in self.weights.values()))
+
+    def to_dense(self) -> List[float]:
+        vector = [0.0] * self.dimension
+        for index, value in self.weights.items():
+            vector[index] = value
+        return vector
+
+    def to_dict(self) -> dict:
+        ordered = sorted(self.weights.items())
+        return {
+            "dimension": self.dimension,
+            "indices": [index for index, _ in ordered],
+            "values": [value for _, value in ordered],
+        }
+
+
+Embedding = Union[List[float], SparseEmbedding]
+
+
 @dataclass
 class MemoryVectorRecord:
     user_id: str
     text: str
-    embedding: List[float]
+    embedding: Embedding
     memory_id: str = field(default_factory=lambda: str(uuid4()))
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    merged_count: int = 1
+    retrieval_hits: int = 0
+    minhash: Tuple[int, ...] = ()
 
     def to_dict(self) -> dict:
+        embedding = (
+            self.embedding.to_dict()
+            if isinstance(self.embedding, SparseEmbedding)
+            else list(self.embedding)
+        )
         return {
             "memory_id": self.memory_id,
             "user_id": self.user_id,
             "text": self.text,
-            "embedding": list(self.embedding),
+            "embedding": embedding,
             "created_at": self.created_at.isoformat(),
+            "merged_count": self.merged_count,
+            "retrieval_hits": self.retrieval_hits,
         }
@@ -1,4 +1,5 @@
 from modules.memory.providers.base import EmbeddingProvider, RerankerProvider
+from modules.memory.providers.local_bm25 import LocalBM25RerankerProvider
 from modules.memory.providers.local_embedding import LocalHashEmbeddingProvider
 from modules.memory.providers.local_reranker import LocalOverlapRerankerProvider
 from modules.memory.providers.openai_embedding import OpenAIEmbeddingProvider
@@ -6,6 +7,7 @@ from modules.memory.providers.openai_embedding import OpenAIEmbeddingProvider
 __all__ = [
     "EmbeddingProvider",
     "RerankerProvider",
+    "LocalBM25RerankerProvider",
     "LocalHashEmbeddingProvider",
     "LocalOverlapRerankerProvider",
     "OpenAIEmbeddingProvider",
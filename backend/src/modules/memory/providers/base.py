@@ -1,11 +1,25 @@
-from typing import List, Protocol, Tuple
+from typing import List, Optional, Protocol, Tuple
+
+from modules.memory.models import Embedding
 
 
 class EmbeddingProvider(Protocol):
-    def embed(self, text: str) -> List[float]:
+    def embed(self, text: str) -> Embedding:
+        ...
+
+    def embed_many(self, texts: List[str]) -> List[Embedding]:
         ...
 
 
 class RerankerProvider(Protocol):
-    def rerank(self, query: str, candidates: List[str], limit: int) -> List[Tuple[str, float]]:
+    def sync_index(self, user_id: str, documents: List[Tuple[str, str]]) -> None:
+        ...
+
+    def rerank(
+        self,
+        query: str,
+        candidates: List[str],
+        limit: int,
+        user_id: Optional[str] = None,
+    ) -> List[Tuple[str, float]]:
         ...
@@ -0,0 +1,132 @@
+import math
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from modules.memory.tokenizer import tokenize_for_retrieval
+
+
+@dataclass
+class _UserIndex:
+    postings: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    doc_lengths: Dict[str, int] = field(default_factory=dict)
+    doc_ids_by_text: Dict[str, str] = field(default_factory=dict)
+    texts_by_doc_id: Dict[str, str] = field(default_factory=dict)
+    terms_by_doc_id: Dict[str, List[str]] = field(default_factory=dict)
+    total_length: int = 0
+
+    def add(self, doc_id: str, text: str) -> None:
+        frequencies = Counter(tokenize_for_retrieval(text))
+        for term, count in frequencies.items():
+            self.postings.setdefault(term, {})[doc_id] = count
+        length = sum(frequencies.values())
+        self.doc_lengths[doc_id] = length
+        self.total_length += length
+        self.texts_by_doc_id[doc_id] = text
+        self.terms_by_doc_id[doc_id] = list(frequencies)
+        self.doc_ids_by_text.setdefault(text, doc_id)
+
+    def remove(self, doc_id: str) -> None:
+        text = self.texts_by_doc_id.pop(doc_id, None)
+        if text is None:
+            return
+        for term in self.terms_by_doc_id.pop(doc_id, []):
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(doc_id, None)
+            if not posting:
+                self.postings.pop(term, None)
+        self.total_length -= self.doc_lengths.pop(doc_id, 0)
+        if self.doc_ids_by_text.get(text) == doc_id:
+            self.doc_ids_by_text.pop(text, None)
+            for other_id, other_text in self.texts_by_doc_id.items():
+                if other_text == text:
+                    self.doc_ids_by_text[text] = other_id
+                    break
+
+
+class LocalBM25RerankerProvider:
+    """BM25 reranker over a per-user inverted index built once at index time.
+
+    Memories are tokenized when they are synced into the index; queries only
+    walk the posting lists of their own terms. Candidates that are not in the
+    user's index (or calls without a user) are scored against an ad-hoc index.
+    """
+
+    SUBSTRING_BONUS = 0.15
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75) -> None:
+        self._k1 = float(k1)
+        self._b = float(b)
+        self._indexes: Dict[str, _UserIndex] = {}
+        self._lock = threading.Lock()
+
+    def sync_index(self, user_id: str, documents: List[Tuple[str, str]]) -> None:
+        with self._lock:
+            index = self._indexes.setdefault(user_id, _UserIndex())
+            wanted = {doc_id: text for doc_id, text in documents}
+            for doc_id in [doc_id for doc_id in index.texts_by_doc_id if doc_id not in wanted]:
+                index.remove(doc_id)
+            for doc_id, text in wanted.items():
+                if doc_id not in index.texts_by_doc_id:
+                    index.add(doc_id, text)
+            if not index.texts_by_doc_id:
+                self._indexes.pop(user_id, None)
+
+    def rerank(
+        self,
+        query: str,
+        candidates: List[str],
+        limit: int,
+        user_id: Optional[str] = None,
+    ) -> List[Tuple[str, float]]:
+        if limit <= 0 or not candidates:
+            return []
+
+        normalized_query = str(query).lower().strip()
+        query_terms = set(tokenize_for_retrieval(normalized_query))
+
+        with self._lock:
+            index = self._indexes.get(user_id) if user_id is not None else None
+            texts = [str(candidate) for candidate in candidates]
+            if index is None or any(text not in index.doc_ids_by_text for text in texts):
+                index = _UserIndex()
+                for position, text in enumerate(texts):
+                    index.add(str(position), text)
+            raw_scores = self._score(index, query_terms, texts)
+
+        best = max(raw_scores) if raw_scores else 0.0
+        scored: List[Tuple[str, float]] = []
+        for text, raw in zip(texts, raw_scores):
+            score = raw / best if best > 0 else 0.0
+            if normalized_query and normalized_query in text.lower():
+                score += self.SUBSTRING_BONUS
+            scored.append((text, score))
+
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:limit]
+
+    def _score(self, index: _UserIndex, query_terms: set, texts: List[str]) -> List[float]:
+        doc_count = len(index.doc_lengths)
+        if doc_count == 0 or not query_terms:
+            return [0.0] * len(texts)
+
+        candidate_ids = [index.doc_ids_by_text.get(text, "") for text in texts]
+        wanted = set(candidate_ids)
+        average_length = (index.total_length / doc_count) or 1.0
+        totals: Dict[str, float] = {}
+        for term in query_terms:
+            posting = index.postings.get(term)
+            if not posting:
+                continue
+            document_frequency = len(posting)
+            idf = math.log(1.0 + (doc_count - document_frequency + 0.5) / (document_frequency + 0.5))
+            for doc_id, frequency in posting.items():
+                if doc_id not in wanted:
+                    continue
+                length_ratio = index.doc_lengths[doc_id] / average_length
+                denominator = frequency + self._k1 * (1.0 - self._b + self._b * length_ratio)
+                totals[doc_id] = totals.get(doc_id, 0.0) + idf * frequency * (self._k1 + 1.0) / denominator
+        return [totals.get(doc_id, 0.0) for doc_id in candidate_ids]
@@ -1,27 +1,74 @@
 import math
 import re
-from typing import List
+from hashlib import blake2b
+from typing import Dict, Iterator, List, Tuple
+
+from modules.memory.models import SparseEmbedding
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]+|[㐀-鿿豈-﫿]+")
+_CJK_PATTERN = re.compile(r"[㐀-鿿豈-﫿]")
 
 
 class LocalHashEmbeddingProvider:
-    def __init__(self, dimension: int = 64) -> None:
+    """Feature-hashing embedder that is stable across processes and restarts.
+
+    Word unigrams, word bigrams and character n-grams are hashed with an
+    unkeyed 8-byte BLAKE2b digest (not Python's per-process salted ``hash``)
+    into a sparse, L2-normalized vector, so persisted vectors stay comparable
+    between workers. The digest is for stable bucketing, not secrecy.
+    """
+
+    def __init__(self, dimension: int = 4096, word_ngram: int = 2, char_ngram: int = 3) -> None:
         self._dimension = max(8, int(dimension))
+        self._word_ngram = max(1, int(word_ngram))
+        self._char_ngram = max(0, int(char_ngram))
+
+    @property
+    def dimension(self) -> int:
+        return self._dimension
 
-    def embed(self, text: str) -> List[float]:
+    def embed(self, text: str) -> SparseEmbedding:
         normalized = str(text).lower().strip()
         if not normalized:
-            return [0.0] * self._dimension
+            return SparseEmbedding(dimension=self._dimension)
 
-        tokens = re.findall(r"[a-z0-9]+", normalized)
-        if not tokens:
-            return [0.0] * self._dimension
+        weights: Dict[int, float] = {}
+        for feature in self._features(normalized):
+            index, sign = self._hash_feature(feature)
+            weights[index] = weights.get(index, 0.0) + sign
+
+        norm = math.sqrt(sum(value * value for value in weights.values()))
+        if norm == 0:
+            return SparseEmbedding(dimension=self._dimension)
+        return SparseEmbedding(
+            dimension=self._dimension,
+            weights={index: value / norm for index, value in weights.items() if value != 0.0},
+        )
+
+    def embed_many(self, texts: List[str]) -> List[SparseEmbedding]:
+        return [self.embed(text) for text in texts]
+
+    def _features(self, normalized: str) -> Iterator[str]:
+        tokens: List[str] = []
+        for chunk in _WORD_PATTERN.findall(normalized):
+            if _CJK_PATTERN.match(chunk):
+                # CJK has no whitespace word boundaries; treat each character as a token.
+                tokens.extend(chunk)
+            else:
+                tokens.append(chunk)
 
-        vector = [0.0] * self._dimension
         for token in tokens:
-            index = hash(token) % self._dimension
-            vector[index] += 1.0
+            yield f"w:{token}"
+            if self._char_ngram and len(token) > self._char_ngram:
+                padded = f"<{token}>"
+                for start in range(len(padded) - self._char_ngram + 1):
+                    yield f"c:{padded[start:start + self._char_ngram]}"
 
-        norm = math.sqrt(sum(value * value for value in vector))
-        if norm == 0:
-            return vector
-        return [value / norm for value in vector]
+        for size in range(2, self._word_ngram + 1):
+            for start in range(len(tokens) - size + 1):
+                yield "n:" + " ".join(tokens[start:start + size])
+
+    def _hash_feature(self, feature: str) -> Tuple[int, float]:
+        digest = int.from_bytes(blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+        sign = 1.0 if digest >> 63 else -1.0
+        return digest % self._dimension, sign
@@ -1,9 +1,18 @@
 import re
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 
 class LocalOverlapRerankerProvider:
-    def rerank(self, query: str, candidates: List[str], limit: int) -> List[Tuple[str, float]]:
+    def sync_index(self, user_id: str, documents: List[Tuple[str, str]]) -> None:
+        return
+
+    def rerank(
+        self,
+        query: str,
+        candidates: List[str],
+        limit: int,
+        user_id: Optional[str] = None,
+    ) -> List[Tuple[str, float]]:
         normalized_query = str(query).lower().strip()
         query_tokens = set(re.findall(r"[a-z0-9]+", normalized_query))
         if limit <= 0:
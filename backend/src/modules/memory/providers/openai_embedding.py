@@ -1,37 +1,131 @@
-from typing import List
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional, Tuple
 
 import httpx
 
 from modules.memory.config import MemoryRetrievalConfig
 
 
+class _EmbeddingMicroBatcher:
+    """Coalesces concurrent single-text embed calls into one batched request.
+
+    The first caller to arrive in an empty window becomes the leader: it waits
+    for the window to elapse, drains everything queued meanwhile and resolves
+    every waiter's future from one ``embed_many`` call.
+    """
+
+    def __init__(self, provider: "OpenAIEmbeddingProvider", window_ms: int) -> None:
+        self._provider = provider
+        self._window_seconds = max(0, int(window_ms)) / 1000.0
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[str, Future]] = []
+
+    def submit(self, text: str) -> List[float]:
+        future: Future = Future()
+        with self._lock:
+            self._pending.append((text, future))
+            is_leader = len(self._pending) == 1
+
+        if is_leader:
+            if self._window_seconds > 0:
+                time.sleep(self._window_seconds)
+            self._flush()
+
+        return future.result()
+
+    def _flush(self) -> None:
+        with self._lock:
+            batch = self._pending
+            self._pending = []
+
+        try:
+            embeddings = self._provider.embed_many([text for text, _ in batch])
+        except Exception as error:
+            for _, future in batch:
+                future.set_exception(error)
+            return
+
+        for (_, future), embedding in zip(batch, embeddings):
+            future.set_result(embedding)
+
+
 class OpenAIEmbeddingProvider:
-    def __init__(self, config: MemoryRetrievalConfig) -> None:
+    def __init__(self, config: MemoryRetrievalConfig, client: Optional[httpx.Client] = None) -> None:
         self._config = config
+        self._client = client
+        self._client_lock = threading.Lock()
+        self._batch_size = max(1, int(config.openai_embedding_batch_size))
+        self._batcher = _EmbeddingMicroBatcher(self, window_ms=config.openai_embedding_batch_window_ms)
 
     def embed(self, text: str) -> List[float]:
+        self._ensure_api_key()
+        return self._batcher.submit(text)
+
+    def embed_many(self, texts: List[str]) -> List[List[float]]:
+        self._ensure_api_key()
+        items = [str(text) for text in texts]
+        embeddings: List[List[float]] = []
+        for offset in range(0, len(items), self._batch_size):
+            embeddings.extend(self._request_embeddings(items[offset:offset + self._batch_size]))
+        return embeddings
+
+    def close(self) -> None:
+        with self._client_lock:
+            client = self._client
+            self._client = None
+        if client is not None:
+            client.close()
+
+    def _ensure_api_key(self) -> None:
         if not self._config.openai_api_key:
             raise ValueError("OPENAI_API_KEY is required when memory embedder provider is openai")
 
-        endpoint = f"{self._config.openai_base_url.rstrip('/')}/embeddings"
-        response = httpx.post(
-            endpoint,
-            headers={
-                "Authorization": f"Bearer {self._config.openai_api_key}",
-                "Content-Type": "application/json",
-            },
+    def _http_client(self) -> httpx.Client:
+        with self._client_lock:
+            if self._client is None:
+                max_connections = max(1, int(self._config.openai_embedding_max_connections))
+                self._client = httpx.Client(
+                    base_url=self._config.openai_base_url.rstrip("/"),
+                    headers={
+                        "Authorization": f"Bearer {self._config.openai_api_key}",
+                        "Content-Type": "application/json",
+                    },
+                    limits=httpx.Limits(
+                        max_connections=max_connections,
+                        max_keepalive_connections=max_connections,
+                    ),
+                    timeout=5.0,
+                )
+            return self._client
+
+    def _request_embeddings(self, inputs: List[str]) -> List[List[float]]:
+        if not inputs:
+            return []
+
+        response = self._http_client().post(
+            "/embeddings",
             json={
                 "model": self._config.openai_embedding_model,
-                "input": text,
+                "input": inputs,
             },
-            timeout=5.0,
         )
         response.raise_for_status()
         payload = response.json()
         data = payload.get("data", [])
         if not data:
             raise RuntimeError("OpenAI embedding provider returned empty data")
-        embedding = data[0].get("embedding")
-        if not isinstance(embedding, list):
-            raise RuntimeError("OpenAI embedding provider returned invalid embedding")
-        return [float(value) for value in embedding]
+        if len(data) != len(inputs):
+            raise RuntimeError(
+                f"OpenAI embedding provider returned {len(data)} embeddings for {len(inputs)} inputs"
+            )
+
+        ordered = sorted(data, key=lambda item: int(item.get("index", 0)))
+        embeddings: List[List[float]] = []
+        for item in ordered:
+            embedding = item.get("embedding")
+            if not isinstance(embedding, list):
+                raise RuntimeError("OpenAI embedding provider returned invalid embedding")
+            embeddings.append([float(value) for value in embedding])
+        return embeddings
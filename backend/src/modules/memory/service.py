@@ -1,9 +1,13 @@
 import math
-from typing import List, Optional
+import threading
+from dataclasses import replace
+from typing import Dict, List, Optional
 
 from modules.memory.config import MemoryRetrievalConfig, load_memory_retrieval_config
-from modules.memory.models import MemoryVectorRecord
+from modules.memory.consolidation import MemoryConsolidator
+from modules.memory.models import Embedding, MemoryVectorRecord, SparseEmbedding
 from modules.memory.providers.base import EmbeddingProvider, RerankerProvider
+from modules.memory.providers.local_bm25 import LocalBM25RerankerProvider
 from modules.memory.providers.local_embedding import LocalHashEmbeddingProvider
 from modules.memory.providers.local_reranker import LocalOverlapRerankerProvider
 from modules.memory.providers.openai_embedding import OpenAIEmbeddingProvider
@@ -11,6 +15,13 @@ from modules.storage.in_memory import InMemoryStore
 
 
 class MemoryService:
+    """Per-user memory indexing, retrieval and compaction.
+
+    Indexing and compaction both read a user's vectors and write back a full
+    replacement, so they hold the same per-user lock. Share one instance
+    between the coach and the compaction job for that lock to apply.
+    """
+
     def __init__(
         self,
         store: InMemoryStore,
@@ -22,12 +33,18 @@ class MemoryService:
         self._config = config or load_memory_retrieval_config()
         self._embedder = embedder or self._build_embedder(self._config)
         self._reranker = reranker or self._build_reranker(self._config)
+        self._consolidator = MemoryConsolidator(
+            similarity_threshold=self._config.dedup_similarity_threshold,
+            max_items_per_user=self._config.max_items_per_user,
+            recency_half_life_days=self._config.recency_half_life_days,
+        )
+        self._user_locks: Dict[str, threading.Lock] = {}
+        self._user_locks_guard = threading.Lock()
 
     def index_summary(self, user_id: str, summary: str) -> None:
         cleaned = str(summary).strip()
         if not cleaned:
             return
-        self._store.save_memory_summary(user_id, cleaned)
 
         embedding = self._embedder.embed(cleaned)
         record = MemoryVectorRecord(
@@ -35,7 +52,54 @@ class MemoryService:
             text=cleaned,
             embedding=embedding,
         )
-        self._store.save_memory_vector(record)
+        record.minhash = self._consolidator.signature(cleaned)
+
+        with self._user_lock(user_id):
+            existing = self._store.list_memory_vectors(user_id)
+            duplicate = self._consolidator.find_near_duplicate(record, existing)
+            if duplicate is None and len(existing) < self._consolidator.max_items_per_user:
+                self._store.save_memory_summary(user_id, cleaned)
+                self._store.save_memory_vector(record)
+                self._sync_reranker_index(user_id, existing + [record])
+                return
+
+            if duplicate is not None:
+                self._consolidator.merge_into(record, duplicate)
+                existing = [item for item in existing if item.memory_id != duplicate.memory_id]
+            retained = self._consolidator.enforce_cap(existing + [record])
+            self._write_back(user_id, retained)
+
+    def index_summaries(self, user_id: str, summaries: List[str]) -> int:
+        cleaned = [str(summary).strip() for summary in summaries if str(summary).strip()]
+        if not cleaned:
+            return 0
+
+        embeddings = self._embedder.embed_many(cleaned)
+        records = [
+            MemoryVectorRecord(
+                user_id=user_id,
+                text=text,
+                embedding=embedding,
+                minhash=self._consolidator.signature(text),
+            )
+            for text, embedding in zip(cleaned, embeddings)
+        ]
+        with self._user_lock(user_id):
+            existing = self._store.list_memory_vectors(user_id)
+            retained, _, _ = self._consolidator.consolidate(existing + records)
+            self._write_back(user_id, retained)
+        return len(retained)
+
+    def reindex_user(self, user_id: str) -> int:
+        with self._user_lock(user_id):
+            records = self._store.list_memory_vectors(user_id)
+            if not records:
+                return 0
+
+            embeddings = self._embedder.embed_many([record.text for record in records])
+            refreshed = [replace(record, embedding=embedding) for record, embedding in zip(records, embeddings)]
+            self._store.replace_memory_vectors(user_id, refreshed)
+        return len(refreshed)
 
     def retrieve_recent(self, user_id: str, limit: int = 3) -> List[str]:
         items = self._store.list_memory_summaries(user_id)
@@ -70,14 +134,79 @@ class MemoryService:
 
         candidate_limit = max(limit * 4, limit)
         candidates = [text for text, _ in scored[:candidate_limit]]
-        reranked = self._reranker.rerank(query_text, candidates, limit=limit)
-        if reranked:
-            return [text for text, _ in reranked]
+        reranked = self._reranker.rerank(query_text, candidates, limit=limit, user_id=user_id)
+        results = [text for text, _ in reranked] if reranked else candidates[:limit]
+        self._record_retrieval_hits(vector_items, results)
+        return results
+
+    def compact_user(self, user_id: str) -> dict:
+        with self._user_lock(user_id):
+            records = self._store.list_memory_vectors(user_id)
+            retained, merged, evicted = self._consolidator.consolidate(records)
+            if merged or evicted:
+                self._write_back(user_id, retained)
+        return {
+            "user_id": user_id,
+            "before": len(records),
+            "after": len(retained),
+            "merged": merged,
+            "evicted": evicted,
+        }
+
+    def erase_user(self, user_id: str) -> None:
+        """Drop in-process state derived from a user's memories once the store has erased them."""
+        with self._user_lock(user_id):
+            self._reranker.sync_index(user_id, [])
+
+    def compact_all(self) -> dict:
+        reports = [self.compact_user(user_id) for user_id in self._store.list_memory_user_ids()]
+        return {
+            "users": len(reports),
+            "before": sum(item["before"] for item in reports),
+            "after": sum(item["after"] for item in reports),
+            "merged": sum(item["merged"] for item in reports),
+            "evicted": sum(item["evicted"] for item in reports),
+        }
+
+    def _user_lock(self, user_id: str) -> threading.Lock:
+        with self._user_locks_guard:
+            lock = self._user_locks.get(user_id)
+            if lock is None:
+                lock = threading.Lock()
+                self._user_locks[user_id] = lock
+            return lock
+
+    def _write_back(self, user_id: str, records: List[MemoryVectorRecord]) -> None:
+        ordered = sorted(records, key=lambda item: item.created_at)
+        self._store.replace_memory_vectors(user_id, ordered)
+        self._store.replace_memory_summaries(user_id, [item.text for item in ordered])
+        self._sync_reranker_index(user_id, ordered)
 
-        return candidates[:limit]
+    @staticmethod
+    def _record_retrieval_hits(records: List[MemoryVectorRecord], texts: List[str]) -> None:
+        returned = set(texts)
+        for record in records:
+            if record.text in returned:
+                record.retrieval_hits += 1
+
+    def _sync_reranker_index(self, user_id: str, records: List[MemoryVectorRecord]) -> None:
+        self._reranker.sync_index(user_id, [(record.memory_id, record.text) for record in records])
 
     @staticmethod
-    def _cosine_similarity(left: List[float], right: List[float]) -> float:
+    def _cosine_similarity(left: Embedding, right: Embedding) -> float:
+        if isinstance(left, SparseEmbedding) and isinstance(right, SparseEmbedding):
+            if left.dimension != right.dimension:
+                return 0.0
+            left_norm = left.norm()
+            right_norm = right.norm()
+            if left_norm == 0 or right_norm == 0:
+                return 0.0
+            return left.dot(right) / (left_norm * right_norm)
+        if isinstance(left, SparseEmbedding):
+            left = left.to_dense()
+        if isinstance(right, SparseEmbedding):
+            right = right.to_dense()
+
         if not left or not right:
             return 0.0
         size = min(len(left), len(right))
@@ -94,13 +223,15 @@ class MemoryService:
     @staticmethod
     def _build_embedder(config: MemoryRetrievalConfig) -> EmbeddingProvider:
         if config.embedder_provider == "local":
-            return LocalHashEmbeddingProvider()
+            return LocalHashEmbeddingProvider(dimension=config.local_embedding_dimension)
         if config.embedder_provider == "openai":
             return OpenAIEmbeddingProvider(config)
         raise ValueError(f"Unknown memory embedder provider: {config.embedder_provider}")
 
     @staticmethod
     def _build_reranker(config: MemoryRetrievalConfig) -> RerankerProvider:
-        if config.reranker_provider == "local":
+        if config.reranker_provider in ("local", "bm25"):
+            return LocalBM25RerankerProvider()
+        if config.reranker_provider == "overlap":
             return LocalOverlapRerankerProvider()
         raise ValueError(f"Unknown memory reranker provider: {config.reranker_provider}")
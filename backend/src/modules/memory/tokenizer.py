@@ -0,0 +1,19 @@
+import re
+from typing import List
+
+_WORD_PATTERN = re.compile(r"[^\W_]+")
+_SCRIPT_RUN_PATTERN = re.compile(r"[㐀-鿿豈-﫿]+|[^㐀-鿿豈-﫿]+")
+_CJK_PATTERN = re.compile(r"[㐀-鿿豈-﫿]")
+
+
+def tokenize_for_retrieval(text: str) -> List[str]:
+    """Lowercased word tokens; CJK runs become character unigrams plus bigrams."""
+    tokens: List[str] = []
+    for word in _WORD_PATTERN.findall(str(text).lower()):
+        for run in _SCRIPT_RUN_PATTERN.findall(word):
+            if not _CJK_PATTERN.match(run):
+                tokens.append(run)
+                continue
+            tokens.extend(run)
+            tokens.extend(run[index:index + 2] for index in range(len(run) - 1))
+    return tokens
@@ -1,12 +1,28 @@
 from modules.model_gateway.config import ModelGatewayRoutingConfig, load_model_gateway_config
-from modules.model_gateway.models import ModelGatewayRequest, ModelGatewayResponse, ModelTaskType
+from modules.model_gateway.models import (
+    ModelBatchResult,
+    ModelGatewayRequest,
+    ModelGatewayResponse,
+    ModelStreamEvent,
+    ModelTaskType,
+)
+from modules.model_gateway.resilience import CircuitOpenError, GatewayResilience
+from modules.model_gateway.result_cache import SafetyResultCache
+from modules.model_gateway.scheduler import GatewayOverloadedError, GatewayScheduler
 from modules.model_gateway.service import ModelGatewayService
 
 __all__ = [
+    "CircuitOpenError",
+    "GatewayResilience",
+    "GatewayOverloadedError",
+    "GatewayScheduler",
+    "ModelBatchResult",
     "ModelGatewayRoutingConfig",
     "ModelTaskType",
     "ModelGatewayRequest",
     "ModelGatewayResponse",
+    "ModelStreamEvent",
     "ModelGatewayService",
+    "SafetyResultCache",
     "load_model_gateway_config",
 ]
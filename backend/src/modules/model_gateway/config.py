@@ -2,6 +2,26 @@ import os
 from dataclasses import dataclass
 
 
+def _parse_bool(raw: str) -> bool:
+    return raw.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _parse_float(raw: str, default: float, *, minimum: float, maximum: float) -> float:
+    try:
+        value = float(raw.strip())
+    except ValueError:
+        value = default
+    return min(max(value, minimum), maximum)
+
+
+def _parse_int(raw: str, default: int, *, minimum: int, maximum: int) -> int:
+    try:
+        value = int(raw.strip())
+    except ValueError:
+        value = default
+    return min(max(value, minimum), maximum)
+
+
 @dataclass
 class ModelGatewayRoutingConfig:
     safety_nlu_provider: str = "local"
@@ -10,6 +30,32 @@ class ModelGatewayRoutingConfig:
     openai_api_key: str = ""
     openai_base_url: str = "https://api.openai.com/v1"
     openai_coach_model: str = "gpt-4o-mini"
+    openai_max_connections: int = 20
+    openai_max_keepalive_connections: int = 10
+    openai_http2: bool = True
+    max_inflight: int = 32
+    safety_nlu_concurrency: int = 16
+    safety_semantic_concurrency: int = 16
+    coach_concurrency: int = 8
+    coach_queue_deadline_ms: int = 1500
+    coach_max_queue_depth: int = 64
+    breaker_failure_rate_threshold: float = 0.5
+    breaker_slow_call_ms: int = 3000
+    breaker_window_size: int = 20
+    breaker_min_calls: int = 5
+    breaker_open_ms: int = 15000
+    retry_max_attempts: int = 1
+    retry_budget_ratio: float = 0.1
+    retry_budget_min_per_window: int = 3
+    hedge_enabled: bool = False
+    hedge_min_delay_ms: int = 50
+    safety_cache_enabled: bool = True
+    safety_cache_max_entries: int = 4096
+    safety_cache_ttl_seconds: float = 300.0
+    coach_prompt_token_budget: int = 1500
+    batch_max_parallelism: int = 4
+    batch_chunk_size: int = 64
+    batch_concurrency: int = 4
 
 
 def load_model_gateway_config() -> ModelGatewayRoutingConfig:
@@ -20,4 +66,145 @@ def load_model_gateway_config() -> ModelGatewayRoutingConfig:
         openai_api_key=os.getenv("OPENAI_API_KEY", "").strip(),
         openai_base_url=os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1").strip(),
         openai_coach_model=os.getenv("OPENAI_COACH_MODEL", "gpt-4o-mini").strip(),
+        openai_max_connections=_parse_int(
+            os.getenv("MINDCOACH_OPENAI_MAX_CONNECTIONS", "20"),
+            20,
+            minimum=1,
+            maximum=1000,
+        ),
+        openai_max_keepalive_connections=_parse_int(
+            os.getenv("MINDCOACH_OPENAI_MAX_KEEPALIVE", "10"),
+            10,
+            minimum=0,
+            maximum=1000,
+        ),
+        openai_http2=_parse_bool(os.getenv("MINDCOACH_OPENAI_HTTP2", "true")),
+        max_inflight=_parse_int(
+            os.getenv("MINDCOACH_GATEWAY_MAX_INFLIGHT", "32"),
+            32,
+            minimum=1,
+            maximum=4096,
+        ),
+        safety_nlu_concurrency=_parse_int(
+            os.getenv("MINDCOACH_GATEWAY_SAFETY_NLU_CONCURRENCY", "16"),
+            16,
+            minimum=1,
+            maximum=4096,
+        ),
+        safety_semantic_concurrency=_parse_int(
+            os.getenv("MINDCOACH_GATEWAY_SAFETY_SEMANTIC_CONCURRENCY", "16"),
+            16,
+            minimum=1,
+            maximum=4096,
+        ),
+        coach_concurrency=_parse_int(
+            os.getenv("MINDCOACH_GATEWAY_COACH_CONCURRENCY", "8"),
+            8,
+            minimum=1,
+            maximum=4096,
+        ),
+        coach_queue_deadline_ms=_parse_int(
+            os.getenv("MINDCOACH_GATEWAY_COACH_QUEUE_DEADLINE_MS", "1500"),
+            1500,
+            minimum=0,
+            maximum=60000,
+        ),
+        coach_max_queue_depth=_parse_int(
+            os.getenv("MINDCOACH_GATEWAY_COACH_MAX_QUEUE", "64"),
+            64,
+            minimum=0,
+            maximum=100000,
+        ),
+        breaker_failure_rate_threshold=_parse_float(
+            os.getenv("MINDCOACH_GATEWAY_BREAKER_FAILURE_RATE", "0.5"),
+            0.5,
+            minimum=0.01,
+            maximum=1.0,
+        ),
+        breaker_slow_call_ms=_parse_int(
+            os.getenv("MINDCOACH_GATEWAY_BREAKER_SLOW_CALL_MS", "3000"),
+            3000,
+            minimum=1,
+            maximum=600000,
+        ),
+        breaker_window_size=_parse_int(
+            os.getenv("MINDCOACH_GATEWAY_BREAKER_WINDOW", "20"),
+            20,
+            minimum=1,
+            maximum=10000,
+        ),
+        breaker_min_calls=_parse_int(
+            os.getenv("MINDCOACH_GATEWAY_BREAKER_MIN_CALLS", "5"),
+            5,
+            minimum=1,
+            maximum=10000,
+        ),
+        breaker_open_ms=_parse_int(
+            os.getenv("MINDCOACH_GATEWAY_BREAKER_OPEN_MS", "15000"),
+            15000,
+            minimum=1,
+            maximum=3600000,
+        ),
+        retry_max_attempts=_parse_int(
+            os.getenv("MINDCOACH_GATEWAY_RETRY_MAX_ATTEMPTS", "1"),
+            1,
+            minimum=0,
+            maximum=10,
+        ),
+        retry_budget_ratio=_parse_float(
+            os.getenv("MINDCOACH_GATEWAY_RETRY_BUDGET_RATIO", "0.1"),
+            0.1,
+            minimum=0.0,
+            maximum=1.0,
+        ),
+        retry_budget_min_per_window=_parse_int(
+            os.getenv("MINDCOACH_GATEWAY_RETRY_BUDGET_MIN", "3"),
+            3,
+            minimum=0,
+            maximum=10000,
+        ),
+        hedge_enabled=_parse_bool(os.getenv("MINDCOACH_GATEWAY_HEDGE_ENABLED", "false")),
+        hedge_min_delay_ms=_parse_int(
+            os.getenv("MINDCOACH_GATEWAY_HEDGE_MIN_DELAY_MS", "50"),
+            50,
+            minimum=0,
+            maximum=60000,
+        ),
+        safety_cache_enabled=_parse_bool(os.getenv("MINDCOACH_SAFETY_CACHE_ENABLED", "true")),
+        safety_cache_max_entries=_parse_int(
+            os.getenv("MINDCOACH_SAFETY_CACHE_MAX_ENTRIES", "4096"),
+            4096,
+            minimum=1,
+            maximum=1000000,
+        ),
+        safety_cache_ttl_seconds=_parse_float(
+            os.getenv("MINDCOACH_SAFETY_CACHE_TTL_SECONDS", "300"),
+            300.0,
+            minimum=0.0,
+            maximum=86400.0,
+        ),
+        coach_prompt_token_budget=_parse_int(
+            os.getenv("MINDCOACH_COACH_PROMPT_TOKEN_BUDGET", "1500"),
+            1500,
+            minimum=256,
+            maximum=128000,
+        ),
+        batch_max_parallelism=_parse_int(
+            os.getenv("MINDCOACH_GATEWAY_BATCH_PARALLELISM", "4"),
+            4,
+            minimum=1,
+            maximum=256,
+        ),
+        batch_chunk_size=_parse_int(
+            os.getenv("MINDCOACH_GATEWAY_BATCH_CHUNK_SIZE", "64"),
+            64,
+            minimum=1,
+            maximum=10000,
+        ),
+        batch_concurrency=_parse_int(
+            os.getenv("MINDCOACH_GATEWAY_BATCH_CONCURRENCY", "4"),
+            4,
+            minimum=1,
+            maximum=4096,
+        ),
     )
@@ -0,0 +1,113 @@
+import asyncio
+import importlib.util
+import threading
+from typing import Dict, Optional, Tuple
+
+import httpx
+from modules.model_gateway.config import ModelGatewayRoutingConfig
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class PooledHTTPClients:
+    """Keep-alive sync and async httpx clients shared by every provider of one endpoint.
+
+    HTTP/2 is only negotiated when the optional ``h2`` package is installed.
+    The async client is bound to the event loop that created it and is
+    rebuilt if it is requested from a different loop.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        http2: bool = True,
+    ) -> None:
+        self._base_url = base_url.rstrip("/")
+        self._limits = httpx.Limits(
+            max_connections=max(1, int(max_connections)),
+            max_keepalive_connections=max(0, int(max_keepalive_connections)),
+        )
+        self._http2 = bool(http2) and http2_available()
+        self._lock = threading.Lock()
+        self._sync_client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def http2(self) -> bool:
+        return self._http2
+
+    def sync_client(self) -> httpx.Client:
+        with self._lock:
+            if self._sync_client is None:
+                self._sync_client = httpx.Client(
+                    base_url=self._base_url,
+                    limits=self._limits,
+                    http2=self._http2,
+                )
+            return self._sync_client
+
+    def async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._async_client is None or self._async_loop is not loop or self._async_client.is_closed:
+                self._async_client = httpx.AsyncClient(
+                    base_url=self._base_url,
+                    limits=self._limits,
+                    http2=self._http2,
+                )
+                self._async_loop = loop
+            return self._async_client
+
+    def close(self) -> None:
+        with self._lock:
+            client = self._sync_client
+            self._sync_client = None
+        if client is not None:
+            client.close()
+
+    async def aclose(self) -> None:
+        self.close()
+        with self._lock:
+            client = self._async_client
+            loop = self._async_loop
+            self._async_client = None
+            self._async_loop = None
+        if client is not None and loop is asyncio.get_running_loop():
+            await client.aclose()
+
+
+_SHARED_CLIENTS: Dict[Tuple[str, int, int, bool], PooledHTTPClients] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def get_shared_http_clients(config: ModelGatewayRoutingConfig) -> PooledHTTPClients:
+    key = (
+        config.openai_base_url.rstrip("/"),
+        int(config.openai_max_connections),
+        int(config.openai_max_keepalive_connections),
+        bool(config.openai_http2),
+    )
+    with _SHARED_LOCK:
+        clients = _SHARED_CLIENTS.get(key)
+        if clients is None:
+            clients = PooledHTTPClients(
+                base_url=key[0],
+                max_connections=key[1],
+                max_keepalive_connections=key[2],
+                http2=key[3],
+            )
+            _SHARED_CLIENTS[key] = clients
+        return clients
+
+
+async def aclose_shared_http_clients() -> None:
+    with _SHARED_LOCK:
+        clients = list(_SHARED_CLIENTS.values())
+        _SHARED_CLIENTS.clear()
+    for item in clients:
+        await item.aclose()
@@ -42,3 +42,25 @@ class ModelGatewayResponse:
             "trace_id": self.trace_id,
             "raw": dict(self.raw),
         }
+
+
+@dataclass
+class ModelStreamEvent:
+    """One streamed chunk: a text delta, or the final response once the stream completes."""
+
+    delta: str = ""
+    response: Optional[ModelGatewayResponse] = None
+
+
+@dataclass
+class ModelBatchResult:
+    """Outcome of one request in a batch, in input order: a response or the error it raised."""
+
+    index: int
+    request: ModelGatewayRequest
+    response: Optional[ModelGatewayResponse] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.response is not None
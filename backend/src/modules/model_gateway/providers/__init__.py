@@ -1,11 +1,17 @@
-from modules.model_gateway.providers.base import ModelProvider
+from modules.model_gateway.providers.base import (
+    AsyncModelProvider,
+    ModelProvider,
+    StreamingModelProvider,
+)
 from modules.model_gateway.providers.local_coach import LocalCoachProvider
 from modules.model_gateway.providers.local_safety import LocalSafetyProvider
 from modules.model_gateway.providers.openai_chat import OpenAIChatProvider
 
 __all__ = [
+    "AsyncModelProvider",
     "ModelProvider",
     "LocalCoachProvider",
     "LocalSafetyProvider",
     "OpenAIChatProvider",
+    "StreamingModelProvider",
 ]
@@ -1,8 +1,23 @@
-from typing import Protocol
+from typing import AsyncIterator, List, Protocol, Sequence
 
-from modules.model_gateway.models import ModelGatewayRequest, ModelGatewayResponse
+from modules.model_gateway.models import ModelGatewayRequest, ModelGatewayResponse, ModelStreamEvent
 
 
 class ModelProvider(Protocol):
     def infer(self, request: ModelGatewayRequest) -> ModelGatewayResponse:
         ...
+
+
+class AsyncModelProvider(Protocol):
+    async def ainfer(self, request: ModelGatewayRequest) -> ModelGatewayResponse:
+        ...
+
+
+class StreamingModelProvider(Protocol):
+    def astream(self, request: ModelGatewayRequest) -> AsyncIterator[ModelStreamEvent]:
+        ...
+
+
+class BatchModelProvider(Protocol):
+    def infer_many(self, requests: Sequence[ModelGatewayRequest]) -> List[ModelGatewayResponse]:
+        ...
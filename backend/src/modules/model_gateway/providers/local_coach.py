@@ -1,6 +1,16 @@
+import asyncio
+import re
 import time
+from typing import AsyncIterator
 
-from modules.model_gateway.models import ModelGatewayRequest, ModelGatewayResponse, ModelTaskType
+from modules.model_gateway.models import (
+    ModelGatewayRequest,
+    ModelGatewayResponse,
+    ModelStreamEvent,
+    ModelTaskType,
+)
+
+_CHUNK_PATTERN = re.compile(r"\S+\s*")
 
 
 class LocalCoachProvider:
@@ -35,3 +45,14 @@ class LocalCoachProvider:
             output_text=reply,
             raw={"style_id": style_id},
         )
+
+    async def ainfer(self, request: ModelGatewayRequest) -> ModelGatewayResponse:
+        return self.infer(request)
+
+    async def astream(self, request: ModelGatewayRequest) -> AsyncIterator[ModelStreamEvent]:
+        response = self.infer(request)
+        for chunk in _CHUNK_PATTERN.findall(response.output_text or ""):
+            yield ModelStreamEvent(delta=chunk)
+            # Hand control back so each chunk is flushed before the next one.
+            await asyncio.sleep(0)
+        yield ModelStreamEvent(response=response)
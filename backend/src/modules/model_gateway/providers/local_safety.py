@@ -1,16 +1,25 @@
+from typing import List, Optional, Sequence
+
 from modules.model_gateway.models import ModelGatewayRequest, ModelGatewayResponse, ModelTaskType
+from modules.safety.lexicon.compiled import LocaleLexicons, get_locale_lexicons
 from modules.safety.nlu.classifier import NLUClassifier
 from modules.safety.semantic.evaluator import SemanticRiskEvaluator
 
 
 class LocalSafetyProvider:
-    def __init__(self) -> None:
-        self._nlu = NLUClassifier()
-        self._semantic = SemanticRiskEvaluator()
+    def __init__(self, lexicons: Optional[LocaleLexicons] = None) -> None:
+        self._lexicons = lexicons or get_locale_lexicons()
+        self._nlu = NLUClassifier(self._lexicons)
+        self._semantic = SemanticRiskEvaluator(self._lexicons)
+
+    @property
+    def cache_version(self) -> str:
+        """Version of the compiled per-locale lexicons; any edit changes it and invalidates cached verdicts."""
+        return f"local-lexicon-{self._lexicons.version}"
 
     def infer(self, request: ModelGatewayRequest) -> ModelGatewayResponse:
         if request.task_type == ModelTaskType.SAFETY_NLU_FAST:
-            detection = self._nlu.classify(request.text)
+            detection = self._nlu.classify(request.text, request.locale)
             return ModelGatewayResponse(
                 task_type=request.task_type,
                 provider="local-heuristic-nlu",
@@ -23,7 +32,7 @@ class LocalSafetyProvider:
             )
 
         if request.task_type == ModelTaskType.SAFETY_SEMANTIC_JUDGE:
-            detection = self._semantic.evaluate(request.text)
+            detection = self._semantic.evaluate(request.text, request.locale)
             return ModelGatewayResponse(
                 task_type=request.task_type,
                 provider="local-heuristic-semantic",
@@ -36,3 +45,9 @@ class LocalSafetyProvider:
             )
 
         raise ValueError(f"LocalSafetyProvider does not support task_type: {request.task_type}")
+
+    def infer_many(self, requests: Sequence[ModelGatewayRequest]) -> List[ModelGatewayResponse]:
+        return [self.infer(request) for request in requests]
+
+    async def ainfer(self, request: ModelGatewayRequest) -> ModelGatewayResponse:
+        return self.infer(request)
@@ -1,27 +1,144 @@
 import json
 import time
+from typing import AsyncIterator, Optional
 
 import httpx
 
 from modules.model_gateway.config import ModelGatewayRoutingConfig
-from modules.model_gateway.models import ModelGatewayRequest, ModelGatewayResponse, ModelTaskType
+from modules.model_gateway.http_client import PooledHTTPClients, get_shared_http_clients
+from modules.model_gateway.models import (
+    ModelGatewayRequest,
+    ModelGatewayResponse,
+    ModelStreamEvent,
+    ModelTaskType,
+)
+from modules.prompt.assembly import AssembledPrompt, PromptAssembler
 
 
 class OpenAIChatProvider:
-    def __init__(self, config: ModelGatewayRoutingConfig) -> None:
+    def __init__(
+        self,
+        config: ModelGatewayRoutingConfig,
+        clients: Optional[PooledHTTPClients] = None,
+    ) -> None:
         self._config = config
+        self._clients = clients
+        self._assembler = PromptAssembler(token_budget=config.coach_prompt_token_budget)
 
     def infer(self, request: ModelGatewayRequest) -> ModelGatewayResponse:
+        self._validate(request)
+        prompt = self._assemble(request)
+        start = time.perf_counter()
+        response = self._http_clients().sync_client().post(
+            "/chat/completions",
+            headers=self._headers(),
+            json=self._build_body(prompt),
+            timeout=self._timeout(request),
+        )
+        return self._parse_response(request, response, start, prompt)
+
+    async def ainfer(self, request: ModelGatewayRequest) -> ModelGatewayResponse:
+        self._validate(request)
+        prompt = self._assemble(request)
+        start = time.perf_counter()
+        response = await self._http_clients().async_client().post(
+            "/chat/completions",
+            headers=self._headers(),
+            json=self._build_body(prompt),
+            timeout=self._timeout(request),
+        )
+        return self._parse_response(request, response, start, prompt)
+
+    async def astream(self, request: ModelGatewayRequest) -> AsyncIterator[ModelStreamEvent]:
+        self._validate(request)
+        prompt = self._assemble(request)
+        start = time.perf_counter()
+        body = self._build_body(prompt)
+        body["stream"] = True
+        body["stream_options"] = {"include_usage": True}
+
+        parts = []
+        first_token_ms: Optional[float] = None
+        finish_reason = None
+        response_id = None
+        usage = None
+        async with self._http_clients().async_client().stream(
+            "POST",
+            "/chat/completions",
+            headers=self._headers(),
+            json=body,
+            timeout=self._timeout(request),
+        ) as response:
+            response.raise_for_status()
+            http_version = response.http_version
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                chunk = json.loads(data)
+                response_id = response_id or chunk.get("id")
+                usage = chunk.get("usage") or usage
+                choices = chunk.get("choices") or []
+                if not choices:
+                    continue
+                finish_reason = choices[0].get("finish_reason") or finish_reason
+                delta = (choices[0].get("delta") or {}).get("content") or ""
+                if not delta:
+                    continue
+                if first_token_ms is None:
+                    first_token_ms = (time.perf_counter() - start) * 1000
+                parts.append(delta)
+                yield ModelStreamEvent(delta=delta)
+
+        content = "".join(parts).strip()
+        if not content:
+            raise RuntimeError("OpenAI provider returned empty content")
+
+        yield ModelStreamEvent(
+            response=ModelGatewayResponse(
+                task_type=request.task_type,
+                provider=f"openai:{self._config.openai_coach_model}",
+                risk_level=None,
+                reasons=["provider-openai", "streamed"],
+                latency_ms=(time.perf_counter() - start) * 1000,
+                output_text=content,
+                raw={
+                    "id": response_id,
+                    "finish_reason": finish_reason,
+                    "http_version": http_version,
+                    "first_token_ms": round(first_token_ms, 3) if first_token_ms is not None else None,
+                    "prompt": prompt.report(),
+                    "usage": self._parse_usage(usage),
+                },
+            )
+        )
+
+    def _validate(self, request: ModelGatewayRequest) -> None:
         if request.task_type != ModelTaskType.COACH_GENERATION:
             raise ValueError(f"OpenAIChatProvider does not support task_type: {request.task_type}")
         if not self._config.openai_api_key:
             raise ValueError("OPENAI_API_KEY is required when coach provider is set to openai")
 
-        start = time.perf_counter()
+    def _http_clients(self) -> PooledHTTPClients:
+        if self._clients is None:
+            self._clients = get_shared_http_clients(self._config)
+        return self._clients
+
+    def _headers(self) -> dict:
+        return {
+            "Authorization": f"Bearer {self._config.openai_api_key}",
+            "Content-Type": "application/json",
+        }
+
+    @staticmethod
+    def _timeout(request: ModelGatewayRequest) -> float:
+        return max(1.0, request.timeout_ms / 1000.0)
 
+    def _assemble(self, request: ModelGatewayRequest) -> AssembledPrompt:
         system_prompt = str(request.metadata.get("system_prompt", "")).strip()
         style_prompt = request.metadata.get("style_prompt")
-        context_prompt = request.metadata.get("context_prompt")
 
         style_text = ""
         if isinstance(style_prompt, dict):
@@ -29,37 +146,27 @@ class OpenAIChatProvider:
         elif isinstance(style_prompt, str):
             style_text = style_prompt.strip()
 
-        context_text = ""
-        if isinstance(context_prompt, dict):
-            context_text = json.dumps(context_prompt, ensure_ascii=True)
-        elif isinstance(context_prompt, str):
-            context_text = context_prompt
-
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        if style_text:
-            messages.append({"role": "system", "content": f"Style instruction: {style_text}"})
-        if context_text:
-            messages.append({"role": "system", "content": f"Context payload: {context_text}"})
-        messages.append({"role": "user", "content": request.text})
-
-        endpoint = f"{self._config.openai_base_url.rstrip('/')}/chat/completions"
-        timeout = max(1.0, request.timeout_ms / 1000.0)
-
-        response = httpx.post(
-            endpoint,
-            headers={
-                "Authorization": f"Bearer {self._config.openai_api_key}",
-                "Content-Type": "application/json",
-            },
-            json={
-                "model": self._config.openai_coach_model,
-                "messages": messages,
-                "temperature": 0.4,
-            },
-            timeout=timeout,
+        return self._assembler.assemble(
+            system_prompt=system_prompt,
+            style_text=style_text,
+            context=request.metadata.get("context_prompt"),
+            user_text=request.text,
         )
+
+    def _build_body(self, prompt: AssembledPrompt) -> dict:
+        return {
+            "model": self._config.openai_coach_model,
+            "messages": prompt.messages,
+            "temperature": 0.4,
+        }
+
+    def _parse_response(
+        self,
+        request: ModelGatewayRequest,
+        response: httpx.Response,
+        start: float,
+        prompt: AssembledPrompt,
+    ) -> ModelGatewayResponse:
         response.raise_for_status()
         payload = response.json()
 
@@ -82,5 +189,20 @@ class OpenAIChatProvider:
             raw={
                 "id": payload.get("id"),
                 "finish_reason": choices[0].get("finish_reason"),
+                "http_version": response.http_version,
+                "prompt": prompt.report(),
+                "usage": self._parse_usage(payload.get("usage")),
             },
         )
+
+    @staticmethod
+    def _parse_usage(usage: Optional[dict]) -> Optional[dict]:
+        """Token counts as billed, including the prompt prefix the provider served from its cache."""
+        if not isinstance(usage, dict):
+            return None
+        details = usage.get("prompt_tokens_details") or {}
+        return {
+            "prompt_tokens": int(usage.get("prompt_tokens") or 0),
+            "completion_tokens": int(usage.get("completion_tokens") or 0),
+            "cached_tokens": int(details.get("cached_tokens") or 0),
+        }
@@ -0,0 +1,316 @@
+import math
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+import httpx
+from modules.model_gateway.config import ModelGatewayRoutingConfig
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling the provider while its circuit breaker is open."""
+
+
+class CircuitState:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Rolling-window breaker that trips on the combined rate of failed and slow calls.
+
+    After ``open_ms`` an open breaker lets ``half_open_probes`` calls through;
+    a successful probe closes it again, a failed one re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        slow_call_ms: float = 3000.0,
+        window_size: int = 20,
+        min_calls: int = 5,
+        open_ms: float = 15000.0,
+        half_open_probes: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self._failure_rate_threshold = float(failure_rate_threshold)
+        self._slow_call_ms = float(slow_call_ms)
+        self._min_calls = max(1, int(min_calls))
+        self._open_seconds = float(open_ms) / 1000.0
+        self._half_open_probes = max(1, int(half_open_probes))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._outcomes: Deque[bool] = deque(maxlen=max(1, int(window_size)))
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._rejected = 0
+        self._trips = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh_locked()
+            return self._state
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            self._refresh_locked()
+            if self._state == CircuitState.CLOSED:
+                return True
+            if self._state == CircuitState.HALF_OPEN and self._probes_in_flight < self._half_open_probes:
+                self._probes_in_flight += 1
+                return True
+            self._rejected += 1
+            return False
+
+    def record_success(self, latency_ms: float) -> None:
+        slow = float(latency_ms) >= self._slow_call_ms
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if slow:
+                    self._open_locked()
+                else:
+                    self._state = CircuitState.CLOSED
+                    self._outcomes.clear()
+                return
+            self._record_locked(bad=slow)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                self._open_locked()
+                return
+            self._record_locked(bad=True)
+
+    def release(self) -> None:
+        """Give back a permit whose call said nothing about provider health."""
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            self._refresh_locked()
+            calls = len(self._outcomes)
+            bad = sum(1 for item in self._outcomes if item)
+            return {
+                "state": self._state,
+                "window_calls": calls,
+                "failure_rate": round(bad / calls, 4) if calls else 0.0,
+                "trips": self._trips,
+                "rejected": self._rejected,
+            }
+
+    def _record_locked(self, bad: bool) -> None:
+        if self._state != CircuitState.CLOSED:
+            return
+        self._outcomes.append(bad)
+        calls = len(self._outcomes)
+        if calls < self._min_calls:
+            return
+        bad_calls = sum(1 for item in self._outcomes if item)
+        if bad_calls / calls >= self._failure_rate_threshold:
+            self._open_locked()
+
+    def _open_locked(self) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = self._clock()
+        self._outcomes.clear()
+        self._trips += 1
+
+    def _refresh_locked(self) -> None:
+        if self._state == CircuitState.OPEN and self._clock() - self._opened_at >= self._open_seconds:
+            self._state = CircuitState.HALF_OPEN
+            self._probes_in_flight = 0
+
+
+class RetryBudget:
+    """Process-wide cap on retries and hedges: ``ratio`` of recent requests, never below ``min_per_window``."""
+
+    def __init__(
+        self,
+        ratio: float = 0.1,
+        min_per_window: int = 3,
+        window_seconds: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ratio = max(0.0, float(ratio))
+        self._min_per_window = max(0, int(min_per_window))
+        self._window_seconds = float(window_seconds)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._requests: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+        self._denied = 0
+
+    def record_request(self) -> None:
+        with self._lock:
+            now = self._clock()
+            self._prune_locked(now)
+            self._requests.append(now)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            now = self._clock()
+            self._prune_locked(now)
+            if len(self._retries) >= self._allowance_locked():
+                self._denied += 1
+                return False
+            self._retries.append(now)
+            return True
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            self._prune_locked(self._clock())
+            return {
+                "window_seconds": self._window_seconds,
+                "requests": len(self._requests),
+                "retries": len(self._retries),
+                "allowance": self._allowance_locked(),
+                "denied": self._denied,
+            }
+
+    def _allowance_locked(self) -> int:
+        return max(self._min_per_window, int(self._ratio * len(self._requests)))
+
+    def _prune_locked(self, now: float) -> None:
+        cutoff = now - self._window_seconds
+        while self._requests and self._requests[0] < cutoff:
+            self._requests.popleft()
+        while self._retries and self._retries[0] < cutoff:
+            self._retries.popleft()
+
+
+class _LatencyWindow:
+    def __init__(self, size: int = 200) -> None:
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def add(self, latency_ms: float) -> None:
+        self._samples.append(float(latency_ms))
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, percentile: int) -> float:
+        values: List[float] = sorted(self._samples)
+        if not values:
+            return 0.0
+        index = math.ceil((percentile / 100) * len(values)) - 1
+        return values[min(max(index, 0), len(values) - 1)]
+
+
+class GatewayResilience:
+    """Breakers, retry budget and hedge delays for every provider behind the gateway."""
+
+    HEDGE_MIN_SAMPLES = 20
+
+    def __init__(self, config: ModelGatewayRoutingConfig, clock: Callable[[], float] = time.monotonic) -> None:
+        self._config = config
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latencies: Dict[str, _LatencyWindow] = {}
+        self._hedges: Dict[str, int] = {}
+        self.retry_budget = RetryBudget(
+            ratio=config.retry_budget_ratio,
+            min_per_window=config.retry_budget_min_per_window,
+            clock=clock,
+        )
+
+    @property
+    def max_retries(self) -> int:
+        return int(self._config.retry_max_attempts)
+
+    def breaker(self, provider_name: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(provider_name)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    name=provider_name,
+                    failure_rate_threshold=self._config.breaker_failure_rate_threshold,
+                    slow_call_ms=self._config.breaker_slow_call_ms,
+                    window_size=self._config.breaker_window_size,
+                    min_calls=self._config.breaker_min_calls,
+                    open_ms=self._config.breaker_open_ms,
+                    clock=self._clock,
+                )
+                self._breakers[provider_name] = breaker
+            return breaker
+
+    def record_latency(self, provider_name: str, latency_ms: float) -> None:
+        with self._lock:
+            window = self._latencies.setdefault(provider_name, _LatencyWindow())
+            window.add(latency_ms)
+
+    def hedge_delay_ms(self, provider_name: str) -> Optional[float]:
+        """p95 of recent successful calls, once enough samples exist and hedging is enabled."""
+        if not self._config.hedge_enabled:
+            return None
+        with self._lock:
+            window = self._latencies.get(provider_name)
+            if window is None or len(window) < self.HEDGE_MIN_SAMPLES:
+                return None
+            return max(float(self._config.hedge_min_delay_ms), window.percentile(95))
+
+    def record_hedge(self, provider_name: str) -> None:
+        with self._lock:
+            self._hedges[provider_name] = self._hedges.get(provider_name, 0) + 1
+
+    @staticmethod
+    def is_retryable(error: Exception) -> bool:
+        if isinstance(error, httpx.HTTPStatusError):
+            status = error.response.status_code
+            return status == 429 or status >= 500
+        return isinstance(error, httpx.TransportError)
+
+    @staticmethod
+    def counts_against_provider(error: Exception) -> bool:
+        # ValueError marks caller/configuration mistakes, not provider health.
+        return not isinstance(error, ValueError)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            breakers = dict(self._breakers)
+            latencies = {name: window.percentile(95) for name, window in self._latencies.items()}
+            hedges = dict(self._hedges)
+        return {
+            "circuit_breakers": {name: breakers[name].snapshot() for name in sorted(breakers)},
+            "retry_budget": self.retry_budget.snapshot(),
+            "hedging": {
+                "enabled": bool(self._config.hedge_enabled),
+                "p95_latency_ms": {name: round(value, 3) for name, value in sorted(latencies.items())},
+                "hedged_requests": hedges,
+            },
+        }
+
+
+_SHARED_RESILIENCE: Dict[Tuple, GatewayResilience] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def get_shared_resilience(config: ModelGatewayRoutingConfig) -> GatewayResilience:
+    key = (
+        float(config.breaker_failure_rate_threshold),
+        int(config.breaker_slow_call_ms),
+        int(config.breaker_window_size),
+        int(config.breaker_min_calls),
+        int(config.breaker_open_ms),
+        int(config.retry_max_attempts),
+        float(config.retry_budget_ratio),
+        int(config.retry_budget_min_per_window),
+        bool(config.hedge_enabled),
+        int(config.hedge_min_delay_ms),
+    )
+    with _SHARED_LOCK:
+        resilience = _SHARED_RESILIENCE.get(key)
+        if resilience is None:
+            resilience = GatewayResilience(config)
+            _SHARED_RESILIENCE[key] = resilience
+        return resilience
@@ -0,0 +1,228 @@
+import asyncio
+import dataclasses
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+from uuid import uuid4
+
+from modules.model_gateway.config import ModelGatewayRoutingConfig
+from modules.model_gateway.models import ModelGatewayRequest, ModelGatewayResponse, ModelTaskType
+
+CACHEABLE_TASK_TYPES = frozenset(
+    {
+        ModelTaskType.SAFETY_NLU_FAST,
+        ModelTaskType.SAFETY_SEMANTIC_JUDGE,
+    }
+)
+
+
+class SafetyCacheKey(NamedTuple):
+    task_type: str
+    provider: str
+    version: str
+    locale: str
+    text_digest: str
+
+
+def normalize_cache_text(text: str) -> str:
+    # Only transformations the local classifiers are already invariant to
+    # (they lowercase and match substrings), so a hit can never change a verdict.
+    return str(text).strip().lower()
+
+
+def build_cache_key(request: ModelGatewayRequest, provider: object) -> Optional[SafetyCacheKey]:
+    """Key for a cacheable safety request, or None when the provider does not publish a cache version."""
+    if request.task_type not in CACHEABLE_TASK_TYPES:
+        return None
+    version = getattr(provider, "cache_version", None)
+    if not version:
+        return None
+    # Digest instead of plaintext so cached entries do not retain user messages.
+    digest = hashlib.blake2b(normalize_cache_text(request.text).encode("utf-8"), digest_size=16).hexdigest()
+    return SafetyCacheKey(
+        task_type=request.task_type,
+        provider=provider.__class__.__name__,
+        version=str(version),
+        locale=str(request.locale),
+        text_digest=digest,
+    )
+
+
+class SafetyResultCache:
+    """TTL + LRU bounded cache of successful safety inferences with single-flight.
+
+    Only successful responses are stored; errors are handed to every waiter and
+    never cached, so the detector's fail-closed handling is unchanged. When a
+    provider reports a new ``cache_version`` (lexicon or model change), its old
+    entries are dropped.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        ttl_seconds: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max(1, int(max_entries))
+        self._ttl_seconds = float(ttl_seconds)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[SafetyCacheKey, Tuple[float, ModelGatewayResponse]]" = OrderedDict()
+        self._in_flight: Dict[SafetyCacheKey, Future] = {}
+        self._versions: Dict[Tuple[str, str], str] = {}
+        self._hits = 0
+        self._misses = 0
+        self._shared = 0
+        self._invalidations = 0
+
+    def get_or_compute(
+        self,
+        key: SafetyCacheKey,
+        compute: Callable[[], ModelGatewayResponse],
+    ) -> Tuple[ModelGatewayResponse, str]:
+        cached, flight, leader = self._claim(key)
+        if cached is not None:
+            return cached, "hit"
+        if not leader:
+            return self._copy(flight.result()), "shared"
+        return self._lead(key, flight, compute), "miss"
+
+    async def aget_or_compute(
+        self,
+        key: SafetyCacheKey,
+        compute: Callable[[], Awaitable[ModelGatewayResponse]],
+    ) -> Tuple[ModelGatewayResponse, str]:
+        cached, flight, leader = self._claim(key)
+        if cached is not None:
+            return cached, "hit"
+        if not leader:
+            return self._copy(await asyncio.wrap_future(flight)), "shared"
+        try:
+            response = await compute()
+        except BaseException as error:
+            self._fail(key, flight, error)
+            raise
+        self._store(key, flight, response)
+        return response, "miss"
+
+    def invalidate(self, provider: Optional[str] = None) -> int:
+        with self._lock:
+            stale = [key for key in self._entries if provider is None or key.provider == provider]
+            for key in stale:
+                del self._entries[key]
+            self._invalidations += 1
+            return len(stale)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses + self._shared
+            return {
+                "enabled": True,
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "ttl_seconds": self._ttl_seconds,
+                "in_flight": len(self._in_flight),
+                "hits": self._hits,
+                "misses": self._misses,
+                "shared": self._shared,
+                "hit_rate": round((self._hits + self._shared) / lookups, 4) if lookups else 0.0,
+                "invalidations": self._invalidations,
+            }
+
+    def _claim(self, key: SafetyCacheKey) -> Tuple[Optional[ModelGatewayResponse], Optional[Future], bool]:
+        with self._lock:
+            self._track_version_locked(key)
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, response = entry
+                if self._clock() - stored_at < self._ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return self._copy(response), None, False
+                del self._entries[key]
+
+            flight = self._in_flight.get(key)
+            if flight is not None:
+                self._shared += 1
+                return None, flight, False
+
+            flight = Future()
+            self._in_flight[key] = flight
+            self._misses += 1
+            return None, flight, True
+
+    def _lead(
+        self,
+        key: SafetyCacheKey,
+        flight: Future,
+        compute: Callable[[], ModelGatewayResponse],
+    ) -> ModelGatewayResponse:
+        try:
+            response = compute()
+        except BaseException as error:
+            self._fail(key, flight, error)
+            raise
+        self._store(key, flight, response)
+        return response
+
+    def _store(self, key: SafetyCacheKey, flight: Future, response: ModelGatewayResponse) -> None:
+        # Followers and later hits only ever read this private copy; the leader
+        # keeps ``response`` and may annotate it after we return.
+        stored = dataclasses.replace(response, reasons=list(response.reasons), raw=dict(response.raw))
+        with self._lock:
+            self._in_flight.pop(key, None)
+            if self._versions.get((key.task_type, key.provider)) == key.version:
+                self._entries[key] = (self._clock(), stored)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+        flight.set_result(stored)
+
+    def _fail(self, key: SafetyCacheKey, flight: Future, error: BaseException) -> None:
+        with self._lock:
+            self._in_flight.pop(key, None)
+        if isinstance(error, Exception):
+            flight.set_exception(error)
+        else:
+            flight.set_exception(RuntimeError(f"safety inference aborted: {error!r}"))
+
+    def _track_version_locked(self, key: SafetyCacheKey) -> None:
+        scope = (key.task_type, key.provider)
+        current = self._versions.get(scope)
+        if current == key.version:
+            return
+        self._versions[scope] = key.version
+        if current is None:
+            return
+        stale = [item for item in self._entries if (item.task_type, item.provider) == scope]
+        for item in stale:
+            del self._entries[item]
+        self._invalidations += 1
+
+    @staticmethod
+    def _copy(response: ModelGatewayResponse) -> ModelGatewayResponse:
+        return dataclasses.replace(
+            response,
+            reasons=list(response.reasons),
+            trace_id=str(uuid4()),
+            raw=dict(response.raw, cached_trace_id=response.trace_id),
+        )
+
+
+_SHARED_CACHES: Dict[Tuple[int, float], SafetyResultCache] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def get_shared_result_cache(config: ModelGatewayRoutingConfig) -> Optional[SafetyResultCache]:
+    if not config.safety_cache_enabled:
+        return None
+    key = (int(config.safety_cache_max_entries), float(config.safety_cache_ttl_seconds))
+    with _SHARED_LOCK:
+        cache = _SHARED_CACHES.get(key)
+        if cache is None:
+            cache = SafetyResultCache(max_entries=key[0], ttl_seconds=key[1])
+            _SHARED_CACHES[key] = cache
+        return cache
@@ -0,0 +1,266 @@
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Tuple
+
+from modules.model_gateway.config import ModelGatewayRoutingConfig
+from modules.model_gateway.models import ModelTaskType
+
+# Bulkhead for offline batch inference; it is dispatched after all live traffic.
+OFFLINE_BATCH_BULKHEAD = "offline_batch"
+
+
+class GatewayOverloadedError(RuntimeError):
+    """Raised when a request is shed instead of waiting for a gateway slot."""
+
+
+@dataclass(frozen=True)
+class TaskBulkheadPolicy:
+    concurrency: int
+    priority: int
+    max_queue_ms: Optional[int] = None
+    max_queue_depth: Optional[int] = None
+
+
+class SchedulerLease:
+    def __init__(self, scheduler: "GatewayScheduler", task_type: str, queue_ms: float) -> None:
+        self._scheduler = scheduler
+        self._released = False
+        self.task_type = task_type
+        self.queue_ms = queue_ms
+
+    def release(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        self._scheduler._release(self.task_type)
+
+    def __enter__(self) -> "SchedulerLease":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+class _Waiter:
+    def __init__(self, task_type: str, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        self.task_type = task_type
+        self.enqueued_at = time.perf_counter()
+        self.granted = False
+        self._event = threading.Event() if loop is None else None
+        self._loop = loop
+        self.future: Optional[asyncio.Future] = loop.create_future() if loop is not None else None
+
+    def grant(self) -> None:
+        self.granted = True
+        if self._event is not None:
+            self._event.set()
+            return
+        self._loop.call_soon_threadsafe(self._resolve)
+
+    def _resolve(self) -> None:
+        if self.future is not None and not self.future.done():
+            self.future.set_result(True)
+
+    def wait(self, timeout: Optional[float]) -> None:
+        self._event.wait(timeout)
+
+
+class _TaskState:
+    def __init__(self, policy: TaskBulkheadPolicy) -> None:
+        self.policy = policy
+        self.active = 0
+        self.queue: Deque[_Waiter] = deque()
+        self.admitted = 0
+        self.shed = 0
+        self.queue_samples: Deque[float] = deque(maxlen=512)
+
+
+class GatewayScheduler:
+    """Per-task bulkheads sharing one in-flight budget, handed out in priority order.
+
+    Each task type has its own concurrency cap, so a burst of coach generations
+    can never hold the slots safety checks need. When the shared ``max_inflight``
+    budget is exhausted, freed slots go to the lowest ``priority`` value first.
+    Tasks with ``max_queue_ms``/``max_queue_depth`` are shed with
+    ``GatewayOverloadedError`` rather than queueing past their deadline.
+    """
+
+    def __init__(self, policies: Dict[str, TaskBulkheadPolicy], max_inflight: int) -> None:
+        self._policies = dict(policies)
+        self._max_inflight = max(1, int(max_inflight))
+        self._lock = threading.Lock()
+        self._active_total = 0
+        self._tasks: Dict[str, _TaskState] = {task: _TaskState(policy) for task, policy in self._policies.items()}
+        self._dispatch_order: List[str] = sorted(self._tasks, key=lambda task: self._tasks[task].policy.priority)
+
+    def acquire(self, task_type: str) -> SchedulerLease:
+        state = self._state(task_type)
+        waiter = _Waiter(task_type)
+        if self._enqueue(state, waiter):
+            waiter.wait(self._deadline_seconds(state))
+        return self._finish_wait(state, waiter)
+
+    async def aacquire(self, task_type: str) -> SchedulerLease:
+        state = self._state(task_type)
+        waiter = _Waiter(task_type, loop=asyncio.get_running_loop())
+        if self._enqueue(state, waiter):
+            try:
+                await asyncio.wait_for(asyncio.shield(waiter.future), self._deadline_seconds(state))
+            except asyncio.TimeoutError:
+                pass
+            except asyncio.CancelledError:
+                self._abandon(state, waiter)
+                raise
+        return self._finish_wait(state, waiter)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            tasks = {}
+            for task_type in self._dispatch_order:
+                state = self._tasks[task_type]
+                samples = sorted(state.queue_samples)
+                tasks[task_type] = {
+                    "priority": state.policy.priority,
+                    "concurrency": state.policy.concurrency,
+                    "active": state.active,
+                    "queued": len(state.queue),
+                    "admitted": state.admitted,
+                    "shed": state.shed,
+                    "max_queue_ms": state.policy.max_queue_ms,
+                    "p50_queue_ms": round(_percentile(samples, 50), 3),
+                    "p95_queue_ms": round(_percentile(samples, 95), 3),
+                }
+            return {
+                "max_inflight": self._max_inflight,
+                "active": self._active_total,
+                "tasks": tasks,
+            }
+
+    def _state(self, task_type: str) -> _TaskState:
+        state = self._tasks.get(task_type)
+        if state is None:
+            raise ValueError(f"No bulkhead policy for task_type: {task_type}")
+        return state
+
+    @staticmethod
+    def _deadline_seconds(state: _TaskState) -> Optional[float]:
+        if state.policy.max_queue_ms is None:
+            return None
+        return state.policy.max_queue_ms / 1000.0
+
+    def _enqueue(self, state: _TaskState, waiter: _Waiter) -> bool:
+        """Queue the waiter; return True if the caller has to wait for a grant."""
+        with self._lock:
+            state.queue.append(waiter)
+            self._dispatch_locked()
+            if waiter.granted:
+                return False
+            depth = state.policy.max_queue_depth
+            if depth is not None and len(state.queue) > depth:
+                state.queue.remove(waiter)
+                state.shed += 1
+                raise GatewayOverloadedError(f"{waiter.task_type} queue is full ({depth} waiting)")
+            return True
+
+    def _finish_wait(self, state: _TaskState, waiter: _Waiter) -> SchedulerLease:
+        with self._lock:
+            queue_ms = (time.perf_counter() - waiter.enqueued_at) * 1000
+            if not waiter.granted:
+                state.queue.remove(waiter)
+                state.shed += 1
+                raise GatewayOverloadedError(
+                    f"{waiter.task_type} waited {queue_ms:.0f} ms without a slot "
+                    f"(deadline {state.policy.max_queue_ms} ms)"
+                )
+            state.queue_samples.append(queue_ms)
+            return SchedulerLease(self, waiter.task_type, queue_ms)
+
+    def _abandon(self, state: _TaskState, waiter: _Waiter) -> None:
+        with self._lock:
+            if not waiter.granted:
+                state.queue.remove(waiter)
+                return
+        # The slot was granted while the caller was being cancelled; hand it back.
+        self._release(waiter.task_type)
+
+    def _release(self, task_type: str) -> None:
+        with self._lock:
+            state = self._tasks[task_type]
+            state.active -= 1
+            self._active_total -= 1
+            self._dispatch_locked()
+
+    def _dispatch_locked(self) -> None:
+        for task_type in self._dispatch_order:
+            state = self._tasks[task_type]
+            while (
+                state.queue
+                and state.active < state.policy.concurrency
+                and self._active_total < self._max_inflight
+            ):
+                waiter = state.queue.popleft()
+                state.active += 1
+                state.admitted += 1
+                self._active_total += 1
+                waiter.grant()
+
+
+def _percentile(values: List[float], percentile: int) -> float:
+    if not values:
+        return 0.0
+    index = math.ceil((percentile / 100) * len(values)) - 1
+    return values[min(max(index, 0), len(values) - 1)]
+
+
+def build_scheduler(config: ModelGatewayRoutingConfig) -> GatewayScheduler:
+    coach_deadline = int(config.coach_queue_deadline_ms)
+    return GatewayScheduler(
+        policies={
+            ModelTaskType.SAFETY_NLU_FAST: TaskBulkheadPolicy(
+                concurrency=config.safety_nlu_concurrency,
+                priority=0,
+            ),
+            ModelTaskType.SAFETY_SEMANTIC_JUDGE: TaskBulkheadPolicy(
+                concurrency=config.safety_semantic_concurrency,
+                priority=0,
+            ),
+            ModelTaskType.COACH_GENERATION: TaskBulkheadPolicy(
+                concurrency=config.coach_concurrency,
+                priority=1,
+                max_queue_ms=coach_deadline,
+                max_queue_depth=int(config.coach_max_queue_depth),
+            ),
+            OFFLINE_BATCH_BULKHEAD: TaskBulkheadPolicy(
+                concurrency=config.batch_concurrency,
+                priority=2,
+            ),
+        },
+        max_inflight=config.max_inflight,
+    )
+
+
+_SHARED_SCHEDULERS: Dict[Tuple[int, ...], GatewayScheduler] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def get_shared_scheduler(config: ModelGatewayRoutingConfig) -> GatewayScheduler:
+    """Return the process-wide scheduler for these limits so every gateway instance shares one budget."""
+    key = (
+        int(config.max_inflight),
+        int(config.safety_nlu_concurrency),
+        int(config.safety_semantic_concurrency),
+        int(config.coach_concurrency),
+        int(config.coach_queue_deadline_ms),
+        int(config.coach_max_queue_depth),
+        int(config.batch_concurrency),
+    )
+    with _SHARED_LOCK:
+        scheduler = _SHARED_SCHEDULERS.get(key)
+        if scheduler is None:
+            scheduler = build_scheduler(config)
+            _SHARED_SCHEDULERS[key] = scheduler
+        return scheduler
@@ -1,13 +1,40 @@
+import asyncio
 import math
-from typing import Dict, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
 from uuid import uuid4
 
 from modules.model_gateway.config import ModelGatewayRoutingConfig, load_model_gateway_config
-from modules.model_gateway.models import ModelGatewayRequest, ModelGatewayResponse, ModelTaskType
+from modules.model_gateway.models import (
+    ModelBatchResult,
+    ModelGatewayRequest,
+    ModelGatewayResponse,
+    ModelStreamEvent,
+    ModelTaskType,
+)
 from modules.model_gateway.providers.base import ModelProvider
 from modules.model_gateway.providers.local_coach import LocalCoachProvider
 from modules.model_gateway.providers.local_safety import LocalSafetyProvider
 from modules.model_gateway.providers.openai_chat import OpenAIChatProvider
+from modules.model_gateway.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    GatewayResilience,
+    get_shared_resilience,
+)
+from modules.model_gateway.result_cache import (
+    SafetyResultCache,
+    build_cache_key,
+    get_shared_result_cache,
+)
+from modules.model_gateway.scheduler import (
+    OFFLINE_BATCH_BULKHEAD,
+    GatewayScheduler,
+    SchedulerLease,
+    get_shared_scheduler,
+)
 from modules.observability.models import ModelInvocationRecord
 from modules.storage.in_memory import InMemoryStore
 
@@ -18,12 +45,32 @@ class ModelGatewayService:
         providers: Optional[Dict[str, ModelProvider]] = None,
         config: Optional[ModelGatewayRoutingConfig] = None,
         audit_store: Optional[InMemoryStore] = None,
+        scheduler: Optional[GatewayScheduler] = None,
+        resilience: Optional[GatewayResilience] = None,
+        result_cache: Optional[SafetyResultCache] = None,
     ) -> None:
+        resolved = config or load_model_gateway_config()
         if providers is None:
-            resolved = config or load_model_gateway_config()
             providers = self._build_default_providers(resolved)
         self._providers = dict(providers)
         self._audit_store = audit_store
+        self._scheduler = scheduler or get_shared_scheduler(resolved)
+        self._resilience = resilience or get_shared_resilience(resolved)
+        self._result_cache = result_cache or get_shared_result_cache(resolved)
+        self._batch_max_parallelism = resolved.batch_max_parallelism
+        self._batch_chunk_size = resolved.batch_chunk_size
+
+    @property
+    def scheduler(self) -> GatewayScheduler:
+        return self._scheduler
+
+    @property
+    def resilience(self) -> GatewayResilience:
+        return self._resilience
+
+    @property
+    def result_cache(self) -> Optional[SafetyResultCache]:
+        return self._result_cache
 
     def infer(self, request: ModelGatewayRequest) -> ModelGatewayResponse:
         provider = self._providers.get(request.task_type)
@@ -35,19 +82,431 @@ class ModelGatewayService:
             )
             raise ValueError(f"Unsupported model task_type: {request.task_type}")
 
+        cache_key = build_cache_key(request, provider) if self._result_cache is not None else None
+        if cache_key is None:
+            return self._infer_uncached(request, provider)
+
+        start = time.perf_counter()
+        response, status = self._result_cache.get_or_compute(
+            cache_key,
+            lambda: self._infer_uncached(request, provider),
+        )
+        return self._finish_cached(request, response, status, start)
+
+    def _infer_uncached(self, request: ModelGatewayRequest, provider: ModelProvider) -> ModelGatewayResponse:
+        self._fail_fast_if_open(request, provider)
+        lease = self._acquire(request, provider)
         try:
-            response = provider.infer(request)
+            response = self._invoke_with_retries(provider, request)
         except Exception as error:
             self._record_failure(
                 request=request,
                 provider_name=provider.__class__.__name__,
                 error=error,
+                queue_ms=lease.queue_ms,
             )
             raise
+        finally:
+            lease.release()
+
+        self._record_success(request=request, response=response, queue_ms=lease.queue_ms)
+        return response
+
+    async def ainfer(self, request: ModelGatewayRequest) -> ModelGatewayResponse:
+        provider = self._providers.get(request.task_type)
+        if provider is None:
+            self._record_failure(
+                request=request,
+                provider_name="unresolved",
+                error=ValueError(f"Unsupported model task_type: {request.task_type}"),
+            )
+            raise ValueError(f"Unsupported model task_type: {request.task_type}")
+
+        cache_key = build_cache_key(request, provider) if self._result_cache is not None else None
+        if cache_key is None:
+            return await self._ainfer_uncached(request, provider)
+
+        start = time.perf_counter()
+        response, status = await self._result_cache.aget_or_compute(
+            cache_key,
+            lambda: self._ainfer_uncached(request, provider),
+        )
+        return self._finish_cached(request, response, status, start)
+
+    async def _ainfer_uncached(self, request: ModelGatewayRequest, provider: ModelProvider) -> ModelGatewayResponse:
+        self._fail_fast_if_open(request, provider)
+        lease = await self._aacquire(request, provider)
+        try:
+            response = await self._ainvoke_with_retries(provider, request)
+        except Exception as error:
+            self._record_failure(
+                request=request,
+                provider_name=provider.__class__.__name__,
+                error=error,
+                queue_ms=lease.queue_ms,
+            )
+            raise
+        finally:
+            lease.release()
+
+        self._record_success(request=request, response=response, queue_ms=lease.queue_ms)
+        return response
+
+    def infer_batch(
+        self,
+        requests: Sequence[ModelGatewayRequest],
+        max_parallelism: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+    ) -> Iterator[ModelBatchResult]:
+        """Run many same-task requests for offline jobs, yielding results in input order chunk by chunk.
+
+        Providers with ``infer_many`` get each chunk in one call; others are
+        fanned out over at most ``max_parallelism`` threads. Slots come from
+        the offline batch bulkhead, which has its own cap and is served after
+        live safety and coach traffic, so a backfill cannot take the slots
+        real-time checks need. A failed item is reported in its result
+        instead of aborting the batch. The safety
+        result cache is bypassed so a re-classification neither reads stale
+        verdicts nor evicts the live working set, and every chunk is audited
+        with a single store write.
+        """
+        items = list(requests)
+        if not items:
+            return
+        task_types = {request.task_type for request in items}
+        if len(task_types) > 1:
+            raise ValueError(f"Batch requests must share one task_type, got: {sorted(task_types)}")
+        task_type = items[0].task_type
+        provider = self._providers.get(task_type)
+        if provider is None:
+            raise ValueError(f"Unsupported model task_type: {task_type}")
+
+        parallelism = max(1, int(max_parallelism or self._batch_max_parallelism))
+        size = max(1, int(chunk_size or self._batch_chunk_size))
+        batch_id = str(uuid4())
+        native = getattr(provider, "infer_many", None)
+        with ThreadPoolExecutor(max_workers=parallelism, thread_name_prefix="gateway-batch") as executor:
+            for offset in range(0, len(items), size):
+                chunk = items[offset:offset + size]
+                if native is not None:
+                    outcomes = self._infer_chunk_native(provider, chunk)
+                else:
+                    outcomes = list(executor.map(lambda request: self._infer_batch_item(provider, request), chunk))
+                yield from self._finish_batch_chunk(provider, batch_id, offset, chunk, outcomes)
+
+    def _infer_batch_item(
+        self,
+        provider: ModelProvider,
+        request: ModelGatewayRequest,
+    ) -> Tuple[Optional[ModelGatewayResponse], Optional[Exception], float]:
+        provider_name = provider.__class__.__name__
+        if self._resilience.breaker(provider_name).state == CircuitState.OPEN:
+            return None, CircuitOpenError(f"Circuit open for {provider_name}; failing fast"), 0.0
+        try:
+            lease = self._scheduler.acquire(OFFLINE_BATCH_BULKHEAD)
+        except Exception as error:
+            return None, error, 0.0
+        try:
+            return self._invoke_with_retries(provider, request), None, lease.queue_ms
+        except Exception as error:
+            return None, error, lease.queue_ms
+        finally:
+            lease.release()
+
+    def _infer_chunk_native(
+        self,
+        provider: ModelProvider,
+        chunk: List[ModelGatewayRequest],
+    ) -> List[Tuple[Optional[ModelGatewayResponse], Optional[Exception], float]]:
+        provider_name = provider.__class__.__name__
+        breaker = self._resilience.breaker(provider_name)
+        try:
+            lease = self._scheduler.acquire(OFFLINE_BATCH_BULKHEAD)
+        except Exception as error:
+            return [(None, error, 0.0)] * len(chunk)
+        try:
+            if not breaker.try_acquire():
+                error = CircuitOpenError(f"Circuit open for {provider_name}; failing fast")
+                return [(None, error, lease.queue_ms)] * len(chunk)
+            start = time.perf_counter()
+            try:
+                responses = list(provider.infer_many(chunk))
+                if len(responses) != len(chunk):
+                    raise RuntimeError(
+                        f"{provider_name}.infer_many returned {len(responses)} results for {len(chunk)} requests"
+                    )
+            except Exception as error:
+                self._settle_failure(breaker, error)
+                return [(None, error, lease.queue_ms)] * len(chunk)
+            # The breaker and hedging judge per-call latency, not the size of the chunk.
+            latency_ms = (time.perf_counter() - start) * 1000 / len(chunk)
+            breaker.record_success(latency_ms)
+            self._resilience.record_latency(provider_name, latency_ms)
+            return [(response, None, lease.queue_ms) for response in responses]
+        finally:
+            lease.release()
+
+    def _finish_batch_chunk(
+        self,
+        provider: ModelProvider,
+        batch_id: str,
+        offset: int,
+        chunk: List[ModelGatewayRequest],
+        outcomes: List[Tuple[Optional[ModelGatewayResponse], Optional[Exception], float]],
+    ) -> List[ModelBatchResult]:
+        results: List[ModelBatchResult] = []
+        records: List[ModelInvocationRecord] = []
+        for position, (request, (response, error, queue_ms)) in enumerate(zip(chunk, outcomes)):
+            if response is not None:
+                response.raw["batch_id"] = batch_id
+                record = self._success_record(request, response, queue_ms)
+                results.append(ModelBatchResult(index=offset + position, request=request, response=response))
+            else:
+                record = self._failure_record(request, provider.__class__.__name__, error, queue_ms)
+                results.append(ModelBatchResult(index=offset + position, request=request, error=str(error)))
+            if record is not None:
+                record.metadata["batch_id"] = batch_id
+                records.append(record)
+        self._save_records(records)
+        return results
+
+    async def astream(self, request: ModelGatewayRequest) -> AsyncIterator[ModelStreamEvent]:
+        """Yield text deltas as the provider produces them, then one event carrying the final response.
+
+        Providers without ``astream`` are invoked once and their whole output is
+        forwarded as a single delta. The invocation is audited when the stream
+        finishes, fails, or is abandoned by the consumer.
+        """
+        provider = self._providers.get(request.task_type)
+        if provider is None:
+            self._record_failure(
+                request=request,
+                provider_name="unresolved",
+                error=ValueError(f"Unsupported model task_type: {request.task_type}"),
+            )
+            raise ValueError(f"Unsupported model task_type: {request.task_type}")
+
+        self._fail_fast_if_open(request, provider)
+        # The slot is held for the whole stream, not just until the first delta.
+        lease = await self._aacquire(request, provider)
+        breaker = self._resilience.breaker(provider.__class__.__name__)
+        start = time.perf_counter()
+        first_delta_ms: Optional[float] = None
+        response: Optional[ModelGatewayResponse] = None
+        try:
+            if not breaker.try_acquire():
+                raise CircuitOpenError(f"Circuit open for {provider.__class__.__name__}; failing fast")
+            astream = getattr(provider, "astream", None)
+            if astream is None:
+                response = await self._ainvoke(provider, request)
+                if response.output_text:
+                    first_delta_ms = (time.perf_counter() - start) * 1000
+                    yield ModelStreamEvent(delta=response.output_text)
+            else:
+                async for event in astream(request):
+                    if event.response is not None:
+                        response = event.response
+                        continue
+                    if event.delta:
+                        if first_delta_ms is None:
+                            first_delta_ms = (time.perf_counter() - start) * 1000
+                        yield event
+            if response is None:
+                raise RuntimeError(f"{provider.__class__.__name__} stream ended without a final response")
+        except CircuitOpenError as error:
+            self._record_failure(
+                request=request,
+                provider_name=provider.__class__.__name__,
+                error=error,
+                queue_ms=lease.queue_ms,
+            )
+            raise
+        except Exception as error:
+            self._settle_failure(breaker, error)
+            self._record_failure(
+                request=request,
+                provider_name=provider.__class__.__name__,
+                error=error,
+                queue_ms=lease.queue_ms,
+            )
+            raise
+        except (GeneratorExit, asyncio.CancelledError):
+            breaker.release()
+            self._record_failure(
+                request=request,
+                provider_name=provider.__class__.__name__,
+                error=RuntimeError("stream aborted by consumer"),
+                queue_ms=lease.queue_ms,
+            )
+            raise
+        finally:
+            lease.release()
+
+        if first_delta_ms is not None:
+            response.raw.setdefault("first_token_ms", round(first_delta_ms, 3))
+        # Streams are judged on time to first token; total duration depends on reply length.
+        health_latency_ms = first_delta_ms if first_delta_ms is not None else (time.perf_counter() - start) * 1000
+        breaker.record_success(health_latency_ms)
+        self._record_success(request=request, response=response, queue_ms=lease.queue_ms)
+        yield ModelStreamEvent(response=response)
 
-        self._record_success(request=request, response=response)
+    def _finish_cached(
+        self,
+        request: ModelGatewayRequest,
+        response: ModelGatewayResponse,
+        status: str,
+        start: float,
+    ) -> ModelGatewayResponse:
+        response.raw["cache"] = status
+        if status != "miss":
+            # The miss was audited by the leader; hits are audited with their lookup time.
+            response.latency_ms = (time.perf_counter() - start) * 1000
+            self._record_success(request=request, response=response)
         return response
 
+    def _fail_fast_if_open(self, request: ModelGatewayRequest, provider: ModelProvider) -> None:
+        provider_name = provider.__class__.__name__
+        if self._resilience.breaker(provider_name).state != CircuitState.OPEN:
+            return
+        error = CircuitOpenError(f"Circuit open for {provider_name}; failing fast")
+        self._record_failure(request=request, provider_name=provider_name, error=error)
+        raise error
+
+    def _invoke_with_retries(self, provider: ModelProvider, request: ModelGatewayRequest) -> ModelGatewayResponse:
+        provider_name = provider.__class__.__name__
+        breaker = self._resilience.breaker(provider_name)
+        self._resilience.retry_budget.record_request()
+        attempt = 0
+        while True:
+            if not breaker.try_acquire():
+                raise CircuitOpenError(f"Circuit open for {provider_name}; failing fast")
+            start = time.perf_counter()
+            try:
+                response = provider.infer(request)
+            except Exception as error:
+                self._settle_failure(breaker, error)
+                if self._should_retry(error, attempt):
+                    attempt += 1
+                    continue
+                raise
+            return self._settle_success(breaker, provider_name, response, start, attempt)
+
+    async def _ainvoke_with_retries(
+        self,
+        provider: ModelProvider,
+        request: ModelGatewayRequest,
+    ) -> ModelGatewayResponse:
+        provider_name = provider.__class__.__name__
+        breaker = self._resilience.breaker(provider_name)
+        self._resilience.retry_budget.record_request()
+        attempt = 0
+        while True:
+            if not breaker.try_acquire():
+                raise CircuitOpenError(f"Circuit open for {provider_name}; failing fast")
+            start = time.perf_counter()
+            try:
+                response = await self._ainvoke_hedged(provider, request)
+            except asyncio.CancelledError:
+                breaker.release()
+                raise
+            except Exception as error:
+                self._settle_failure(breaker, error)
+                if self._should_retry(error, attempt):
+                    attempt += 1
+                    continue
+                raise
+            return self._settle_success(breaker, provider_name, response, start, attempt)
+
+    async def _ainvoke_hedged(self, provider: ModelProvider, request: ModelGatewayRequest) -> ModelGatewayResponse:
+        """Send a second copy of a slow request after the provider's recent p95, keeping whichever finishes first."""
+        provider_name = provider.__class__.__name__
+        delay_ms = self._resilience.hedge_delay_ms(provider_name)
+        if delay_ms is None:
+            return await self._ainvoke(provider, request)
+
+        primary = asyncio.ensure_future(self._ainvoke(provider, request))
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay_ms / 1000.0)
+            if done or not self._resilience.retry_budget.try_spend():
+                return await primary
+
+            self._resilience.record_hedge(provider_name)
+            hedge = asyncio.ensure_future(self._ainvoke(provider, request))
+            pending = {primary, hedge}
+            first_error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        response = task.result()
+                        response.raw["hedged"] = True
+                        response.raw["hedge_won"] = task is hedge
+                        return response
+                    first_error = first_error or task.exception()
+            raise first_error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _should_retry(self, error: Exception, attempt: int) -> bool:
+        if attempt >= self._resilience.max_retries:
+            return False
+        if not self._resilience.is_retryable(error):
+            return False
+        return self._resilience.retry_budget.try_spend()
+
+    def _settle_failure(self, breaker: CircuitBreaker, error: Exception) -> None:
+        if self._resilience.counts_against_provider(error):
+            breaker.record_failure()
+        else:
+            breaker.release()
+
+    def _settle_success(
+        self,
+        breaker: CircuitBreaker,
+        provider_name: str,
+        response: ModelGatewayResponse,
+        start: float,
+        attempt: int,
+    ) -> ModelGatewayResponse:
+        latency_ms = (time.perf_counter() - start) * 1000
+        breaker.record_success(latency_ms)
+        self._resilience.record_latency(provider_name, latency_ms)
+        if attempt:
+            response.raw["retries"] = attempt
+        return response
+
+    def _acquire(self, request: ModelGatewayRequest, provider: ModelProvider) -> SchedulerLease:
+        try:
+            return self._scheduler.acquire(request.task_type)
+        except Exception as error:
+            self._record_failure(
+                request=request,
+                provider_name=provider.__class__.__name__,
+                error=error,
+            )
+            raise
+
+    async def _aacquire(self, request: ModelGatewayRequest, provider: ModelProvider) -> SchedulerLease:
+        try:
+            return await self._scheduler.aacquire(request.task_type)
+        except Exception as error:
+            self._record_failure(
+                request=request,
+                provider_name=provider.__class__.__name__,
+                error=error,
+            )
+            raise
+
+    @staticmethod
+    async def _ainvoke(provider: ModelProvider, request: ModelGatewayRequest) -> ModelGatewayResponse:
+        ainfer = getattr(provider, "ainfer", None)
+        if ainfer is not None:
+            return await ainfer(request)
+        # Sync-only providers must not block the event loop.
+        return await asyncio.to_thread(provider.infer, request)
+
     def run(
         self,
         task_type: str,
@@ -65,6 +524,23 @@ class ModelGatewayService:
         )
         return self.infer(request)
 
+    async def arun(
+        self,
+        task_type: str,
+        text: str,
+        locale: str = "en-US",
+        timeout_ms: int = 2000,
+        metadata: Optional[dict] = None,
+    ) -> ModelGatewayResponse:
+        request = ModelGatewayRequest(
+            task_type=task_type,
+            text=text,
+            locale=locale,
+            timeout_ms=timeout_ms,
+            metadata=metadata or {},
+        )
+        return await self.ainfer(request)
+
     @staticmethod
     def _build_default_providers(config: ModelGatewayRoutingConfig) -> Dict[str, ModelProvider]:
         local_safety = LocalSafetyProvider()
@@ -111,59 +587,108 @@ class ModelGatewayService:
 
         raise ValueError(f"Unknown provider '{provider_id}' for task_type '{task_type}'")
 
-    def _record_success(self, request: ModelGatewayRequest, response: ModelGatewayResponse) -> None:
+    def _record_success(
+        self,
+        request: ModelGatewayRequest,
+        response: ModelGatewayResponse,
+        queue_ms: float = 0.0,
+    ) -> None:
+        if self._audit_store is None:
+            return
+        self._save_records([self._success_record(request, response, queue_ms)])
+
+    def _record_failure(
+        self,
+        request: ModelGatewayRequest,
+        provider_name: str,
+        error: Exception,
+        queue_ms: float = 0.0,
+    ) -> None:
         if self._audit_store is None:
             return
+        self._save_records([self._failure_record(request, provider_name, error, queue_ms)])
+
+    def _save_records(self, records: List[Optional[ModelInvocationRecord]]) -> None:
+        records = [record for record in records if record is not None]
+        if self._audit_store is None or not records:
+            return
+        try:
+            save_many = getattr(self._audit_store, "save_model_invocations", None)
+            if save_many is not None:
+                save_many(records)
+                return
+            for record in records:
+                self._audit_store.save_model_invocation(record)
+        except Exception:
+            # Auditing must never break runtime behavior.
+            return
+
+    def _success_record(
+        self,
+        request: ModelGatewayRequest,
+        response: ModelGatewayResponse,
+        queue_ms: float = 0.0,
+    ) -> Optional[ModelInvocationRecord]:
         try:
             input_chars = len(request.text)
             output_chars = len(response.output_text or "")
-            self._audit_store.save_model_invocation(
-                ModelInvocationRecord(
-                    trace_id=response.trace_id,
+            prompt = response.raw.get("prompt") if isinstance(response.raw.get("prompt"), dict) else {}
+            usage = response.raw.get("usage") if isinstance(response.raw.get("usage"), dict) else {}
+            # Provider-reported counts win over the assembler's estimate.
+            input_tokens = int(usage.get("prompt_tokens") or prompt.get("input_tokens", 0))
+            cached_input_tokens = int(usage.get("cached_tokens", 0))
+            return ModelInvocationRecord(
+                trace_id=response.trace_id,
+                task_type=request.task_type,
+                provider=response.provider,
+                success=True,
+                latency_ms=response.latency_ms,
+                estimated_cost_usd=self._estimate_cost_usd(
                     task_type=request.task_type,
                     provider=response.provider,
-                    success=True,
-                    latency_ms=response.latency_ms,
-                    estimated_cost_usd=self._estimate_cost_usd(
-                        task_type=request.task_type,
-                        provider=response.provider,
-                        input_chars=input_chars,
-                        output_chars=output_chars,
-                    ),
                     input_chars=input_chars,
                     output_chars=output_chars,
-                    metadata=self._sanitize_metadata(request.metadata),
-                )
+                    input_tokens=input_tokens,
+                    cached_input_tokens=cached_input_tokens,
+                ),
+                input_chars=input_chars,
+                output_chars=output_chars,
+                metadata=self._sanitize_metadata(request.metadata),
+                queue_ms=queue_ms,
+                input_tokens=input_tokens,
+                input_tokens_saved=int(prompt.get("tokens_saved", 0)),
+                cached_input_tokens=cached_input_tokens,
             )
         except Exception:
-            # Auditing must never break runtime behavior.
-            return
+            return None
 
-    def _record_failure(self, request: ModelGatewayRequest, provider_name: str, error: Exception) -> None:
-        if self._audit_store is None:
-            return
+    def _failure_record(
+        self,
+        request: ModelGatewayRequest,
+        provider_name: str,
+        error: Exception,
+        queue_ms: float = 0.0,
+    ) -> Optional[ModelInvocationRecord]:
         try:
-            input_chars = len(request.text)
-            self._audit_store.save_model_invocation(
-                ModelInvocationRecord(
-                    trace_id=f"error-{uuid4()}",
-                    task_type=request.task_type,
-                    provider=provider_name,
-                    success=False,
-                    latency_ms=0.0,
-                    estimated_cost_usd=0.0,
-                    input_chars=input_chars,
-                    output_chars=0,
-                    metadata=self._sanitize_metadata(request.metadata),
-                    error=str(error),
-                )
+            return ModelInvocationRecord(
+                trace_id=f"error-{uuid4()}",
+                task_type=request.task_type,
+                provider=provider_name,
+                success=False,
+                latency_ms=0.0,
+                estimated_cost_usd=0.0,
+                input_chars=len(request.text),
+                output_chars=0,
+                metadata=self._sanitize_metadata(request.metadata),
+                error=str(error),
+                queue_ms=queue_ms,
             )
         except Exception:
-            return
+            return None
 
     @staticmethod
     def _sanitize_metadata(metadata: dict) -> dict:
-        keep = {"component", "session_id", "user_id", "style_id"}
+        keep = {"component", "session_id", "user_id", "style_id", "prompt_pack_version", "prompt_prefix_id"}
         sanitized: Dict[str, str] = {}
         for key in keep:
             if key in metadata and metadata[key] is not None:
@@ -171,11 +696,25 @@ class ModelGatewayService:
         return sanitized
 
     @staticmethod
-    def _estimate_cost_usd(task_type: str, provider: str, input_chars: int, output_chars: int) -> float:
+    def _estimate_cost_usd(
+        task_type: str,
+        provider: str,
+        input_chars: int,
+        output_chars: int,
+        input_tokens: int = 0,
+        cached_input_tokens: int = 0,
+    ) -> float:
         if provider.startswith("local-"):
             return 0.0
         if provider.startswith("openai:") and task_type == ModelTaskType.COACH_GENERATION:
-            input_tokens = math.ceil(max(0, input_chars) / 4)
+            # Prefer the assembled prompt size; the user text alone undercounts the system messages.
+            input_tokens = input_tokens or math.ceil(max(0, input_chars) / 4)
             output_tokens = math.ceil(max(0, output_chars) / 4)
-            return (input_tokens * 0.15 / 1_000_000) + (output_tokens * 0.6 / 1_000_000)
+            # Prefix-cache hits are billed at half the input rate.
+            cached = min(max(0, cached_input_tokens), input_tokens)
+            return (
+                ((input_tokens - cached) * 0.15 / 1_000_000)
+                + (cached * 0.075 / 1_000_000)
+                + (output_tokens * 0.6 / 1_000_000)
+            )
         return 0.0
@@ -1,6 +1,11 @@
+from modules.observability.invocation_log import InvocationGroupStats, ModelInvocationLog
 from modules.observability.models import APIAuditLogRecord, ModelInvocationRecord
+from modules.observability.sketch import LatencySketch
 
 __all__ = [
     "APIAuditLogRecord",
+    "InvocationGroupStats",
+    "LatencySketch",
+    "ModelInvocationLog",
     "ModelInvocationRecord",
 ]
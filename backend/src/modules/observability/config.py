@@ -0,0 +1,47 @@
+import os
+from dataclasses import dataclass
+
+
+def _parse_int(raw: str, default: int, *, minimum: int, maximum: int) -> int:
+    try:
+        value = int(raw.strip())
+    except ValueError:
+        value = default
+    return min(max(value, minimum), maximum)
+
+
+@dataclass
+class ObservabilityConfig:
+    model_invocation_log_capacity: int = 5000
+    model_invocation_spill_batch: int = 256
+    model_invocation_stats_bucket_seconds: int = 60
+    model_invocation_stats_window_buckets: int = 15
+
+
+def load_observability_config() -> ObservabilityConfig:
+    return ObservabilityConfig(
+        model_invocation_log_capacity=_parse_int(
+            os.getenv("MINDCOACH_MODEL_INVOCATION_LOG_CAPACITY", "5000"),
+            5000,
+            minimum=1,
+            maximum=1000000,
+        ),
+        model_invocation_spill_batch=_parse_int(
+            os.getenv("MINDCOACH_MODEL_INVOCATION_SPILL_BATCH", "256"),
+            256,
+            minimum=1,
+            maximum=100000,
+        ),
+        model_invocation_stats_bucket_seconds=_parse_int(
+            os.getenv("MINDCOACH_MODEL_INVOCATION_STATS_BUCKET_SECONDS", "60"),
+            60,
+            minimum=1,
+            maximum=3600,
+        ),
+        model_invocation_stats_window_buckets=_parse_int(
+            os.getenv("MINDCOACH_MODEL_INVOCATION_STATS_WINDOW_BUCKETS", "15"),
+            15,
+            minimum=1,
+            maximum=1440,
+        ),
+    )
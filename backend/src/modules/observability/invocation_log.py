@@ -0,0 +1,205 @@
+import math
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from modules.observability.config import load_observability_config
+from modules.observability.models import ModelInvocationRecord
+from modules.observability.sketch import LatencySketch
+
+SpillHandler = Callable[[List[ModelInvocationRecord]], None]
+GroupKey = Tuple[str, str]
+
+
+class InvocationGroupStats:
+    """Running totals and latency sketches for one (task_type, provider) pair."""
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.success = 0
+        self.estimated_cost_usd = 0.0
+        self.input_tokens = 0
+        self.input_tokens_saved = 0
+        self.cached_input_tokens = 0
+        self.latency = LatencySketch()
+        self.queue = LatencySketch()
+
+    def add(self, record: ModelInvocationRecord) -> None:
+        self.total += 1
+        self.success += 1 if record.success else 0
+        self.estimated_cost_usd += float(record.estimated_cost_usd)
+        self.input_tokens += int(record.input_tokens)
+        self.input_tokens_saved += int(record.input_tokens_saved)
+        self.cached_input_tokens += int(record.cached_input_tokens)
+        self.latency.add(record.latency_ms)
+        self.queue.add(record.queue_ms)
+
+    def merge(self, other: "InvocationGroupStats") -> None:
+        self.total += other.total
+        self.success += other.success
+        self.estimated_cost_usd += other.estimated_cost_usd
+        self.input_tokens += other.input_tokens
+        self.input_tokens_saved += other.input_tokens_saved
+        self.cached_input_tokens += other.cached_input_tokens
+        self.latency.merge(other.latency)
+        self.queue.merge(other.queue)
+
+    def copy(self) -> "InvocationGroupStats":
+        clone = InvocationGroupStats()
+        clone.merge(self)
+        return clone
+
+    def to_summary(self) -> dict:
+        total = self.total
+        return {
+            "total": total,
+            "success": self.success,
+            "failure": total - self.success,
+            "success_rate": round(self.success / total, 4) if total else 0.0,
+            "avg_latency_ms": round(self.latency.mean, 3),
+            "p50_latency_ms": round(self.latency.percentile(50), 3),
+            "p90_latency_ms": round(self.latency.percentile(90), 3),
+            "p95_latency_ms": round(self.latency.percentile(95), 3),
+            "p99_latency_ms": round(self.latency.percentile(99), 3),
+            "p95_queue_ms": round(self.queue.percentile(95), 3),
+            "p99_queue_ms": round(self.queue.percentile(99), 3),
+            "estimated_cost_usd": round(self.estimated_cost_usd, 8),
+            "input_tokens": self.input_tokens,
+            "input_tokens_saved": self.input_tokens_saved,
+            "cached_input_tokens": self.cached_input_tokens,
+            "prefix_cache_hit_rate": (
+                round(self.cached_input_tokens / self.input_tokens, 4) if self.input_tokens else 0.0
+            ),
+        }
+
+
+class ModelInvocationLog:
+    """Fixed-capacity log of recent model invocations plus per-group windowed statistics.
+
+    Records are appended to a ring buffer; once it is over ``capacity`` the
+    oldest ``spill_batch`` records are evicted together and handed to
+    ``spill`` (for example a database writer), so memory stays bounded under
+    any traffic. Statistics are updated on write into time buckets of
+    ``bucket_seconds``; only the last ``window_buckets`` are kept, so
+    percentiles track recent traffic instead of the process lifetime and a
+    summary costs O(buckets x groups) rather than O(records).
+    """
+
+    def __init__(
+        self,
+        capacity: Optional[int] = None,
+        spill: Optional[SpillHandler] = None,
+        spill_batch: Optional[int] = None,
+        bucket_seconds: Optional[int] = None,
+        window_buckets: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        config = load_observability_config()
+        self._capacity = max(1, int(capacity if capacity is not None else config.model_invocation_log_capacity))
+        resolved_batch = spill_batch if spill_batch is not None else config.model_invocation_spill_batch
+        self._spill_batch = max(1, min(int(resolved_batch), self._capacity))
+        self._bucket_seconds = max(
+            1, int(bucket_seconds if bucket_seconds is not None else config.model_invocation_stats_bucket_seconds)
+        )
+        self._window_buckets = max(
+            1, int(window_buckets if window_buckets is not None else config.model_invocation_stats_window_buckets)
+        )
+        self._clock = clock
+        self._spill = spill
+        self._records: Deque[ModelInvocationRecord] = deque()
+        self._buckets: Deque[Tuple[int, Dict[GroupKey, InvocationGroupStats]]] = deque()
+        self._spilled = 0
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def window_seconds(self) -> int:
+        return self._bucket_seconds * self._window_buckets
+
+    @property
+    def spilled(self) -> int:
+        return self._spilled
+
+    def set_spill(self, spill: Optional[SpillHandler]) -> None:
+        self._spill = spill
+
+    def append(self, record: ModelInvocationRecord) -> None:
+        self.extend((record,))
+
+    def extend(self, records: Iterable[ModelInvocationRecord]) -> None:
+        evicted: List[ModelInvocationRecord] = []
+        with self._lock:
+            groups = self._current_bucket_locked()
+            for record in records:
+                self._records.append(record)
+                key = (record.task_type, record.provider)
+                stats = groups.get(key)
+                if stats is None:
+                    stats = groups[key] = InvocationGroupStats()
+                stats.add(record)
+            overflow = len(self._records) - self._capacity
+            if overflow > 0:
+                for _ in range(max(overflow, self._spill_batch)):
+                    evicted.append(self._records.popleft())
+                self._spilled += len(evicted)
+        if evicted and self._spill is not None:
+            try:
+                self._spill(evicted)
+            except Exception:
+                # Losing spilled history must never break the request path.
+                return
+
+    def recent(self) -> List[ModelInvocationRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def group_stats(self, window_seconds: Optional[int] = None) -> Dict[GroupKey, InvocationGroupStats]:
+        """Merge the buckets covering the last ``window_seconds`` (default: the whole window).
+
+        The window is rounded up to whole buckets and capped at ``window_seconds``
+        of the log, so the most recent bucket is always included.
+        """
+        span = self._window_buckets
+        if window_seconds is not None:
+            span = min(span, max(1, math.ceil(int(window_seconds) / self._bucket_seconds)))
+        merged: Dict[GroupKey, InvocationGroupStats] = {}
+        with self._lock:
+            current = self._bucket_index()
+            self._prune_locked(current)
+            for index, groups in self._buckets:
+                if index <= current - span:
+                    continue
+                for key, stats in groups.items():
+                    target = merged.get(key)
+                    if target is None:
+                        target = merged[key] = InvocationGroupStats()
+                    target.merge(stats)
+        return merged
+
+    def _bucket_index(self) -> int:
+        return int(self._clock() // self._bucket_seconds)
+
+    def _current_bucket_locked(self) -> Dict[GroupKey, InvocationGroupStats]:
+        current = self._bucket_index()
+        self._prune_locked(current)
+        if not self._buckets or self._buckets[-1][0] != current:
+            self._buckets.append((current, {}))
+        return self._buckets[-1][1]
+
+    def _prune_locked(self, current: int) -> None:
+        while self._buckets and self._buckets[0][0] <= current - self._window_buckets:
+            self._buckets.popleft()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[ModelInvocationRecord]:
+        return iter(self.recent())
+
+    def __getitem__(self, index: int) -> ModelInvocationRecord:
+        with self._lock:
+            return self._records[index]
@@ -15,6 +15,10 @@ class ModelInvocationRecord:
     output_chars: int
     metadata: Dict[str, str] = field(default_factory=dict)
     error: Optional[str] = None
+    queue_ms: float = 0.0
+    input_tokens: int = 0
+    input_tokens_saved: int = 0
+    cached_input_tokens: int = 0
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
     def to_dict(self) -> dict:
@@ -29,6 +33,10 @@ class ModelInvocationRecord:
             "output_chars": self.output_chars,
             "metadata": dict(self.metadata),
             "error": self.error,
+            "queue_ms": round(self.queue_ms, 3),
+            "input_tokens": self.input_tokens,
+            "input_tokens_saved": self.input_tokens_saved,
+            "cached_input_tokens": self.cached_input_tokens,
             "created_at": self.created_at.isoformat(),
         }
 
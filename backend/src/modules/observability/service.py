@@ -1,7 +1,11 @@
-import math
 from collections import defaultdict
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
+from modules.model_gateway.config import load_model_gateway_config
+from modules.model_gateway.resilience import get_shared_resilience
+from modules.model_gateway.result_cache import get_shared_result_cache
+from modules.model_gateway.scheduler import get_shared_scheduler
+from modules.observability.invocation_log import InvocationGroupStats
 from modules.storage.in_memory import InMemoryStore
 
 
@@ -32,17 +36,71 @@ class ModelObservabilityService:
 
     def summarize_model_invocations(
         self,
-        limit: int = 200,
+        limit: Optional[int] = None,
         task_type: Optional[str] = None,
         provider: Optional[str] = None,
+        window_seconds: Optional[int] = None,
     ) -> dict:
-        records = self._filtered_records(limit=limit, task_type=task_type, provider=provider)
+        """Aggregate recent invocations.
+
+        With ``limit`` the summary covers the latest ``limit`` matching records
+        still in the in-memory ring buffer. Otherwise it merges the store's
+        bucketed stats for the last ``window_seconds``, which default to and
+        are capped at the invocation log's retention window; that cost does
+        not depend on how much traffic was logged.
+        """
+        normalized_task = str(task_type).strip() if task_type is not None else None
+        normalized_provider = str(provider).strip().lower() if provider is not None else None
+
+        if limit is not None:
+            groups = self._recent_group_stats(limit, normalized_task, normalized_provider)
+        else:
+            groups = self._store.model_invocation_stats(window_seconds)
+
+        totals = InvocationGroupStats()
+        by_task_type: Dict[str, InvocationGroupStats] = defaultdict(InvocationGroupStats)
+        by_provider: Dict[str, InvocationGroupStats] = defaultdict(InvocationGroupStats)
+        for (group_task, group_provider), stats in groups.items():
+            if normalized_task and group_task != normalized_task:
+                continue
+            if normalized_provider and normalized_provider not in group_provider.lower():
+                continue
+            totals.merge(stats)
+            by_task_type[group_task].merge(stats)
+            by_provider[group_provider].merge(stats)
+
         return {
-            "totals": self._aggregate(records),
-            "by_task_type": self._group_aggregate(records, key="task_type"),
-            "by_provider": self._group_aggregate(records, key="provider"),
+            "totals": totals.to_summary(),
+            "by_task_type": {name: stats.to_summary() for name, stats in sorted(by_task_type.items())},
+            "by_provider": {name: stats.to_summary() for name, stats in sorted(by_provider.items())},
         }
 
+    def _recent_group_stats(
+        self,
+        limit: int,
+        task_type: Optional[str],
+        provider: Optional[str],
+    ) -> Dict[Tuple[str, str], InvocationGroupStats]:
+        ordered = sorted(self._store.list_model_invocations(), key=lambda item: item.created_at, reverse=True)
+        if task_type:
+            ordered = [item for item in ordered if item.task_type == task_type]
+        if provider:
+            ordered = [item for item in ordered if provider in item.provider.lower()]
+
+        groups: Dict[Tuple[str, str], InvocationGroupStats] = defaultdict(InvocationGroupStats)
+        for record in ordered[: max(1, min(int(limit), 2000))]:
+            groups[(record.task_type, record.provider)].add(record)
+        return groups
+
+    @staticmethod
+    def model_gateway_status() -> dict:
+        config = load_model_gateway_config()
+        status = {"scheduler": get_shared_scheduler(config).snapshot()}
+        status.update(get_shared_resilience(config).snapshot())
+        cache = get_shared_result_cache(config)
+        status["safety_cache"] = cache.snapshot() if cache is not None else {"enabled": False}
+        return status
+
     def list_api_audit_logs(
         self,
         limit: int = 100,
@@ -69,77 +127,3 @@ class ModelObservabilityService:
 
         safe_limit = max(1, min(int(limit), 1000))
         return [item.to_dict() for item in ordered[:safe_limit]]
-
-    def _filtered_records(
-        self,
-        limit: int,
-        task_type: Optional[str],
-        provider: Optional[str],
-    ) -> List[object]:
-        items = self._store.list_model_invocations()
-        ordered = sorted(items, key=lambda item: item.created_at, reverse=True)
-
-        normalized_task = str(task_type).strip() if task_type is not None else None
-        normalized_provider = str(provider).strip() if provider is not None else None
-        if normalized_task:
-            ordered = [item for item in ordered if item.task_type == normalized_task]
-        if normalized_provider:
-            lowered = normalized_provider.lower()
-            ordered = [item for item in ordered if lowered in item.provider.lower()]
-
-        safe_limit = max(1, min(int(limit), 2000))
-        return ordered[:safe_limit]
-
-    @staticmethod
-    def _aggregate(records: List[object]) -> dict:
-        total = len(records)
-        if total == 0:
-            return {
-                "total": 0,
-                "success": 0,
-                "failure": 0,
-                "success_rate": 0.0,
-                "avg_latency_ms": 0.0,
-                "p95_latency_ms": 0.0,
-                "estimated_cost_usd": 0.0,
-            }
-
-        success = sum(1 for item in records if bool(item.success))
-        failure = total - success
-        latencies = sorted(float(item.latency_ms) for item in records)
-        avg_latency = sum(latencies) / total
-        p95 = ModelObservabilityService._percentile(latencies, 95)
-        estimated_cost = sum(float(item.estimated_cost_usd) for item in records)
-
-        return {
-            "total": total,
-            "success": success,
-            "failure": failure,
-            "success_rate": round(success / total, 4),
-            "avg_latency_ms": round(avg_latency, 3),
-            "p95_latency_ms": round(p95, 3),
-            "estimated_cost_usd": round(estimated_cost, 8),
-        }
-
-    @staticmethod
-    def _group_aggregate(records: List[object], key: str) -> Dict[str, dict]:
-        grouped: Dict[str, List[object]] = defaultdict(list)
-        for item in records:
-            group_value = str(getattr(item, key))
-            grouped[group_value].append(item)
-        return {
-            group_name: ModelObservabilityService._aggregate(group_items)
-            for group_name, group_items in sorted(grouped.items(), key=lambda item: item[0])
-        }
-
-    @staticmethod
-    def _percentile(values: List[float], percentile: int) -> float:
-        if not values:
-            return 0.0
-        if percentile <= 0:
-            return values[0]
-        if percentile >= 100:
-            return values[-1]
-        index = math.ceil((percentile / 100) * len(values)) - 1
-        index = min(max(index, 0), len(values) - 1)
-        return values[index]
@@ -0,0 +1,99 @@
+import math
+from typing import Dict, Iterable, Optional
+
+
+class LatencySketch:
+    """Mergeable quantile sketch over non-negative values with bounded relative error.
+
+    Values land in logarithmic buckets (the DDSketch layout), so memory depends
+    on the value range, not the sample count, and two sketches merge by adding
+    bucket counts. Any quantile is within ``relative_accuracy`` of the exact
+    sample value. Values below ``min_value`` share one zero bucket.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 0.001) -> None:
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self._relative_accuracy = relative_accuracy
+        self._gamma = (1.0 + relative_accuracy) / (1.0 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._min_value = min_value
+        self._buckets: Dict[int, int] = {}
+        self._zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        value = max(0.0, float(value))
+        if self.count == 0:
+            self.min = self.max = value
+        else:
+            self.min = min(self.min, value)
+            self.max = max(self.max, value)
+        self.count += 1
+        self.total += value
+        if value < self._min_value:
+            self._zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+
+    def extend(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "LatencySketch") -> None:
+        if other._gamma != self._gamma:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.min, self.max = other.min, other.max
+        else:
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+        self._zero_count += other._zero_count
+        for index, count in other._buckets.items():
+            self._buckets[index] = self._buckets.get(index, 0) + count
+
+    def copy(self) -> "LatencySketch":
+        clone = LatencySketch(self._relative_accuracy, self._min_value)
+        clone.merge(self)
+        return clone
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Nearest-rank quantile for ``q`` in [0, 1]; 0.0 when empty."""
+        if self.count == 0:
+            return 0.0
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        rank = max(1, math.ceil(q * self.count))
+        seen = self._zero_count
+        if rank <= seen:
+            return self.min
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                # Bucket midpoint in log space keeps the error symmetric.
+                estimate = 2.0 * self._gamma ** index / (self._gamma + 1.0)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def percentile(self, percentile: float) -> float:
+        return self.quantile(percentile / 100.0)
+
+    def summary(self, percentiles: Optional[Iterable[int]] = None) -> Dict[str, float]:
+        result = {"count": self.count, "mean": round(self.mean, 3), "max": round(self.max, 3)}
+        for percentile in percentiles or (50, 90, 95, 99):
+            result[f"p{percentile}"] = round(self.percentile(percentile), 3)
+        return result
@@ -0,0 +1,28 @@
+from modules.prompt.assembly.assembler import (
+    COACH_CONTEXT_SECTIONS,
+    AssembledPrompt,
+    ContextSection,
+    PromptAssembler,
+    compact_value,
+)
+from modules.prompt.assembly.prefix import (
+    PromptPrefix,
+    build_prompt_prefix,
+    compose_system_prompt,
+    prompt_prefix_cache_info,
+)
+from modules.prompt.assembly.tokens import estimate_tokens, tokenizer_available
+
+__all__ = [
+    "AssembledPrompt",
+    "COACH_CONTEXT_SECTIONS",
+    "ContextSection",
+    "PromptAssembler",
+    "PromptPrefix",
+    "build_prompt_prefix",
+    "compact_value",
+    "compose_system_prompt",
+    "estimate_tokens",
+    "prompt_prefix_cache_info",
+    "tokenizer_available",
+]
@@ -0,0 +1,237 @@
+import json
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from modules.prompt.assembly.tokens import (
+    MESSAGE_OVERHEAD_TOKENS,
+    REPLY_PRIMING_TOKENS,
+    estimate_tokens,
+)
+
+CONTEXT_HEADER = "Context:"
+
+
+@dataclass(frozen=True)
+class ContextSection:
+    key: str
+    label: str
+    priority: int
+    omit_fields: Tuple[str, ...] = ()
+    keep_latest: bool = False
+
+
+# Lower priority values survive longest when the budget is tight.
+COACH_CONTEXT_SECTIONS: Tuple[ContextSection, ...] = (
+    ContextSection("latest_triage", "triage", 0),
+    ContextSection("latest_assessment_scores", "scores", 1),
+    ContextSection("relevant_memory_summaries", "relevant_memories", 2),
+    ContextSection("journal_summary", "journal", 3),
+    ContextSection("memory_summaries", "recent_memories", 4, keep_latest=True),
+    ContextSection("neurodiversity_scores", "neurodiversity", 5, omit_fields=("source_result_id", "captured_at")),
+    ContextSection("user_profile", "profile", 6, omit_fields=("user_id", "email")),
+)
+
+# Already folded into the system prompt by the coach session service.
+SYSTEM_PROMPT_CONTEXT_KEYS = frozenset({"expert_qa", "neurodiversity_prompt_fragments"})
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or (isinstance(value, (list, tuple, dict)) and not value)
+
+
+def compact_value(value: Any, omit_fields: Sequence[str] = (), depth: int = 0) -> str:
+    """Render context as ``key=value`` text: no quotes or braces, empty fields and ``omit_fields`` skipped."""
+    if isinstance(value, dict):
+        parts = []
+        for key, item in value.items():
+            if key in omit_fields or _is_empty(item):
+                continue
+            rendered = compact_value(item, omit_fields, depth + 1)
+            if isinstance(item, dict):
+                parts.append(f"{key}({rendered})")
+            else:
+                parts.append(f"{key}={rendered}")
+        return ("; " if depth == 0 else ", ").join(parts)
+    if isinstance(value, (list, tuple)):
+        return " | ".join(compact_value(item, omit_fields, depth + 1) for item in value if not _is_empty(item))
+    if isinstance(value, bool):
+        return "yes" if value else "no"
+    if isinstance(value, float):
+        return f"{round(value, 2):g}"
+    return " ".join(str(value).split())
+
+
+@dataclass
+class AssembledPrompt:
+    messages: List[dict]
+    input_tokens: int
+    baseline_tokens: int
+    token_budget: int
+    prefix_tokens: int = 0
+    included_sections: List[str] = field(default_factory=list)
+    trimmed_sections: List[str] = field(default_factory=list)
+    dropped_sections: List[str] = field(default_factory=list)
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.baseline_tokens - self.input_tokens)
+
+    def report(self) -> dict:
+        return {
+            "input_tokens": self.input_tokens,
+            "baseline_tokens": self.baseline_tokens,
+            "tokens_saved": self.tokens_saved,
+            "token_budget": self.token_budget,
+            "prefix_tokens": self.prefix_tokens,
+            "over_budget": self.input_tokens > self.token_budget,
+            "included_sections": list(self.included_sections),
+            "trimmed_sections": list(self.trimmed_sections),
+            "dropped_sections": list(self.dropped_sections),
+        }
+
+
+class PromptAssembler:
+    """Builds chat messages for coach generation within an input-token budget.
+
+    System prompt, style instruction and the user message are always sent.
+    The first two form a stable prefix and always lead, so provider prefix
+    caches can match them; the per-turn context follows. Context sections fill
+    what is left in priority order; list sections are trimmed item by item
+    before a section is dropped altogether. The report compares the result
+    with the previous layout (the whole context dict JSON-dumped into one
+    system message).
+    """
+
+    def __init__(
+        self,
+        token_budget: int = 1500,
+        sections: Sequence[ContextSection] = COACH_CONTEXT_SECTIONS,
+        estimator: Callable[[str], int] = estimate_tokens,
+    ) -> None:
+        self._token_budget = max(1, int(token_budget))
+        self._sections = sorted(sections, key=lambda section: section.priority)
+        self._estimate = estimator
+
+    def assemble(
+        self,
+        system_prompt: str,
+        style_text: str,
+        context: Any,
+        user_text: str,
+    ) -> AssembledPrompt:
+        head = []
+        if system_prompt:
+            head.append({"role": "system", "content": system_prompt})
+        if style_text:
+            head.append({"role": "system", "content": f"Style instruction: {style_text}"})
+        user_message = {"role": "user", "content": user_text}
+
+        fixed_tokens = REPLY_PRIMING_TOKENS + sum(self._message_tokens(message) for message in head + [user_message])
+        available = self._token_budget - fixed_tokens - MESSAGE_OVERHEAD_TOKENS - self._estimate(CONTEXT_HEADER)
+
+        lines, included, trimmed, dropped = self._fit_context(context, available)
+        messages = list(head)
+        if lines:
+            messages.append({"role": "system", "content": "\n".join([CONTEXT_HEADER] + lines)})
+        messages.append(user_message)
+
+        return AssembledPrompt(
+            messages=messages,
+            input_tokens=REPLY_PRIMING_TOKENS + sum(self._message_tokens(message) for message in messages),
+            baseline_tokens=self._baseline_tokens(head, context, user_message),
+            token_budget=self._token_budget,
+            prefix_tokens=sum(self._message_tokens(message) for message in head),
+            included_sections=included,
+            trimmed_sections=trimmed,
+            dropped_sections=dropped,
+        )
+
+    def _fit_context(
+        self,
+        context: Any,
+        available: int,
+    ) -> Tuple[List[str], List[str], List[str], List[str]]:
+        lines: List[str] = []
+        included: List[str] = []
+        trimmed: List[str] = []
+        dropped: List[str] = []
+
+        if isinstance(context, str):
+            text = " ".join(context.split())
+            if text and self._line_tokens(text) <= available:
+                return [text], ["context"], [], []
+            return [], [], [], ["context"] if text else []
+        if not isinstance(context, dict):
+            return lines, included, trimmed, dropped
+
+        for section in self._sections_for(context):
+            value = context.get(section.key)
+            if _is_empty(value):
+                continue
+            line = self._render(section, value)
+            if not line:
+                continue
+            cost = self._line_tokens(line)
+            if cost <= available:
+                lines.append(line)
+                included.append(section.key)
+                available -= cost
+                continue
+
+            fitted = self._trim_list(section, value, available) if isinstance(value, list) else None
+            if fitted is None:
+                dropped.append(section.key)
+                continue
+            line, cost = fitted
+            lines.append(line)
+            included.append(section.key)
+            trimmed.append(section.key)
+            available -= cost
+
+        return lines, included, trimmed, dropped
+
+    def _sections_for(self, context: Dict[str, Any]) -> List[ContextSection]:
+        known = {section.key for section in self._sections}
+        lowest = max((section.priority for section in self._sections), default=0)
+        extra = [
+            ContextSection(key, key, lowest + 1)
+            for key in context
+            if key not in known and key not in SYSTEM_PROMPT_CONTEXT_KEYS
+        ]
+        return list(self._sections) + extra
+
+    def _trim_list(self, section: ContextSection, items: List[Any], available: int) -> Optional[Tuple[str, int]]:
+        """Keep as many items as fit, binary-searching the count since cost grows with it."""
+        best: Optional[Tuple[str, int]] = None
+        low, high = 1, len(items) - 1
+        while low <= high:
+            keep = (low + high) // 2
+            subset = items[-keep:] if section.keep_latest else items[:keep]
+            line = self._render(section, subset)
+            cost = self._line_tokens(line)
+            if line and cost <= available:
+                best = (line, cost)
+                low = keep + 1
+            else:
+                high = keep - 1
+        return best
+
+    @staticmethod
+    def _render(section: ContextSection, value: Any) -> str:
+        rendered = compact_value(value, section.omit_fields)
+        return f"{section.label}: {rendered}" if rendered else ""
+
+    def _line_tokens(self, line: str) -> int:
+        return self._estimate(line) + 1
+
+    def _message_tokens(self, message: dict) -> int:
+        return self._estimate(message["content"]) + MESSAGE_OVERHEAD_TOKENS
+
+    def _baseline_tokens(self, head: List[dict], context: Any, user_message: dict) -> int:
+        messages = list(head)
+        if isinstance(context, dict):
+            messages.append({"role": "system", "content": f"Context payload: {json.dumps(context, ensure_ascii=True)}"})
+        elif isinstance(context, str) and context:
+            messages.append({"role": "system", "content": f"Context payload: {context}"})
+        messages.append(user_message)
+        return REPLY_PRIMING_TOKENS + sum(self._message_tokens(message) for message in messages)
@@ -0,0 +1,104 @@
+import functools
+import hashlib
+from dataclasses import dataclass, field
+from typing import Optional, Sequence, Tuple
+
+from modules.prompt.registry.runtime import get_prompt_registry
+from modules.prompt.registry.service import PromptRegistryService
+
+
+@dataclass(frozen=True)
+class PromptPrefix:
+    """The per-turn-invariant head of a coach prompt.
+
+    Everything here is sent first and byte-for-byte identically while the
+    pack version, style and guidance inputs stay the same, so provider-side
+    prefix caches can reuse it across turns and users.
+    """
+
+    pack_version: str
+    style_id: str
+    system_prompt: str
+    style_prompt: dict = field(compare=False, hash=False)
+    prefix_id: str = ""
+
+    @property
+    def style_text(self) -> str:
+        return str(self.style_prompt.get("prompt", "")).strip()
+
+
+def compose_system_prompt(
+    base_prompt: str,
+    expert_policy: Optional[str] = None,
+    fragments: Sequence[str] = (),
+) -> str:
+    composed_prompt = base_prompt
+    if expert_policy:
+        composed_prompt = (
+            f"{composed_prompt}\n\n"
+            "Additional expert educational Q&A guidance:\n"
+            f"{expert_policy}"
+        )
+
+    cleaned = [str(item).strip() for item in fragments if str(item).strip()]
+    if not cleaned:
+        return composed_prompt
+
+    return (
+        f"{composed_prompt}\n\n"
+        "Additional neurodiversity adaptation guidance:\n"
+        + "\n\n".join(cleaned)
+    )
+
+
+def extract_prefix_inputs(context_prompt: dict) -> Tuple[Optional[str], Tuple[str, ...]]:
+    """Pull the expert policy and neurodiversity fragments that belong in the static prefix."""
+    expert_policy = None
+    expert_qa = context_prompt.get("expert_qa")
+    if isinstance(expert_qa, dict):
+        policy_candidate = expert_qa.get("policy")
+        if isinstance(policy_candidate, str):
+            expert_policy = policy_candidate.strip() or None
+
+    fragments = context_prompt.get("neurodiversity_prompt_fragments")
+    if not isinstance(fragments, list):
+        return expert_policy, ()
+    return expert_policy, tuple(str(item).strip() for item in fragments if str(item).strip())
+
+
+def build_prompt_prefix(
+    style_id: str,
+    context_prompt: dict,
+    registry: Optional[PromptRegistryService] = None,
+) -> PromptPrefix:
+    resolved = registry or get_prompt_registry()
+    expert_policy, fragments = extract_prefix_inputs(context_prompt)
+    return _cached_prefix(resolved, resolved.get_active_version(), style_id, expert_policy, fragments)
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_prefix(
+    registry: PromptRegistryService,
+    pack_version: str,
+    style_id: str,
+    expert_policy: Optional[str],
+    fragments: Tuple[str, ...],
+) -> PromptPrefix:
+    system_prompt = compose_system_prompt(registry.get_system_prompt(pack_version), expert_policy, fragments)
+    style_prompt = registry.get_style_prompt(style_id=style_id, version=pack_version)
+    digest = hashlib.blake2b(digest_size=8)
+    for part in (pack_version, style_id, system_prompt, str(style_prompt.get("prompt", ""))):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x1e")
+    return PromptPrefix(
+        pack_version=pack_version,
+        style_id=style_id,
+        system_prompt=system_prompt,
+        style_prompt=style_prompt,
+        prefix_id=digest.hexdigest(),
+    )
+
+
+def prompt_prefix_cache_info() -> dict:
+    info = _cached_prefix.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize}
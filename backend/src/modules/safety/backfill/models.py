@@ -0,0 +1,118 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+BACKFILL_SOURCES = ("journal", "coach")
+
+
+@dataclass
+class SafetyBackfillItem:
+    """One stored text to re-score; ``cursor`` orders items within their source for checkpointing."""
+
+    item_key: str
+    source: str
+    user_id: str
+    locale: str
+    text: str
+    cursor: Tuple[str, ...]
+
+
+@dataclass
+class SafetyBackfillResult:
+    run_id: str
+    item_key: str
+    source: str
+    user_id: str
+    risk_level: str
+    reasons: List[str] = field(default_factory=list)
+    fail_closed: bool = False
+    lexicon_version: str = ""
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def to_dict(self) -> dict:
+        return {
+            "run_id": self.run_id,
+            "item_key": self.item_key,
+            "source": self.source,
+            "user_id": self.user_id,
+            "risk_level": self.risk_level,
+            "reasons": list(self.reasons),
+            "fail_closed": self.fail_closed,
+            "lexicon_version": self.lexicon_version,
+            "created_at": self.created_at.isoformat(),
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> "SafetyBackfillResult":
+        return cls(
+            run_id=str(payload["run_id"]),
+            item_key=str(payload["item_key"]),
+            source=str(payload["source"]),
+            user_id=str(payload["user_id"]),
+            risk_level=str(payload["risk_level"]),
+            reasons=[str(item) for item in payload.get("reasons", [])],
+            fail_closed=bool(payload.get("fail_closed", False)),
+            lexicon_version=str(payload.get("lexicon_version", "")),
+            created_at=datetime.fromisoformat(str(payload["created_at"])),
+        )
+
+
+@dataclass
+class SafetyBackfillRun:
+    """Progress and checkpoint of one backfill; ``cursors`` hold the last committed item per source."""
+
+    run_id: str
+    lexicon_version: str
+    sources: List[str]
+    status: str = "pending"
+    processed: int = 0
+    level_counts: Dict[str, int] = field(default_factory=dict)
+    fail_closed: int = 0
+    cursors: Dict[str, List[str]] = field(default_factory=dict)
+    completed_sources: List[str] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+    last_error: Optional[str] = None
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    @property
+    def items_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.processed / self.elapsed_seconds
+
+    def to_dict(self) -> dict:
+        return {
+            "run_id": self.run_id,
+            "lexicon_version": self.lexicon_version,
+            "sources": list(self.sources),
+            "status": self.status,
+            "processed": self.processed,
+            "level_counts": dict(self.level_counts),
+            "fail_closed": self.fail_closed,
+            "cursors": {source: list(cursor) for source, cursor in self.cursors.items()},
+            "completed_sources": list(self.completed_sources),
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "items_per_second": round(self.items_per_second, 1),
+            "last_error": self.last_error,
+            "started_at": self.started_at.isoformat(),
+            "updated_at": self.updated_at.isoformat(),
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> "SafetyBackfillRun":
+        return cls(
+            run_id=str(payload["run_id"]),
+            lexicon_version=str(payload["lexicon_version"]),
+            sources=[str(item) for item in payload.get("sources", [])],
+            status=str(payload.get("status", "pending")),
+            processed=int(payload.get("processed", 0)),
+            level_counts={str(key): int(value) for key, value in payload.get("level_counts", {}).items()},
+            fail_closed=int(payload.get("fail_closed", 0)),
+            cursors={str(key): [str(part) for part in value] for key, value in payload.get("cursors", {}).items()},
+            completed_sources=[str(item) for item in payload.get("completed_sources", [])],
+            elapsed_seconds=float(payload.get("elapsed_seconds", 0.0)),
+            last_error=payload.get("last_error"),
+            started_at=datetime.fromisoformat(str(payload["started_at"])),
+            updated_at=datetime.fromisoformat(str(payload["updated_at"])),
+        )
@@ -0,0 +1,220 @@
+import itertools
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from modules.safety.backfill.models import (
+    BACKFILL_SOURCES,
+    SafetyBackfillItem,
+    SafetyBackfillResult,
+    SafetyBackfillRun,
+)
+from modules.safety.config import SafetyBackfillConfig, load_safety_backfill_config
+from modules.safety.detector_service import SafetyDetectorService
+from modules.safety.lexicon.compiled import get_locale_lexicons
+from modules.storage.in_memory import InMemoryStore
+
+
+class SafetyBackfillJob:
+    """Re-scores stored journal notes and coach user turns, e.g. after a lexicon update.
+
+    Items stream from the store in a stable per-source order and are classified
+    chunk by chunk through ``SafetyDetectorService.detect_batch``. After each
+    chunk the results are written and the run's cursor advances, so a run that
+    stops (limit, crash, restart) resumes after its last committed chunk.
+    """
+
+    def __init__(
+        self,
+        store: InMemoryStore,
+        detector: Optional[SafetyDetectorService] = None,
+        config: Optional[SafetyBackfillConfig] = None,
+    ) -> None:
+        self._store = store
+        self._detector = detector or SafetyDetectorService(store=store)
+        self._config = config or load_safety_backfill_config()
+        self._lock = threading.Lock()
+        self._active: Dict[str, threading.Thread] = {}
+
+    @property
+    def config(self) -> SafetyBackfillConfig:
+        return self._config
+
+    @property
+    def detector(self) -> SafetyDetectorService:
+        return self._detector
+
+    def start(
+        self,
+        sources: Optional[Sequence[str]] = None,
+        resume_run_id: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> SafetyBackfillRun:
+        """Begin or resume a run on a background thread and return it immediately."""
+        run = self._claim(sources, resume_run_id)
+        thread = threading.Thread(target=self._execute, args=(run, limit), name="safety-backfill", daemon=True)
+        with self._lock:
+            self._active[run.run_id] = thread
+        thread.start()
+        return run
+
+    def run(
+        self,
+        sources: Optional[Sequence[str]] = None,
+        resume_run_id: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> SafetyBackfillRun:
+        """Begin or resume a run on the calling thread; ``limit`` pauses it after that many items."""
+        run = self._claim(sources, resume_run_id)
+        with self._lock:
+            self._active[run.run_id] = threading.current_thread()
+        return self._execute(run, limit)
+
+    def wait(self, run_id: str, timeout: Optional[float] = None) -> Optional[SafetyBackfillRun]:
+        with self._lock:
+            thread = self._active.get(run_id)
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout)
+        return self._store.get_safety_backfill_run(run_id)
+
+    def _claim(self, sources: Optional[Sequence[str]], resume_run_id: Optional[str]) -> SafetyBackfillRun:
+        if resume_run_id is not None:
+            run = self._store.get_safety_backfill_run(resume_run_id)
+            if run is None:
+                raise ValueError("Unknown backfill run_id")
+            if run.status == "completed":
+                raise ValueError("Backfill run already completed")
+            with self._lock:
+                if resume_run_id in self._active:
+                    raise ValueError("Backfill run is already running")
+                # Reserve the run until the caller registers the thread executing it.
+                self._active[resume_run_id] = threading.current_thread()
+            return run
+
+        selected = list(sources) if sources else list(BACKFILL_SOURCES)
+        unknown = [source for source in selected if source not in BACKFILL_SOURCES]
+        if unknown:
+            raise ValueError(f"Unknown backfill sources: {unknown}")
+        run = SafetyBackfillRun(
+            run_id=str(uuid.uuid4()),
+            lexicon_version=get_locale_lexicons().version,
+            sources=selected,
+        )
+        self._store.save_safety_backfill_run(run)
+        return run
+
+    def _execute(self, run: SafetyBackfillRun, limit: Optional[int]) -> SafetyBackfillRun:
+        remaining = None if limit is None else max(0, int(limit))
+        base_elapsed = run.elapsed_seconds
+        started = time.perf_counter()
+        run.status = "running"
+        run.last_error = None
+        self._checkpoint(run, base_elapsed, started)
+        try:
+            for source in run.sources:
+                if source in run.completed_sources:
+                    continue
+                items = self._iter_source(source, run.cursors.get(source))
+                while True:
+                    size = self._config.chunk_size if remaining is None else min(self._config.chunk_size, remaining)
+                    chunk = list(itertools.islice(items, size))
+                    if chunk:
+                        self._process_chunk(run, source, chunk)
+                        if remaining is not None:
+                            remaining -= len(chunk)
+                        self._checkpoint(run, base_elapsed, started)
+                    if remaining == 0:
+                        run.status = "paused"
+                        return run
+                    if len(chunk) < size:
+                        break
+                run.completed_sources.append(source)
+                self._checkpoint(run, base_elapsed, started)
+            run.status = "completed"
+        except Exception as error:
+            run.status = "failed"
+            run.last_error = str(error)
+        finally:
+            self._checkpoint(run, base_elapsed, started)
+            with self._lock:
+                self._active.pop(run.run_id, None)
+        return run
+
+    def _process_chunk(self, run: SafetyBackfillRun, source: str, chunk: List[SafetyBackfillItem]) -> None:
+        detections = self._detector.detect_batch(
+            [(item.text, item.locale) for item in chunk],
+            max_parallelism=self._config.max_parallelism,
+            chunk_size=self._config.chunk_size,
+        )
+        results = []
+        for item, detection in zip(chunk, detections):
+            level = detection.level.name.lower()
+            results.append(
+                SafetyBackfillResult(
+                    run_id=run.run_id,
+                    item_key=item.item_key,
+                    source=item.source,
+                    user_id=item.user_id,
+                    risk_level=level,
+                    reasons=list(detection.reasons),
+                    fail_closed=detection.fail_closed,
+                    lexicon_version=run.lexicon_version,
+                )
+            )
+            run.level_counts[level] = run.level_counts.get(level, 0) + 1
+            run.fail_closed += int(detection.fail_closed)
+        self._store.save_safety_backfill_results(results)
+        run.processed += len(results)
+        run.cursors[source] = list(chunk[-1].cursor)
+
+    def _checkpoint(self, run: SafetyBackfillRun, base_elapsed: float, started: float) -> None:
+        run.elapsed_seconds = base_elapsed + (time.perf_counter() - started)
+        run.updated_at = datetime.now(timezone.utc)
+        self._store.save_safety_backfill_run(run)
+
+    def _iter_source(self, source: str, cursor: Optional[List[str]]) -> Iterator[SafetyBackfillItem]:
+        after = tuple(cursor) if cursor else None
+        items = self._iter_journal(after) if source == "journal" else self._iter_coach_turns(after)
+        for item in items:
+            if after is None or item.cursor > after:
+                yield item
+
+    def _iter_journal(self, after: Optional[tuple]) -> Iterator[SafetyBackfillItem]:
+        locales: Dict[str, str] = {}
+        for entry in self._store.iter_journal_entries(since=after):
+            text = f"{entry.mood} {entry.note}".strip()
+            if not text:
+                continue
+            yield SafetyBackfillItem(
+                item_key=f"journal:{entry.entry_id}",
+                source="journal",
+                user_id=entry.user_id,
+                locale=self._user_locale(entry.user_id, locales),
+                text=text,
+                cursor=(entry.created_at.isoformat(), entry.entry_id),
+            )
+
+    def _iter_coach_turns(self, after: Optional[tuple]) -> Iterator[SafetyBackfillItem]:
+        locales: Dict[str, str] = {}
+        since = (after[0], after[1]) if after else None
+        for session in self._store.iter_coach_sessions(since=since):
+            locale = self._user_locale(session.user_id, locales)
+            for index, turn in enumerate(session.turns):
+                if turn.role != "user" or not turn.message.strip():
+                    continue
+                yield SafetyBackfillItem(
+                    item_key=f"coach:{session.session_id}:{index}",
+                    source="coach",
+                    user_id=session.user_id,
+                    locale=locale,
+                    text=turn.message,
+                    cursor=(session.started_at.isoformat(), session.session_id, f"{index:08d}"),
+                )
+
+    def _user_locale(self, user_id: str, cache: Dict[str, str]) -> str:
+        if user_id not in cache:
+            user = self._store.get_user(user_id)
+            cache[user_id] = user.locale if user is not None else "en-US"
+        return cache[user_id]
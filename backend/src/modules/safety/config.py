@@ -0,0 +1,169 @@
+import os
+from dataclasses import dataclass
+
+
+def _parse_int(raw: str, default: int, *, minimum: int, maximum: int) -> int:
+    try:
+        value = int(raw.strip())
+    except ValueError:
+        value = default
+    return min(max(value, minimum), maximum)
+
+
+@dataclass
+class SafetyDetectionConfig:
+    # "concurrent" starts the semantic judge alongside NLU; "sequential" waits for NLU first.
+    execution_mode: str = "concurrent"
+    nlu_timeout_ms: int = 100
+    semantic_timeout_ms: int = 2000
+    max_workers: int = 16
+    # A stage still waiting for a pool worker after this long runs on an overflow thread
+    # under the same stage deadline.
+    queue_timeout_ms: int = 20
+
+
+def load_safety_detection_config() -> SafetyDetectionConfig:
+    mode = os.getenv("MINDCOACH_SAFETY_DETECTION_MODE", "concurrent").strip().lower()
+    return SafetyDetectionConfig(
+        execution_mode=mode if mode in {"concurrent", "sequential"} else "concurrent",
+        nlu_timeout_ms=_parse_int(
+            os.getenv("MINDCOACH_SAFETY_NLU_TIMEOUT_MS", "100"),
+            100,
+            minimum=1,
+            maximum=10000,
+        ),
+        semantic_timeout_ms=_parse_int(
+            os.getenv("MINDCOACH_SAFETY_SEMANTIC_TIMEOUT_MS", "2000"),
+            2000,
+            minimum=1,
+            maximum=60000,
+        ),
+        max_workers=_parse_int(
+            os.getenv("MINDCOACH_SAFETY_DETECTION_WORKERS", "16"),
+            16,
+            minimum=1,
+            maximum=1024,
+        ),
+        queue_timeout_ms=_parse_int(
+            os.getenv("MINDCOACH_SAFETY_QUEUE_TIMEOUT_MS", "20"),
+            20,
+            minimum=0,
+            maximum=10000,
+        ),
+    )
+
+
+@dataclass
+class OpsAlertDispatchConfig:
+    # Alerts for the same (user, level) inside one window are collapsed into the first.
+    dedupe_window_seconds: int = 300
+    max_attempts: int = 3
+    retry_backoff_ms: int = 200
+    # The worker thread exits after this long without alerts and restarts on demand.
+    worker_idle_seconds: int = 30
+
+
+def load_ops_alert_dispatch_config() -> OpsAlertDispatchConfig:
+    return OpsAlertDispatchConfig(
+        dedupe_window_seconds=_parse_int(
+            os.getenv("MINDCOACH_OPS_ALERT_DEDUPE_WINDOW_SECONDS", "300"),
+            300,
+            minimum=1,
+            maximum=86400,
+        ),
+        max_attempts=_parse_int(
+            os.getenv("MINDCOACH_OPS_ALERT_MAX_ATTEMPTS", "3"),
+            3,
+            minimum=1,
+            maximum=20,
+        ),
+        retry_backoff_ms=_parse_int(
+            os.getenv("MINDCOACH_OPS_ALERT_RETRY_BACKOFF_MS", "200"),
+            200,
+            minimum=0,
+            maximum=60000,
+        ),
+        worker_idle_seconds=_parse_int(
+            os.getenv("MINDCOACH_OPS_ALERT_WORKER_IDLE_SECONDS", "30"),
+            30,
+            minimum=1,
+            maximum=3600,
+        ),
+    )
+
+
+@dataclass
+class SafetyBackfillConfig:
+    max_parallelism: int = 4
+    # Results are written and the checkpoint advanced once per chunk.
+    chunk_size: int = 256
+
+
+def load_safety_backfill_config() -> SafetyBackfillConfig:
+    return SafetyBackfillConfig(
+        max_parallelism=_parse_int(
+            os.getenv("MINDCOACH_SAFETY_BACKFILL_PARALLELISM", "4"),
+            4,
+            minimum=1,
+            maximum=64,
+        ),
+        chunk_size=_parse_int(
+            os.getenv("MINDCOACH_SAFETY_BACKFILL_CHUNK_SIZE", "256"),
+            256,
+            minimum=1,
+            maximum=10000,
+        ),
+    )
+
+
+@dataclass
+class SafetySLOConfig:
+    # Latency budgets per stage; the NLU budget is the constitution's 100 ms fast-pass limit.
+    nlu_budget_ms: int = 100
+    semantic_budget_ms: int = 2000
+    detection_budget_ms: int = 2000
+    policy_budget_ms: int = 5
+    interruption_budget_ms: int = 50
+    # Time a stage waits for a detector worker before it starts running.
+    queue_budget_ms: int = 20
+
+
+def load_safety_slo_config() -> SafetySLOConfig:
+    return SafetySLOConfig(
+        nlu_budget_ms=_parse_int(
+            os.getenv("MINDCOACH_SAFETY_SLO_NLU_BUDGET_MS", "100"),
+            100,
+            minimum=1,
+            maximum=10000,
+        ),
+        semantic_budget_ms=_parse_int(
+            os.getenv("MINDCOACH_SAFETY_SLO_SEMANTIC_BUDGET_MS", "2000"),
+            2000,
+            minimum=1,
+            maximum=60000,
+        ),
+        detection_budget_ms=_parse_int(
+            os.getenv("MINDCOACH_SAFETY_SLO_DETECTION_BUDGET_MS", "2000"),
+            2000,
+            minimum=1,
+            maximum=60000,
+        ),
+        policy_budget_ms=_parse_int(
+            os.getenv("MINDCOACH_SAFETY_SLO_POLICY_BUDGET_MS", "5"),
+            5,
+            minimum=1,
+            maximum=10000,
+        ),
+        interruption_budget_ms=_parse_int(
+            os.getenv("MINDCOACH_SAFETY_SLO_INTERRUPTION_BUDGET_MS", "50"),
+            50,
+            minimum=1,
+            maximum=60000,
+        ),
+        queue_budget_ms=_parse_int(
+            os.getenv("MINDCOACH_SAFETY_SLO_QUEUE_BUDGET_MS", "20"),
+            20,
+            minimum=1,
+            maximum=60000,
+        ),
+    )
@@ -1,65 +1,374 @@
-from typing import Optional
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
-from modules.model_gateway.models import ModelTaskType
+from modules.model_gateway.models import ModelGatewayRequest, ModelGatewayResponse, ModelTaskType
 from modules.model_gateway.service import ModelGatewayService
+from modules.safety.config import SafetyDetectionConfig, load_safety_detection_config
 from modules.safety.models import SafetyDetectionResult
+from modules.safety.slo import SafetyLatencyMonitor, get_shared_safety_latency_monitor
 from modules.storage.in_memory import InMemoryStore
 from modules.triage.models import DialogueRiskSignal, RiskLevel
 
+_EXECUTORS: Dict[int, ThreadPoolExecutor] = {}
+_EXECUTORS_LOCK = threading.Lock()
+
+
+class SafetyStageTimeoutError(TimeoutError):
+    """A detection stage missed its deadline; the detector fails closed."""
+
+    def __init__(self, task_type: str, timeout_ms: int) -> None:
+        super().__init__(f"{task_type} exceeded {timeout_ms}ms")
+        self.task_type = task_type
+        self.timeout_ms = timeout_ms
+
+
+def get_shared_detection_executor(max_workers: int) -> ThreadPoolExecutor:
+    with _EXECUTORS_LOCK:
+        executor = _EXECUTORS.get(max_workers)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="safety-detect")
+            _EXECUTORS[max_workers] = executor
+        return executor
+
+
+class _StageCall:
+    """One submitted detection stage; records when execution actually began."""
+
+    def __init__(self, task_type: str, text: str, locale: str) -> None:
+        self.task_type = task_type
+        self.text = text
+        self.locale = locale
+        self.submitted_at = time.perf_counter()
+        self.started_at: Optional[float] = None
+        self.started = threading.Event()
+        self.future: Union[Future, "asyncio.Future", None] = None
+
+    def mark_started(self) -> None:
+        self.started_at = time.perf_counter()
+        self.started.set()
+
+    def queue_ms(self) -> float:
+        started_at = self.started_at if self.started_at is not None else time.perf_counter()
+        return (started_at - self.submitted_at) * 1000.0
+
 
 class SafetyDetectorService:
-    def __init__(self, gateway: Optional[ModelGatewayService] = None, store: Optional[InMemoryStore] = None) -> None:
+    """Runs the NLU fast pass and the semantic judge under per-stage deadlines.
+
+    In ``concurrent`` mode both stages start together, so the critical path is
+    max(NLU, semantic) instead of their sum; the semantic call is cancelled as
+    soon as NLU reports HIGH or EXTREME. In ``sequential`` mode the semantic
+    judge only starts after a non-high NLU verdict. Either way a stage that
+    misses its ``timeout_ms`` fails the detection closed. The deadline starts
+    when a worker picks the stage up; a stage still queued after
+    ``queue_timeout_ms`` moves to its own overflow thread under the same
+    deadline, so a saturated pool adds latency rather than escalating benign
+    messages to HIGH, and never blocks a caller past the deadline. Live detections
+    report their stage latencies and fail-closed outcomes to ``monitor``.
+    """
+
+    def __init__(
+        self,
+        gateway: Optional[ModelGatewayService] = None,
+        store: Optional[InMemoryStore] = None,
+        config: Optional[SafetyDetectionConfig] = None,
+        monitor: Optional[SafetyLatencyMonitor] = None,
+    ) -> None:
+        self._config = config or load_safety_detection_config()
         self._gateway = gateway or ModelGatewayService(audit_store=store)
+        self._monitor = monitor or get_shared_safety_latency_monitor()
+
+    @property
+    def config(self) -> SafetyDetectionConfig:
+        return self._config
 
-    def detect(self, text: str, override_signal: Optional[DialogueRiskSignal] = None) -> SafetyDetectionResult:
+    def detect(
+        self,
+        text: str,
+        override_signal: Optional[DialogueRiskSignal] = None,
+        locale: str = "en-US",
+    ) -> SafetyDetectionResult:
+        """Classify ``text`` with the lexicon matcher of the user's ``locale``."""
+        started = time.perf_counter()
         try:
-            nlu_result = self._gateway.run(
-                task_type=ModelTaskType.SAFETY_NLU_FAST,
-                text=text,
-                timeout_ms=100,
-                metadata={"component": "safety_detector"},
-            )
-            nlu_level = nlu_result.risk_level or RiskLevel.LOW
+            nlu_result, semantic_result = self._run_stages(text, locale)
+            result = self._combine(nlu_result, semantic_result, override_signal)
+        except Exception as error:
+            self._monitor.record_fail_closed(error)
+            result = self._fail_closed(error)
+        self._monitor.record_detection(result, (time.perf_counter() - started) * 1000.0)
+        return result
 
-            if nlu_level in (RiskLevel.HIGH, RiskLevel.EXTREME):
-                level = nlu_level
-                reasons = list(nlu_result.reasons)
-                semantic_latency_ms = 0.0
-                source = "nlu-short-circuit"
-            else:
-                semantic_result = self._gateway.run(
-                    task_type=ModelTaskType.SAFETY_SEMANTIC_JUDGE,
-                    text=text,
-                    timeout_ms=2000,
-                    metadata={"component": "safety_detector"},
-                )
-                semantic_level = semantic_result.risk_level or RiskLevel.LOW
-
-                level = max(nlu_level, semantic_level)
-                reasons = list(nlu_result.reasons) + list(semantic_result.reasons)
-                semantic_latency_ms = semantic_result.latency_ms
-                source = "nlu+semantic"
-
-            if override_signal is not None and override_signal.level > level:
-                level = override_signal.level
-                reasons.append("override-signal")
-
-            # Constitution rule: do not trust "just joking" to suppress safety response.
-            if override_signal is not None and override_signal.is_joke and override_signal.level >= RiskLevel.HIGH:
-                level = override_signal.level
-                reasons.append("joke-disclaimer-ignored")
-
-            return SafetyDetectionResult(
-                level=level,
-                source=source,
-                reasons=reasons,
-                nlu_latency_ms=nlu_result.latency_ms,
-                semantic_latency_ms=semantic_latency_ms,
-            )
+    async def adetect(
+        self,
+        text: str,
+        override_signal: Optional[DialogueRiskSignal] = None,
+        locale: str = "en-US",
+    ) -> SafetyDetectionResult:
+        started = time.perf_counter()
+        try:
+            nlu_result, semantic_result = await self._arun_stages(text, locale)
+            result = self._combine(nlu_result, semantic_result, override_signal)
         except Exception as error:
-            return SafetyDetectionResult(
-                level=RiskLevel.HIGH,
-                source="fail-closed",
-                reasons=[f"detector-error:{error}"],
-                fail_closed=True,
+            self._monitor.record_fail_closed(error)
+            result = self._fail_closed(error)
+        self._monitor.record_detection(result, (time.perf_counter() - started) * 1000.0)
+        return result
+
+    def detect_batch(
+        self,
+        items: Sequence[Tuple[str, str]],
+        max_parallelism: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+    ) -> List[SafetyDetectionResult]:
+        """Classify ``(text, locale)`` pairs offline through the gateway batch API.
+
+        The stages and their combination match ``detect``, but without live
+        deadlines: NLU runs over the whole batch first and the semantic judge
+        only sees items NLU did not rate HIGH or EXTREME. An item whose stage
+        fails is failed closed on its own. Offline batches stay out of the
+        live SLO histograms.
+        """
+        results: List[Optional[SafetyDetectionResult]] = [None] * len(items)
+        nlu_results: Dict[int, ModelGatewayResponse] = {}
+        for index, outcome in self._run_batch_stage(
+            ModelTaskType.SAFETY_NLU_FAST, items, range(len(items)), max_parallelism, chunk_size
+        ):
+            if isinstance(outcome, Exception):
+                results[index] = self._fail_closed(outcome)
+            elif self._short_circuits(outcome):
+                results[index] = self._combine(outcome, None, None)
+            else:
+                nlu_results[index] = outcome
+
+        for index, outcome in self._run_batch_stage(
+            ModelTaskType.SAFETY_SEMANTIC_JUDGE, items, sorted(nlu_results), max_parallelism, chunk_size
+        ):
+            if isinstance(outcome, Exception):
+                results[index] = self._fail_closed(outcome)
+            else:
+                results[index] = self._combine(nlu_results[index], outcome, None)
+        return [result or self._fail_closed(RuntimeError("missing batch result")) for result in results]
+
+    def _run_batch_stage(
+        self,
+        task_type: str,
+        items: Sequence[Tuple[str, str]],
+        indices: Sequence[int],
+        max_parallelism: Optional[int],
+        chunk_size: Optional[int],
+    ) -> Iterator[Tuple[int, Union[ModelGatewayResponse, Exception]]]:
+        if not indices:
+            return
+        requests = [
+            ModelGatewayRequest(
+                task_type=task_type,
+                text=items[index][0],
+                locale=items[index][1],
+                timeout_ms=self._timeout_ms(task_type),
+                metadata={"component": "safety_detector_batch"},
             )
+            for index in indices
+        ]
+        for result in self._gateway.infer_batch(requests, max_parallelism=max_parallelism, chunk_size=chunk_size):
+            outcome = result.response if result.ok else RuntimeError(result.error or "batch item failed")
+            yield indices[result.index], outcome
+
+    def _run_stages(
+        self,
+        text: str,
+        locale: str,
+    ) -> Tuple[ModelGatewayResponse, Optional[ModelGatewayResponse]]:
+        executor = get_shared_detection_executor(self._config.max_workers)
+        concurrent = self._config.execution_mode == "concurrent"
+        nlu = self._submit(executor, ModelTaskType.SAFETY_NLU_FAST, text, locale)
+        semantic = self._submit(executor, ModelTaskType.SAFETY_SEMANTIC_JUDGE, text, locale) if concurrent else None
+        try:
+            nlu_result = self._await(nlu)
+        except Exception:
+            if semantic is not None:
+                semantic.future.cancel()
+            raise
+
+        if self._short_circuits(nlu_result):
+            if semantic is not None:
+                semantic.future.cancel()
+            return nlu_result, None
+
+        if semantic is None:
+            semantic = self._submit(executor, ModelTaskType.SAFETY_SEMANTIC_JUDGE, text, locale)
+        return nlu_result, self._await(semantic)
+
+    async def _arun_stages(
+        self,
+        text: str,
+        locale: str,
+    ) -> Tuple[ModelGatewayResponse, Optional[ModelGatewayResponse]]:
+        concurrent = self._config.execution_mode == "concurrent"
+        nlu = self._astart(ModelTaskType.SAFETY_NLU_FAST, text, locale)
+        semantic = self._astart(ModelTaskType.SAFETY_SEMANTIC_JUDGE, text, locale) if concurrent else None
+        try:
+            nlu_result = await self._aawait(nlu)
+        except BaseException:
+            if semantic is not None:
+                semantic.future.cancel()
+            raise
+
+        if self._short_circuits(nlu_result):
+            if semantic is not None:
+                semantic.future.cancel()
+            return nlu_result, None
+
+        if semantic is None:
+            semantic = self._astart(ModelTaskType.SAFETY_SEMANTIC_JUDGE, text, locale)
+        return nlu_result, await self._aawait(semantic)
+
+    def _call(self, task_type: str, text: str, locale: str) -> ModelGatewayResponse:
+        return self._gateway.run(
+            task_type=task_type,
+            text=text,
+            locale=locale,
+            timeout_ms=self._timeout_ms(task_type),
+            metadata={"component": "safety_detector"},
+        )
+
+    async def _acall(self, task_type: str, text: str, locale: str) -> ModelGatewayResponse:
+        return await self._gateway.arun(
+            task_type=task_type,
+            text=text,
+            locale=locale,
+            timeout_ms=self._timeout_ms(task_type),
+            metadata={"component": "safety_detector"},
+        )
+
+    def _submit(self, executor: ThreadPoolExecutor, task_type: str, text: str, locale: str) -> "_StageCall":
+        stage = _StageCall(task_type, text, locale)
+
+        def _run() -> ModelGatewayResponse:
+            stage.mark_started()
+            return self._call(task_type, text, locale)
+
+        stage.future = executor.submit(_run)
+        return stage
+
+    def _astart(self, task_type: str, text: str, locale: str) -> "_StageCall":
+        stage = _StageCall(task_type, text, locale)
+
+        async def _run() -> ModelGatewayResponse:
+            stage.mark_started()
+            return await self._acall(task_type, text, locale)
+
+        stage.future = asyncio.ensure_future(_run())
+        return stage
+
+    def _await(self, stage: "_StageCall") -> ModelGatewayResponse:
+        """Wait for ``stage``; its deadline runs from when a worker starts it, not from submission."""
+        if not stage.started.wait(self._config.queue_timeout_ms / 1000.0) and stage.future.cancel():
+            # Every worker is busy: rather than fail a message closed because of pool saturation,
+            # run the stage on an overflow thread. Local providers ignore ``timeout_ms``, so the
+            # deadline is enforced here and a stage that misses it fails closed as usual.
+            self._monitor.record_queue_wait(stage.task_type, stage.queue_ms(), fell_back=True)
+            return self._run_overflow(stage)
+        stage.started.wait()
+        self._monitor.record_queue_wait(stage.task_type, stage.queue_ms(), fell_back=False)
+        timeout_ms = self._timeout_ms(stage.task_type)
+        try:
+            return stage.future.result(timeout=self._remaining_seconds(timeout_ms, stage.started_at))
+        except FutureTimeoutError:
+            # A stage already running in a worker cannot be interrupted; its late result is dropped.
+            stage.future.cancel()
+            raise SafetyStageTimeoutError(stage.task_type, timeout_ms) from None
+
+    def _run_overflow(self, stage: "_StageCall") -> ModelGatewayResponse:
+        overflow: Future = Future()
+
+        def _run() -> None:
+            if not overflow.set_running_or_notify_cancel():
+                return
+            try:
+                overflow.set_result(self._call(stage.task_type, stage.text, stage.locale))
+            except BaseException as error:
+                overflow.set_exception(error)
+
+        timeout_ms = self._timeout_ms(stage.task_type)
+        threading.Thread(target=_run, name="safety-detect-overflow", daemon=True).start()
+        try:
+            return overflow.result(timeout=timeout_ms / 1000.0)
+        except FutureTimeoutError:
+            # As with pooled stages, the overflow call cannot be interrupted; its late result is dropped.
+            raise SafetyStageTimeoutError(stage.task_type, timeout_ms) from None
+
+    async def _aawait(self, stage: "_StageCall") -> ModelGatewayResponse:
+        if stage.started_at is None:
+            await asyncio.wait({stage.future}, timeout=self._config.queue_timeout_ms / 1000.0)
+        # A stalled event loop delays every task alike, so the clock falls back to submission time.
+        self._monitor.record_queue_wait(stage.task_type, stage.queue_ms(), fell_back=False)
+        timeout_ms = self._timeout_ms(stage.task_type)
+        clock = stage.started_at if stage.started_at is not None else stage.submitted_at
+        try:
+            return await asyncio.wait_for(stage.future, timeout=self._remaining_seconds(timeout_ms, clock))
+        except asyncio.TimeoutError:
+            raise SafetyStageTimeoutError(stage.task_type, timeout_ms) from None
+
+    def _timeout_ms(self, task_type: str) -> int:
+        if task_type == ModelTaskType.SAFETY_NLU_FAST:
+            return self._config.nlu_timeout_ms
+        return self._config.semantic_timeout_ms
+
+    @staticmethod
+    def _remaining_seconds(timeout_ms: int, started: float) -> float:
+        return max(0.0, timeout_ms / 1000.0 - (time.perf_counter() - started))
+
+    @staticmethod
+    def _short_circuits(nlu_result: ModelGatewayResponse) -> bool:
+        return (nlu_result.risk_level or RiskLevel.LOW) in (RiskLevel.HIGH, RiskLevel.EXTREME)
+
+    @staticmethod
+    def _combine(
+        nlu_result: ModelGatewayResponse,
+        semantic_result: Optional[ModelGatewayResponse],
+        override_signal: Optional[DialogueRiskSignal],
+    ) -> SafetyDetectionResult:
+        nlu_level = nlu_result.risk_level or RiskLevel.LOW
+        if semantic_result is None:
+            level = nlu_level
+            reasons = list(nlu_result.reasons)
+            semantic_latency_ms = 0.0
+            source = "nlu-short-circuit"
+        else:
+            semantic_level = semantic_result.risk_level or RiskLevel.LOW
+            level = max(nlu_level, semantic_level)
+            reasons = list(nlu_result.reasons) + list(semantic_result.reasons)
+            semantic_latency_ms = semantic_result.latency_ms
+            source = "nlu+semantic"
+
+        if override_signal is not None and override_signal.level > level:
+            level = override_signal.level
+            reasons.append("override-signal")
+
+        # Constitution rule: do not trust "just joking" to suppress safety response.
+        if override_signal is not None and override_signal.is_joke and override_signal.level >= RiskLevel.HIGH:
+            level = override_signal.level
+            reasons.append("joke-disclaimer-ignored")
+
+        return SafetyDetectionResult(
+            level=level,
+            source=source,
+            reasons=reasons,
+            nlu_latency_ms=nlu_result.latency_ms,
+            semantic_latency_ms=semantic_latency_ms,
+        )
+
+    @staticmethod
+    def _fail_closed(error: Exception) -> SafetyDetectionResult:
+        reason = f"detector-timeout:{error}" if isinstance(error, SafetyStageTimeoutError) else f"detector-error:{error}"
+        return SafetyDetectionResult(
+            level=RiskLevel.HIGH,
+            source="fail-closed",
+            reasons=[reason],
+            fail_closed=True,
+        )
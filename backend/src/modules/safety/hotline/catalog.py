@@ -0,0 +1,89 @@
+import copy
+import gzip
+import hashlib
+import json
+from functools import lru_cache
+from typing import Dict, Mapping, Optional, Tuple
+
+HOTLINE_BY_LOCALE = {
+    "en-US": {
+        "name": "988 Suicide & Crisis Lifeline",
+        "phone": "988",
+        "text": "Text or call 988",
+    },
+    "zh-CN": {
+        "name": "全国心理援助热线",
+        "phone": "12356",
+        "text": "可拨打本地心理援助热线",
+    },
+}
+
+FALLBACK_HOTLINE = {
+    "name": "Local Emergency Support",
+    "phone": "112",
+    "text": "Call your local emergency number immediately if danger is imminent.",
+}
+
+CACHE_CONTROL = "public, max-age=300"
+
+
+class HotlineCatalog:
+    """The hotline directory rendered once into the bytes clients cache offline.
+
+    ``version`` is a content hash of the canonical JSON, so it changes exactly
+    when a hotline entry does; safety responses carry only this hash and
+    clients refetch the catalog (with ``If-None-Match``) when it differs.
+    """
+
+    def __init__(self, hotlines: Mapping[str, dict], fallback: dict) -> None:
+        payload = {locale: dict(entry) for locale, entry in hotlines.items()}
+        payload["default"] = dict(fallback)
+        self._payload = payload
+        self.body = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        self.gzip_body = gzip.compress(self.body, mtime=0)
+        self.version = hashlib.sha256(self.body).hexdigest()[:16]
+        self.etag = f'"{self.version}"'
+
+    def payload(self) -> dict:
+        return copy.deepcopy(self._payload)
+
+    def not_modified(self, if_none_match: Optional[str]) -> bool:
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*" or tag == self.etag or tag == f"W/{self.etag}":
+                return True
+        return False
+
+    def encode(self, accept_encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+        """Return the precomputed body and its Content-Encoding for the client's Accept-Encoding."""
+        if _accepts_gzip(accept_encoding):
+            return self.gzip_body, "gzip"
+        return self.body, None
+
+    def http_headers(self, encoding: Optional[str] = None) -> Dict[str, str]:
+        headers = {"ETag": self.etag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return headers
+
+
+def _accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    for item in (accept_encoding or "").split(","):
+        name, _, params = item.strip().partition(";")
+        if name.strip().lower() not in {"gzip", "*"}:
+            continue
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                return float(quality[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+@lru_cache(maxsize=1)
+def get_hotline_catalog() -> HotlineCatalog:
+    return HotlineCatalog(HOTLINE_BY_LOCALE, FALLBACK_HOTLINE)
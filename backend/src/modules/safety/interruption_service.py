@@ -1,17 +1,23 @@
-from modules.safety.emergency.service import EmergencyService
-from modules.safety.hotline.resolver import HotlineResolver
+import time
+from typing import Optional
+
 from modules.safety.models import SafetyDetectionResult
 from modules.safety.ops_alert.service import OpsAlertService
-from modules.safety.policy.engine import SafetyPolicyEngine
+from modules.safety.policy.decision_table import SafetyDecisionTable, get_safety_decision_table
+from modules.safety.slo import SafetyLatencyMonitor, get_shared_safety_latency_monitor
 from modules.storage.in_memory import InMemoryStore
 
 
 class SafetyInterruptionService:
-    def __init__(self, store: InMemoryStore) -> None:
-        self._policy = SafetyPolicyEngine()
-        self._hotline = HotlineResolver()
+    def __init__(
+        self,
+        store: InMemoryStore,
+        monitor: Optional[SafetyLatencyMonitor] = None,
+        decisions: Optional[SafetyDecisionTable] = None,
+    ) -> None:
+        self._decisions = decisions or get_safety_decision_table()
         self._ops = OpsAlertService(store)
-        self._emergency = EmergencyService()
+        self._monitor = monitor or get_shared_safety_latency_monitor()
 
     def handle(
         self,
@@ -20,27 +26,28 @@ class SafetyInterruptionService:
         detection: SafetyDetectionResult,
         legal_policy_enabled: bool = False,
     ) -> dict:
-        action = self._policy.resolve(detection.level)
-        hotline = self._hotline.resolve(locale) if action.show_hotline else None
+        started = time.perf_counter()
+        # Policy action, hotline and emergency outcome are precomputed; only the detection is per request.
+        decision = self._decisions.lookup(detection.level, locale, legal_policy_enabled)
+        self._monitor.observe("policy", (time.perf_counter() - started) * 1000.0)
 
         ops_event = None
-        if action.notify_ops:
+        if decision.notify_ops:
             ops_event = self._ops.notify(
                 user_id=user_id,
                 level=detection.level,
                 reason=";".join(detection.reasons),
             )
 
-        emergency_contact_notified = self._emergency.should_notify_emergency_contact(
-            level=detection.level,
-            legal_policy_enabled=legal_policy_enabled,
-        )
-
-        return {
+        response = {
             "detection": detection.to_dict(),
-            "action": action.to_dict(),
-            "hotline": hotline,
+            # The table's fragments are shared read-only mappings; each response gets its own copy.
+            "action": dict(decision.action_payload),
+            "hotline": dict(decision.hotline) if decision.hotline is not None else None,
             "ops_event": ops_event,
-            "emergency_contact_notified": emergency_contact_notified,
-            "hotline_cache": self._hotline.local_cache_payload(),
+            "emergency_contact_notified": decision.emergency_contact_notified,
+            # Clients fetch the catalog from /api/safety/hotline-cache when this hash changes.
+            "hotline_cache_version": self._decisions.hotline_cache_version,
         }
+        self._monitor.observe("interruption", (time.perf_counter() - started) * 1000.0)
+        return response
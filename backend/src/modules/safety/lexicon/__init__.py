@@ -0,0 +1,21 @@
+from modules.safety.lexicon.automaton import PatternAutomaton
+from modules.safety.lexicon.compiled import (
+    CompiledLexicon,
+    LexiconEntry,
+    LexiconScan,
+    LocaleLexicons,
+    get_locale_lexicons,
+    get_safety_lexicon,
+)
+from modules.safety.lexicon.normalize import normalize_text
+
+__all__ = [
+    "CompiledLexicon",
+    "LexiconEntry",
+    "LexiconScan",
+    "LocaleLexicons",
+    "PatternAutomaton",
+    "get_locale_lexicons",
+    "get_safety_lexicon",
+    "normalize_text",
+]
@@ -0,0 +1,71 @@
+from collections import deque
+from typing import Dict, List, Sequence, Set, Tuple
+
+
+class PatternAutomaton:
+    """Aho-Corasick automaton over a fixed set of literal patterns.
+
+    Built once; ``search`` then reports every pattern occurring anywhere in
+    the text (overlaps included) in a single pass over its characters, so the
+    cost per message does not grow with the number of patterns.
+    """
+
+    def __init__(self, patterns: Sequence[str]) -> None:
+        self._patterns: Tuple[str, ...] = tuple(patterns)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[int, ...]] = [()]
+        for pattern_id, pattern in enumerate(self._patterns):
+            if pattern:
+                self._insert(pattern, pattern_id)
+        self._link()
+
+    @property
+    def patterns(self) -> Tuple[str, ...]:
+        return self._patterns
+
+    @property
+    def state_count(self) -> int:
+        return len(self._goto)
+
+    def search(self, text: str) -> Set[int]:
+        """Return the ids (indexes into ``patterns``) of every pattern found in ``text``."""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        found: Set[int] = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+    def _insert(self, pattern: str, pattern_id: int) -> None:
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        self._output[state] = self._output[state] + (pattern_id,)
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                # Fold suffix matches in so search never has to walk the fail chain for output.
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
@@ -0,0 +1,96 @@
+from typing import Dict, List, Tuple
+
+# Bump when phrases are edited by hand; the compiled version also fingerprints the content.
+LEXICON_REVISION = "2026.10"
+
+# NLU fast classifier tiers.
+NLU_HIGH = [
+    "kill myself",
+    "suicide",
+    "end my life",
+    "hurt myself",
+    "hurt someone",
+    "kill them",
+]
+
+NLU_MEDIUM = [
+    "hopeless",
+    "can't go on",
+    "no reason to live",
+    "worthless",
+]
+
+NLU_LOW = [
+    "stressed",
+    "anxious",
+    "sad",
+    "tired",
+]
+
+# Semantic judge tiers; "extreme" marks immediacy and only escalates high intent.
+SEMANTIC_EXTREME = [
+    "tonight",
+    "right now",
+    "already prepared",
+    "have a plan",
+]
+
+SEMANTIC_HIGH = [
+    "i want to die",
+    "i will kill myself",
+    "i want to hurt myself",
+    "i want to hurt others",
+]
+
+SEMANTIC_MEDIUM = [
+    "nothing matters",
+    "can't handle this",
+    "i am breaking down",
+]
+
+# Journal entry risk signals.
+JOURNAL_HIGH = ["kill myself", "end my life", "suicide", "self-harm"]
+JOURNAL_MEDIUM = ["hopeless", "can't go on", "worthless"]
+
+# zh-CN tiers. Written in simplified Chinese; traditional input is folded before matching.
+ZH_NLU_HIGH = ["自杀", "想死", "不想活", "结束生命", "结束自己的生命", "伤害自己", "自残", "割腕", "杀了他们"]
+ZH_NLU_MEDIUM = ["绝望", "撑不下去", "活着没意义", "没有活下去的理由", "一无是处", "毫无价值"]
+ZH_NLU_LOW = ["压力大", "焦虑", "难过", "伤心", "好累", "疲惫"]
+ZH_SEMANTIC_EXTREME = ["今晚", "现在就", "已经准备好", "已经计划好", "有计划"]
+ZH_SEMANTIC_HIGH = ["我想死", "我要自杀", "我不想活了", "我想伤害自己", "我想伤害别人"]
+ZH_SEMANTIC_MEDIUM = ["什么都不重要", "受不了了", "我快崩溃了"]
+ZH_JOURNAL_HIGH = ["自杀", "想死", "结束生命", "自残", "伤害自己"]
+ZH_JOURNAL_MEDIUM = ["绝望", "撑不下去", "毫无价值"]
+
+BASE_LOCALE = "en-US"
+
+# (group, tier) -> phrases, in the precedence order each caller reports them.
+EN_US_LEXICON: Dict[Tuple[str, str], List[str]] = {
+    ("nlu", "high"): NLU_HIGH,
+    ("nlu", "medium"): NLU_MEDIUM,
+    ("nlu", "low"): NLU_LOW,
+    ("semantic", "extreme"): SEMANTIC_EXTREME,
+    ("semantic", "high"): SEMANTIC_HIGH,
+    ("semantic", "medium"): SEMANTIC_MEDIUM,
+    ("journal", "high"): JOURNAL_HIGH,
+    ("journal", "medium"): JOURNAL_MEDIUM,
+}
+
+ZH_CN_LEXICON: Dict[Tuple[str, str], List[str]] = {
+    ("nlu", "high"): ZH_NLU_HIGH,
+    ("nlu", "medium"): ZH_NLU_MEDIUM,
+    ("nlu", "low"): ZH_NLU_LOW,
+    ("semantic", "extreme"): ZH_SEMANTIC_EXTREME,
+    ("semantic", "high"): ZH_SEMANTIC_HIGH,
+    ("semantic", "medium"): ZH_SEMANTIC_MEDIUM,
+    ("journal", "high"): ZH_JOURNAL_HIGH,
+    ("journal", "medium"): ZH_JOURNAL_MEDIUM,
+}
+
+# Every locale is matched on top of the base locale, so English phrases are
+# still caught in messages from users with another locale. High and extreme
+# tiers of every locale are matched for all users (see compiled.CRISIS_TIERS).
+LOCALE_LEXICONS: Dict[str, Dict[Tuple[str, str], List[str]]] = {
+    "en-US": EN_US_LEXICON,
+    "zh-CN": ZH_CN_LEXICON,
+}
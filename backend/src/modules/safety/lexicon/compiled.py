@@ -0,0 +1,168 @@
+import functools
+import hashlib
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from modules.safety.lexicon.automaton import PatternAutomaton
+from modules.safety.lexicon.catalog import BASE_LOCALE, LEXICON_REVISION, LOCALE_LEXICONS
+from modules.safety.lexicon.normalize import normalize_text
+
+LexiconTiers = Mapping[Tuple[str, str], Sequence[str]]
+
+# Crisis phrases are matched in every locale: a user's locale setting says
+# little about the language a crisis message is written in.
+CRISIS_TIERS = ("high", "extreme")
+
+
+@dataclass(frozen=True)
+class LexiconEntry:
+    phrase: str
+    group: str
+    tier: str
+    rank: int
+
+
+class LexiconScan:
+    """Every lexicon entry found in one message, grouped by (group, tier)."""
+
+    def __init__(self, hits: Dict[Tuple[str, str], List[LexiconEntry]]) -> None:
+        self._hits = hits
+
+    def has(self, group: str, tier: str) -> bool:
+        return (group, tier) in self._hits
+
+    def first(self, group: str, tier: str) -> Optional[str]:
+        """The matched phrase listed earliest in its tier, mirroring the old sequential scans."""
+        entries = self._hits.get((group, tier))
+        if not entries:
+            return None
+        return min(entries, key=lambda entry: entry.rank).phrase
+
+    def phrases(self, group: str, tier: str) -> List[str]:
+        return [entry.phrase for entry in sorted(self._hits.get((group, tier), ()), key=lambda entry: entry.rank)]
+
+
+class CompiledLexicon:
+    """All safety phrases of one locale, from every caller, compiled into one shared automaton."""
+
+    def __init__(
+        self,
+        tiers: LexiconTiers,
+        revision: str = LEXICON_REVISION,
+        locale: str = BASE_LOCALE,
+    ) -> None:
+        self._locale = locale
+        entries_by_phrase: Dict[str, List[LexiconEntry]] = {}
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update(locale.encode("utf-8"))
+        for (group, tier), phrases in tiers.items():
+            digest.update(f"{group}\x1f{tier}\x1f".encode("utf-8"))
+            for rank, phrase in enumerate(phrases):
+                normalized = normalize_text(phrase)
+                if not normalized:
+                    continue
+                digest.update(normalized.encode("utf-8"))
+                digest.update(b"\x1e")
+                entries_by_phrase.setdefault(normalized, []).append(LexiconEntry(normalized, group, tier, rank))
+
+        self._automaton = PatternAutomaton(list(entries_by_phrase))
+        self._entries: Tuple[Tuple[LexiconEntry, ...], ...] = tuple(
+            tuple(entries_by_phrase[phrase]) for phrase in self._automaton.patterns
+        )
+        self._version = f"{revision}-{digest.hexdigest()}"
+
+    @property
+    def version(self) -> str:
+        return self._version
+
+    @property
+    def locale(self) -> str:
+        return self._locale
+
+    @property
+    def size(self) -> int:
+        return len(self._entries)
+
+    def scan(self, text: str) -> LexiconScan:
+        hits: Dict[Tuple[str, str], List[LexiconEntry]] = {}
+        for pattern_id in self._automaton.search(normalize_text(text)):
+            for entry in self._entries[pattern_id]:
+                hits.setdefault((entry.group, entry.tier), []).append(entry)
+        return LexiconScan(hits)
+
+
+class LocaleLexicons:
+    """One precompiled lexicon per locale, each layered on the base locale's phrases.
+
+    Every lexicon also carries the ``CRISIS_TIERS`` phrases of all locales, so
+    a crisis message is caught whatever the user's locale; lower tiers stay
+    locale-specific. Locales resolve exactly, then by language (``zh-TW`` uses
+    ``zh-CN``), then fall back to the base locale.
+    """
+
+    def __init__(
+        self,
+        catalog: Mapping[str, LexiconTiers] = LOCALE_LEXICONS,
+        base_locale: str = BASE_LOCALE,
+        revision: str = LEXICON_REVISION,
+    ) -> None:
+        base = catalog.get(base_locale, {})
+        crisis: Dict[Tuple[str, str], List[str]] = {}
+        for tiers in catalog.values():
+            crisis = _layer(crisis, {key: phrases for key, phrases in tiers.items() if key[1] in CRISIS_TIERS})
+        self._base_locale = base_locale
+        self._lexicons: Dict[str, CompiledLexicon] = {
+            locale: CompiledLexicon(
+                _layer(_layer(base, tiers) if locale != base_locale else base, crisis), revision, locale
+            )
+            for locale, tiers in catalog.items()
+        }
+        if base_locale not in self._lexicons:
+            self._lexicons[base_locale] = CompiledLexicon(_layer(base, crisis), revision, base_locale)
+        self._by_language: Dict[str, str] = {}
+        for locale in self._lexicons:
+            self._by_language.setdefault(_language(locale), locale)
+        self._by_language[_language(base_locale)] = base_locale
+        digest = hashlib.blake2b(digest_size=8)
+        for locale in sorted(self._lexicons):
+            digest.update(self._lexicons[locale].version.encode("utf-8"))
+        self._version = f"{revision}-{digest.hexdigest()}"
+
+    @property
+    def version(self) -> str:
+        return self._version
+
+    @property
+    def locales(self) -> Tuple[str, ...]:
+        return tuple(sorted(self._lexicons))
+
+    def resolve_locale(self, locale: Optional[str]) -> str:
+        normalized = str(locale or "").strip().replace("_", "-")
+        for candidate in self._lexicons:
+            if candidate.lower() == normalized.lower():
+                return candidate
+        return self._by_language.get(_language(normalized), self._base_locale)
+
+    def for_locale(self, locale: Optional[str]) -> CompiledLexicon:
+        return self._lexicons[self.resolve_locale(locale)]
+
+
+def _language(locale: str) -> str:
+    return locale.split("-", 1)[0].lower()
+
+
+def _layer(base: LexiconTiers, extra: LexiconTiers) -> Dict[Tuple[str, str], List[str]]:
+    layered = {key: list(phrases) for key, phrases in base.items()}
+    for key, phrases in extra.items():
+        merged = layered.setdefault(key, [])
+        merged.extend(phrase for phrase in phrases if phrase not in merged)
+    return layered
+
+
+@functools.lru_cache(maxsize=1)
+def get_locale_lexicons() -> LocaleLexicons:
+    return LocaleLexicons()
+
+
+def get_safety_lexicon(locale: Optional[str] = None) -> CompiledLexicon:
+    return get_locale_lexicons().for_locale(locale or BASE_LOCALE)
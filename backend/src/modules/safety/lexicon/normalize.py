@@ -0,0 +1,19 @@
+import unicodedata
+
+# Traditional -> simplified forms for the characters used by the zh lexicon and
+# common in distress messages. Text and phrases are both folded, so either
+# script matches either spelling.
+_TRADITIONAL = "殺傷結絕沒義處價壓慮過憊現經準備劃計別殘撐們麼潰無難點還為個時後體覺說會這讓對從開關應該樣聽裡來嗎喪鬱憂懼煩惱淚淒孤獨"
+_SIMPLIFIED = "杀伤结绝没义处价压虑过惫现经准备划计别残撑们么溃无难点还为个时后体觉说会这让对从开关应该样听里来吗丧郁忧惧烦恼泪凄孤独"
+TRADITIONAL_TO_SIMPLIFIED = str.maketrans(_TRADITIONAL, _SIMPLIFIED)
+
+
+def normalize_text(text: str) -> str:
+    """Fold text for lexicon matching.
+
+    NFKC turns full-width letters, digits, punctuation and the ideographic
+    space into their half-width forms; casefold handles case; traditional
+    Chinese characters map to simplified ones; whitespace runs collapse.
+    """
+    folded = unicodedata.normalize("NFKC", text).casefold().translate(TRADITIONAL_TO_SIMPLIFIED)
+    return " ".join(folded.split())
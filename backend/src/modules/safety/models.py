@@ -24,7 +24,7 @@ class SafetyDetectionResult:
         }
 
 
-@dataclass
+@dataclass(frozen=True)
 class SafetyResponseAction:
     mode: str
     pause_topic: bool
@@ -1,65 +1,33 @@
 import time
+from typing import Optional
 
+from modules.safety.lexicon.compiled import LocaleLexicons, get_locale_lexicons
 from modules.safety.models import SafetyDetectionResult
 from modules.triage.models import RiskLevel
 
-
-HIGH_KEYWORDS = [
-    "kill myself",
-    "suicide",
-    "end my life",
-    "hurt myself",
-    "hurt someone",
-    "kill them",
-]
-
-MEDIUM_KEYWORDS = [
-    "hopeless",
-    "can't go on",
-    "no reason to live",
-    "worthless",
-]
-
-LOW_KEYWORDS = [
-    "stressed",
-    "anxious",
-    "sad",
-    "tired",
-]
+TIERS = (
+    ("high", RiskLevel.HIGH),
+    ("medium", RiskLevel.MEDIUM),
+    ("low", RiskLevel.LOW),
+)
 
 
 class NLUClassifier:
-    def classify(self, text: str) -> SafetyDetectionResult:
-        start = time.perf_counter()
-        normalized = text.lower()
-
-        for keyword in HIGH_KEYWORDS:
-            if keyword in normalized:
-                latency = (time.perf_counter() - start) * 1000
-                return SafetyDetectionResult(
-                    level=RiskLevel.HIGH,
-                    source="nlu",
-                    reasons=[f"high-keyword:{keyword}"],
-                    nlu_latency_ms=latency,
-                )
+    def __init__(self, lexicons: Optional[LocaleLexicons] = None) -> None:
+        self._lexicons = lexicons or get_locale_lexicons()
 
-        for keyword in MEDIUM_KEYWORDS:
-            if keyword in normalized:
-                latency = (time.perf_counter() - start) * 1000
-                return SafetyDetectionResult(
-                    level=RiskLevel.MEDIUM,
-                    source="nlu",
-                    reasons=[f"medium-keyword:{keyword}"],
-                    nlu_latency_ms=latency,
-                )
+    def classify(self, text: str, locale: Optional[str] = None) -> SafetyDetectionResult:
+        start = time.perf_counter()
+        scan = self._lexicons.for_locale(locale).scan(text)
 
-        for keyword in LOW_KEYWORDS:
-            if keyword in normalized:
+        for tier, level in TIERS:
+            keyword = scan.first("nlu", tier)
+            if keyword is not None:
                 latency = (time.perf_counter() - start) * 1000
                 return SafetyDetectionResult(
-                    level=RiskLevel.LOW,
+                    level=level,
                     source="nlu",
-                    reasons=[f"low-keyword:{keyword}"],
+                    reasons=[f"{tier}-keyword:{keyword}"],
                     nlu_latency_ms=latency,
                 )
 
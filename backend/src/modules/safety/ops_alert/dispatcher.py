@@ -0,0 +1,257 @@
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from typing import Callable, Deque, Dict, Optional, Protocol, Tuple
+
+from modules.observability.sketch import LatencySketch
+from modules.safety.config import OpsAlertDispatchConfig, load_ops_alert_dispatch_config
+from modules.safety.ops_alert.models import OpsAlertRecord
+from modules.storage.in_memory import InMemoryStore
+
+_DISPATCHERS: Dict[Tuple[int, int, int, int, int], "OpsAlertDispatcher"] = {}
+_DISPATCHERS_LOCK = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+
+class OpsAlertSink(Protocol):
+    def deliver(self, alert: OpsAlertRecord) -> None:
+        ...
+
+
+class ToolEventAlertSink:
+    """Writes the alert to the user's tool events, where ops tooling already reads it."""
+
+    def __init__(self, store: InMemoryStore) -> None:
+        self._store = store
+
+    def deliver(self, alert: OpsAlertRecord) -> None:
+        self._store.save_tool_event(
+            alert.user_id,
+            {
+                "tool": "ops-alert",
+                "alert_id": alert.alert_id,
+                "user_id": alert.user_id,
+                "risk_level": alert.risk_level,
+                "reason": alert.reason,
+                "created_at": alert.created_at.isoformat(),
+            },
+        )
+
+
+class OpsAlertDispatcher:
+    """In-process outbox for ops alerts.
+
+    ``submit`` dedupes per (user, level, window), persists the first alert of
+    each window as ``pending`` and queues it; a background worker delivers it
+    to the sink with retries and records the outcome. The request path never
+    waits on the sink. Pending alerts left by a previous process are queued
+    again on construction, so every unique alert is delivered at least once.
+    """
+
+    def __init__(
+        self,
+        store: InMemoryStore,
+        sink: Optional[OpsAlertSink] = None,
+        config: Optional[OpsAlertDispatchConfig] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._store = store
+        self._sink = sink or ToolEventAlertSink(store)
+        self._config = config or load_ops_alert_dispatch_config()
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._queue: Deque[OpsAlertRecord] = deque()
+        self._recent: Dict[str, OpsAlertRecord] = {}
+        self._recent_window = -1
+        self._worker: Optional[threading.Thread] = None
+        self._in_flight = 0
+        self._latency = LatencySketch()
+        self._counters = {
+            "submitted": 0,
+            "deduplicated": 0,
+            "delivered": 0,
+            "retried": 0,
+            "failed": 0,
+            "store_errors": 0,
+        }
+        self.recover()
+
+    @property
+    def config(self) -> OpsAlertDispatchConfig:
+        return self._config
+
+    def submit(self, user_id: str, risk_level: str, reason: str) -> Tuple[OpsAlertRecord, bool]:
+        """Queue an alert; returns the outbox record and whether it was a duplicate."""
+        now = self._clock()
+        window = int(now // self._config.dedupe_window_seconds)
+        dedupe_key = f"{user_id}:{risk_level}:{window}"
+        with self._condition:
+            self._counters["submitted"] += 1
+            if window != self._recent_window:
+                self._recent = {}
+                self._recent_window = window
+            # Lookup and insert share one critical section so concurrent duplicates cannot both miss.
+            existing = self._recent.get(dedupe_key)
+            if existing is not None:
+                existing.suppressed_count += 1
+                self._counters["deduplicated"] += 1
+            else:
+                alert = OpsAlertRecord(
+                    alert_id=str(uuid.uuid4()),
+                    user_id=user_id,
+                    risk_level=risk_level,
+                    reason=reason,
+                    dedupe_key=dedupe_key,
+                    created_at=datetime.fromtimestamp(now, timezone.utc),
+                )
+                self._recent[dedupe_key] = alert
+        if existing is not None:
+            # Persist the count so the outbox reflects every suppressed duplicate.
+            self._store.save_ops_alert(existing)
+            return existing, True
+
+        # The outbox write is the delivery guarantee, so it stays on the caller's path.
+        self._store.save_ops_alert(alert)
+        self._enqueue(alert)
+        return alert, False
+
+    def recover(self) -> int:
+        """Queue alerts persisted as pending but never delivered (e.g. before a restart)."""
+        pending = self._store.list_ops_alerts(status="pending")
+        for alert in pending:
+            self._enqueue(alert)
+        return len(pending)
+
+    def retry_failed(self) -> int:
+        failed = self._store.list_ops_alerts(status="failed")
+        for alert in failed:
+            alert.status = "pending"
+            alert.attempts = 0
+            self._store.save_ops_alert(alert)
+            self._enqueue(alert)
+        return len(failed)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until the queue is drained; returns False on timeout."""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self._queue or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def snapshot(self) -> dict:
+        with self._condition:
+            return {
+                **self._counters,
+                "queued": len(self._queue),
+                "in_flight": self._in_flight,
+                "worker_running": self._worker is not None,
+                "delivery_latency_ms": self._latency.summary(),
+            }
+
+    def _enqueue(self, alert: OpsAlertRecord) -> None:
+        with self._condition:
+            self._queue.append(alert)
+            if self._worker is None:
+                self._start_worker_locked()
+            self._condition.notify_all()
+
+    def _start_worker_locked(self) -> None:
+        self._worker = threading.Thread(target=self._run, name="ops-alert-dispatch", daemon=True)
+        self._worker.start()
+
+    def _run(self) -> None:
+        try:
+            while True:
+                with self._condition:
+                    if not self._queue:
+                        self._condition.wait(self._config.worker_idle_seconds)
+                    if not self._queue:
+                        self._worker = None
+                        return
+                    alert = self._queue.popleft()
+                    self._in_flight += 1
+                try:
+                    self._deliver(alert)
+                except Exception:
+                    # Usually the outbox write failed; keep the alert queued so it is not stranded.
+                    logger.exception("ops alert %s could not be persisted; requeueing", alert.alert_id)
+                    self._count("store_errors")
+                    time.sleep(self._config.retry_backoff_ms / 1000.0)
+                    with self._condition:
+                        self._queue.append(alert)
+                finally:
+                    with self._condition:
+                        self._in_flight -= 1
+                        self._condition.notify_all()
+        finally:
+            # An unexpected exit must not leave a dead handle behind that stops _enqueue from starting workers.
+            with self._condition:
+                if self._worker is threading.current_thread():
+                    self._worker = None
+                    if self._queue:
+                        self._start_worker_locked()
+                self._condition.notify_all()
+
+    def _deliver(self, alert: OpsAlertRecord) -> None:
+        if alert.status in ("delivered", "failed"):
+            # Settled earlier but the status write failed; only persist it, do not page again.
+            self._store.save_ops_alert(alert)
+            return
+        while True:
+            alert.attempts += 1
+            try:
+                self._sink.deliver(alert)
+            except Exception as error:
+                alert.last_error = str(error)
+                if alert.attempts >= self._config.max_attempts:
+                    alert.status = "failed"
+                    self._count("failed")
+                    self._store.save_ops_alert(alert)
+                    return
+                self._count("retried")
+                time.sleep(self._config.retry_backoff_ms / 1000.0 * 2 ** (alert.attempts - 1))
+                continue
+            break
+
+        delivered_at = datetime.fromtimestamp(self._clock(), timezone.utc)
+        alert.status = "delivered"
+        alert.delivered_at = delivered_at
+        alert.delivery_latency_ms = round(max(0.0, (delivered_at - alert.created_at).total_seconds() * 1000), 3)
+        alert.last_error = None
+        with self._condition:
+            self._counters["delivered"] += 1
+            self._latency.add(alert.delivery_latency_ms)
+        self._store.save_ops_alert(alert)
+
+    def _count(self, name: str) -> None:
+        with self._condition:
+            self._counters[name] += 1
+
+
+def get_shared_ops_alert_dispatcher(
+    store: InMemoryStore,
+    config: Optional[OpsAlertDispatchConfig] = None,
+) -> OpsAlertDispatcher:
+    """One dispatcher per store and config, so dedupe windows span every caller."""
+    resolved = config or load_ops_alert_dispatch_config()
+    key = (
+        id(store),
+        resolved.dedupe_window_seconds,
+        resolved.max_attempts,
+        resolved.retry_backoff_ms,
+        resolved.worker_idle_seconds,
+    )
+    with _DISPATCHERS_LOCK:
+        dispatcher = _DISPATCHERS.get(key)
+        if dispatcher is None:
+            dispatcher = OpsAlertDispatcher(store, config=resolved)
+            _DISPATCHERS[key] = dispatcher
+        return dispatcher
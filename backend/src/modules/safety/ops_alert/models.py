@@ -0,0 +1,56 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass
+class OpsAlertRecord:
+    """Outbox entry for one unique ops alert; duplicates in its window only bump ``suppressed_count``."""
+
+    alert_id: str
+    user_id: str
+    risk_level: str
+    reason: str
+    dedupe_key: str
+    created_at: datetime
+    status: str = "pending"
+    attempts: int = 0
+    suppressed_count: int = 0
+    delivered_at: Optional[datetime] = None
+    delivery_latency_ms: Optional[float] = None
+    last_error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "alert_id": self.alert_id,
+            "user_id": self.user_id,
+            "risk_level": self.risk_level,
+            "reason": self.reason,
+            "dedupe_key": self.dedupe_key,
+            "created_at": self.created_at.isoformat(),
+            "status": self.status,
+            "attempts": self.attempts,
+            "suppressed_count": self.suppressed_count,
+            "delivered_at": self.delivered_at.isoformat() if self.delivered_at else None,
+            "delivery_latency_ms": self.delivery_latency_ms,
+            "last_error": self.last_error,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> "OpsAlertRecord":
+        delivered_at = payload.get("delivered_at")
+        latency = payload.get("delivery_latency_ms")
+        return cls(
+            alert_id=str(payload["alert_id"]),
+            user_id=str(payload["user_id"]),
+            risk_level=str(payload["risk_level"]),
+            reason=str(payload.get("reason", "")),
+            dedupe_key=str(payload["dedupe_key"]),
+            created_at=datetime.fromisoformat(str(payload["created_at"])),
+            status=str(payload.get("status", "pending")),
+            attempts=int(payload.get("attempts", 0)),
+            suppressed_count=int(payload.get("suppressed_count", 0)),
+            delivered_at=datetime.fromisoformat(str(delivered_at)) if delivered_at else None,
+            delivery_latency_ms=float(latency) if latency is not None else None,
+            last_error=payload.get("last_error"),
+        )
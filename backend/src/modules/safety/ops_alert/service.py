@@ -1,20 +1,27 @@
-from datetime import datetime, timezone
+from typing import Optional
 
+from modules.safety.ops_alert.dispatcher import OpsAlertDispatcher, get_shared_ops_alert_dispatcher
 from modules.storage.in_memory import InMemoryStore
 from modules.triage.models import RiskLevel
 
 
 class OpsAlertService:
-    def __init__(self, store: InMemoryStore) -> None:
+    def __init__(self, store: InMemoryStore, dispatcher: Optional[OpsAlertDispatcher] = None) -> None:
         self._store = store
+        self._dispatcher = dispatcher or get_shared_ops_alert_dispatcher(store)
 
     def notify(self, user_id: str, level: RiskLevel, reason: str) -> dict:
-        event = {
+        alert, deduplicated = self._dispatcher.submit(
+            user_id=user_id,
+            risk_level=level.name.lower(),
+            reason=reason,
+        )
+        return {
             "tool": "ops-alert",
-            "user_id": user_id,
-            "risk_level": level.name.lower(),
+            "alert_id": alert.alert_id,
+            "user_id": alert.user_id,
+            "risk_level": alert.risk_level,
             "reason": reason,
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": alert.created_at.isoformat(),
+            "delivery": "deduplicated" if deduplicated else "queued",
         }
-        self._store.save_tool_event(user_id, event)
-        return event
@@ -0,0 +1,82 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from modules.safety.emergency.service import EmergencyService
+from modules.safety.hotline.catalog import HOTLINE_BY_LOCALE, get_hotline_catalog
+from modules.safety.hotline.resolver import HotlineResolver
+from modules.safety.models import SafetyResponseAction
+from modules.safety.policy.engine import SafetyPolicyEngine
+from modules.triage.models import RiskLevel
+
+# Locales outside the hotline directory share the entries built for this key.
+FALLBACK_LOCALE = "*"
+
+
+@dataclass(frozen=True)
+class SafetyDecision:
+    """Everything the interruption path derives from (level, locale, legal_policy_enabled).
+
+    ``action_payload`` and ``hotline`` are prebuilt response fragments shared
+    by every lookup that hits this entry, so they are read-only mappings;
+    copy them with ``dict()`` before handing them to a caller.
+    """
+
+    action: SafetyResponseAction
+    action_payload: Mapping[str, Any]
+    hotline: Optional[Mapping[str, Any]]
+    notify_ops: bool
+    emergency_contact_notified: bool
+
+
+class SafetyDecisionTable:
+    """Policy, hotline and emergency outcomes precomputed for every key.
+
+    The inputs are pure functions of the risk level, the user's locale and
+    whether the legal emergency-contact policy is on, so the table is built
+    once from ``SafetyPolicyEngine``, ``HotlineResolver`` and
+    ``EmergencyService`` and the request path becomes a single dict lookup.
+    """
+
+    def __init__(
+        self,
+        policy: Optional[SafetyPolicyEngine] = None,
+        hotline: Optional[HotlineResolver] = None,
+        emergency: Optional[EmergencyService] = None,
+    ) -> None:
+        policy = policy or SafetyPolicyEngine()
+        hotline = hotline or HotlineResolver()
+        emergency = emergency or EmergencyService()
+        self.hotline_cache_version = get_hotline_catalog().version
+        self._entries: Dict[Tuple[RiskLevel, str, bool], SafetyDecision] = {}
+        for level in RiskLevel:
+            action = policy.resolve(level)
+            action_payload = MappingProxyType(action.to_dict())
+            for locale in (*HOTLINE_BY_LOCALE, FALLBACK_LOCALE):
+                hotline_entry = MappingProxyType(dict(hotline.resolve(locale))) if action.show_hotline else None
+                for legal_policy_enabled in (False, True):
+                    self._entries[(level, locale, legal_policy_enabled)] = SafetyDecision(
+                        action=action,
+                        action_payload=action_payload,
+                        hotline=hotline_entry,
+                        notify_ops=action.notify_ops,
+                        emergency_contact_notified=emergency.should_notify_emergency_contact(
+                            level=level,
+                            legal_policy_enabled=legal_policy_enabled,
+                        ),
+                    )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, level: RiskLevel, locale: str, legal_policy_enabled: bool = False) -> SafetyDecision:
+        entry = self._entries.get((level, locale, legal_policy_enabled))
+        if entry is None:
+            entry = self._entries[(level, FALLBACK_LOCALE, bool(legal_policy_enabled))]
+        return entry
+
+
+@lru_cache(maxsize=1)
+def get_safety_decision_table() -> SafetyDecisionTable:
+    return SafetyDecisionTable()
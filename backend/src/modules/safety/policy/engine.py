@@ -1,52 +1,54 @@
+from typing import Dict
+
 from modules.safety.models import SafetyResponseAction
 from modules.triage.models import RiskLevel
 
+_ACTIONS: Dict[RiskLevel, SafetyResponseAction] = {
+    RiskLevel.LOW: SafetyResponseAction(
+        mode="monitor",
+        pause_topic=False,
+        stop_coaching=False,
+        show_hotline=False,
+        notify_ops=False,
+        notify_emergency_contact=False,
+        suggested_channel="green",
+        message="I hear you. We can keep exploring this safely.",
+    ),
+    RiskLevel.MEDIUM: SafetyResponseAction(
+        mode="safety_pause",
+        pause_topic=True,
+        stop_coaching=False,
+        show_hotline=True,
+        notify_ops=False,
+        notify_emergency_contact=False,
+        suggested_channel="yellow",
+        message="Let's pause and focus on your safety first, with support resources nearby.",
+    ),
+    RiskLevel.HIGH: SafetyResponseAction(
+        mode="crisis_stop",
+        pause_topic=True,
+        stop_coaching=True,
+        show_hotline=True,
+        notify_ops=True,
+        notify_emergency_contact=False,
+        suggested_channel="red",
+        message="I need to stop normal coaching now and connect you to urgent support.",
+    ),
+}
 
-class SafetyPolicyEngine:
-    def resolve(self, level: RiskLevel) -> SafetyResponseAction:
-        if level == RiskLevel.LOW:
-            return SafetyResponseAction(
-                mode="monitor",
-                pause_topic=False,
-                stop_coaching=False,
-                show_hotline=False,
-                notify_ops=False,
-                notify_emergency_contact=False,
-                suggested_channel="green",
-                message="I hear you. We can keep exploring this safely.",
-            )
-
-        if level == RiskLevel.MEDIUM:
-            return SafetyResponseAction(
-                mode="safety_pause",
-                pause_topic=True,
-                stop_coaching=False,
-                show_hotline=True,
-                notify_ops=False,
-                notify_emergency_contact=False,
-                suggested_channel="yellow",
-                message="Let's pause and focus on your safety first, with support resources nearby.",
-            )
+_EXTREME_ACTION = SafetyResponseAction(
+    mode="extreme_emergency",
+    pause_topic=True,
+    stop_coaching=True,
+    show_hotline=True,
+    notify_ops=True,
+    notify_emergency_contact=True,
+    suggested_channel="red",
+    message="This appears to be an immediate danger situation. Emergency support is required now.",
+)
 
-        if level == RiskLevel.HIGH:
-            return SafetyResponseAction(
-                mode="crisis_stop",
-                pause_topic=True,
-                stop_coaching=True,
-                show_hotline=True,
-                notify_ops=True,
-                notify_emergency_contact=False,
-                suggested_channel="red",
-                message="I need to stop normal coaching now and connect you to urgent support.",
-            )
 
-        return SafetyResponseAction(
-            mode="extreme_emergency",
-            pause_topic=True,
-            stop_coaching=True,
-            show_hotline=True,
-            notify_ops=True,
-            notify_emergency_contact=True,
-            suggested_channel="red",
-            message="This appears to be an immediate danger situation. Emergency support is required now.",
-        )
+class SafetyPolicyEngine:
+    def resolve(self, level: RiskLevel) -> SafetyResponseAction:
+        # Actions are frozen, so every caller shares the same instance per level.
+        return _ACTIONS.get(level, _EXTREME_ACTION)
@@ -1,69 +1,33 @@
 import time
+from typing import Optional
 
+from modules.safety.lexicon.compiled import LocaleLexicons, get_locale_lexicons
 from modules.safety.models import SafetyDetectionResult
 from modules.triage.models import RiskLevel
 
 
-EXTREME_PATTERNS = [
-    "tonight",
-    "right now",
-    "already prepared",
-    "have a plan",
-]
-
-HIGH_PATTERNS = [
-    "i want to die",
-    "i will kill myself",
-    "i want to hurt myself",
-    "i want to hurt others",
-]
-
-MEDIUM_PATTERNS = [
-    "nothing matters",
-    "can't handle this",
-    "i am breaking down",
-]
-
-
 class SemanticRiskEvaluator:
-    def evaluate(self, text: str) -> SafetyDetectionResult:
+    def __init__(self, lexicons: Optional[LocaleLexicons] = None) -> None:
+        self._lexicons = lexicons or get_locale_lexicons()
+
+    def evaluate(self, text: str, locale: Optional[str] = None) -> SafetyDetectionResult:
         start = time.perf_counter()
-        normalized = text.lower()
+        scan = self._lexicons.for_locale(locale).scan(text)
 
         # A simple heuristic evaluator used in prototype mode.
-        if any(signal in normalized for signal in HIGH_PATTERNS) and any(
-            marker in normalized for marker in EXTREME_PATTERNS
-        ):
-            latency = (time.perf_counter() - start) * 1000
-            return SafetyDetectionResult(
-                level=RiskLevel.EXTREME,
-                source="semantic",
-                reasons=["high-intent-with-immediacy"],
-                semantic_latency_ms=latency,
-            )
-
-        if any(signal in normalized for signal in HIGH_PATTERNS):
-            latency = (time.perf_counter() - start) * 1000
-            return SafetyDetectionResult(
-                level=RiskLevel.HIGH,
-                source="semantic",
-                reasons=["high-intent"],
-                semantic_latency_ms=latency,
-            )
-
-        if any(signal in normalized for signal in MEDIUM_PATTERNS):
-            latency = (time.perf_counter() - start) * 1000
-            return SafetyDetectionResult(
-                level=RiskLevel.MEDIUM,
-                source="semantic",
-                reasons=["moderate-distress"],
-                semantic_latency_ms=latency,
-            )
+        if scan.has("semantic", "high") and scan.has("semantic", "extreme"):
+            level, reason = RiskLevel.EXTREME, "high-intent-with-immediacy"
+        elif scan.has("semantic", "high"):
+            level, reason = RiskLevel.HIGH, "high-intent"
+        elif scan.has("semantic", "medium"):
+            level, reason = RiskLevel.MEDIUM, "moderate-distress"
+        else:
+            level, reason = RiskLevel.LOW, "low-distress"
 
         latency = (time.perf_counter() - start) * 1000
         return SafetyDetectionResult(
-            level=RiskLevel.LOW,
+            level=level,
             source="semantic",
-            reasons=["low-distress"],
+            reasons=[reason],
             semantic_latency_ms=latency,
         )
@@ -1,15 +1,17 @@
+import asyncio
 from typing import Optional
 
 from modules.safety.detector_service import SafetyDetectorService
 from modules.safety.interruption_service import SafetyInterruptionService
+from modules.safety.slo import SafetyLatencyMonitor
 from modules.storage.in_memory import InMemoryStore
 from modules.triage.models import DialogueRiskSignal
 
 
 class SafetyRuntimeService:
-    def __init__(self, store: InMemoryStore) -> None:
-        self._detector = SafetyDetectorService(store=store)
-        self._interruption = SafetyInterruptionService(store)
+    def __init__(self, store: InMemoryStore, monitor: Optional[SafetyLatencyMonitor] = None) -> None:
+        self._detector = SafetyDetectorService(store=store, monitor=monitor)
+        self._interruption = SafetyInterruptionService(store, monitor=monitor)
 
     def assess_and_respond(
         self,
@@ -19,10 +21,28 @@ class SafetyRuntimeService:
         override_signal: Optional[DialogueRiskSignal] = None,
         legal_policy_enabled: bool = False,
     ) -> dict:
-        detection = self._detector.detect(text=text, override_signal=override_signal)
+        detection = self._detector.detect(text=text, override_signal=override_signal, locale=locale)
         return self._interruption.handle(
             user_id=user_id,
             locale=locale,
             detection=detection,
             legal_policy_enabled=legal_policy_enabled,
         )
+
+    async def aassess_and_respond(
+        self,
+        user_id: str,
+        locale: str,
+        text: str,
+        override_signal: Optional[DialogueRiskSignal] = None,
+        legal_policy_enabled: bool = False,
+    ) -> dict:
+        detection = await self._detector.adetect(text=text, override_signal=override_signal, locale=locale)
+        # Escalation writes to the ops-alert outbox under a lock; keep it off the event loop.
+        return await asyncio.to_thread(
+            self._interruption.handle,
+            user_id=user_id,
+            locale=locale,
+            detection=detection,
+            legal_policy_enabled=legal_policy_enabled,
+        )
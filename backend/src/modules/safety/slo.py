@@ -0,0 +1,145 @@
+import threading
+from typing import Dict, Optional
+
+from modules.model_gateway.models import ModelTaskType
+from modules.observability.sketch import LatencySketch
+from modules.safety.config import SafetySLOConfig, load_safety_slo_config
+from modules.safety.models import SafetyDetectionResult
+
+_STAGE_BY_TASK = {
+    ModelTaskType.SAFETY_NLU_FAST: "nlu",
+    ModelTaskType.SAFETY_SEMANTIC_JUDGE: "semantic",
+}
+
+_SHARED_MONITOR: Optional["SafetyLatencyMonitor"] = None
+_SHARED_MONITOR_LOCK = threading.Lock()
+
+
+class _StageStats:
+    def __init__(self, budget_ms: int) -> None:
+        self.budget_ms = budget_ms
+        self.latency = LatencySketch()
+        self.violations = 0
+        self.timeouts = 0
+
+    def to_summary(self) -> dict:
+        latency = self.latency
+        count = latency.count
+        return {
+            "budget_ms": self.budget_ms,
+            "count": count,
+            "mean_ms": round(latency.mean, 3),
+            "p50_ms": round(latency.quantile(0.5), 3),
+            "p90_ms": round(latency.quantile(0.9), 3),
+            "p99_ms": round(latency.quantile(0.99), 3),
+            "p999_ms": round(latency.quantile(0.999), 3),
+            "max_ms": round(latency.max, 3),
+            "budget_violations": self.violations,
+            "timeouts": self.timeouts,
+            "violation_rate": round(self.violations / count, 4) if count else 0.0,
+        }
+
+
+class SafetyLatencyMonitor:
+    """Live per-stage latency histograms for the safety path, checked against SLO budgets.
+
+    ``nlu`` and ``semantic`` are the model stages as reported by the gateway,
+    ``nlu_queue`` and ``semantic_queue`` the time each stage waited for a
+    detector worker, ``detection`` the detector's wall-clock critical path,
+    and ``policy`` and ``interruption`` time ``SafetyInterruptionService.handle``.
+    A sample above its stage budget counts as a violation; a stage that hits
+    its deadline counts as a timeout and a violation but adds no sample, since
+    its real latency is unknown. For queue stages, ``timeouts`` counts stages
+    that gave up on the pool and ran on the caller.
+    """
+
+    def __init__(self, config: Optional[SafetySLOConfig] = None) -> None:
+        self._config = config or load_safety_slo_config()
+        self._lock = threading.Lock()
+        self._reset_locked()
+
+    @property
+    def config(self) -> SafetySLOConfig:
+        return self._config
+
+    def observe(self, stage: str, latency_ms: float) -> None:
+        with self._lock:
+            self._add(self._stages[stage], latency_ms)
+
+    def record_detection(self, result: SafetyDetectionResult, elapsed_ms: float) -> None:
+        with self._lock:
+            self._detections += 1
+            self._add(self._stages["detection"], elapsed_ms)
+            if result.fail_closed:
+                return
+            self._add(self._stages["nlu"], result.nlu_latency_ms)
+            if result.source == "nlu+semantic":
+                self._add(self._stages["semantic"], result.semantic_latency_ms)
+
+    def record_queue_wait(self, task_type: str, wait_ms: float, fell_back: bool) -> None:
+        stage = _STAGE_BY_TASK.get(task_type)
+        if stage is None:
+            return
+        with self._lock:
+            stats = self._stages[f"{stage}_queue"]
+            self._add(stats, wait_ms)
+            if fell_back:
+                stats.timeouts += 1
+
+    def record_fail_closed(self, error: Exception) -> None:
+        task_type = getattr(error, "task_type", None)
+        stage = _STAGE_BY_TASK.get(task_type) if task_type is not None else None
+        with self._lock:
+            if stage is not None:
+                stats = self._stages[stage]
+                stats.timeouts += 1
+                stats.violations += 1
+                self._fail_closed["timeout"] += 1
+            else:
+                self._fail_closed["error"] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            fail_closed = sum(self._fail_closed.values())
+            return {
+                "detections": self._detections,
+                "fail_closed": {
+                    **self._fail_closed,
+                    "total": fail_closed,
+                    "rate": round(fail_closed / self._detections, 4) if self._detections else 0.0,
+                },
+                "stages": {stage: stats.to_summary() for stage, stats in self._stages.items()},
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._reset_locked()
+
+    @staticmethod
+    def _add(stats: _StageStats, latency_ms: float) -> None:
+        stats.latency.add(latency_ms)
+        if latency_ms > stats.budget_ms:
+            stats.violations += 1
+
+    def _reset_locked(self) -> None:
+        config = self._config
+        self._stages: Dict[str, _StageStats] = {
+            "nlu": _StageStats(config.nlu_budget_ms),
+            "semantic": _StageStats(config.semantic_budget_ms),
+            "nlu_queue": _StageStats(config.queue_budget_ms),
+            "semantic_queue": _StageStats(config.queue_budget_ms),
+            "detection": _StageStats(config.detection_budget_ms),
+            "policy": _StageStats(config.policy_budget_ms),
+            "interruption": _StageStats(config.interruption_budget_ms),
+        }
+        self._detections = 0
+        self._fail_closed: Dict[str, int] = {"timeout": 0, "error": 0}
+
+
+def get_shared_safety_latency_monitor() -> SafetyLatencyMonitor:
+    """The process-wide monitor every detector and interruption service reports to."""
+    global _SHARED_MONITOR
+    with _SHARED_MONITOR_LOCK:
+        if _SHARED_MONITOR is None:
+            _SHARED_MONITOR = SafetyLatencyMonitor()
+        return _SHARED_MONITOR
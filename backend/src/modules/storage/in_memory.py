@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
 from modules.admin.models import AdminSession
 from modules.assessment.models import AssessmentScoreSet, AssessmentSubmission, ReassessmentSchedule
@@ -10,7 +10,10 @@ from modules.coach.models import CoachSession
 from modules.compliance.models import ConsentRecord
 from modules.journal.models import JournalEntry
 from modules.memory.models import MemoryVectorRecord
+from modules.observability.invocation_log import InvocationGroupStats, ModelInvocationLog
 from modules.observability.models import APIAuditLogRecord, ModelInvocationRecord
+from modules.safety.backfill.models import SafetyBackfillResult, SafetyBackfillRun
+from modules.safety.ops_alert.models import OpsAlertRecord
 from modules.tests.models import TestResult
 from modules.triage.models import TriageDecision
 from modules.user.models import User
@@ -32,7 +35,10 @@ class InMemoryStore:
     memory_vectors: Dict[str, List[MemoryVectorRecord]] = field(default_factory=dict)
     journal_entries: Dict[str, List[JournalEntry]] = field(default_factory=dict)
     tool_events: Dict[str, List[dict]] = field(default_factory=dict)
-    model_invocations: List[ModelInvocationRecord] = field(default_factory=list)
+    ops_alerts: Dict[str, OpsAlertRecord] = field(default_factory=dict)
+    safety_backfill_runs: Dict[str, SafetyBackfillRun] = field(default_factory=dict)
+    safety_backfill_results: Dict[Tuple[str, str], SafetyBackfillResult] = field(default_factory=dict)
+    model_invocations: ModelInvocationLog = field(default_factory=ModelInvocationLog)
     api_audit_logs: List[APIAuditLogRecord] = field(default_factory=list)
     subscriptions: Dict[str, SubscriptionRecord] = field(default_factory=dict)
     renewal_reminders: Dict[str, List[RenewalReminderRecord]] = field(default_factory=dict)
@@ -70,18 +76,37 @@ class InMemoryStore:
     def save_memory_summary(self, user_id: str, summary: str) -> None:
         self.memory_summaries.setdefault(user_id, []).append(summary)
 
+    def replace_memory_summaries(self, user_id: str, summaries: List[str]) -> None:
+        self.memory_summaries[user_id] = list(summaries)
+
     def save_memory_vector(self, record: MemoryVectorRecord) -> None:
         self.memory_vectors.setdefault(record.user_id, []).append(record)
 
+    def replace_memory_vectors(self, user_id: str, records: List[MemoryVectorRecord]) -> None:
+        self.memory_vectors[user_id] = list(records)
+
     def save_journal_entry(self, entry: JournalEntry) -> None:
         self.journal_entries.setdefault(entry.user_id, []).append(entry)
 
     def save_tool_event(self, user_id: str, event: dict) -> None:
         self.tool_events.setdefault(user_id, []).append(event)
 
+    def save_ops_alert(self, alert: OpsAlertRecord) -> None:
+        self.ops_alerts[alert.alert_id] = alert
+
+    def save_safety_backfill_run(self, run: SafetyBackfillRun) -> None:
+        self.safety_backfill_runs[run.run_id] = run
+
+    def save_safety_backfill_results(self, results: Sequence[SafetyBackfillResult]) -> None:
+        for result in results:
+            self.safety_backfill_results[(result.run_id, result.item_key)] = result
+
     def save_model_invocation(self, record: ModelInvocationRecord) -> None:
         self.model_invocations.append(record)
 
+    def save_model_invocations(self, records: Sequence[ModelInvocationRecord]) -> None:
+        self.model_invocations.extend(records)
+
     def save_api_audit_log(self, record: APIAuditLogRecord) -> None:
         self.api_audit_logs.append(record)
 
@@ -167,12 +192,48 @@ class InMemoryStore:
     def list_memory_vectors(self, user_id: str) -> List[MemoryVectorRecord]:
         return list(self.memory_vectors.get(user_id, []))
 
+    def list_memory_user_ids(self) -> List[str]:
+        return [user_id for user_id, records in self.memory_vectors.items() if records]
+
     def list_journal_entries(self, user_id: str) -> List[JournalEntry]:
         return list(self.journal_entries.get(user_id, []))
 
     def list_tool_events(self, user_id: str) -> List[dict]:
         return list(self.tool_events.get(user_id, []))
 
+    def list_ops_alerts(self, status: Optional[str] = None) -> List[OpsAlertRecord]:
+        alerts = list(self.ops_alerts.values())
+        if status is not None:
+            alerts = [alert for alert in alerts if alert.status == status]
+        return sorted(alerts, key=lambda alert: alert.created_at)
+
+    def get_safety_backfill_run(self, run_id: str) -> Optional[SafetyBackfillRun]:
+        return self.safety_backfill_runs.get(run_id)
+
+    def list_safety_backfill_runs(self) -> List[SafetyBackfillRun]:
+        return sorted(self.safety_backfill_runs.values(), key=lambda run: run.started_at, reverse=True)
+
+    def list_safety_backfill_results(self, run_id: str) -> List[SafetyBackfillResult]:
+        return [result for (result_run_id, _), result in self.safety_backfill_results.items() if result_run_id == run_id]
+
+    def iter_journal_entries(self, since: Optional[Tuple[str, str]] = None) -> Iterator[JournalEntry]:
+        """All users' journal entries ordered by (created_at, entry_id), from ``since`` inclusive."""
+        entries = [entry for items in self.journal_entries.values() for entry in items]
+        entries.sort(key=lambda entry: (entry.created_at.isoformat(), entry.entry_id))
+        for entry in entries:
+            if since is None or (entry.created_at.isoformat(), entry.entry_id) >= tuple(since):
+                yield entry
+
+    def iter_coach_sessions(self, since: Optional[Tuple[str, str]] = None) -> Iterator[CoachSession]:
+        """All coach sessions ordered by (started_at, session_id), from ``since`` inclusive."""
+        sessions = sorted(
+            self.coach_sessions.values(),
+            key=lambda session: (session.started_at.isoformat(), session.session_id),
+        )
+        for session in sessions:
+            if since is None or (session.started_at.isoformat(), session.session_id) >= tuple(since):
+                yield session
+
     def get_subscription(self, user_id: str) -> Optional[SubscriptionRecord]:
         return self.subscriptions.get(user_id)
 
@@ -188,7 +249,10 @@ class InMemoryStore:
             session.revoked = True
 
     def list_model_invocations(self) -> List[ModelInvocationRecord]:
-        return list(self.model_invocations)
+        return self.model_invocations.recent()
+
+    def model_invocation_stats(self, window_seconds: Optional[int] = None) -> Dict[Tuple[str, str], InvocationGroupStats]:
+        return self.model_invocations.group_stats(window_seconds=window_seconds)
 
     def list_api_audit_logs(self) -> List[APIAuditLogRecord]:
         return list(self.api_audit_logs)
@@ -307,6 +371,10 @@ class InMemoryStore:
 
         removed_journal_entries = len(self.journal_entries.pop(user_id, []))
         removed_tool_events = len(self.tool_events.pop(user_id, []))
+        removed_ops_alerts = 0
+        for alert_id in [alert_id for alert_id, alert in self.ops_alerts.items() if alert.user_id == user_id]:
+            self.ops_alerts.pop(alert_id, None)
+            removed_ops_alerts += 1
         removed_memory_summaries = len(self.memory_summaries.pop(user_id, []))
         removed_memory_vectors = len(self.memory_vectors.pop(user_id, []))
         removed_api_audit_logs = 0
@@ -317,6 +385,10 @@ class InMemoryStore:
             else:
                 retained_api_logs.append(record)
         self.api_audit_logs = retained_api_logs
+        removed_backfill_results = 0
+        for key in [key for key, result in self.safety_backfill_results.items() if result.user_id == user_id]:
+            self.safety_backfill_results.pop(key, None)
+            removed_backfill_results += 1
         removed_subscription = 1 if self.subscriptions.pop(user_id, None) is not None else 0
         removed_renewal_reminders = len(self.renewal_reminders.pop(user_id, []))
         removed_user = 1 if self.users.pop(user_id, None) is not None else 0
@@ -332,6 +404,8 @@ class InMemoryStore:
             "coach_sessions": removed_coach_sessions,
             "journal_entries": removed_journal_entries,
             "tool_events": removed_tool_events,
+            "ops_alerts": removed_ops_alerts,
+            "safety_backfill_results": removed_backfill_results,
             "memory_summaries": removed_memory_summaries,
             "memory_vectors": removed_memory_vectors,
             "api_audit_logs": removed_api_audit_logs,
@@ -242,6 +242,84 @@ MIGRATIONS: List[SQLiteMigration] = [
             """,
         ],
     ),
+    SQLiteMigration(
+        version=8,
+        name="model_invocation_history",
+        statements=[
+            """
+            CREATE TABLE IF NOT EXISTS model_invocations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                trace_id TEXT NOT NULL,
+                task_type TEXT NOT NULL,
+                provider TEXT NOT NULL,
+                success INTEGER NOT NULL,
+                latency_ms REAL NOT NULL,
+                queue_ms REAL NOT NULL,
+                estimated_cost_usd REAL NOT NULL,
+                user_id TEXT,
+                record_json TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_model_invocations_task_created_at
+            ON model_invocations (task_type, created_at)
+            """,
+        ],
+    ),
+    SQLiteMigration(
+        version=9,
+        name="ops_alert_outbox",
+        statements=[
+            """
+            CREATE TABLE IF NOT EXISTS ops_alerts (
+                alert_id TEXT PRIMARY KEY,
+                user_id TEXT NOT NULL,
+                risk_level TEXT NOT NULL,
+                dedupe_key TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL,
+                record_json TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_ops_alerts_status_created_at
+            ON ops_alerts (status, created_at)
+            """,
+        ],
+    ),
+    SQLiteMigration(
+        version=10,
+        name="safety_backfill",
+        statements=[
+            """
+            CREATE TABLE IF NOT EXISTS safety_backfill_runs (
+                run_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                run_json TEXT NOT NULL,
+                started_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS safety_backfill_results (
+                run_id TEXT NOT NULL,
+                item_key TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                risk_level TEXT NOT NULL,
+                record_json TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                PRIMARY KEY (run_id, item_key)
+            )
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_safety_backfill_results_user_id
+            ON safety_backfill_results (user_id)
+            """,
+        ],
+    ),
 ]
 
 
@@ -5,12 +5,14 @@ import os
 import sqlite3
 from datetime import date, datetime, timezone
 from threading import Lock
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
 from modules.admin.models import AdminSession
 from modules.assessment.models import AssessmentScoreSet, AssessmentSubmission, ReassessmentSchedule
 from modules.coach.models import CoachSession, CoachTurn
-from modules.observability.models import APIAuditLogRecord
+from modules.observability.models import APIAuditLogRecord, ModelInvocationRecord
+from modules.safety.backfill.models import SafetyBackfillResult, SafetyBackfillRun
+from modules.safety.ops_alert.models import OpsAlertRecord
 from modules.security.crypto import DataEncryptor
 from modules.storage.in_memory import InMemoryStore
 from modules.storage.migrations import apply_sqlite_migrations
@@ -22,6 +24,8 @@ from modules.user.models import User
 class SQLiteStore(InMemoryStore):
     """Hybrid storage: relational persistence for scale/test flows, memory for the rest."""
 
+    _SESSION_PAGE_SIZE = 200
+
     def __init__(self, db_path: str) -> None:
         super().__init__()
         self._db_path = db_path
@@ -29,6 +33,7 @@ class SQLiteStore(InMemoryStore):
         self._encryptor = DataEncryptor.from_env()
         self._connection = self._connect(db_path)
         self._initialize_schema()
+        self.model_invocations.set_spill(self._spill_model_invocations)
 
     @property
     def db_path(self) -> str:
@@ -1030,6 +1035,41 @@ class SQLiteStore(InMemoryStore):
 
         return hydrated
 
+    def iter_coach_sessions(self, since: Optional[Tuple[str, str]] = None) -> Iterator[CoachSession]:
+        """Page through persisted sessions by (started_at, session_id) without loading them all."""
+        cursor = tuple(since) if since is not None else None
+        inclusive = True
+        while True:
+            with self._lock:
+                if cursor is None:
+                    rows = self._connection.execute(
+                        """
+                        SELECT session_id, user_id, style_id, started_at, ended_at, active, halted_for_safety, turns_encrypted
+                        FROM coach_sessions_secure
+                        ORDER BY started_at ASC, session_id ASC
+                        LIMIT ?
+                        """,
+                        (self._SESSION_PAGE_SIZE,),
+                    ).fetchall()
+                else:
+                    comparison = ">=" if inclusive else ">"
+                    rows = self._connection.execute(
+                        f"""
+                        SELECT session_id, user_id, style_id, started_at, ended_at, active, halted_for_safety, turns_encrypted
+                        FROM coach_sessions_secure
+                        WHERE started_at > ? OR (started_at = ? AND session_id {comparison} ?)
+                        ORDER BY started_at ASC, session_id ASC
+                        LIMIT ?
+                        """,
+                        (cursor[0], cursor[0], cursor[1], self._SESSION_PAGE_SIZE),
+                    ).fetchall()
+            for row in rows:
+                yield self._hydrate_secure_coach_session(row)
+            if len(rows) < self._SESSION_PAGE_SIZE:
+                return
+            cursor = (rows[-1]["started_at"], rows[-1]["session_id"])
+            inclusive = False
+
     def _hydrate_secure_coach_session(self, row: sqlite3.Row) -> CoachSession:
         raw_turns = self._decrypt_json(row["turns_encrypted"])
         turns_payload = raw_turns if isinstance(raw_turns, list) else []
@@ -1181,6 +1221,171 @@ class SQLiteStore(InMemoryStore):
 
         return hydrated
 
+    def _spill_model_invocations(self, records: List[ModelInvocationRecord]) -> None:
+        """Persist records evicted from the in-memory invocation ring in one transaction."""
+        rows = [
+            (
+                record.trace_id,
+                record.task_type,
+                record.provider,
+                1 if record.success else 0,
+                float(record.latency_ms),
+                float(record.queue_ms),
+                float(record.estimated_cost_usd),
+                record.metadata.get("user_id"),
+                json.dumps(record.to_dict(), ensure_ascii=False),
+                record.created_at.isoformat(),
+            )
+            for record in records
+        ]
+        with self._lock:
+            self._connection.executemany(
+                """
+                INSERT INTO model_invocations (
+                    trace_id,
+                    task_type,
+                    provider,
+                    success,
+                    latency_ms,
+                    queue_ms,
+                    estimated_cost_usd,
+                    user_id,
+                    record_json,
+                    created_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+            self._connection.commit()
+
+    def save_ops_alert(self, alert: OpsAlertRecord) -> None:
+        super().save_ops_alert(alert)
+        with self._lock:
+            self._connection.execute(
+                """
+                INSERT INTO ops_alerts (
+                    alert_id,
+                    user_id,
+                    risk_level,
+                    dedupe_key,
+                    status,
+                    attempts,
+                    record_json,
+                    created_at,
+                    updated_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(alert_id) DO UPDATE SET
+                    status = excluded.status,
+                    attempts = excluded.attempts,
+                    record_json = excluded.record_json,
+                    updated_at = excluded.updated_at
+                """,
+                (
+                    alert.alert_id,
+                    alert.user_id,
+                    alert.risk_level,
+                    alert.dedupe_key,
+                    alert.status,
+                    alert.attempts,
+                    self._encrypt_json(alert.to_dict()),
+                    alert.created_at.isoformat(),
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+            self._connection.commit()
+
+    def list_ops_alerts(self, status: Optional[str] = None) -> List[OpsAlertRecord]:
+        """Read from the outbox table so alerts queued before a restart are visible."""
+        with self._lock:
+            if status is None:
+                rows = self._connection.execute(
+                    "SELECT record_json FROM ops_alerts ORDER BY created_at ASC"
+                ).fetchall()
+            else:
+                rows = self._connection.execute(
+                    "SELECT record_json FROM ops_alerts WHERE status = ? ORDER BY created_at ASC",
+                    (status,),
+                ).fetchall()
+        return [OpsAlertRecord.from_dict(self._decrypt_json(row["record_json"])) for row in rows]
+
+    def save_safety_backfill_run(self, run: SafetyBackfillRun) -> None:
+        """Runs live only in SQLite; the in-memory dicts stay empty for this store."""
+        with self._lock:
+            self._connection.execute(
+                """
+                INSERT INTO safety_backfill_runs (run_id, status, run_json, started_at, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(run_id) DO UPDATE SET
+                    status = excluded.status,
+                    run_json = excluded.run_json,
+                    updated_at = excluded.updated_at
+                """,
+                (
+                    run.run_id,
+                    run.status,
+                    json.dumps(run.to_dict(), ensure_ascii=False),
+                    run.started_at.isoformat(),
+                    run.updated_at.isoformat(),
+                ),
+            )
+            self._connection.commit()
+
+    def get_safety_backfill_run(self, run_id: str) -> Optional[SafetyBackfillRun]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT run_json FROM safety_backfill_runs WHERE run_id = ?",
+                (run_id,),
+            ).fetchone()
+        return SafetyBackfillRun.from_dict(json.loads(row["run_json"])) if row is not None else None
+
+    def list_safety_backfill_runs(self) -> List[SafetyBackfillRun]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT run_json FROM safety_backfill_runs ORDER BY started_at DESC"
+            ).fetchall()
+        return [SafetyBackfillRun.from_dict(json.loads(row["run_json"])) for row in rows]
+
+    def save_safety_backfill_results(self, results: Sequence[SafetyBackfillResult]) -> None:
+        """Upsert one checkpoint chunk of results in a single transaction.
+
+        Results are not mirrored into ``safety_backfill_results`` so a full
+        rescore does not grow process memory with the size of the history.
+        """
+        rows = [
+            (
+                result.run_id,
+                result.item_key,
+                result.user_id,
+                result.risk_level,
+                self._encrypt_json(result.to_dict()),
+                result.created_at.isoformat(),
+            )
+            for result in results
+        ]
+        with self._lock:
+            self._connection.executemany(
+                """
+                INSERT INTO safety_backfill_results (run_id, item_key, user_id, risk_level, record_json, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(run_id, item_key) DO UPDATE SET
+                    risk_level = excluded.risk_level,
+                    record_json = excluded.record_json,
+                    created_at = excluded.created_at
+                """,
+                rows,
+            )
+            self._connection.commit()
+
+    def list_safety_backfill_results(self, run_id: str) -> List[SafetyBackfillResult]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT record_json FROM safety_backfill_results WHERE run_id = ? ORDER BY rowid ASC",
+                (run_id,),
+            ).fetchall()
+        return [SafetyBackfillResult.from_dict(self._decrypt_json(row["record_json"])) for row in rows]
+
     def erase_user_data(self, user_id: str) -> Dict[str, int]:
         with self._lock:
             persisted_counts = {
@@ -1194,6 +1399,8 @@ class SQLiteStore(InMemoryStore):
                 "test_results_secure": self._count_rows("test_results_secure", user_id),
                 "coach_sessions_secure": self._count_rows("coach_sessions_secure", user_id),
                 "api_audit_logs": self._count_rows("api_audit_logs", user_id),
+                "ops_alerts": self._count_rows("ops_alerts", user_id),
+                "safety_backfill_results": self._count_rows("safety_backfill_results", user_id),
                 "user": self._count_rows("users", user_id),
             }
 
@@ -1207,6 +1414,9 @@ class SQLiteStore(InMemoryStore):
             self._connection.execute("DELETE FROM test_results_secure WHERE user_id = ?", (user_id,))
             self._connection.execute("DELETE FROM coach_sessions_secure WHERE user_id = ?", (user_id,))
             self._connection.execute("DELETE FROM api_audit_logs WHERE user_id = ?", (user_id,))
+            self._connection.execute("DELETE FROM model_invocations WHERE user_id = ?", (user_id,))
+            self._connection.execute("DELETE FROM ops_alerts WHERE user_id = ?", (user_id,))
+            self._connection.execute("DELETE FROM safety_backfill_results WHERE user_id = ?", (user_id,))
             self._connection.execute("DELETE FROM users WHERE user_id = ?", (user_id,))
             self._connection.commit()
 
@@ -1251,6 +1461,14 @@ class SQLiteStore(InMemoryStore):
                 in_memory_counts.get("api_audit_logs", 0),
                 persisted_counts["api_audit_logs"],
             ),
+            "ops_alerts": max(
+                in_memory_counts.get("ops_alerts", 0),
+                persisted_counts["ops_alerts"],
+            ),
+            "safety_backfill_results": max(
+                in_memory_counts.get("safety_backfill_results", 0),
+                persisted_counts["safety_backfill_results"],
+            ),
             "user": max(in_memory_counts.get("user", 0), persisted_counts["user"]),
         }
 
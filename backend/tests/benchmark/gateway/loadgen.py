@@ -0,0 +1,346 @@
+"""Coach chat load generator for offline gateway benchmarks.
+
+Starts the OpenAI-compatible stub (``stub_openai``) and the API in a uvicorn
+subprocess pointed at it, provisions one coach session per worker and drives
+``POST /api/coach/{session_id}/chat/stream`` (or ``/chat`` with
+``--no-stream``). Reports throughput, time-to-first-token and latency
+percentiles as JSON. Run directly:
+
+    PYTHONPATH=backend/src python -m backend.tests.benchmark.gateway.loadgen \\
+        --concurrency 16 --requests 400 --latency-p50-ms 150 --output gateway-bench.json
+
+Pass ``--target`` to benchmark an API that is already running (it must be
+configured against the stub or a real provider itself).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import httpx
+
+from backend.tests.benchmark.gateway.stub_openai import (
+    StubOpenAIServer,
+    StubProfile,
+    add_profile_arguments,
+    profile_from_args,
+)
+from backend.tests.benchmark.memory.harness import percentile
+
+BACKEND_SRC = Path(__file__).resolve().parents[3] / "src"
+FALLBACK_PROVIDER = "fallback-local-template"
+
+_MESSAGES = (
+    "Work has been busy and I feel a bit tense before meetings.",
+    "I slept badly last night and want to plan a calmer evening.",
+    "Can you help me think through a conversation with my manager?",
+    "I want to build a short breathing routine for the mornings.",
+)
+
+
+@dataclass
+class RequestSample:
+    ok: bool
+    latency_ms: float
+    ttft_ms: Optional[float] = None
+    provider: str = ""
+    error: str = ""
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+@contextmanager
+def run_api_process(stub_base_url: str, extra_env: Optional[Dict[str, str]] = None) -> Iterator[str]:
+    """Run the API in a uvicorn subprocess wired to ``stub_base_url``; yields its base URL."""
+    port = _free_port()
+    with tempfile.TemporaryDirectory(prefix="gateway-bench-") as workdir:
+        env = dict(os.environ)
+        env.update(
+            {
+                "PYTHONPATH": os.pathsep.join(filter(None, [str(BACKEND_SRC), env.get("PYTHONPATH", "")])),
+                "MINDCOACH_PROVIDER_COACH": "openai",
+                "OPENAI_API_KEY": "stub-key",
+                "OPENAI_BASE_URL": stub_base_url,
+                "MINDCOACH_OPENAI_HTTP2": "false",
+                "RATE_LIMIT_ENABLED": "false",
+                "MIMIND_DB_PATH": str(Path(workdir) / "bench.sqlite3"),
+            }
+        )
+        env.update(extra_env or {})
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "uvicorn",
+                "app:app",
+                "--app-dir",
+                str(BACKEND_SRC),
+                "--host",
+                "127.0.0.1",
+                "--port",
+                str(port),
+                "--log-level",
+                "warning",
+            ],
+            cwd=workdir,
+            env=env,
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            _wait_until_healthy(base_url, process)
+            yield base_url
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait(timeout=5)
+
+
+def _wait_until_healthy(base_url: str, process: subprocess.Popen, timeout_seconds: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout_seconds
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"API process exited with code {process.returncode} during startup")
+        try:
+            if httpx.get(f"{base_url}/healthz", timeout=1.0).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"API at {base_url} did not become healthy within {timeout_seconds:.0f}s")
+
+
+async def _provision_session(client: httpx.AsyncClient, index: int) -> str:
+    response = await client.post(
+        "/api/register",
+        json={
+            "email": f"loadgen-{index}-{time.monotonic_ns()}@example.com",
+            "locale": "en-US",
+            "policy_version": "2026.02",
+        },
+    )
+    response.raise_for_status()
+    user_id = response.json()["user_id"]
+
+    response = await client.post(
+        f"/api/assessment/{user_id}",
+        json={
+            "responses": {
+                "phq9": [0] * 9,
+                "gad7": [0] * 7,
+                "pss10": [0] * 10,
+                "cssrs": {"q1": False, "q2": False},
+            }
+        },
+    )
+    response.raise_for_status()
+
+    response = await client.post(
+        f"/api/coach/{user_id}/start",
+        json={"style_id": "warm_guide", "subscription_active": True},
+    )
+    response.raise_for_status()
+    return response.json()["session"]["session_id"]
+
+
+async def _stream_once(client: httpx.AsyncClient, session_id: str, message: str) -> RequestSample:
+    started = time.perf_counter()
+    ttft_ms: Optional[float] = None
+    provider = ""
+    event = ""
+    async with client.stream("POST", f"/api/coach/{session_id}/chat/stream", json={"user_message": message}) as response:
+        if response.status_code != 200:
+            await response.aread()
+            return RequestSample(False, (time.perf_counter() - started) * 1000, error=f"HTTP {response.status_code}")
+        async for line in response.aiter_lines():
+            if line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:") and event == "token" and ttft_ms is None:
+                ttft_ms = (time.perf_counter() - started) * 1000
+            elif line.startswith("data:") and event == "done":
+                done = json.loads(line[len("data:"):])
+                provider = str((done.get("model") or {}).get("provider", ""))
+    latency_ms = (time.perf_counter() - started) * 1000
+    return RequestSample(provider != FALLBACK_PROVIDER, latency_ms, ttft_ms, provider, "" if provider != FALLBACK_PROVIDER else "fallback")
+
+
+async def _chat_once(client: httpx.AsyncClient, session_id: str, message: str) -> RequestSample:
+    started = time.perf_counter()
+    response = await client.post(f"/api/coach/{session_id}/chat", json={"user_message": message})
+    latency_ms = (time.perf_counter() - started) * 1000
+    if response.status_code != 200:
+        return RequestSample(False, latency_ms, error=f"HTTP {response.status_code}")
+    provider = str((response.json().get("model") or {}).get("provider", ""))
+    return RequestSample(provider != FALLBACK_PROVIDER, latency_ms, None, provider, "" if provider != FALLBACK_PROVIDER else "fallback")
+
+
+async def drive_load(
+    target: str,
+    concurrency: int,
+    requests: int,
+    stream: bool = True,
+    warmup: int = 0,
+    timeout_seconds: float = 30.0,
+) -> dict:
+    """Drive ``requests`` coach turns over ``concurrency`` sessions and summarise the samples."""
+    limits = httpx.Limits(max_connections=concurrency * 2, max_keepalive_connections=concurrency * 2)
+    async with httpx.AsyncClient(base_url=target, timeout=timeout_seconds, limits=limits) as client:
+        sessions = await asyncio.gather(*(_provision_session(client, index) for index in range(concurrency)))
+        send = _stream_once if stream else _chat_once
+
+        for index in range(warmup):
+            await send(client, sessions[index % concurrency], _MESSAGES[index % len(_MESSAGES)])
+
+        queue: "asyncio.Queue[int]" = asyncio.Queue()
+        for index in range(requests):
+            queue.put_nowait(index)
+        samples: List[RequestSample] = []
+
+        async def _worker(session_id: str) -> None:
+            while True:
+                try:
+                    index = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    samples.append(await send(client, session_id, _MESSAGES[index % len(_MESSAGES)]))
+                except httpx.HTTPError as error:
+                    samples.append(RequestSample(False, 0.0, error=type(error).__name__))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(_worker(session_id) for session_id in sessions))
+        elapsed = time.perf_counter() - started
+
+    return summarize(samples, elapsed, concurrency=concurrency, stream=stream)
+
+
+def summarize(samples: Sequence[RequestSample], elapsed_seconds: float, concurrency: int, stream: bool) -> dict:
+    latencies = sorted(item.latency_ms for item in samples if item.ok)
+    ttfts = sorted(item.ttft_ms for item in samples if item.ok and item.ttft_ms is not None)
+    errors: Dict[str, int] = {}
+    for item in samples:
+        if not item.ok:
+            errors[item.error or "unknown"] = errors.get(item.error or "unknown", 0) + 1
+    ok = len(latencies)
+    return {
+        "mode": "stream" if stream else "chat",
+        "concurrency": concurrency,
+        "requests": len(samples),
+        "succeeded": ok,
+        "errors": errors,
+        "error_rate": round(1 - ok / len(samples), 4) if samples else 0.0,
+        "elapsed_seconds": round(elapsed_seconds, 3),
+        "throughput_rps": round(ok / elapsed_seconds, 3) if elapsed_seconds > 0 else 0.0,
+        "latency_ms": _percentiles(latencies),
+        "ttft_ms": _percentiles(ttfts),
+    }
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    return {f"p{pct}": round(percentile(values, pct), 3) for pct in (50, 95, 99)}
+
+
+def run_benchmark(
+    profile: StubProfile,
+    concurrency: int,
+    requests: int,
+    stream: bool = True,
+    warmup: int = 0,
+    target: str = "",
+    extra_env: Optional[Dict[str, str]] = None,
+) -> dict:
+    with ExitStack() as stack:
+        stub: Optional[StubOpenAIServer] = None
+        if not target:
+            stub = stack.enter_context(StubOpenAIServer(profile=profile))
+            target = stack.enter_context(run_api_process(stub.base_url, extra_env))
+        result = asyncio.run(drive_load(target, concurrency, requests, stream=stream, warmup=warmup))
+        gateway = httpx.get(f"{target}/api/observability/model-gateway", timeout=5.0)
+        return {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "result": result,
+            "stub": stub.stats() if stub is not None else None,
+            "gateway": gateway.json() if gateway.status_code == 200 else None,
+        }
+
+
+def compare_to_baseline(report: dict, baseline: dict, max_regression: float) -> List[str]:
+    """Return human-readable regressions of ``report`` against ``baseline``."""
+    current, before = report.get("result", {}), baseline.get("result", {})
+    regressions: List[str] = []
+    for group in ("latency_ms", "ttft_ms"):
+        for metric in ("p50", "p99"):
+            previous = float(before.get(group, {}).get(metric, 0.0))
+            value = float(current.get(group, {}).get(metric, 0.0))
+            if previous > 0 and value > previous * (1.0 + max_regression):
+                regressions.append(f"{group}.{metric} {previous} -> {value}")
+    previous_rps = float(before.get("throughput_rps", 0.0))
+    if previous_rps > 0 and float(current.get("throughput_rps", 0.0)) < previous_rps * (1.0 - max_regression):
+        regressions.append(f"throughput_rps {previous_rps} -> {current.get('throughput_rps')}")
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Coach chat load generator against a local OpenAI stub")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=8)
+    parser.add_argument("--no-stream", action="store_true", help="use the blocking chat endpoint")
+    parser.add_argument("--target", default="", help="benchmark an already running API instead of spawning one")
+    parser.add_argument("--env", action="append", default=[], help="extra KEY=VALUE for the spawned API")
+    parser.add_argument("--output", default="", help="write JSON results to this path")
+    parser.add_argument("--baseline", default="", help="fail when results regress against this JSON")
+    parser.add_argument("--max-regression", type=float, default=0.25)
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    extra_env = dict(item.split("=", 1) for item in args.env if "=" in item)
+    report = run_benchmark(
+        profile=profile_from_args(args),
+        concurrency=max(1, args.concurrency),
+        requests=max(1, args.requests),
+        stream=not args.no_stream,
+        warmup=max(0, args.warmup),
+        target=args.target,
+        extra_env=extra_env,
+    )
+    payload = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(payload)
+    else:
+        print(payload)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        regressions = compare_to_baseline(report, baseline, args.max_regression)
+        for line in regressions:
+            print(f"[REGRESSION] {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,327 @@
+"""Local OpenAI-compatible stub for offline gateway benchmarks.
+
+Serves ``POST /v1/chat/completions`` (plain and ``stream=true`` SSE) and
+``POST /v1/embeddings`` with a configurable latency distribution, error rate
+and token throughput, so ``OpenAIChatProvider`` and ``OpenAIEmbeddingProvider``
+can be exercised without network access. ``GET /stats`` returns counters.
+Run standalone:
+
+    PYTHONPATH=backend/src python -m backend.tests.benchmark.gateway.stub_openai \\
+        --port 8787 --latency-p50-ms 120 --latency-p99-ms 900 --error-rate 0.02
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from backend.tests.bootstrap import configure_import_path
+
+configure_import_path()
+
+from modules.prompt.assembly.tokens import heuristic_token_count
+
+_REPLY_WORDS = (
+    "Thank you for sharing that with me. It sounds like a lot has been building up. "
+    "Let's slow down together and notice one small thing you can do in the next hour "
+    "that would make today feel a little lighter for you."
+).split()
+
+# Z-score of the 99th percentile; turns (p50, p99) into lognormal parameters.
+_Z_P99 = 2.326
+
+
+@dataclass
+class StubProfile:
+    latency_p50_ms: float = 80.0
+    latency_p99_ms: float = 400.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    tokens_per_second: float = 200.0
+    reply_tokens: int = 24
+    embedding_dimensions: int = 256
+    prefix_cache_min_tokens: int = 1024
+    seed: int = 7
+
+    def sample_latency_ms(self, generator: random.Random) -> float:
+        p50 = max(0.0, float(self.latency_p50_ms))
+        if p50 <= 0.0:
+            return 0.0
+        p99 = max(p50, float(self.latency_p99_ms))
+        sigma = math.log(p99 / p50) / _Z_P99
+        return generator.lognormvariate(math.log(p50), sigma)
+
+    def token_interval_seconds(self) -> float:
+        return 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+
+class StubOpenAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, profile: Optional[StubProfile] = None) -> None:
+        super().__init__((host, port), _StubHandler)
+        self.profile = profile or StubProfile()
+        self._random = random.Random(self.profile.seed)
+        self._lock = threading.Lock()
+        self._seen_prefixes: Dict[str, int] = {}
+        self._thread: Optional[threading.Thread] = None
+        self.counters: Dict[str, int] = {
+            "chat_requests": 0,
+            "stream_requests": 0,
+            "embedding_requests": 0,
+            "embedded_inputs": 0,
+            "errors_injected": 0,
+        }
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "StubOpenAIServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="stub-openai", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "StubOpenAIServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"counters": dict(self.counters), "profile": asdict(self.profile)}
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def draw(self) -> Tuple[float, bool]:
+        """Sample (latency_ms, inject_error) for one request."""
+        with self._lock:
+            latency_ms = self.profile.sample_latency_ms(self._random)
+            failed = self._random.random() < self.profile.error_rate
+            if failed:
+                self.counters["errors_injected"] += 1
+            return latency_ms, failed
+
+    def cached_prompt_tokens(self, messages: List[dict]) -> int:
+        """Mimic provider prefix caching: a repeated leading system prefix is served from cache in 128-token blocks."""
+        prefix = [message.get("content", "") for message in messages if message.get("role") == "system"][:2]
+        prefix_tokens = sum(heuristic_token_count(str(item)) for item in prefix)
+        if prefix_tokens < self.profile.prefix_cache_min_tokens:
+            return 0
+        key = hashlib.blake2b("\x1e".join(map(str, prefix)).encode("utf-8"), digest_size=16).hexdigest()
+        with self._lock:
+            seen = key in self._seen_prefixes
+            self._seen_prefixes[key] = prefix_tokens
+        return (prefix_tokens // 128) * 128 if seen else 0
+
+
+def _embedding(text: str, dimensions: int) -> List[float]:
+    generator = random.Random(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest())
+    vector = [generator.gauss(0.0, 1.0) for _ in range(dimensions)]
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return [value / norm for value in vector]
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: StubOpenAIServer
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002
+        return
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path.rstrip("/") == "/stats":
+            self._send_json(200, self.server.stats())
+            return
+        self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+
+    def do_POST(self) -> None:  # noqa: N802
+        length = int(self.headers.get("Content-Length", "0"))
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"message": "invalid JSON body"}})
+            return
+
+        path = self.path.rstrip("/")
+        if path.endswith("/chat/completions"):
+            self._chat(payload)
+        elif path.endswith("/embeddings"):
+            self._embeddings(payload)
+        else:
+            self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+
+    def _chat(self, payload: dict) -> None:
+        profile = self.server.profile
+        streaming = bool(payload.get("stream"))
+        self.server.count("stream_requests" if streaming else "chat_requests")
+        latency_ms, failed = self.server.draw()
+        time.sleep(latency_ms / 1000.0)
+        if failed:
+            self._send_error(profile.error_status)
+            return
+
+        messages = payload.get("messages") or []
+        words = [_REPLY_WORDS[index % len(_REPLY_WORDS)] for index in range(max(1, profile.reply_tokens))]
+        usage = {
+            "prompt_tokens": sum(heuristic_token_count(str(item.get("content", ""))) + 4 for item in messages) + 3,
+            "completion_tokens": len(words),
+            "prompt_tokens_details": {"cached_tokens": self.server.cached_prompt_tokens(messages)},
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        response_id = f"chatcmpl-stub-{time.monotonic_ns()}"
+        model = payload.get("model", "stub-model")
+
+        if streaming:
+            include_usage = bool((payload.get("stream_options") or {}).get("include_usage"))
+            self._stream_chat(response_id, model, words, usage if include_usage else None)
+            return
+
+        time.sleep(len(words) * profile.token_interval_seconds())
+        self._send_json(
+            200,
+            {
+                "id": response_id,
+                "object": "chat.completion",
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": " ".join(words)},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": usage,
+            },
+        )
+
+    def _stream_chat(self, response_id: str, model: str, words: List[str], usage: Optional[dict]) -> None:
+        interval = self.server.profile.token_interval_seconds()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def _emit(chunk: dict) -> None:
+            self._write_chunk(f"data: {json.dumps(chunk)}\n\n")
+
+        base = {"id": response_id, "object": "chat.completion.chunk", "model": model}
+        try:
+            _emit(dict(base, choices=[{"index": 0, "delta": {"role": "assistant"}}]))
+            for index, word in enumerate(words):
+                if index:
+                    time.sleep(interval)
+                text = word if index == len(words) - 1 else f"{word} "
+                _emit(dict(base, choices=[{"index": 0, "delta": {"content": text}}]))
+            _emit(dict(base, choices=[{"index": 0, "delta": {}, "finish_reason": "stop"}]))
+            if usage is not None:
+                _emit(dict(base, choices=[], usage=usage))
+            self._write_chunk("data: [DONE]\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # The client abandoned the stream; nothing left to deliver.
+            self.close_connection = True
+
+    def _embeddings(self, payload: dict) -> None:
+        raw_input = payload.get("input")
+        inputs = [raw_input] if isinstance(raw_input, str) else [str(item) for item in (raw_input or [])]
+        self.server.count("embedding_requests")
+        self.server.count("embedded_inputs", len(inputs))
+        latency_ms, failed = self.server.draw()
+        time.sleep(latency_ms / 1000.0)
+        if failed:
+            self._send_error(self.server.profile.error_status)
+            return
+
+        dimensions = int(payload.get("dimensions") or self.server.profile.embedding_dimensions)
+        prompt_tokens = sum(heuristic_token_count(item) for item in inputs)
+        self._send_json(
+            200,
+            {
+                "object": "list",
+                "model": payload.get("model", "stub-embedding"),
+                "data": [
+                    {"object": "embedding", "index": index, "embedding": _embedding(item, dimensions)}
+                    for index, item in enumerate(inputs)
+                ],
+                "usage": {"prompt_tokens": prompt_tokens, "total_tokens": prompt_tokens},
+            },
+        )
+
+    def _send_error(self, status: int) -> None:
+        self._send_json(status, {"error": {"message": "injected stub failure", "type": "server_error"}})
+
+    def _send_json(self, status: int, body: dict) -> None:
+        encoded = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def _write_chunk(self, text: str) -> None:
+        encoded = text.encode("utf-8")
+        self.wfile.write(f"{len(encoded):x}\r\n".encode("ascii") + encoded + b"\r\n")
+        self.wfile.flush()
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = StubProfile()
+    parser.add_argument("--latency-p50-ms", type=float, default=defaults.latency_p50_ms)
+    parser.add_argument("--latency-p99-ms", type=float, default=defaults.latency_p99_ms)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate)
+    parser.add_argument("--error-status", type=int, default=defaults.error_status)
+    parser.add_argument("--tokens-per-second", type=float, default=defaults.tokens_per_second)
+    parser.add_argument("--reply-tokens", type=int, default=defaults.reply_tokens)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def profile_from_args(args: argparse.Namespace) -> StubProfile:
+    return StubProfile(
+        latency_p50_ms=args.latency_p50_ms,
+        latency_p99_ms=args.latency_p99_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        tokens_per_second=args.tokens_per_second,
+        reply_tokens=args.reply_tokens,
+        seed=args.seed,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="OpenAI-compatible stub server for offline benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = StubOpenAIServer(host=args.host, port=args.port, profile=profile_from_args(args))
+    print(f"stub OpenAI API listening on {server.base_url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,113 @@
+import asyncio
+import math
+import random
+import unittest
+
+import httpx
+
+from backend.tests.bootstrap import configure_import_path
+
+configure_import_path()
+
+from modules.memory.config import MemoryRetrievalConfig
+from modules.memory.providers.openai_embedding import OpenAIEmbeddingProvider
+from modules.model_gateway.config import ModelGatewayRoutingConfig
+from modules.model_gateway.http_client import PooledHTTPClients
+from modules.model_gateway.models import ModelGatewayRequest, ModelTaskType
+from modules.model_gateway.providers.openai_chat import OpenAIChatProvider
+
+from backend.tests.benchmark.gateway.loadgen import compare_to_baseline, run_benchmark
+from backend.tests.benchmark.gateway.stub_openai import StubOpenAIServer, StubProfile
+
+FAST = StubProfile(latency_p50_ms=5, latency_p99_ms=20, tokens_per_second=2000, reply_tokens=12)
+
+
+def _chat_request() -> ModelGatewayRequest:
+    return ModelGatewayRequest(
+        task_type=ModelTaskType.COACH_GENERATION,
+        text="I feel tense",
+        metadata={"system_prompt": "Be kind.", "style_prompt": "warm"},
+    )
+
+
+class StubOpenAIServerTests(unittest.TestCase):
+    def test_latency_profile_matches_requested_percentiles(self) -> None:
+        profile = StubProfile(latency_p50_ms=100, latency_p99_ms=800)
+        generator = random.Random(3)
+        samples = sorted(profile.sample_latency_ms(generator) for _ in range(5000))
+
+        self.assertAlmostEqual(samples[2500], 100, delta=10)
+        self.assertAlmostEqual(samples[math.ceil(0.99 * 5000) - 1], 800, delta=150)
+
+    def test_chat_provider_runs_offline_against_stub(self) -> None:
+        with StubOpenAIServer(profile=FAST) as stub:
+            config = ModelGatewayRoutingConfig(openai_api_key="stub-key", openai_base_url=stub.base_url, openai_http2=False)
+            clients = PooledHTTPClients(base_url=stub.base_url, http2=False)
+            provider = OpenAIChatProvider(config, clients=clients)
+
+            async def _stream():
+                events = [event async for event in provider.astream(_chat_request())]
+                await clients.aclose()
+                return events
+
+            response = provider.infer(_chat_request())
+            events = asyncio.run(_stream())
+            clients.close()
+
+            self.assertEqual(len(response.output_text.split()), 12)
+            self.assertEqual(response.raw["usage"]["completion_tokens"], 12)
+            self.assertEqual(len(events), 13)
+            self.assertEqual(events[-1].response.output_text, response.output_text)
+            self.assertEqual(stub.stats()["counters"]["stream_requests"], 1)
+
+    def test_embedding_provider_gets_deterministic_unit_vectors(self) -> None:
+        with StubOpenAIServer(profile=FAST) as stub:
+            provider = OpenAIEmbeddingProvider(
+                MemoryRetrievalConfig(openai_api_key="stub-key", openai_base_url=stub.base_url)
+            )
+            first, second, again = provider.embed_many(["calm evening", "work stress", "calm evening"])
+            provider.close()
+
+        self.assertEqual(len(first), FAST.embedding_dimensions)
+        self.assertEqual(first, again)
+        self.assertNotEqual(first, second)
+        self.assertAlmostEqual(sum(value * value for value in first), 1.0, places=6)
+
+    def test_error_rate_injects_provider_failures(self) -> None:
+        profile = StubProfile(latency_p50_ms=0, error_rate=1.0, error_status=429)
+        with StubOpenAIServer(profile=profile) as stub:
+            config = ModelGatewayRoutingConfig(openai_api_key="stub-key", openai_base_url=stub.base_url, openai_http2=False)
+            clients = PooledHTTPClients(base_url=stub.base_url, http2=False)
+            with self.assertRaises(httpx.HTTPStatusError) as caught:
+                OpenAIChatProvider(config, clients=clients).infer(_chat_request())
+            clients.close()
+
+        self.assertEqual(caught.exception.response.status_code, 429)
+        self.assertEqual(stub.stats()["counters"]["errors_injected"], 1)
+
+
+class GatewayLoadBenchmarkTests(unittest.TestCase):
+    def test_streaming_load_run_reports_throughput_and_ttft(self) -> None:
+        report = run_benchmark(profile=FAST, concurrency=2, requests=8, warmup=1)
+        result = report["result"]
+
+        self.assertEqual(result["succeeded"], 8, result["errors"])
+        self.assertGreater(result["throughput_rps"], 0.0)
+        self.assertGreater(result["ttft_ms"]["p50"], 0.0)
+        self.assertLessEqual(result["ttft_ms"]["p99"], result["latency_ms"]["p99"])
+        self.assertGreaterEqual(report["stub"]["counters"]["stream_requests"], 9)
+        self.assertEqual(report["gateway"]["circuit_breakers"]["OpenAIChatProvider"]["state"], "closed")
+
+    def test_baseline_comparison_flags_latency_and_throughput_regressions(self) -> None:
+        baseline = {"result": {"latency_ms": {"p50": 100, "p99": 200}, "ttft_ms": {"p50": 40, "p99": 80}, "throughput_rps": 50}}
+        current = {"result": {"latency_ms": {"p50": 110, "p99": 400}, "ttft_ms": {"p50": 40, "p99": 80}, "throughput_rps": 20}}
+
+        regressions = compare_to_baseline(current, baseline, max_regression=0.25)
+
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("latency_ms.p99"))
+        self.assertTrue(regressions[1].startswith("throughput_rps"))
+
+
+if __name__ == "__main__":
+    unittest.main()
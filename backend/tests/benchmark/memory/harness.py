@@ -0,0 +1,296 @@
+"""Memory retrieval benchmark harness.
+
+Builds deterministic synthetic per-user memory corpora (en-US and zh-CN),
+indexes them through MemoryService for each embedder/reranker combination
+and reports index time, query p50/p99, traced memory footprint and recall@k
+as JSON. Run directly for the full size sweep:
+
+    PYTHONPATH=backend/src python -m backend.tests.benchmark.memory.harness \\
+        --sizes 10,100,1000,10000,100000 --output memory-bench.json
+"""
+
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from backend.tests.bootstrap import configure_import_path
+
+configure_import_path()
+
+from modules.memory.config import MemoryRetrievalConfig
+from modules.memory.service import MemoryService
+from modules.storage.in_memory import InMemoryStore
+
+DEFAULT_SIZES = (10, 100, 1000, 10000, 100000)
+DEFAULT_LOCALES = ("en-US", "zh-CN")
+DEFAULT_COMBINATIONS = (("local", "local"), ("local", "overlap"))
+RECALL_KS = (1, 3, 5)
+
+_EN_TOPICS = {
+    "work": ["deadline", "manager", "presentation", "meeting", "promotion", "overtime"],
+    "sleep": ["insomnia", "nap", "bedtime", "nightmare", "alarm", "restless"],
+    "family": ["mother", "father", "sister", "dinner", "holiday", "argument"],
+    "exercise": ["running", "yoga", "gym", "stretching", "hike", "cycling"],
+    "study": ["exam", "thesis", "lecture", "homework", "grades", "library"],
+    "friends": ["party", "message", "loneliness", "trust", "weekend", "laughter"],
+}
+_EN_FEELINGS = ["anxious", "calm", "frustrated", "hopeful", "tired", "proud", "overwhelmed"]
+_EN_SYLLABLES = ["ka", "lo", "mi", "ter", "van", "zu", "ri", "pel", "dor", "sa", "quin", "bex"]
+
+_ZH_TOPICS = {
+    "work": ["截止日期", "领导", "汇报", "会议", "升职", "加班"],
+    "sleep": ["失眠", "午睡", "作息", "噩梦", "闹钟", "辗转"],
+    "family": ["妈妈", "爸爸", "姐姐", "晚饭", "假期", "争吵"],
+    "exercise": ["跑步", "瑜伽", "健身", "拉伸", "爬山", "骑车"],
+    "study": ["考试", "论文", "讲座", "作业", "成绩", "图书馆"],
+    "friends": ["聚会", "消息", "孤独", "信任", "周末", "欢笑"],
+}
+_ZH_FEELINGS = ["焦虑", "平静", "沮丧", "期待", "疲惫", "自豪", "崩溃"]
+_ZH_NAME_CHARS = "岚澈珂翊骁琰瑾昀霁珩湛璟玥钰祺"
+
+
+@dataclass
+class SyntheticCorpus:
+    locale: str
+    memories: List[str]
+    queries: List[Tuple[str, int]]
+
+
+@dataclass
+class BenchmarkResult:
+    locale: str
+    size: int
+    embedder: str
+    reranker: str
+    stored_items: int
+    index_seconds: float
+    index_items_per_second: float
+    query_count: int
+    query_p50_ms: float
+    query_p99_ms: float
+    memory_bytes: int
+    memory_bytes_per_item: float
+    recall_at_k: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        return f"{self.locale}|{self.size}|{self.embedder}|{self.reranker}"
+
+
+def build_corpus(locale: str, size: int, query_count: int, seed: int = 7) -> SyntheticCorpus:
+    generator = random.Random(f"{seed}:{locale}:{size}")
+    entities = _unique_entities(locale, size, generator)
+    topics = _ZH_TOPICS if locale == "zh-CN" else _EN_TOPICS
+    feelings = _ZH_FEELINGS if locale == "zh-CN" else _EN_FEELINGS
+    topic_names = sorted(topics)
+
+    memories: List[str] = []
+    details: List[Tuple[str, List[str]]] = []
+    for index in range(size):
+        topic = topic_names[index % len(topic_names)]
+        words = generator.sample(topics[topic], 3)
+        feeling = generator.choice(feelings)
+        entity = entities[index]
+        details.append((entity, words))
+        if locale == "zh-CN":
+            memories.append(f"和{entity}有关的{words[0]}让我{feeling}，后来又想到{words[1]}和{words[2]}。")
+        else:
+            memories.append(
+                f"Talking about {entity} and the {words[0]} left me {feeling}; "
+                f"later I thought about {words[1]} and {words[2]}."
+            )
+
+    targets = generator.sample(range(size), min(query_count, size))
+    queries: List[Tuple[str, int]] = []
+    for target in targets:
+        entity, words = details[target]
+        if locale == "zh-CN":
+            queries.append((f"我又想起{entity}和{words[0]}", target))
+        else:
+            queries.append((f"I keep thinking about {entity} and {words[0]}", target))
+    return SyntheticCorpus(locale=locale, memories=memories, queries=queries)
+
+
+def run_case(
+    corpus: SyntheticCorpus,
+    embedder: str,
+    reranker: str,
+    measure_memory: bool = True,
+) -> BenchmarkResult:
+    config = MemoryRetrievalConfig(
+        embedder_provider=embedder,
+        reranker_provider=reranker,
+        max_items_per_user=max(len(corpus.memories), 1),
+        compaction_interval_seconds=0,
+    )
+    user_id = f"bench-{corpus.locale}"
+
+    store = InMemoryStore()
+    service = MemoryService(store, config=config)
+    if measure_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    stored = service.index_summaries(user_id, corpus.memories)
+    index_seconds = time.perf_counter() - started
+    memory_bytes = 0
+    if measure_memory:
+        memory_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    latencies: List[float] = []
+    hits = {k: 0 for k in RECALL_KS}
+    max_k = max(RECALL_KS)
+    for query, target in corpus.queries:
+        started = time.perf_counter()
+        results = service.retrieve_relevant(user_id, query, limit=max_k)
+        latencies.append((time.perf_counter() - started) * 1000)
+        expected = corpus.memories[target]
+        for k in RECALL_KS:
+            if expected in results[:k]:
+                hits[k] += 1
+
+    query_count = len(corpus.queries)
+    ordered = sorted(latencies)
+    return BenchmarkResult(
+        locale=corpus.locale,
+        size=len(corpus.memories),
+        embedder=embedder,
+        reranker=reranker,
+        stored_items=stored,
+        index_seconds=round(index_seconds, 6),
+        index_items_per_second=round(len(corpus.memories) / index_seconds, 2) if index_seconds > 0 else 0.0,
+        query_count=query_count,
+        query_p50_ms=round(percentile(ordered, 50), 3),
+        query_p99_ms=round(percentile(ordered, 99), 3),
+        memory_bytes=int(memory_bytes),
+        memory_bytes_per_item=round(memory_bytes / max(stored, 1), 1),
+        recall_at_k={str(k): round(hits[k] / query_count, 4) if query_count else 0.0 for k in RECALL_KS},
+    )
+
+
+def run_suite(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    locales: Sequence[str] = DEFAULT_LOCALES,
+    combinations: Sequence[Tuple[str, str]] = DEFAULT_COMBINATIONS,
+    query_count: int = 50,
+    measure_memory: bool = True,
+) -> dict:
+    results: List[BenchmarkResult] = []
+    for locale in locales:
+        for size in sizes:
+            corpus = build_corpus(locale, size, query_count=query_count)
+            for embedder, reranker in combinations:
+                results.append(run_case(corpus, embedder, reranker, measure_memory=measure_memory))
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": [asdict(item) for item in results],
+    }
+
+
+def compare_to_baseline(report: dict, baseline: dict, max_regression: float) -> List[str]:
+    """Return human-readable regressions of ``report`` against ``baseline``."""
+    previous = {
+        f"{item['locale']}|{item['size']}|{item['embedder']}|{item['reranker']}": item
+        for item in baseline.get("results", [])
+    }
+    regressions: List[str] = []
+    for item in report.get("results", []):
+        key = f"{item['locale']}|{item['size']}|{item['embedder']}|{item['reranker']}"
+        before = previous.get(key)
+        if before is None:
+            continue
+        for metric in ("query_p50_ms", "query_p99_ms", "index_seconds"):
+            allowed = float(before[metric]) * (1.0 + max_regression)
+            if float(before[metric]) > 0 and float(item[metric]) > allowed:
+                regressions.append(f"{key} {metric} {before[metric]} -> {item[metric]}")
+        for k, value in item.get("recall_at_k", {}).items():
+            previous_recall = float(before.get("recall_at_k", {}).get(k, 0.0))
+            if float(value) + 1e-9 < previous_recall - max_regression * previous_recall:
+                regressions.append(f"{key} recall@{k} {previous_recall} -> {value}")
+    return regressions
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = math.ceil((pct / 100) * len(sorted_values)) - 1
+    index = min(max(index, 0), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def _unique_entities(locale: str, size: int, generator: random.Random) -> List[str]:
+    seen = set()
+    entities: List[str] = []
+    while len(entities) < size:
+        if locale == "zh-CN":
+            name = "".join(generator.choice(_ZH_NAME_CHARS) for _ in range(3 + len(entities) // 3000))
+        else:
+            name = "".join(generator.choice(_EN_SYLLABLES) for _ in range(3 + len(entities) // 1500))
+        if name not in seen:
+            seen.add(name)
+            entities.append(name)
+    return entities
+
+
+def _parse_combinations(raw: str) -> List[Tuple[str, str]]:
+    pairs: List[Tuple[str, str]] = []
+    for item in raw.split(","):
+        embedder, _, reranker = item.strip().partition(":")
+        if embedder:
+            pairs.append((embedder, reranker or "local"))
+    return pairs
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="MemoryService retrieval benchmark")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES))
+    parser.add_argument("--locales", default=",".join(DEFAULT_LOCALES))
+    parser.add_argument(
+        "--combinations",
+        default=",".join(f"{embedder}:{reranker}" for embedder, reranker in DEFAULT_COMBINATIONS),
+        help="comma separated embedder:reranker pairs",
+    )
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc footprint measurement")
+    parser.add_argument("--output", default="", help="write JSON results to this path")
+    parser.add_argument("--baseline", default="", help="fail when results regress against this JSON")
+    parser.add_argument("--max-regression", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    report = run_suite(
+        sizes=[int(size) for size in args.sizes.split(",") if size.strip()],
+        locales=[locale.strip() for locale in args.locales.split(",") if locale.strip()],
+        combinations=_parse_combinations(args.combinations),
+        query_count=args.queries,
+        measure_memory=not args.no_memory,
+    )
+    payload = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(payload)
+    else:
+        print(payload)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        regressions = compare_to_baseline(report, baseline, args.max_regression)
+        for line in regressions:
+            print(f"[REGRESSION] {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
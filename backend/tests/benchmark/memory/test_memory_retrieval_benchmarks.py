@@ -0,0 +1,62 @@
+import json
+import unittest
+
+from backend.tests.bootstrap import configure_import_path
+
+configure_import_path()
+
+from backend.tests.benchmark.memory.harness import (
+    DEFAULT_COMBINATIONS,
+    build_corpus,
+    compare_to_baseline,
+    run_suite,
+)
+
+
+class MemoryRetrievalBenchmarkTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.report = run_suite(sizes=(10, 200), query_count=20, measure_memory=True)
+
+    def test_report_is_machine_readable_for_every_combination(self) -> None:
+        decoded = json.loads(json.dumps(self.report, ensure_ascii=False))
+        results = decoded["results"]
+        self.assertEqual(len(results), 2 * 2 * len(DEFAULT_COMBINATIONS))
+        for item in results:
+            for key in (
+                "index_seconds",
+                "query_p50_ms",
+                "query_p99_ms",
+                "memory_bytes",
+                "recall_at_k",
+            ):
+                self.assertIn(key, item)
+            self.assertLessEqual(item["query_p50_ms"], item["query_p99_ms"])
+            self.assertGreater(item["memory_bytes"], 0)
+
+    def test_recall_and_latency_floor_on_small_corpora(self) -> None:
+        for item in self.report["results"]:
+            label = f"{item['locale']} size={item['size']} {item['embedder']}:{item['reranker']}"
+            self.assertGreaterEqual(item["recall_at_k"]["5"], 0.9, label)
+            self.assertLess(item["query_p99_ms"], 250.0, label)
+
+    def test_synthetic_corpus_is_deterministic(self) -> None:
+        first = build_corpus("zh-CN", 50, query_count=5)
+        second = build_corpus("zh-CN", 50, query_count=5)
+        self.assertEqual(first.memories, second.memories)
+        self.assertEqual(first.queries, second.queries)
+        self.assertEqual(len(set(first.memories)), 50)
+
+    def test_baseline_comparison_flags_latency_regression(self) -> None:
+        baseline = json.loads(json.dumps(self.report))
+        slower = json.loads(json.dumps(self.report))
+        slower["results"][0]["query_p99_ms"] = baseline["results"][0]["query_p99_ms"] * 3 + 1
+
+        self.assertEqual(compare_to_baseline(self.report, baseline, max_regression=0.25), [])
+        regressions = compare_to_baseline(slower, baseline, max_regression=0.25)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("query_p99_ms", regressions[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,351 @@
+"""Sustained-load safety benchmark harness.
+
+Drives ``SafetyDetectorService.detect`` and
+``SafetyRuntimeService.assess_and_respond`` with a deterministic en-US/zh-CN
+message corpus (mostly everyday messages, a share of distress and a few
+high-risk ones) from a fixed number of worker threads, and reports
+throughput, p50/p99/p999 latency and per-operation allocations as JSON.
+Run directly, store the report as a baseline and compare later runs to it:
+
+    PYTHONPATH=backend/src python -m backend.tests.benchmark.safety.harness \\
+        --concurrency 1,4,16 --operations 4000 --output safety-bench.json
+    PYTHONPATH=backend/src python -m backend.tests.benchmark.safety.harness \\
+        --baseline safety-bench.json --max-regression 0.25
+"""
+
+import argparse
+import gc
+import json
+import platform
+import random
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from backend.tests.bootstrap import configure_import_path
+
+configure_import_path()
+
+from modules.safety.config import SafetyDetectionConfig
+from modules.safety.detector_service import SafetyDetectorService
+from modules.safety.service import SafetyRuntimeService
+from modules.safety.slo import SafetyLatencyMonitor
+from modules.storage.in_memory import InMemoryStore
+
+from backend.tests.benchmark.memory.harness import percentile
+
+DEFAULT_TARGETS = ("detector", "runtime")
+DEFAULT_CONCURRENCY = (1, 4, 16)
+DEFAULT_OPERATIONS = 4000
+# Share of each tier in the corpus: everyday chatter dominates real traffic.
+TIER_WEIGHTS = (("low", 0.80), ("medium", 0.15), ("high", 0.05))
+
+_CORPUS_MESSAGES = {
+    "en-US": {
+        "low": [
+            "Work was busy today and I feel a little tense before tomorrow's meeting",
+            "I slept badly again but the morning walk helped",
+            "Had dinner with my sister, feeling calmer than yesterday",
+            "I am stressed about exams and want a plan for the week",
+            "Can we practise a breathing routine before bed",
+            "My manager praised the presentation and I feel proud",
+        ],
+        "medium": [
+            "I feel hopeless lately and nothing I do seems to matter",
+            "I can't handle this anymore, everything keeps breaking down",
+            "I have been crying every night and feel completely alone",
+            "Nothing matters and I am so tired of trying",
+        ],
+        "high": [
+            "I want to kill myself",
+            "I have a plan to end my life tonight",
+            "I don't want to live anymore",
+        ],
+    },
+    "zh-CN": {
+        "low": [
+            "今天工作有点忙，开会前有些紧张",
+            "昨晚又没睡好，不过早上散步之后好一些",
+            "和家人吃了晚饭，感觉比昨天平静",
+            "考试压力很大，想做一个本周计划",
+        ],
+        "medium": [
+            "最近感觉很绝望，做什么都没有意义",
+            "我快撑不下去了，每天晚上都在哭",
+            "觉得自己很孤独，没有人理解我",
+        ],
+        "high": [
+            "我不想活了",
+            "我想自杀",
+            "今晚我打算结束自己的生命",
+        ],
+    },
+}
+
+
+@dataclass
+class SafetyBenchmarkResult:
+    target: str
+    concurrency: int
+    operations: int
+    errors: int
+    fail_closed: int
+    elapsed_seconds: float
+    ops_per_second: float
+    p50_ms: float
+    p99_ms: float
+    p999_ms: float
+    max_ms: float
+    retained_blocks_per_op: float
+    alloc_peak_bytes_per_op: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.target}|{self.concurrency}"
+
+
+def build_corpus(size: int, seed: int = 17) -> List[Tuple[str, str]]:
+    """``size`` deterministic ``(text, locale)`` pairs drawn by ``TIER_WEIGHTS``."""
+    generator = random.Random(f"safety:{seed}:{size}")
+    tiers = [tier for tier, _ in TIER_WEIGHTS]
+    weights = [weight for _, weight in TIER_WEIGHTS]
+    locales = sorted(_CORPUS_MESSAGES)
+    corpus: List[Tuple[str, str]] = []
+    for _ in range(size):
+        locale = generator.choice(locales)
+        tier = generator.choices(tiers, weights=weights)[0]
+        corpus.append((generator.choice(_CORPUS_MESSAGES[locale][tier]), locale))
+    return corpus
+
+
+def build_target(target: str) -> Callable[[int, str, str], bool]:
+    """A callable ``(worker, text, locale) -> fail_closed`` over a fresh store and monitor."""
+    store = InMemoryStore()
+    # A private monitor keeps benchmark traffic out of the process-wide SLO view.
+    monitor = SafetyLatencyMonitor()
+    if target == "detector":
+        detector = SafetyDetectorService(store=store, config=SafetyDetectionConfig(), monitor=monitor)
+
+        def _detect(worker: int, text: str, locale: str) -> bool:
+            return detector.detect(text=text, locale=locale).fail_closed
+
+        return _detect
+    if target == "runtime":
+        runtime = SafetyRuntimeService(store, monitor=monitor)
+
+        def _assess(worker: int, text: str, locale: str) -> bool:
+            response = runtime.assess_and_respond(user_id=f"bench-{worker}", locale=locale, text=text)
+            return bool(response["detection"]["fail_closed"])
+
+        return _assess
+    raise ValueError(f"Unknown benchmark target: {target}")
+
+
+def run_case(
+    target: str,
+    concurrency: int,
+    corpus: Sequence[Tuple[str, str]],
+    operations: int,
+    warmup: int = 50,
+    allocation_samples: int = 200,
+) -> SafetyBenchmarkResult:
+    call = build_target(target)
+    for index in range(min(warmup, len(corpus))):
+        call(0, *corpus[index])
+
+    retained_blocks, alloc_peak = _measure_allocations(call, corpus, allocation_samples)
+
+    per_worker = max(1, operations // concurrency)
+    latencies: List[List[float]] = [[] for _ in range(concurrency)]
+    failures = [[0, 0] for _ in range(concurrency)]
+    barrier = threading.Barrier(concurrency + 1)
+
+    def _worker(worker: int) -> None:
+        samples = latencies[worker]
+        offset = worker * 7919
+        barrier.wait()
+        for step in range(per_worker):
+            text, locale = corpus[(offset + step) % len(corpus)]
+            started = time.perf_counter()
+            try:
+                failed_closed = call(worker, text, locale)
+            except Exception:
+                failures[worker][0] += 1
+                continue
+            samples.append((time.perf_counter() - started) * 1000)
+            failures[worker][1] += int(failed_closed)
+
+    threads = [threading.Thread(target=_worker, args=(worker,), daemon=True) for worker in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(sample for samples in latencies for sample in samples)
+    completed = len(ordered)
+    return SafetyBenchmarkResult(
+        target=target,
+        concurrency=concurrency,
+        operations=completed,
+        errors=sum(item[0] for item in failures),
+        fail_closed=sum(item[1] for item in failures),
+        elapsed_seconds=round(elapsed, 6),
+        ops_per_second=round(completed / elapsed, 2) if elapsed > 0 else 0.0,
+        p50_ms=round(percentile(ordered, 50), 4),
+        p99_ms=round(percentile(ordered, 99), 4),
+        p999_ms=round(percentile(ordered, 99.9), 4),
+        max_ms=round(ordered[-1], 4) if ordered else 0.0,
+        retained_blocks_per_op=retained_blocks,
+        alloc_peak_bytes_per_op=alloc_peak,
+    )
+
+
+def run_suite(
+    targets: Sequence[str] = DEFAULT_TARGETS,
+    concurrency_levels: Sequence[int] = DEFAULT_CONCURRENCY,
+    operations: int = DEFAULT_OPERATIONS,
+    corpus_size: int = 1000,
+    repeats: int = 3,
+) -> dict:
+    """Run every (target, concurrency) case ``repeats`` times and keep the median of each metric."""
+    corpus = build_corpus(corpus_size)
+    results = [
+        _median_result([run_case(target, concurrency, corpus, operations) for _ in range(max(1, repeats))])
+        for target in targets
+        for concurrency in concurrency_levels
+    ]
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "operations": operations,
+        "repeats": max(1, repeats),
+        "results": [asdict(item) for item in results],
+    }
+
+
+def compare_to_baseline(
+    report: dict,
+    baseline: dict,
+    max_regression: float,
+    min_latency_delta_ms: float = 1.0,
+) -> List[str]:
+    """Return human-readable throughput, tail-latency and allocation regressions against ``baseline``.
+
+    A latency only regresses when it grows by more than ``max_regression`` and
+    by more than ``min_latency_delta_ms`` per worker: with the GIL, queueing
+    jitter in the tails scales with the number of threads waiting for it.
+    """
+    previous = {f"{item['target']}|{item['concurrency']}": item for item in baseline.get("results", [])}
+    regressions: List[str] = []
+    for item in report.get("results", []):
+        key = f"{item['target']}|{item['concurrency']}"
+        before = previous.get(key)
+        if before is None:
+            continue
+        floor = float(before["ops_per_second"]) * (1.0 - max_regression)
+        if float(item["ops_per_second"]) < floor:
+            regressions.append(f"{key} ops_per_second {before['ops_per_second']} -> {item['ops_per_second']}")
+        for metric in ("p99_ms", "p999_ms", "retained_blocks_per_op", "alloc_peak_bytes_per_op"):
+            allowed = float(before[metric]) * (1.0 + max_regression)
+            if metric.endswith("_ms"):
+                slack = min_latency_delta_ms * max(1, int(item["concurrency"]))
+                allowed = max(allowed, float(before[metric]) + slack)
+            if float(before[metric]) > 0 and float(item[metric]) > allowed:
+                regressions.append(f"{key} {metric} {before[metric]} -> {item[metric]}")
+    return regressions
+
+
+def _median_result(runs: List[SafetyBenchmarkResult]) -> SafetyBenchmarkResult:
+    """Per-metric median over repeated runs of one case; damps scheduler noise in the tails."""
+    merged = asdict(runs[0])
+    for name, value in merged.items():
+        if isinstance(value, (int, float)) and name != "concurrency":
+            merged[name] = statistics.median(getattr(run, name) for run in runs)
+    merged["operations"] = sum(run.operations for run in runs)
+    merged["errors"] = sum(run.errors for run in runs)
+    merged["fail_closed"] = sum(run.fail_closed for run in runs)
+    return SafetyBenchmarkResult(**merged)
+
+
+def _measure_allocations(
+    call: Callable[[int, str, str], bool],
+    corpus: Sequence[Tuple[str, str]],
+    samples: int,
+) -> Tuple[float, float]:
+    """Blocks retained and peak bytes allocated per operation, measured on one thread.
+
+    tracemalloc only tracks live blocks, so transient allocations show up as
+    the growth of each call's peak over the traced size before it started,
+    and growth of the block count across all samples is what calls keep alive.
+    """
+    if samples <= 0:
+        return 0.0, 0.0
+    gc.collect()
+    tracemalloc.start()
+    peak_total = 0
+    try:
+        before = tracemalloc.take_snapshot()
+        for index in range(samples):
+            text, locale = corpus[index % len(corpus)]
+            tracemalloc.reset_peak()
+            size, _ = tracemalloc.get_traced_memory()
+            call(0, text, locale)
+            _, peak = tracemalloc.get_traced_memory()
+            peak_total += max(0, peak - size)
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    retained = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    return round(max(0, retained) / samples, 2), round(peak_total / samples, 1)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Safety detection sustained-load benchmark")
+    parser.add_argument("--targets", default=",".join(DEFAULT_TARGETS))
+    parser.add_argument("--concurrency", default=",".join(str(level) for level in DEFAULT_CONCURRENCY))
+    parser.add_argument("--operations", type=int, default=DEFAULT_OPERATIONS, help="operations per case")
+    parser.add_argument("--corpus-size", type=int, default=1000)
+    parser.add_argument("--repeats", type=int, default=3, help="runs per case; the median is reported")
+    parser.add_argument("--output", default="", help="write JSON results (e.g. a new baseline) to this path")
+    parser.add_argument("--baseline", default="", help="fail when results regress against this JSON")
+    parser.add_argument("--max-regression", type=float, default=0.25)
+    parser.add_argument("--min-latency-delta-ms", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    report = run_suite(
+        targets=[target.strip() for target in args.targets.split(",") if target.strip()],
+        concurrency_levels=[int(level) for level in args.concurrency.split(",") if level.strip()],
+        operations=args.operations,
+        corpus_size=args.corpus_size,
+        repeats=args.repeats,
+    )
+    payload = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(payload)
+    else:
+        print(payload)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        regressions = compare_to_baseline(report, baseline, args.max_regression, args.min_latency_delta_ms)
+        for line in regressions:
+            print(f"[REGRESSION] {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,22 +1,72 @@
+import json
 import unittest
 
 from backend.tests.bootstrap import configure_import_path
 
 configure_import_path()
 
-from modules.safety.detector_service import SafetyDetectorService
+from modules.safety.config import SafetySLOConfig
 
+from backend.tests.benchmark.safety.harness import (
+    DEFAULT_TARGETS,
+    TIER_WEIGHTS,
+    build_corpus,
+    compare_to_baseline,
+    run_suite,
+)
 
-class SafetyLatencyBenchmarkTests(unittest.TestCase):
-    def test_nlu_latency_under_100ms(self) -> None:
-        detector = SafetyDetectorService()
-        result = detector.detect("I feel stressed about work and life")
-        self.assertLess(result.nlu_latency_ms, 100.0)
+# The top level oversubscribes the 16 detector workers, so queueing shows up in CI.
+CONCURRENCY = (1, 4, 32)
 
-    def test_semantic_latency_under_2s(self) -> None:
-        detector = SafetyDetectorService()
-        result = detector.detect("I can't handle this and nothing matters")
-        self.assertLess(result.semantic_latency_ms, 2000.0)
+
+class SafetyLoadBenchmarkTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.report = run_suite(concurrency_levels=CONCURRENCY, operations=400, corpus_size=200, repeats=1)
+
+    def test_report_is_machine_readable_for_every_case(self) -> None:
+        decoded = json.loads(json.dumps(self.report, ensure_ascii=False))
+        results = decoded["results"]
+        self.assertEqual(len(results), len(DEFAULT_TARGETS) * len(CONCURRENCY))
+        for item in results:
+            for key in ("ops_per_second", "p50_ms", "p99_ms", "p999_ms", "retained_blocks_per_op", "alloc_peak_bytes_per_op"):
+                self.assertIn(key, item)
+            self.assertLessEqual(item["p50_ms"], item["p99_ms"])
+            self.assertLessEqual(item["p99_ms"], item["p999_ms"])
+            self.assertGreater(item["alloc_peak_bytes_per_op"], 0)
+
+    def test_sustained_load_stays_within_slo_budgets(self) -> None:
+        budgets = SafetySLOConfig()
+        for item in self.report["results"]:
+            label = f"{item['target']} concurrency={item['concurrency']}"
+            self.assertEqual(item["errors"], 0, label)
+            self.assertEqual(item["fail_closed"], 0, label)
+            self.assertGreater(item["ops_per_second"], 100.0, label)
+            budget = budgets.nlu_budget_ms if item["target"] == "detector" else budgets.detection_budget_ms
+            self.assertLess(item["p99_ms"], budget, label)
+
+    def test_corpus_is_deterministic_and_mixes_risk_tiers(self) -> None:
+        first = build_corpus(500)
+        self.assertEqual(first, build_corpus(500))
+        self.assertEqual({locale for _, locale in first}, {"en-US", "zh-CN"})
+        self.assertGreater(len(set(first)), len(TIER_WEIGHTS) * 4)
+
+    def test_baseline_comparison_flags_throughput_tail_and_allocation_regressions(self) -> None:
+        baseline = json.loads(json.dumps(self.report))
+        jitter = json.loads(json.dumps(self.report))
+        jitter["results"][0]["p999_ms"] = baseline["results"][0]["p999_ms"] + 0.5
+        slower = json.loads(json.dumps(self.report))
+        slower["results"][0]["ops_per_second"] = baseline["results"][0]["ops_per_second"] / 2
+        slower["results"][1]["p99_ms"] = baseline["results"][1]["p99_ms"] * 3 + 50
+        slower["results"][2]["alloc_peak_bytes_per_op"] = baseline["results"][2]["alloc_peak_bytes_per_op"] * 2
+
+        self.assertEqual(compare_to_baseline(self.report, baseline, max_regression=0.25), [])
+        self.assertEqual(compare_to_baseline(jitter, baseline, max_regression=0.25), [])
+        regressions = compare_to_baseline(slower, baseline, max_regression=0.25)
+        self.assertEqual(len(regressions), 3)
+        self.assertIn("ops_per_second", regressions[0])
+        self.assertIn("p99_ms", regressions[1])
+        self.assertIn("alloc_peak_bytes_per_op", regressions[2])
 
 
 if __name__ == "__main__":
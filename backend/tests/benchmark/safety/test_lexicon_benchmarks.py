@@ -0,0 +1,96 @@
+import random
+import statistics
+import time
+import unittest
+from typing import Callable, Dict, List, Tuple
+
+from backend.tests.bootstrap import configure_import_path
+
+configure_import_path()
+
+from modules.safety.lexicon.catalog import EN_US_LEXICON
+from modules.safety.lexicon.compiled import CompiledLexicon
+from modules.safety.lexicon.normalize import normalize_text
+
+_EN_WORDS = ["feel", "alone", "tired", "work", "family", "sleep", "hurt", "plan", "night", "empty", "lost", "again"]
+_ZH_CHARS = "我不想活累孤独工作家人睡觉痛苦计划晚上空虚失去再也没有意义"
+_MESSAGES = [
+    "I feel stressed about work and I can't sleep again",
+    "Nothing matters anymore and I am breaking down tonight",
+    "我最近工作压力很大，晚上睡不着，感觉很孤独",
+    "Had a good walk with family, feeling a bit better today",
+]
+
+
+def _synthetic_lexicon(size: int, seed: int = 11) -> Dict[Tuple[str, str], List[str]]:
+    """The shipped lexicon padded with ``size`` deterministic en/zh phrases spread over its tiers."""
+    rng = random.Random(seed)
+    tiers = {key: list(phrases) for key, phrases in EN_US_LEXICON.items()}
+    keys = list(tiers)
+    for index in range(size):
+        if index % 2:
+            phrase = "".join(rng.choice(_ZH_CHARS) for _ in range(rng.randint(3, 6)))
+        else:
+            phrase = " ".join(rng.choice(_EN_WORDS) for _ in range(rng.randint(2, 4))) + f" x{index}"
+        tiers[keys[index % len(keys)]].append(phrase)
+    return tiers
+
+
+def _sequential_scan(tiers: Dict[Tuple[str, str], List[str]]) -> Callable[[str], int]:
+    """The previous approach: one ``in`` check per phrase per message."""
+    phrases = [phrase for group in tiers.values() for phrase in group]
+
+    def _scan(text: str) -> int:
+        normalized = normalize_text(text)
+        return sum(1 for phrase in phrases if phrase in normalized)
+
+    return _scan
+
+
+def _per_message_us(scan: Callable[[str], object], rounds: int = 200) -> float:
+    samples = []
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for message in _MESSAGES:
+                scan(message)
+        samples.append((time.perf_counter() - start) * 1_000_000 / (rounds * len(_MESSAGES)))
+    return statistics.median(samples)
+
+
+class SafetyLexiconBenchmarkTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.results = {}
+        for size in (0, 500, 5000):
+            tiers = _synthetic_lexicon(size)
+            lexicon = CompiledLexicon(tiers)
+            cls.results[size] = {
+                "phrases": lexicon.size,
+                "automaton_us": _per_message_us(lexicon.scan),
+                "sequential_us": _per_message_us(_sequential_scan(tiers), rounds=40),
+            }
+
+    def test_automaton_cost_is_flat_as_lexicon_grows(self) -> None:
+        small = self.results[0]["automaton_us"]
+        large = self.results[5000]["automaton_us"]
+        self.assertGreater(self.results[5000]["phrases"], 5000)
+        # A linear scan would be ~100x slower here; allow noise, not growth.
+        self.assertLess(large, small * 3 + 5, self.results)
+
+    def test_automaton_beats_sequential_scan_on_large_lexicons(self) -> None:
+        large = self.results[5000]
+        self.assertLess(large["automaton_us"], large["sequential_us"], self.results)
+
+    def test_matches_are_identical_to_sequential_scan(self) -> None:
+        tiers = _synthetic_lexicon(500)
+        lexicon = CompiledLexicon(tiers)
+        for message in _MESSAGES:
+            scan = lexicon.scan(message)
+            for (group, tier), phrases in tiers.items():
+                expected = [phrase for phrase in phrases if phrase in normalize_text(message)]
+                self.assertEqual(scan.phrases(group, tier), expected, (group, tier, message))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import dataclasses
+import statistics
+import time
+import tracemalloc
+import unittest
+from typing import Callable, List
+
+from backend.tests.bootstrap import configure_import_path
+
+configure_import_path()
+
+from modules.safety.emergency.service import EmergencyService
+from modules.safety.hotline.resolver import HotlineResolver
+from modules.safety.models import SafetyDetectionResult
+from modules.safety.policy.decision_table import SafetyDecisionTable
+from modules.safety.policy.engine import SafetyPolicyEngine
+from modules.triage.models import RiskLevel
+
+# LOW and MEDIUM keep ops alerts out of the measurement; both paths share that code anyway.
+_DETECTIONS = [
+    (SafetyDetectionResult(level=level, source="nlu+semantic", reasons=["bench"]), locale)
+    for level in (RiskLevel.LOW, RiskLevel.MEDIUM)
+    for locale in ("en-US", "zh-CN", "fr-FR")
+]
+
+
+def _resolve_per_request() -> Callable[[SafetyDetectionResult, str], dict]:
+    """The previous interruption path: resolve and serialize every outcome on each call."""
+    policy, hotline, emergency = SafetyPolicyEngine(), HotlineResolver(), EmergencyService()
+
+    def _handle(detection: SafetyDetectionResult, locale: str) -> dict:
+        # The engine used to construct a fresh action on every call.
+        action = dataclasses.replace(policy.resolve(detection.level))
+        return {
+            "detection": detection.to_dict(),
+            "action": action.to_dict(),
+            "hotline": hotline.resolve(locale) if action.show_hotline else None,
+            "ops_event": None,
+            "emergency_contact_notified": emergency.should_notify_emergency_contact(detection.level, False),
+            "hotline_cache_version": hotline.cache_version,
+        }
+
+    return _handle
+
+
+def _precomputed() -> Callable[[SafetyDetectionResult, str], dict]:
+    table = SafetyDecisionTable()
+
+    def _handle(detection: SafetyDetectionResult, locale: str) -> dict:
+        decision = table.lookup(detection.level, locale, False)
+        return {
+            "detection": detection.to_dict(),
+            "action": decision.action_payload,
+            "hotline": decision.hotline,
+            "ops_event": None,
+            "emergency_contact_notified": decision.emergency_contact_notified,
+            "hotline_cache_version": table.hotline_cache_version,
+        }
+
+    return _handle
+
+
+def _per_call_us(handle: Callable[[SafetyDetectionResult, str], dict], rounds: int = 2000) -> float:
+    samples: List[float] = []
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for detection, locale in _DETECTIONS:
+                handle(detection, locale)
+        samples.append((time.perf_counter() - start) * 1_000_000 / (rounds * len(_DETECTIONS)))
+    return statistics.median(samples)
+
+
+def _allocated_blocks_per_call(handle: Callable[[SafetyDetectionResult, str], dict], rounds: int = 50) -> float:
+    """Blocks alive after each call while every response is retained, i.e. what one response allocates."""
+    responses = []
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        for _ in range(rounds):
+            for detection, locale in _DETECTIONS:
+                responses.append(handle(detection, locale))
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    return blocks / (rounds * len(_DETECTIONS))
+
+
+class SafetyPolicyBenchmarkTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.results = {
+            "per_request": {
+                "us": _per_call_us(_resolve_per_request()),
+                "blocks": _allocated_blocks_per_call(_resolve_per_request()),
+            },
+            "precomputed": {
+                "us": _per_call_us(_precomputed()),
+                "blocks": _allocated_blocks_per_call(_precomputed()),
+            },
+        }
+
+    def test_precomputed_table_is_faster(self) -> None:
+        self.assertLess(self.results["precomputed"]["us"], self.results["per_request"]["us"], self.results)
+
+    def test_precomputed_table_allocates_fewer_blocks(self) -> None:
+        self.assertLess(self.results["precomputed"]["blocks"], self.results["per_request"]["blocks"], self.results)
+
+    def test_both_paths_build_identical_responses(self) -> None:
+        legacy, table = _resolve_per_request(), _precomputed()
+        for detection, locale in _DETECTIONS:
+            self.assertEqual(legacy(detection, locale), table(detection, locale))
+
+
+if __name__ == "__main__":
+    unittest.main()
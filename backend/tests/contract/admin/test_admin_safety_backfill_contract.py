@@ -0,0 +1,61 @@
+import unittest
+
+from backend.tests.bootstrap import configure_import_path
+
+configure_import_path()
+
+from modules.api.admin_endpoints import AdminAPI
+from modules.journal.models import JournalEntry
+from modules.storage.in_memory import InMemoryStore
+
+
+class AdminSafetyBackfillContractTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.store = InMemoryStore()
+        self.store.save_journal_entry(
+            JournalEntry(entry_id="j-1", user_id="u-1", mood="low", energy=2, note="I want to kill myself")
+        )
+        self.admin = AdminAPI(store=self.store)
+        status, _, session_id = self.admin.post_login({"username": "admin", "password": "admin"})
+        self.assertEqual(status, 200)
+        self.session_id = session_id
+
+    def test_backfill_requires_session(self) -> None:
+        status, body = self.admin.post_safety_backfill(session_id=None, payload={})
+        self.assertEqual(status, 401)
+        self.assertIn("Admin session required", body["error"])
+
+    def test_backfill_run_contract(self) -> None:
+        status, body = self.admin.post_safety_backfill(session_id=self.session_id, payload={"sources": ["journal"]})
+        self.assertEqual(status, 202)
+        run_id = body["data"]["run_id"]
+        self.admin.backfill.wait(run_id, timeout=10)
+
+        status, body = self.admin.get_safety_backfill_run(session_id=self.session_id, run_id=run_id)
+        self.assertEqual(status, 200)
+        self.assertEqual(body["data"]["status"], "completed")
+        self.assertEqual(body["data"]["processed"], 1)
+        self.assertIn("items_per_second", body["data"])
+
+        status, body = self.admin.get_safety_backfill_runs(session_id=self.session_id)
+        self.assertEqual((status, body["data"]["count"]), (200, 1))
+        status, _ = self.admin.get_safety_backfill_run(session_id=self.session_id, run_id="missing")
+        self.assertEqual(status, 404)
+        status, _ = self.admin.post_safety_backfill(session_id=self.session_id, payload={"sources": ["email"]})
+        self.assertEqual(status, 400)
+
+    def test_detect_batch_contract(self) -> None:
+        status, body = self.admin.post_safety_detect_batch(
+            session_id=self.session_id,
+            payload={"items": [{"text": "I want to kill myself"}, {"text": "Nice day", "locale": "en-US"}]},
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(body["data"]["count"], 2)
+        self.assertNotEqual(body["data"]["items"][0]["level"], body["data"]["items"][1]["level"])
+
+        status, _ = self.admin.post_safety_detect_batch(session_id=self.session_id, payload={"items": []})
+        self.assertEqual(status, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -19,6 +19,18 @@ class FastAPIHTTPContractTests(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json()["status"], "ok")
 
+    def test_hotline_cache_http_etag(self) -> None:
+        response = self.client.get("/api/safety/hotline-cache", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertIn("en-US", response.json())
+        etag = response.headers["etag"]
+
+        revalidated = self.client.get("/api/safety/hotline-cache", headers={"If-None-Match": etag})
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.headers["etag"], etag)
+        self.assertEqual(revalidated.content, b"")
+
     def test_user_auth_cookie_session_http(self) -> None:
         email = f"auth-http-{uuid4().hex[:8]}@example.com"
         register = self.client.post(
@@ -52,6 +52,33 @@ class SafetyAPIContractTests(unittest.TestCase):
         self.assertIn("en-US", body["data"])
         self.assertIn("default", body["data"])
 
+    def test_hotline_cache_resource_supports_etag_and_gzip(self) -> None:
+        import gzip
+        import json
+
+        status, raw, headers = self.safety_api.get_hotline_cache_resource(accept_encoding="br, gzip;q=0.8")
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["Content-Encoding"], "gzip")
+        self.assertEqual(json.loads(gzip.decompress(raw)), self.safety_api.get_hotline_cache()[1]["data"])
+
+        plain_status, plain, plain_headers = self.safety_api.get_hotline_cache_resource(accept_encoding="gzip;q=0")
+        self.assertEqual(plain_status, 200)
+        self.assertNotIn("Content-Encoding", plain_headers)
+        self.assertEqual(gzip.decompress(raw), plain)
+
+        cached_status, cached, cached_headers = self.safety_api.get_hotline_cache_resource(
+            if_none_match=f'W/{headers["ETag"]}'
+        )
+        self.assertEqual((cached_status, cached), (304, b""))
+        self.assertEqual(cached_headers["ETag"], headers["ETag"])
+
+    def test_safety_response_references_hotline_cache_by_version(self) -> None:
+        _, body = self.safety_api.post_assess_message(self.user_id, {"text": "I feel hopeless and can't go on."})
+        _, _, headers = self.safety_api.get_hotline_cache_resource()
+
+        self.assertNotIn("hotline_cache", body["data"])
+        self.assertEqual(f'"{body["data"]["hotline_cache_version"]}"', headers["ETag"])
+
 
 if __name__ == "__main__":
     unittest.main()
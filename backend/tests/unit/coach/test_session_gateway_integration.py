@@ -1,3 +1,5 @@
+import asyncio
+import threading
 import unittest
 
 from backend.tests.bootstrap import configure_import_path
@@ -66,6 +68,109 @@ class CoachGatewayIntegrationUnitTests(unittest.TestCase):
         self.assertIn("provider", chat_body["data"]["model"])
         self.assertGreaterEqual(chat_body["data"]["model"]["relevant_memory_count"], 1)
 
+    def test_async_chat_uses_async_gateway_path(self) -> None:
+        memory = MemoryService(self.store)
+        memory.index_summary(self.user_id, "Work stress peaks before presentations.")
+
+        start_status, start_body = self.coach_api.post_start_session(
+            user_id=self.user_id,
+            payload={
+                "style_id": "warm_guide",
+                "subscription_active": True,
+            },
+        )
+        self.assertEqual(start_status, 200)
+        session_id = start_body["data"]["session"]["session_id"]
+
+        chat_status, chat_body = asyncio.run(
+            self.coach_api.apost_chat(
+                session_id=session_id,
+                payload={"user_message": "Work stress is back before my presentation."},
+            )
+        )
+        self.assertEqual(chat_status, 200)
+        self.assertEqual(chat_body["data"]["mode"], "coaching")
+        self.assertIn("local-heuristic-coach", chat_body["data"]["model"]["provider"])
+        self.assertGreaterEqual(chat_body["data"]["model"]["relevant_memory_count"], 1)
+
+        session = self.store.get_coach_session(session_id)
+        self.assertEqual([turn.role for turn in session.turns][-2:], ["user", "coach"])
+
+    def test_async_chat_keeps_store_and_escalation_off_the_event_loop(self) -> None:
+        session_ids = [self._start_session(), self._start_session()]
+        calls = []
+        for name in ("get_coach_session", "save_coach_session", "save_ops_alert"):
+            original = getattr(self.store, name)
+
+            def _recording(*args, _name=name, _original=original, **kwargs):
+                calls.append((_name, threading.current_thread()))
+                return _original(*args, **kwargs)
+
+            setattr(self.store, name, _recording)
+
+        async def _chat():
+            loop_thread = threading.current_thread()
+            calm = await self.coach_api.apost_chat(session_ids[0], {"user_message": "Work was busy today."})
+            crisis = await self.coach_api.apost_chat(session_ids[1], {"user_message": "I want to kill myself"})
+            return loop_thread, calm, crisis
+
+        loop_thread, (calm_status, calm_body), (crisis_status, crisis_body) = asyncio.run(_chat())
+
+        self.assertEqual((calm_status, calm_body["data"]["mode"]), (200, "coaching"))
+        self.assertEqual((crisis_status, crisis_body["data"]["mode"]), (200, "crisis"))
+        self.assertEqual({name for name, _ in calls}, {"get_coach_session", "save_coach_session", "save_ops_alert"})
+        self.assertEqual([name for name, thread in calls if thread is loop_thread], [])
+
+    def _start_session(self, style_id: str = "warm_guide") -> str:
+        start_status, start_body = self.coach_api.post_start_session(
+            user_id=self.user_id,
+            payload={"style_id": style_id, "subscription_active": True},
+        )
+        self.assertEqual(start_status, 200)
+        return start_body["data"]["session"]["session_id"]
+
+    def test_chat_stream_forwards_deltas_and_persists_turn(self) -> None:
+        session_id = self._start_session()
+        status, body = self.coach_api.open_chat_stream(
+            session_id=session_id,
+            payload={"user_message": "I felt stressed after a long meeting."},
+        )
+        self.assertEqual(status, 200)
+        stream = body["data"]
+        self.assertEqual(stream.meta, {"mode": "coaching", "halted": False})
+
+        async def _collect():
+            return [item async for item in stream.events]
+
+        events = asyncio.run(_collect())
+        tokens = [item["data"]["delta"] for item in events if item["event"] == "token"]
+        done = events[-1]
+        self.assertGreater(len(tokens), 1)
+        self.assertEqual(done["event"], "done")
+        self.assertEqual("".join(tokens).strip(), done["data"]["coach_message"])
+
+        session = self.store.get_coach_session(session_id)
+        self.assertEqual(session.turns[-1].role, "coach")
+        self.assertEqual(session.turns[-1].message, done["data"]["coach_message"])
+
+    def test_aborted_chat_stream_persists_partial_reply(self) -> None:
+        session_id = self._start_session()
+        _, body = self.coach_api.open_chat_stream(
+            session_id=session_id,
+            payload={"user_message": "I felt stressed after a long meeting."},
+        )
+        stream = body["data"]
+
+        async def _read_one_token():
+            first = await stream.events.__anext__()
+            await stream.aclose()
+            return first
+
+        first = asyncio.run(_read_one_token())
+        session = self.store.get_coach_session(session_id)
+        self.assertEqual([turn.role for turn in session.turns][-2:], ["user", "coach"])
+        self.assertEqual(session.turns[-1].message, first["data"]["delta"].strip())
+
     def test_chat_falls_back_when_gateway_fails(self) -> None:
         start_status, start_body = self.coach_api.post_start_session(
             user_id=self.user_id,
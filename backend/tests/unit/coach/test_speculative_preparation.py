@@ -0,0 +1,139 @@
+import asyncio
+import time
+import unittest
+
+from backend.tests.bootstrap import configure_import_path
+
+configure_import_path()
+
+from modules.api.endpoints import OnboardingAPI
+from modules.coach.config import CoachPipelineConfig
+from modules.coach.session_service import CoachSessionService
+from modules.onboarding.service import OnboardingService
+from modules.storage.in_memory import InMemoryStore
+
+_DELAY = 0.12
+
+
+class _SlowMemoryService:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def retrieve_relevant(self, user_id: str, query: str, limit: int = 3):
+        self.calls += 1
+        time.sleep(_DELAY)
+        return ["Breathing slowly helps before meetings."]
+
+
+class _SlowSafetyRuntime:
+    """Delays the real runtime so the overlap with retrieval is measurable."""
+
+    def __init__(self, runtime) -> None:
+        self._runtime = runtime
+
+    def assess_and_respond(self, **kwargs) -> dict:
+        time.sleep(_DELAY)
+        return self._runtime.assess_and_respond(**kwargs)
+
+    async def aassess_and_respond(self, **kwargs) -> dict:
+        await asyncio.sleep(_DELAY)
+        return await self._runtime.aassess_and_respond(**kwargs)
+
+
+class _RecordingGateway:
+    def __init__(self, inner) -> None:
+        self._inner = inner
+        self.calls = []
+
+    def run(self, **kwargs):
+        self.calls.append(kwargs)
+        return self._inner.run(**kwargs)
+
+    async def arun(self, **kwargs):
+        self.calls.append(kwargs)
+        return await self._inner.arun(**kwargs)
+
+
+class SpeculativePreparationTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.store = InMemoryStore()
+        onboarding = OnboardingAPI(service=OnboardingService(self.store))
+        _, body = onboarding.post_register(
+            {"email": "speculative@example.com", "locale": "en-US", "policy_version": "2026.02"}
+        )
+        self.user_id = body["data"]["user_id"]
+        onboarding.post_assessment(
+            user_id=self.user_id,
+            payload={
+                "responses": {
+                    "phq9": [0] * 9,
+                    "gad7": [0] * 7,
+                    "pss10": [0] * 10,
+                    "cssrs": {"q1": False, "q2": False},
+                }
+            },
+        )
+
+    def _service(self, speculative: bool = True):
+        service = CoachSessionService(self.store, config=CoachPipelineConfig(speculative_preparation=speculative))
+        memory = _SlowMemoryService()
+        gateway = _RecordingGateway(service._model_gateway)
+        service._memory_service = memory  # type: ignore[assignment]
+        service._safety_runtime = _SlowSafetyRuntime(service._safety_runtime)  # type: ignore[assignment]
+        service._model_gateway = gateway  # type: ignore[assignment]
+        session_id = service.start_session(self.user_id, "warm_guide", subscription_active=True)["session"]["session_id"]
+        return service, session_id, memory, gateway
+
+    def test_retrieval_overlaps_safety_detection(self) -> None:
+        service, session_id, _, _ = self._service()
+        start = time.perf_counter()
+        result = service.chat(session_id, "Work was stressful today.", None)
+        speculative_s = time.perf_counter() - start
+
+        sequential, sequential_id, _, _ = self._service(speculative=False)
+        start = time.perf_counter()
+        sequential.chat(sequential_id, "Work was stressful today.", None)
+        sequential_s = time.perf_counter() - start
+
+        self.assertEqual(result["mode"], "coaching")
+        self.assertEqual(result["model"]["relevant_memory_count"], 1)
+        self.assertLess(speculative_s, _DELAY * 2 - 0.03)
+        self.assertGreaterEqual(sequential_s, _DELAY * 2)
+
+    def test_halted_turn_discards_speculative_context(self) -> None:
+        service, session_id, memory, gateway = self._service()
+
+        result = service.chat(session_id, "I want to kill myself tonight", None)
+
+        self.assertTrue(result["halted"])
+        self.assertEqual(result["mode"], "crisis")
+        self.assertEqual(memory.calls, 1)
+        self.assertEqual(gateway.calls, [])
+        session = self.store.get_coach_session(session_id)
+        self.assertEqual([turn.role for turn in session.turns], ["user", "coach"])
+
+    def test_async_chat_overlaps_safety_and_retrieval(self) -> None:
+        service, session_id, _, gateway = self._service()
+
+        start = time.perf_counter()
+        result = asyncio.run(service.achat(session_id, "Work was stressful today.", None))
+
+        self.assertLess(time.perf_counter() - start, _DELAY * 2 - 0.03)
+        self.assertEqual(result["model"]["relevant_memory_count"], 1)
+        self.assertEqual(gateway.calls[0]["metadata"]["relevant_memories"], ["Breathing slowly helps before meetings."])
+
+    def test_stream_uses_speculative_context(self) -> None:
+        service, session_id, memory, _ = self._service()
+
+        async def _drain():
+            stream = service.open_chat_stream(session_id, "Work was stressful today.", None)
+            return [event async for event in stream.events]
+
+        events = asyncio.run(_drain())
+        self.assertEqual(events[-1]["event"], "done")
+        self.assertEqual(events[-1]["data"]["model"]["relevant_memory_count"], 1)
+        self.assertEqual(memory.calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
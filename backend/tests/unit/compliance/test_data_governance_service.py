@@ -5,6 +5,7 @@ from backend.tests.bootstrap import configure_import_path
 configure_import_path()
 
 from modules.compliance.data_governance_service import DataGovernanceService
+from modules.memory.service import MemoryService
 from modules.onboarding.service import OnboardingService
 from modules.storage.in_memory import InMemoryStore
 from modules.tests.service import InteractiveTestsService
@@ -62,6 +63,17 @@ class DataGovernanceServiceUnitTests(unittest.TestCase):
         second = self.service.erase_user_bundle(self.user_id)
         self.assertEqual(second["total_deleted"], 0)
 
+    def test_erase_drops_the_in_process_memory_index(self) -> None:
+        memory = MemoryService(self.store)
+        memory.index_summary(self.user_id, "Work stress peaks before presentations.")
+        service = DataGovernanceService(self.store, memory_service=memory)
+        self.assertIn(self.user_id, memory._reranker._indexes)  # type: ignore[attr-defined]
+
+        service.erase_user_bundle(self.user_id)
+
+        self.assertEqual(self.store.list_memory_vectors(self.user_id), [])
+        self.assertNotIn(self.user_id, memory._reranker._indexes)  # type: ignore[attr-defined]
+
     def test_export_unknown_user_raises(self) -> None:
         with self.assertRaises(ValueError):
             self.service.export_user_bundle("missing")
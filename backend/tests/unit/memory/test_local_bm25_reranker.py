@@ -0,0 +1,90 @@
+import unittest
+from unittest import mock
+
+from backend.tests.bootstrap import configure_import_path
+
+configure_import_path()
+
+from modules.memory.providers import local_bm25
+from modules.memory.providers.local_bm25 import LocalBM25RerankerProvider
+from modules.memory.service import MemoryService
+from modules.memory.tokenizer import tokenize_for_retrieval
+from modules.storage.in_memory import InMemoryStore
+
+
+class LocalBM25RerankerUnitTests(unittest.TestCase):
+    def test_tokenizer_emits_cjk_unigrams_and_bigrams(self) -> None:
+        tokens = tokenize_for_retrieval("工作压力 before work")
+        self.assertIn("工作", tokens)
+        self.assertIn("压", tokens)
+        self.assertIn("before", tokens)
+        self.assertIn("work", tokens)
+
+    def test_rerank_orders_by_bm25_with_indexed_documents(self) -> None:
+        reranker = LocalBM25RerankerProvider()
+        documents = [
+            ("m1", "Work anxiety rises before every presentation."),
+            ("m2", "Sleep improved after evening breathing exercises."),
+            ("m3", "Weekend hike with friends felt calming."),
+        ]
+        reranker.sync_index("u1", documents)
+
+        ranked = reranker.rerank(
+            "work presentation anxiety",
+            [text for _, text in documents],
+            limit=2,
+            user_id="u1",
+        )
+        self.assertEqual(len(ranked), 2)
+        self.assertEqual(ranked[0][0], documents[0][1])
+        self.assertGreater(ranked[0][1], ranked[1][1])
+
+    def test_indexed_documents_are_tokenized_once(self) -> None:
+        reranker = LocalBM25RerankerProvider()
+        documents = [("m1", "Work stress"), ("m2", "Breathing helps")]
+
+        with mock.patch.object(
+            local_bm25,
+            "tokenize_for_retrieval",
+            wraps=local_bm25.tokenize_for_retrieval,
+        ) as tokenize:
+            reranker.sync_index("u1", documents)
+            reranker.sync_index("u1", documents)
+            for _ in range(3):
+                reranker.rerank("work", [text for _, text in documents], limit=2, user_id="u1")
+
+        # Two documents at index time plus one query tokenization per rerank call.
+        self.assertEqual(tokenize.call_count, 2 + 3)
+
+    def test_sync_removes_documents_missing_from_store(self) -> None:
+        reranker = LocalBM25RerankerProvider()
+        reranker.sync_index("u1", [("m1", "work stress"), ("m2", "sleep routine")])
+        reranker.sync_index("u1", [("m2", "sleep routine")])
+
+        ranked = reranker.rerank("work", ["sleep routine"], limit=1, user_id="u1")
+        self.assertEqual(ranked, [("sleep routine", 0.0)])
+
+    def test_memory_service_ranks_zh_cn_memories(self) -> None:
+        store = InMemoryStore()
+        service = MemoryService(store)
+        service.index_summary("u1", "最近工作压力很大，开会前特别紧张。")
+        service.index_summary("u1", "晚上做呼吸练习后睡得更好。")
+        service.index_summary("u1", "和伴侣吵架后感觉很疏远。")
+
+        results = service.retrieve_relevant("u1", "工作压力让我紧张", limit=1)
+        self.assertEqual(results, ["最近工作压力很大，开会前特别紧张。"])
+
+    def test_retrieval_does_not_rebuild_the_index(self) -> None:
+        service = MemoryService(InMemoryStore())
+        service.index_summary("u1", "Work anxiety rises before every presentation.")
+        service.index_summary("u1", "Sleep improved after evening breathing exercises.")
+
+        with mock.patch.object(service._reranker, "sync_index", wraps=service._reranker.sync_index) as sync:
+            results = service.retrieve_relevant("u1", "presentation anxiety", limit=1)
+
+        self.assertEqual(results, ["Work anxiety rises before every presentation."])
+        sync.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
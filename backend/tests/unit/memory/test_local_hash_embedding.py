@@ -0,0 +1,77 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+from backend.tests.bootstrap import configure_import_path
+
+configure_import_path()
+
+from modules.memory.models import SparseEmbedding
+from modules.memory.providers.local_embedding import LocalHashEmbeddingProvider
+from modules.memory.service import MemoryService
+
+_SRC_DIR = Path(__file__).resolve().parents[3] / "src"
+_EMBED_SCRIPT = (
+    "import json, sys\n"
+    f"sys.path.insert(0, {str(_SRC_DIR)!r})\n"
+    "from modules.memory.providers.local_embedding import LocalHashEmbeddingProvider\n"
+    "embedding = LocalHashEmbeddingProvider(dimension=512).embed('Work anxiety before presentations')\n"
+    "print(json.dumps(embedding.to_dict()))\n"
+)
+
+
+class LocalHashEmbeddingProviderUnitTests(unittest.TestCase):
+    def test_embedding_is_sparse_and_normalized(self) -> None:
+        provider = LocalHashEmbeddingProvider(dimension=4096)
+        embedding = provider.embed("I felt anxious before a work presentation.")
+
+        self.assertIsInstance(embedding, SparseEmbedding)
+        self.assertEqual(len(embedding), 4096)
+        self.assertLess(len(embedding.weights), 100)
+        self.assertAlmostEqual(embedding.norm(), 1.0, places=6)
+
+    def test_embedding_is_stable_across_processes(self) -> None:
+        outputs = []
+        for seed in ("1", "2"):
+            env = dict(os.environ, PYTHONHASHSEED=seed)
+            completed = subprocess.run(
+                [sys.executable, "-c", _EMBED_SCRIPT],
+                capture_output=True,
+                text=True,
+                env=env,
+                check=True,
+            )
+            outputs.append(completed.stdout.strip())
+
+        self.assertEqual(outputs[0], outputs[1])
+        local = LocalHashEmbeddingProvider(dimension=512).embed("Work anxiety before presentations")
+        self.assertEqual(json.loads(outputs[0]), local.to_dict())
+
+    def test_cjk_text_produces_features(self) -> None:
+        provider = LocalHashEmbeddingProvider()
+        query = provider.embed("工作压力很大")
+        related = provider.embed("最近工作压力让我睡不好")
+        unrelated = provider.embed("周末和朋友去爬山")
+
+        self.assertGreater(len(query.weights), 0)
+        self.assertGreater(
+            MemoryService._cosine_similarity(query, related),
+            MemoryService._cosine_similarity(query, unrelated),
+        )
+
+    def test_cosine_similarity_handles_sparse_and_dense_mix(self) -> None:
+        provider = LocalHashEmbeddingProvider(dimension=64)
+        sparse = provider.embed("breathing exercise")
+        dense = sparse.to_dense()
+
+        self.assertAlmostEqual(MemoryService._cosine_similarity(sparse, sparse), 1.0, places=6)
+        self.assertAlmostEqual(MemoryService._cosine_similarity(sparse, dense), 1.0, places=6)
+        other_dimension = LocalHashEmbeddingProvider(dimension=128).embed("breathing exercise")
+        self.assertEqual(MemoryService._cosine_similarity(sparse, other_dimension), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from backend.tests.bootstrap import configure_import_path
+
+configure_import_path()
+
+from modules.coach.models import CoachSession, CoachTurn
+from modules.coach.summary_service import CoachSummaryService
+from modules.memory.config import MemoryRetrievalConfig
+from modules.memory.consolidation import MemoryCompactionJob, MinHasher
+from modules.memory.models import MemoryVectorRecord
+from modules.memory.service import MemoryService
+from modules.storage.in_memory import InMemoryStore
+
+
+def _session_summary(user_message: str, turn_pairs: int) -> str:
+    session = CoachSession(session_id="s", user_id="u1", style_id="warm_guide")
+    for _ in range(turn_pairs):
+        session.turns.append(CoachTurn(role="user", message=user_message))
+        session.turns.append(CoachTurn(role="coach", message=f"Let's keep exploring: {user_message}"))
+    return CoachSummaryService().build_summary(session)
+
+
+class MemoryConsolidationUnitTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.store = InMemoryStore()
+
+    def _service(self, **overrides) -> MemoryService:
+        return MemoryService(self.store, config=MemoryRetrievalConfig(**overrides))
+
+    def test_minhash_similarity_separates_near_and_far_texts(self) -> None:
+        hasher = MinHasher()
+        base = hasher.signature(_session_summary("I feel stressed about work deadlines", 2))
+        near = hasher.signature(_session_summary("I feel stressed about work deadlines", 5))
+        far = hasher.signature(_session_summary("My sleep got better after breathing", 2))
+
+        self.assertGreaterEqual(MinHasher.similarity(base, near), 0.9)
+        self.assertLess(MinHasher.similarity(base, far), 0.7)
+
+    def test_index_time_merges_templated_near_duplicates(self) -> None:
+        service = self._service()
+        service.index_summary("u1", _session_summary("I feel stressed about work deadlines", 2))
+        service.index_summary("u1", _session_summary("I feel stressed about work deadlines", 3))
+        service.index_summary("u1", _session_summary("My sleep got better after breathing", 1))
+
+        vectors = self.store.list_memory_vectors("u1")
+        self.assertEqual(len(vectors), 2)
+        self.assertEqual(len(self.store.list_memory_summaries("u1")), 2)
+        merged = [item for item in vectors if "work deadlines" in item.text][0]
+        self.assertEqual(merged.merged_count, 2)
+        self.assertIn("3 user turns", merged.text)
+
+    def test_cap_evicts_lowest_recency_times_relevance(self) -> None:
+        service = self._service(max_items_per_user=3)
+        service.index_summary("u1", "Work anxiety rises before presentations.")
+        service.index_summary("u1", "Sleep improved after breathing exercises.")
+        service.index_summary("u1", "Conflict with my partner felt distant.")
+
+        records = self.store.list_memory_vectors("u1")
+        now = datetime.now(timezone.utc)
+        for offset, record in enumerate(records):
+            record.created_at = now - timedelta(days=30 - offset)
+        service.retrieve_relevant("u1", "work presentation anxiety", limit=1)
+
+        service.index_summary("u1", "Weekend hike with friends felt calming.")
+
+        texts = [item.text for item in self.store.list_memory_vectors("u1")]
+        self.assertEqual(len(texts), 3)
+        self.assertIn("Work anxiety rises before presentations.", texts)
+        self.assertNotIn("Sleep improved after breathing exercises.", texts)
+        self.assertIn("Weekend hike with friends felt calming.", texts)
+
+    def test_compaction_job_merges_duplicates_already_in_store(self) -> None:
+        service = self._service()
+        summary = _session_summary("I keep replaying the meeting with my manager", 1)
+        for turn_pairs in range(1, 5):
+            text = _session_summary("I keep replaying the meeting with my manager", turn_pairs)
+            self.store.save_memory_summary("u1", text)
+            self.store.save_memory_vector(MemoryVectorRecord(user_id="u1", text=text, embedding=[1.0]))
+        self.store.save_memory_vector(
+            MemoryVectorRecord(user_id="u2", text=summary, embedding=[1.0])
+        )
+
+        report = MemoryCompactionJob(service, interval_seconds=0).run_once()
+
+        self.assertEqual(report["users"], 2)
+        self.assertEqual(report["merged"], 3)
+        vectors = self.store.list_memory_vectors("u1")
+        self.assertEqual(len(vectors), 1)
+        self.assertEqual(vectors[0].merged_count, 4)
+        self.assertEqual(self.store.list_memory_summaries("u1"), [vectors[0].text])
+
+    def test_index_during_compaction_is_not_overwritten(self) -> None:
+        service = self._service()
+        for turn_pairs in range(1, 3):
+            text = _session_summary("I keep replaying the meeting with my manager", turn_pairs)
+            self.store.save_memory_summary("u1", text)
+            self.store.save_memory_vector(MemoryVectorRecord(user_id="u1", text=text, embedding=[1.0]))
+
+        consolidating = threading.Event()
+        release = threading.Event()
+        consolidate = service._consolidator.consolidate
+
+        def _slow_consolidate(records):
+            consolidating.set()
+            release.wait(timeout=5)
+            return consolidate(records)
+
+        service._consolidator.consolidate = _slow_consolidate
+        compaction = threading.Thread(target=service.compact_user, args=("u1",))
+        compaction.start()
+        self.assertTrue(consolidating.wait(timeout=5))
+        indexer = threading.Thread(target=service.index_summary, args=("u1", "Sleep improved after breathing exercises."))
+        indexer.start()
+        indexer.join(timeout=0.1)
+        self.assertTrue(indexer.is_alive())
+        release.set()
+        compaction.join(timeout=5)
+        indexer.join(timeout=5)
+
+        texts = [item.text for item in self.store.list_memory_vectors("u1")]
+        self.assertEqual(len(texts), 2)
+        self.assertIn("Sleep improved after breathing exercises.", texts)
+        self.assertEqual(self.store.list_memory_summaries("u1"), texts)
+
+
+if __name__ == "__main__":
+    unittest.main()
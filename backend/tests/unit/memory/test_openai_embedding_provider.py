@@ -0,0 +1,134 @@
+import json
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Set
+
+from backend.tests.bootstrap import configure_import_path
+
+configure_import_path()
+
+from modules.memory.config import MemoryRetrievalConfig
+from modules.memory.providers.openai_embedding import OpenAIEmbeddingProvider
+from modules.memory.service import MemoryService
+from modules.storage.in_memory import InMemoryStore
+
+
+class _StubEmbeddingServer(ThreadingHTTPServer):
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _StubEmbeddingHandler)
+        self.lock = threading.Lock()
+        self.batches: List[List[str]] = []
+        self.client_ports: Set[int] = set()
+
+
+class _StubEmbeddingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:  # noqa: N802
+        length = int(self.headers.get("Content-Length", "0"))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        inputs = payload.get("input", [])
+        if isinstance(inputs, str):
+            inputs = [inputs]
+
+        server = self.server
+        assert isinstance(server, _StubEmbeddingServer)
+        with server.lock:
+            server.batches.append(list(inputs))
+            server.client_ports.add(self.client_address[1])
+
+        data = [
+            {"index": index, "embedding": [float(len(text)), 1.0]}
+            for index, text in reversed(list(enumerate(inputs)))
+        ]
+        body = json.dumps({"data": data}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002
+        return
+
+
+class OpenAIEmbeddingProviderStubServerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = _StubEmbeddingServer()
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        host, port = self.server.server_address[:2]
+        self.base_url = f"http://{host}:{port}/v1"
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join(timeout=5)
+
+    def _config(self, batch_size: int = 64, window_ms: int = 0) -> MemoryRetrievalConfig:
+        return MemoryRetrievalConfig(
+            embedder_provider="openai",
+            openai_api_key="test-key",
+            openai_base_url=self.base_url,
+            openai_embedding_batch_size=batch_size,
+            openai_embedding_batch_window_ms=window_ms,
+        )
+
+    def test_embed_many_chunks_by_batch_size_and_preserves_order(self) -> None:
+        provider = OpenAIEmbeddingProvider(self._config(batch_size=2))
+        try:
+            embeddings = provider.embed_many(["a", "bb", "ccc", "dddd", "eeeee"])
+        finally:
+            provider.close()
+
+        self.assertEqual([vector[0] for vector in embeddings], [1.0, 2.0, 3.0, 4.0, 5.0])
+        self.assertEqual([len(batch) for batch in self.server.batches], [2, 2, 1])
+
+    def test_sequential_requests_reuse_keep_alive_connection(self) -> None:
+        provider = OpenAIEmbeddingProvider(self._config())
+        try:
+            for _ in range(4):
+                provider.embed_many(["hello", "world"])
+        finally:
+            provider.close()
+
+        self.assertEqual(len(self.server.batches), 4)
+        self.assertEqual(len(self.server.client_ports), 1)
+
+    def test_concurrent_single_embeds_are_coalesced(self) -> None:
+        provider = OpenAIEmbeddingProvider(self._config(window_ms=50))
+        texts = ["x" * size for size in range(1, 9)]
+        try:
+            with ThreadPoolExecutor(max_workers=len(texts)) as executor:
+                results = list(executor.map(provider.embed, texts))
+        finally:
+            provider.close()
+
+        self.assertEqual([vector[0] for vector in results], [float(len(text)) for text in texts])
+        self.assertLess(len(self.server.batches), len(texts))
+        self.assertEqual(sum(len(batch) for batch in self.server.batches), len(texts))
+
+    def test_reindex_user_uses_batched_round_trips(self) -> None:
+        store = InMemoryStore()
+        local_service = MemoryService(store)
+        for topic in ("work deadlines", "sleep routine", "family dinner", "morning run", "exam nerves"):
+            local_service.index_summary("u1", f"Session focused on {topic}")
+
+        provider = OpenAIEmbeddingProvider(self._config(batch_size=4))
+        try:
+            service = MemoryService(store, config=self._config(batch_size=4), embedder=provider)
+            reindexed = service.reindex_user("u1")
+        finally:
+            provider.close()
+
+        self.assertEqual(reindexed, 5)
+        self.assertEqual(len(self.server.batches), 2)
+        vectors = store.list_memory_vectors("u1")
+        self.assertEqual(len(vectors), 5)
+        self.assertTrue(all(len(vector.embedding) == 2 for vector in vectors))
+
+
+if __name__ == "__main__":
+    unittest.main()
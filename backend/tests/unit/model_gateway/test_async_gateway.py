@@ -0,0 +1,335 @@
+import asyncio
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Set
+
+from backend.tests.bootstrap import configure_import_path
+
+configure_import_path()
+
+from modules.model_gateway.config import ModelGatewayRoutingConfig
+from modules.model_gateway.http_client import PooledHTTPClients
+from modules.model_gateway.models import (
+    ModelGatewayRequest,
+    ModelGatewayResponse,
+    ModelStreamEvent,
+    ModelTaskType,
+)
+from modules.model_gateway.providers.openai_chat import OpenAIChatProvider
+from modules.model_gateway.service import ModelGatewayService
+from modules.storage.in_memory import InMemoryStore
+
+_STUB_USAGE = {"prompt_tokens": 120, "completion_tokens": 6, "prompt_tokens_details": {"cached_tokens": 64}}
+
+
+class _StubChatServer(ThreadingHTTPServer):
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _StubChatHandler)
+        self.lock = threading.Lock()
+        self.requests: List[dict] = []
+        self.client_ports: Set[int] = set()
+
+
+class _StubChatHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:  # noqa: N802
+        length = int(self.headers.get("Content-Length", "0"))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+
+        server = self.server
+        assert isinstance(server, _StubChatServer)
+        with server.lock:
+            server.requests.append({"path": self.path, "payload": payload})
+            server.client_ports.add(self.client_address[1])
+
+        if payload.get("stream"):
+            include_usage = bool((payload.get("stream_options") or {}).get("include_usage"))
+            self._send_stream(["Let's ", "slow ", "down ", "together."], include_usage)
+            return
+
+        body = json.dumps(
+            {
+                "id": f"chatcmpl-{len(server.requests)}",
+                "choices": [
+                    {
+                        "message": {"role": "assistant", "content": "Let's slow down together."},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": _STUB_USAGE,
+            }
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_stream(self, deltas: List[str], include_usage: bool = False) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        events = [{"id": "chatcmpl-stream", "choices": [{"delta": {"role": "assistant"}}]}]
+        events.extend({"id": "chatcmpl-stream", "choices": [{"delta": {"content": item}}]} for item in deltas)
+        events.append({"id": "chatcmpl-stream", "choices": [{"delta": {}, "finish_reason": "stop"}]})
+        if include_usage:
+            events.append({"id": "chatcmpl-stream", "choices": [], "usage": _STUB_USAGE})
+        lines = [f"data: {json.dumps(item)}\n\n" for item in events] + ["data: [DONE]\n\n"]
+        for line in lines:
+            encoded = line.encode("utf-8")
+            self.wfile.write(f"{len(encoded):x}\r\n".encode("ascii") + encoded + b"\r\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002
+        return
+
+
+class _SyncOnlyProvider:
+    def __init__(self) -> None:
+        self.threads: List[str] = []
+
+    def infer(self, request: ModelGatewayRequest) -> ModelGatewayResponse:
+        self.threads.append(threading.current_thread().name)
+        return ModelGatewayResponse(
+            task_type=request.task_type,
+            provider="local-sync-only",
+            risk_level=None,
+            reasons=[],
+            latency_ms=0.0,
+            output_text="ok",
+        )
+
+
+class _FailingAsyncProvider:
+    async def ainfer(self, request: ModelGatewayRequest) -> ModelGatewayResponse:
+        raise RuntimeError("provider outage")
+
+
+class AsyncModelGatewayTests(unittest.TestCase):
+    def test_arun_uses_async_local_providers_and_records_audit(self) -> None:
+        store = InMemoryStore()
+        gateway = ModelGatewayService(audit_store=store)
+
+        async def _run() -> List[ModelGatewayResponse]:
+            return await asyncio.gather(
+                gateway.arun(ModelTaskType.SAFETY_NLU_FAST, "I feel stressed"),
+                gateway.arun(
+                    ModelTaskType.COACH_GENERATION,
+                    "I had a stressful day",
+                    metadata={"style_id": "warm_guide", "session_id": "s-1"},
+                ),
+            )
+
+        nlu, coach = asyncio.run(_run())
+        self.assertTrue(nlu.provider.startswith("local-heuristic"))
+        self.assertIn("local-heuristic-coach", coach.provider)
+        self.assertTrue(bool(coach.output_text))
+        self.assertEqual(len(store.model_invocations), 2)
+        self.assertTrue(all(item.success for item in store.model_invocations))
+
+    def test_ainfer_runs_sync_only_provider_off_the_event_loop(self) -> None:
+        provider = _SyncOnlyProvider()
+        gateway = ModelGatewayService(providers={ModelTaskType.COACH_GENERATION: provider})
+
+        response = asyncio.run(gateway.arun(ModelTaskType.COACH_GENERATION, "hello"))
+
+        self.assertEqual(response.output_text, "ok")
+        self.assertEqual(len(provider.threads), 1)
+        self.assertNotEqual(provider.threads[0], threading.main_thread().name)
+
+    def test_ainfer_failure_is_audited_and_reraised(self) -> None:
+        store = InMemoryStore()
+        gateway = ModelGatewayService(
+            providers={ModelTaskType.COACH_GENERATION: _FailingAsyncProvider()},
+            audit_store=store,
+        )
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(gateway.arun(ModelTaskType.COACH_GENERATION, "hello"))
+
+        self.assertEqual(len(store.model_invocations), 1)
+        record = store.model_invocations[0]
+        self.assertFalse(record.success)
+        self.assertEqual(record.provider, "_FailingAsyncProvider")
+        self.assertIn("provider outage", record.error or "")
+
+
+class ModelGatewayStreamingTests(unittest.TestCase):
+    @staticmethod
+    async def _collect(gateway: ModelGatewayService, text: str) -> List[ModelStreamEvent]:
+        request = ModelGatewayRequest(
+            task_type=ModelTaskType.COACH_GENERATION,
+            text=text,
+            metadata={"style_id": "warm_guide"},
+        )
+        return [event async for event in gateway.astream(request)]
+
+    def test_astream_forwards_local_chunks_then_final_response(self) -> None:
+        store = InMemoryStore()
+        gateway = ModelGatewayService(audit_store=store)
+
+        events = asyncio.run(self._collect(gateway, "I had a stressful day"))
+
+        deltas = [event.delta for event in events if event.response is None]
+        final = events[-1].response
+        self.assertGreater(len(deltas), 3)
+        self.assertIsNotNone(final)
+        self.assertEqual("".join(deltas), final.output_text)
+        self.assertIn("first_token_ms", final.raw)
+        self.assertEqual(len(store.model_invocations), 1)
+        self.assertTrue(store.model_invocations[0].success)
+
+    def test_astream_falls_back_to_single_delta_for_non_streaming_provider(self) -> None:
+        gateway = ModelGatewayService(providers={ModelTaskType.COACH_GENERATION: _SyncOnlyProvider()})
+
+        events = asyncio.run(self._collect(gateway, "hello"))
+
+        self.assertEqual([event.delta for event in events], ["ok", ""])
+        self.assertEqual(events[-1].response.provider, "local-sync-only")
+
+    def test_abandoned_stream_is_audited_as_failure(self) -> None:
+        store = InMemoryStore()
+        gateway = ModelGatewayService(audit_store=store)
+
+        async def _take_first() -> str:
+            stream = gateway.astream(
+                ModelGatewayRequest(task_type=ModelTaskType.COACH_GENERATION, text="hi", metadata={})
+            )
+            first = await stream.__anext__()
+            await stream.aclose()
+            return first.delta
+
+        self.assertTrue(asyncio.run(_take_first()))
+        self.assertEqual(len(store.model_invocations), 1)
+        self.assertFalse(store.model_invocations[0].success)
+        self.assertIn("aborted", store.model_invocations[0].error or "")
+
+
+class OpenAIChatProviderPoolingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = _StubChatServer()
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        host, port = self.server.server_address[:2]
+        self.config = ModelGatewayRoutingConfig(
+            coach_generation_provider="openai",
+            openai_api_key="test-key",
+            openai_base_url=f"http://{host}:{port}/v1",
+            openai_http2=False,
+        )
+        self.clients = PooledHTTPClients(base_url=self.config.openai_base_url, http2=False)
+
+    def tearDown(self) -> None:
+        self.clients.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join(timeout=5)
+
+    def _request(self) -> ModelGatewayRequest:
+        return ModelGatewayRequest(
+            task_type=ModelTaskType.COACH_GENERATION,
+            text="I feel tense",
+            metadata={"system_prompt": "Be kind.", "style_prompt": "warm"},
+        )
+
+    def test_ainfer_reuses_keep_alive_connection(self) -> None:
+        provider = OpenAIChatProvider(self.config, clients=self.clients)
+
+        async def _run() -> List[ModelGatewayResponse]:
+            results = []
+            for _ in range(3):
+                results.append(await provider.ainfer(self._request()))
+            await self.clients.aclose()
+            return results
+
+        responses = asyncio.run(_run())
+
+        self.assertEqual([item.output_text for item in responses], ["Let's slow down together."] * 3)
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(self.server.requests[0]["path"], "/v1/chat/completions")
+        self.assertEqual(self.server.requests[0]["payload"]["messages"][0]["content"], "Be kind.")
+        self.assertEqual(len(self.server.client_ports), 1)
+
+    def test_astream_yields_server_sent_deltas(self) -> None:
+        provider = OpenAIChatProvider(self.config, clients=self.clients)
+
+        async def _run() -> List[ModelStreamEvent]:
+            events = [event async for event in provider.astream(self._request())]
+            await self.clients.aclose()
+            return events
+
+        events = asyncio.run(_run())
+
+        self.assertEqual([event.delta for event in events[:-1]], ["Let's ", "slow ", "down ", "together."])
+        final = events[-1].response
+        self.assertEqual(final.output_text, "Let's slow down together.")
+        self.assertEqual(final.raw["finish_reason"], "stop")
+        self.assertIsNotNone(final.raw["first_token_ms"])
+        self.assertEqual(final.raw["usage"]["cached_tokens"], 64)
+        self.assertTrue(self.server.requests[0]["payload"]["stream"])
+
+    def test_sync_infer_shares_pooled_client(self) -> None:
+        provider = OpenAIChatProvider(self.config, clients=self.clients)
+
+        first = provider.infer(self._request())
+        second = provider.infer(self._request())
+
+        self.assertEqual(first.provider, "openai:gpt-4o-mini")
+        self.assertEqual(second.raw["finish_reason"], "stop")
+        self.assertIs(self.clients.sync_client(), self.clients.sync_client())
+        self.assertEqual(len(self.server.client_ports), 1)
+
+    def test_context_is_sent_compact_and_token_savings_are_audited(self) -> None:
+        store = InMemoryStore()
+        gateway = ModelGatewayService(
+            providers={ModelTaskType.COACH_GENERATION: OpenAIChatProvider(self.config, clients=self.clients)},
+            config=self.config,
+            audit_store=store,
+        )
+        context = {
+            "user_profile": {"user_id": "u1", "email": "u1@example.com", "locale": "en-US"},
+            "latest_triage": {"level": "moderate", "next_step": "weekly check-in"},
+            "expert_qa": {"policy": "already in the system prompt", "topics": ["anxiety", "sleep"]},
+            "memory_summaries": ["slept badly", "argued with manager"],
+        }
+
+        response = gateway.run(
+            ModelTaskType.COACH_GENERATION,
+            "I feel tense",
+            metadata={"system_prompt": "Be kind.", "context_prompt": context},
+        )
+
+        sent = self.server.requests[0]["payload"]["messages"][1]["content"]
+        self.assertTrue(sent.startswith("Context:"))
+        self.assertIn("triage: level=moderate; next_step=weekly check-in", sent)
+        self.assertNotIn("u1@example.com", sent)
+        self.assertNotIn("already in the system prompt", sent)
+
+        record = store.model_invocations[-1]
+        self.assertGreater(response.raw["prompt"]["input_tokens"], 0)
+        self.assertGreater(record.input_tokens_saved, 0)
+        self.assertEqual(record.to_dict()["input_tokens_saved"], record.input_tokens_saved)
+
+    def test_provider_reported_prefix_cache_hits_are_audited(self) -> None:
+        store = InMemoryStore()
+        gateway = ModelGatewayService(
+            providers={ModelTaskType.COACH_GENERATION: OpenAIChatProvider(self.config, clients=self.clients)},
+            config=self.config,
+            audit_store=store,
+        )
+
+        gateway.infer(self._request())
+
+        record = store.model_invocations[-1].to_dict()
+        self.assertEqual(record["input_tokens"], 120)
+        self.assertEqual(record["cached_input_tokens"], 64)
+        uncached_cost = (120 * 0.15 + 7 * 0.6) / 1_000_000
+        self.assertLess(record["estimated_cost_usd"], uncached_cost)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,211 @@
+import threading
+import time
+import unittest
+
+from backend.tests.bootstrap import configure_import_path
+
+configure_import_path()
+
+from modules.model_gateway.config import ModelGatewayRoutingConfig
+from modules.model_gateway.models import ModelGatewayRequest, ModelGatewayResponse, ModelTaskType
+from modules.model_gateway.providers.local_safety import LocalSafetyProvider
+from modules.model_gateway.resilience import GatewayResilience
+from modules.model_gateway.result_cache import SafetyResultCache
+from modules.model_gateway.scheduler import OFFLINE_BATCH_BULKHEAD, build_scheduler
+from modules.model_gateway.service import ModelGatewayService
+from modules.storage.in_memory import InMemoryStore
+
+NLU = ModelTaskType.SAFETY_NLU_FAST
+SEMANTIC = ModelTaskType.SAFETY_SEMANTIC_JUDGE
+
+
+class _CountingStore(InMemoryStore):
+    def __init__(self) -> None:
+        super().__init__()
+        self.single_writes = 0
+        self.batch_writes = 0
+
+    def save_model_invocation(self, record) -> None:
+        self.single_writes += 1
+        super().save_model_invocation(record)
+
+    def save_model_invocations(self, records) -> None:
+        self.batch_writes += 1
+        super().save_model_invocations(records)
+
+
+class _ThreadedProvider:
+    """Per-request provider that tracks peak concurrency and fails on a marker text."""
+
+    def __init__(self, delay_seconds: float = 0.01) -> None:
+        self.delay_seconds = delay_seconds
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def infer(self, request: ModelGatewayRequest) -> ModelGatewayResponse:
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay_seconds)
+            if request.text == "boom":
+                raise ValueError("bad input")
+            return ModelGatewayResponse(
+                task_type=request.task_type,
+                provider="stub-safety",
+                risk_level=None,
+                reasons=[request.text],
+                latency_ms=1.0,
+            )
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class _NativeBatchProvider(_ThreadedProvider):
+    def __init__(self) -> None:
+        super().__init__(delay_seconds=0.0)
+        self.chunks = []
+
+    def infer_many(self, requests):
+        self.chunks.append(len(requests))
+        return [self.infer(request) for request in requests]
+
+
+def _gateway(provider, store: InMemoryStore, cache: SafetyResultCache = None, config=None):
+    config = config or ModelGatewayRoutingConfig()
+    return ModelGatewayService(
+        providers={NLU: provider, SEMANTIC: provider},
+        config=config,
+        audit_store=store,
+        scheduler=build_scheduler(config),
+        resilience=GatewayResilience(config),
+        result_cache=cache,
+    )
+
+
+def _requests(texts, task_type: str = NLU):
+    return [ModelGatewayRequest(task_type=task_type, text=text) for text in texts]
+
+
+class GatewayBatchInferenceTests(unittest.TestCase):
+    def test_results_are_yielded_in_input_order_with_bounded_parallelism(self) -> None:
+        provider = _ThreadedProvider()
+        gateway = _gateway(provider, InMemoryStore())
+        texts = [f"message {index}" for index in range(12)]
+
+        results = list(gateway.infer_batch(_requests(texts), max_parallelism=3, chunk_size=5))
+
+        self.assertEqual([item.index for item in results], list(range(12)))
+        self.assertEqual([item.response.reasons[0] for item in results], texts)
+        self.assertLessEqual(provider.peak, 3)
+        self.assertGreater(provider.peak, 1)
+        self.assertEqual(gateway.scheduler.snapshot()["active"], 0)
+
+    def test_each_chunk_is_audited_with_one_write(self) -> None:
+        store = _CountingStore()
+        gateway = _gateway(_ThreadedProvider(delay_seconds=0.0), store)
+
+        results = list(gateway.infer_batch(_requests([str(index) for index in range(10)]), chunk_size=4))
+
+        self.assertEqual(len(results), 10)
+        self.assertEqual(store.batch_writes, 3)
+        self.assertEqual(store.single_writes, 0)
+        self.assertEqual(len(store.model_invocations), 10)
+        batch_ids = {record.metadata["batch_id"] for record in store.model_invocations}
+        self.assertEqual(batch_ids, {results[0].response.raw["batch_id"]})
+
+    def test_results_stream_back_before_the_batch_finishes(self) -> None:
+        store = _CountingStore()
+        gateway = _gateway(_ThreadedProvider(delay_seconds=0.0), store)
+
+        stream = gateway.infer_batch(_requests([str(index) for index in range(6)]), chunk_size=2)
+        first = next(stream)
+
+        self.assertEqual(first.index, 0)
+        self.assertEqual(store.batch_writes, 1)
+        stream.close()
+
+    def test_failed_item_is_reported_without_aborting_the_batch(self) -> None:
+        store = InMemoryStore()
+        gateway = _gateway(_ThreadedProvider(delay_seconds=0.0), store)
+
+        results = list(gateway.infer_batch(_requests(["ok", "boom", "fine"])))
+
+        self.assertEqual([item.ok for item in results], [True, False, True])
+        self.assertIn("bad input", results[1].error)
+        self.assertEqual([record.success for record in store.model_invocations], [True, False, True])
+
+    def test_provider_native_batch_receives_whole_chunks(self) -> None:
+        provider = _NativeBatchProvider()
+        gateway = _gateway(provider, InMemoryStore())
+
+        results = list(gateway.infer_batch(_requests([str(index) for index in range(7)]), chunk_size=3))
+
+        self.assertEqual(provider.chunks, [3, 3, 1])
+        self.assertTrue(all(item.ok for item in results))
+
+    def test_local_safety_provider_batches_natively(self) -> None:
+        gateway = _gateway(LocalSafetyProvider(), InMemoryStore())
+
+        results = list(gateway.infer_batch(_requests(["I feel calm", "I want to die"], task_type=SEMANTIC)))
+
+        self.assertEqual(len(results), 2)
+        self.assertGreater(results[1].response.risk_level, results[0].response.risk_level)
+
+    def test_batch_bypasses_the_result_cache(self) -> None:
+        cache = SafetyResultCache()
+        gateway = _gateway(_ThreadedProvider(delay_seconds=0.0), InMemoryStore(), cache)
+
+        list(gateway.infer_batch(_requests(["a", "b", "a"])))
+
+        self.assertEqual(cache.snapshot()["entries"], 0)
+
+    def test_batch_items_hold_slots_from_the_capped_offline_bulkhead(self) -> None:
+        provider = _ThreadedProvider()
+        gateway = _gateway(provider, InMemoryStore(), config=ModelGatewayRoutingConfig(batch_concurrency=2))
+
+        results = list(gateway.infer_batch(_requests([str(index) for index in range(8)]), max_parallelism=6))
+
+        self.assertEqual(len(results), 8)
+        self.assertLessEqual(provider.peak, 2)
+        tasks = gateway.scheduler.snapshot()["tasks"]
+        self.assertEqual(tasks[OFFLINE_BATCH_BULKHEAD]["admitted"], 8)
+        self.assertEqual(tasks[NLU]["admitted"], 0)
+
+    def test_live_safety_is_dispatched_before_queued_batch_work(self) -> None:
+        scheduler = build_scheduler(ModelGatewayRoutingConfig(max_inflight=1))
+        holder = scheduler.acquire(OFFLINE_BATCH_BULKHEAD)
+        order = []
+
+        def _worker(task_type: str) -> None:
+            with scheduler.acquire(task_type):
+                order.append(task_type)
+
+        threads = []
+        for task_type in (OFFLINE_BATCH_BULKHEAD, NLU):
+            thread = threading.Thread(target=_worker, args=(task_type,))
+            thread.start()
+            threads.append(thread)
+            deadline = time.monotonic() + 2.0
+            while scheduler.snapshot()["tasks"][task_type]["queued"] < 1:
+                self.assertLess(time.monotonic(), deadline)
+                time.sleep(0.001)
+
+        holder.release()
+        for thread in threads:
+            thread.join(timeout=2)
+
+        self.assertEqual(order, [NLU, OFFLINE_BATCH_BULKHEAD])
+
+    def test_mixed_task_types_are_rejected(self) -> None:
+        gateway = _gateway(_ThreadedProvider(), InMemoryStore())
+        requests = _requests(["a"]) + _requests(["b"], task_type=SEMANTIC)
+
+        with self.assertRaises(ValueError):
+            list(gateway.infer_batch(requests))
+
+
+if __name__ == "__main__":
+    unittest.main()
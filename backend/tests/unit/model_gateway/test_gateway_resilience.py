@@ -0,0 +1,227 @@
+import asyncio
+import time
+import unittest
+
+import httpx
+
+from backend.tests.bootstrap import configure_import_path
+
+configure_import_path()
+
+from modules.model_gateway.config import ModelGatewayRoutingConfig
+from modules.model_gateway.models import ModelGatewayRequest, ModelGatewayResponse, ModelTaskType
+from modules.model_gateway.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    GatewayResilience,
+    RetryBudget,
+)
+from modules.model_gateway.scheduler import build_scheduler
+from modules.model_gateway.service import ModelGatewayService
+from modules.observability.service import ModelObservabilityService
+from modules.storage.in_memory import InMemoryStore
+
+COACH = ModelTaskType.COACH_GENERATION
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _response(request: ModelGatewayRequest, text: str) -> ModelGatewayResponse:
+    return ModelGatewayResponse(
+        task_type=request.task_type,
+        provider="stub",
+        risk_level=None,
+        reasons=[],
+        latency_ms=0.0,
+        output_text=text,
+    )
+
+
+class _FlakyProvider:
+    """Fails with a transient transport error for the first ``failures`` calls."""
+
+    def __init__(self, failures: int) -> None:
+        self.failures = failures
+        self.calls = 0
+
+    def infer(self, request: ModelGatewayRequest) -> ModelGatewayResponse:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise httpx.ConnectError("connection refused")
+        return _response(request, "recovered")
+
+
+class _SlowFirstProvider:
+    def __init__(self, slow_seconds: float) -> None:
+        self.slow_seconds = slow_seconds
+        self.calls = 0
+
+    async def ainfer(self, request: ModelGatewayRequest) -> ModelGatewayResponse:
+        self.calls += 1
+        if self.calls == 1:
+            await asyncio.sleep(self.slow_seconds)
+            return _response(request, "primary")
+        return _response(request, "hedge")
+
+
+def _gateway(provider, config: ModelGatewayRoutingConfig, clock=time.monotonic):
+    store = InMemoryStore()
+    gateway = ModelGatewayService(
+        providers={COACH: provider},
+        config=config,
+        audit_store=store,
+        scheduler=build_scheduler(config),
+        resilience=GatewayResilience(config, clock=clock),
+    )
+    return gateway, store
+
+
+class CircuitBreakerTests(unittest.TestCase):
+    def test_trips_on_error_rate_and_recovers_through_half_open_probe(self) -> None:
+        clock = _FakeClock()
+        breaker = CircuitBreaker("stub", failure_rate_threshold=0.5, window_size=4, min_calls=4, open_ms=1000, clock=clock)
+
+        for _ in range(2):
+            self.assertTrue(breaker.try_acquire())
+            breaker.record_success(10.0)
+        for _ in range(2):
+            self.assertTrue(breaker.try_acquire())
+            breaker.record_failure()
+
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+        self.assertFalse(breaker.try_acquire())
+
+        clock.now += 1.5
+        self.assertEqual(breaker.state, CircuitState.HALF_OPEN)
+        self.assertTrue(breaker.try_acquire())
+        self.assertFalse(breaker.try_acquire())
+        breaker.record_success(10.0)
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+        self.assertEqual(breaker.snapshot()["trips"], 1)
+
+    def test_slow_calls_trip_and_failed_probe_reopens(self) -> None:
+        clock = _FakeClock()
+        breaker = CircuitBreaker("stub", slow_call_ms=100, window_size=3, min_calls=3, open_ms=1000, clock=clock)
+
+        for _ in range(3):
+            breaker.try_acquire()
+            breaker.record_success(250.0)
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+
+        clock.now += 1.0
+        self.assertTrue(breaker.try_acquire())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+        self.assertEqual(breaker.snapshot()["trips"], 2)
+
+
+class RetryBudgetTests(unittest.TestCase):
+    def test_allowance_scales_with_recent_requests(self) -> None:
+        clock = _FakeClock()
+        budget = RetryBudget(ratio=0.1, min_per_window=1, window_seconds=10, clock=clock)
+
+        self.assertTrue(budget.try_spend())
+        self.assertFalse(budget.try_spend())
+
+        for _ in range(30):
+            budget.record_request()
+        self.assertTrue(budget.try_spend())
+        self.assertTrue(budget.try_spend())
+        self.assertFalse(budget.try_spend())
+
+        clock.now += 11
+        self.assertTrue(budget.try_spend())
+        self.assertEqual(budget.snapshot()["denied"], 2)
+
+
+class GatewayResilienceTests(unittest.TestCase):
+    def test_transient_failure_is_retried_within_budget(self) -> None:
+        provider = _FlakyProvider(failures=1)
+        gateway, store = _gateway(provider, ModelGatewayRoutingConfig(retry_max_attempts=1))
+
+        response = gateway.run(COACH, "hello")
+
+        self.assertEqual(response.output_text, "recovered")
+        self.assertEqual(response.raw["retries"], 1)
+        self.assertEqual(provider.calls, 2)
+        self.assertTrue(store.model_invocations[-1].success)
+
+    def test_exhausted_retry_budget_surfaces_the_error(self) -> None:
+        provider = _FlakyProvider(failures=100)
+        config = ModelGatewayRoutingConfig(
+            retry_max_attempts=3,
+            retry_budget_ratio=0.0,
+            retry_budget_min_per_window=1,
+            breaker_min_calls=100,
+        )
+        gateway, _ = _gateway(provider, config)
+
+        with self.assertRaises(httpx.ConnectError):
+            gateway.run(COACH, "hello")
+        self.assertEqual(provider.calls, 2)
+
+        with self.assertRaises(httpx.ConnectError):
+            gateway.run(COACH, "hello")
+        self.assertEqual(provider.calls, 3)
+
+    def test_open_circuit_fails_fast_without_calling_provider(self) -> None:
+        clock = _FakeClock()
+        provider = _FlakyProvider(failures=3)
+        config = ModelGatewayRoutingConfig(
+            retry_max_attempts=0,
+            breaker_window_size=3,
+            breaker_min_calls=3,
+            breaker_open_ms=5000,
+        )
+        gateway, store = _gateway(provider, config, clock=clock)
+
+        for _ in range(3):
+            with self.assertRaises(httpx.ConnectError):
+                gateway.run(COACH, "hello")
+
+        started = time.perf_counter()
+        with self.assertRaises(CircuitOpenError):
+            gateway.run(COACH, "hello")
+        self.assertLess((time.perf_counter() - started) * 1000, 50.0)
+        self.assertEqual(provider.calls, 3)
+        self.assertIn("Circuit open", store.model_invocations[-1].error or "")
+
+        clock.now += 6
+        self.assertEqual(gateway.run(COACH, "hello").output_text, "recovered")
+        snapshot = gateway.resilience.snapshot()["circuit_breakers"]["_FlakyProvider"]
+        self.assertEqual(snapshot["state"], CircuitState.CLOSED)
+
+    def test_hedged_request_returns_faster_copy(self) -> None:
+        config = ModelGatewayRoutingConfig(hedge_enabled=True, hedge_min_delay_ms=10)
+        provider = _SlowFirstProvider(slow_seconds=1.0)
+        gateway, _ = _gateway(provider, config)
+        for _ in range(GatewayResilience.HEDGE_MIN_SAMPLES):
+            gateway.resilience.record_latency("_SlowFirstProvider", 5.0)
+
+        started = time.perf_counter()
+        response = asyncio.run(gateway.arun(COACH, "hello"))
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        self.assertEqual(response.output_text, "hedge")
+        self.assertTrue(response.raw["hedge_won"])
+        self.assertLess(elapsed_ms, 500.0)
+        self.assertEqual(gateway.resilience.snapshot()["hedging"]["hedged_requests"], {"_SlowFirstProvider": 1})
+
+    def test_observability_reports_breakers_and_retry_budget(self) -> None:
+        status = ModelObservabilityService(InMemoryStore()).model_gateway_status()
+
+        self.assertIn("scheduler", status)
+        self.assertIn("circuit_breakers", status)
+        self.assertIn("allowance", status["retry_budget"])
+        self.assertIn("enabled", status["hedging"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+import asyncio
+import threading
+import time
+import unittest
+from typing import List
+
+from backend.tests.bootstrap import configure_import_path
+
+configure_import_path()
+
+from modules.model_gateway.models import ModelTaskType
+from modules.model_gateway.scheduler import (
+    GatewayOverloadedError,
+    GatewayScheduler,
+    TaskBulkheadPolicy,
+)
+from modules.model_gateway.service import ModelGatewayService
+from modules.storage.in_memory import InMemoryStore
+
+SAFETY = ModelTaskType.SAFETY_NLU_FAST
+COACH = ModelTaskType.COACH_GENERATION
+
+
+def _scheduler(
+    max_inflight: int = 8,
+    coach_concurrency: int = 1,
+    coach_queue_ms: int = 2000,
+    coach_depth: int = 16,
+) -> GatewayScheduler:
+    return GatewayScheduler(
+        policies={
+            SAFETY: TaskBulkheadPolicy(concurrency=4, priority=0),
+            COACH: TaskBulkheadPolicy(
+                concurrency=coach_concurrency,
+                priority=1,
+                max_queue_ms=coach_queue_ms,
+                max_queue_depth=coach_depth,
+            ),
+        },
+        max_inflight=max_inflight,
+    )
+
+
+def _wait_for_queued(scheduler: GatewayScheduler, task_type: str, count: int) -> None:
+    deadline = time.monotonic() + 2.0
+    while scheduler.snapshot()["tasks"][task_type]["queued"] < count:
+        if time.monotonic() > deadline:
+            raise AssertionError(f"{task_type} never reached {count} queued waiters")
+        time.sleep(0.001)
+
+
+class GatewaySchedulerTests(unittest.TestCase):
+    def test_saturated_coach_bulkhead_does_not_block_safety(self) -> None:
+        scheduler = _scheduler(coach_concurrency=1)
+        coach_lease = scheduler.acquire(COACH)
+
+        started = time.perf_counter()
+        with scheduler.acquire(SAFETY) as safety_lease:
+            self.assertLess(safety_lease.queue_ms, 50.0)
+        self.assertLess((time.perf_counter() - started) * 1000, 50.0)
+
+        coach_lease.release()
+        snapshot = scheduler.snapshot()
+        self.assertEqual(snapshot["active"], 0)
+        self.assertEqual(snapshot["tasks"][COACH]["admitted"], 1)
+
+    def test_freed_shared_slot_goes_to_safety_before_earlier_coach_waiter(self) -> None:
+        scheduler = _scheduler(max_inflight=1, coach_concurrency=4)
+        holder = scheduler.acquire(COACH)
+        order: List[str] = []
+
+        def _worker(task_type: str) -> None:
+            with scheduler.acquire(task_type):
+                order.append(task_type)
+
+        coach_thread = threading.Thread(target=_worker, args=(COACH,))
+        coach_thread.start()
+        _wait_for_queued(scheduler, COACH, 1)
+        safety_thread = threading.Thread(target=_worker, args=(SAFETY,))
+        safety_thread.start()
+        _wait_for_queued(scheduler, SAFETY, 1)
+
+        holder.release()
+        coach_thread.join(timeout=2)
+        safety_thread.join(timeout=2)
+        self.assertEqual(order, [SAFETY, COACH])
+
+    def test_coach_waiter_is_shed_after_queue_deadline(self) -> None:
+        scheduler = _scheduler(coach_queue_ms=20)
+        holder = scheduler.acquire(COACH)
+
+        started = time.perf_counter()
+        with self.assertRaises(GatewayOverloadedError):
+            scheduler.acquire(COACH)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        holder.release()
+
+        self.assertGreaterEqual(elapsed_ms, 15.0)
+        self.assertLess(elapsed_ms, 500.0)
+        snapshot = scheduler.snapshot()["tasks"][COACH]
+        self.assertEqual(snapshot["shed"], 1)
+        self.assertEqual(snapshot["queued"], 0)
+
+    def test_full_coach_queue_sheds_immediately(self) -> None:
+        scheduler = _scheduler(coach_depth=0)
+        holder = scheduler.acquire(COACH)
+
+        with self.assertRaises(GatewayOverloadedError):
+            scheduler.acquire(COACH)
+        holder.release()
+
+        with scheduler.acquire(COACH) as lease:
+            self.assertGreaterEqual(lease.queue_ms, 0.0)
+
+    def test_async_waiter_is_granted_when_thread_releases(self) -> None:
+        scheduler = _scheduler()
+        holder = scheduler.acquire(COACH)
+
+        async def _run() -> float:
+            threading.Timer(0.02, holder.release).start()
+            lease = await scheduler.aacquire(COACH)
+            lease.release()
+            return lease.queue_ms
+
+        queue_ms = asyncio.run(_run())
+        self.assertGreaterEqual(queue_ms, 10.0)
+        self.assertEqual(scheduler.snapshot()["active"], 0)
+
+    def test_cancelled_async_waiter_leaves_queue(self) -> None:
+        scheduler = _scheduler()
+        holder = scheduler.acquire(COACH)
+
+        async def _run() -> None:
+            task = asyncio.ensure_future(scheduler.aacquire(COACH))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(_run())
+        holder.release()
+        snapshot = scheduler.snapshot()
+        self.assertEqual(snapshot["tasks"][COACH]["queued"], 0)
+        self.assertEqual(snapshot["active"], 0)
+
+
+class GatewaySchedulingIntegrationTests(unittest.TestCase):
+    def test_shed_coach_request_is_audited_and_records_queue_time(self) -> None:
+        store = InMemoryStore()
+        scheduler = _scheduler(coach_depth=0)
+        gateway = ModelGatewayService(audit_store=store, scheduler=scheduler)
+
+        holder = scheduler.acquire(COACH)
+        with self.assertRaises(GatewayOverloadedError):
+            gateway.run(COACH, "hello", metadata={"style_id": "warm_guide"})
+        holder.release()
+
+        gateway.run(SAFETY, "I feel stressed")
+        self.assertEqual(len(store.model_invocations), 2)
+        shed, served = store.model_invocations
+        self.assertFalse(shed.success)
+        self.assertIn("queue is full", shed.error or "")
+        self.assertTrue(served.success)
+        self.assertGreaterEqual(served.to_dict()["queue_ms"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
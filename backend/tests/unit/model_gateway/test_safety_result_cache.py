@@ -0,0 +1,239 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from backend.tests.bootstrap import configure_import_path
+
+configure_import_path()
+
+from modules.model_gateway.config import ModelGatewayRoutingConfig
+from modules.model_gateway.models import ModelGatewayRequest, ModelGatewayResponse, ModelTaskType
+from modules.model_gateway.providers.local_safety import LocalSafetyProvider
+from modules.model_gateway.resilience import GatewayResilience
+from modules.model_gateway.result_cache import SafetyResultCache, build_cache_key
+from modules.model_gateway.scheduler import build_scheduler
+from modules.model_gateway.service import ModelGatewayService
+from modules.storage.in_memory import InMemoryStore
+
+NLU = ModelTaskType.SAFETY_NLU_FAST
+SEMANTIC = ModelTaskType.SAFETY_SEMANTIC_JUDGE
+COACH = ModelTaskType.COACH_GENERATION
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _CountingSafetyProvider:
+    """Versioned stub whose calls can be held open to exercise single-flight."""
+
+    def __init__(self, version: str = "v1", delay_seconds: float = 0.0, fail: bool = False) -> None:
+        self.cache_version = version
+        self.delay_seconds = delay_seconds
+        self.fail = fail
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def infer(self, request: ModelGatewayRequest) -> ModelGatewayResponse:
+        with self._lock:
+            self.calls += 1
+        if self.delay_seconds:
+            time.sleep(self.delay_seconds)
+        if self.fail:
+            raise RuntimeError("classifier unavailable")
+        return ModelGatewayResponse(
+            task_type=request.task_type,
+            provider="stub-safety",
+            risk_level="low",
+            reasons=["stub"],
+            latency_ms=1.0,
+        )
+
+    async def ainfer(self, request: ModelGatewayRequest) -> ModelGatewayResponse:
+        with self._lock:
+            self.calls += 1
+        await asyncio.sleep(self.delay_seconds)
+        return ModelGatewayResponse(
+            task_type=request.task_type,
+            provider="stub-safety",
+            risk_level="low",
+            reasons=["stub"],
+            latency_ms=1.0,
+        )
+
+
+def _gateway(provider, cache: SafetyResultCache, task_type: str = NLU):
+    config = ModelGatewayRoutingConfig()
+    store = InMemoryStore()
+    gateway = ModelGatewayService(
+        providers={task_type: provider},
+        config=config,
+        audit_store=store,
+        scheduler=build_scheduler(config),
+        resilience=GatewayResilience(config),
+        result_cache=cache,
+    )
+    return gateway, store
+
+
+class SafetyResultCacheTests(unittest.TestCase):
+    def test_repeated_text_is_served_from_cache_and_audited(self) -> None:
+        provider = _CountingSafetyProvider()
+        gateway, store = _gateway(provider, SafetyResultCache())
+
+        first = gateway.run(NLU, "I feel stressed")
+        second = gateway.run(NLU, "  I FEEL STRESSED ")
+
+        self.assertEqual(provider.calls, 1)
+        self.assertEqual(first.raw["cache"], "miss")
+        self.assertEqual(second.raw["cache"], "hit")
+        self.assertEqual(second.raw["cached_trace_id"], first.trace_id)
+        self.assertNotEqual(second.trace_id, first.trace_id)
+        self.assertEqual(second.risk_level, first.risk_level)
+        self.assertEqual(len(store.model_invocations), 2)
+        self.assertTrue(all(item.success for item in store.model_invocations))
+
+    def test_cached_copies_do_not_alias_stored_entry(self) -> None:
+        gateway, _ = _gateway(_CountingSafetyProvider(), SafetyResultCache())
+
+        gateway.run(NLU, "hello").reasons.append("mutated")
+        self.assertEqual(gateway.run(NLU, "hello").reasons, ["stub"])
+
+    def test_locale_and_task_type_are_part_of_the_key(self) -> None:
+        provider = _CountingSafetyProvider()
+        gateway, _ = _gateway(provider, SafetyResultCache())
+
+        gateway.run(NLU, "hello", locale="en-US")
+        gateway.run(NLU, "hello", locale="zh-CN")
+        self.assertEqual(provider.calls, 2)
+
+        request = ModelGatewayRequest(task_type=SEMANTIC, text="hello")
+        nlu_request = ModelGatewayRequest(task_type=NLU, text="hello")
+        self.assertNotEqual(build_cache_key(request, provider), build_cache_key(nlu_request, provider))
+
+    def test_entries_expire_after_ttl(self) -> None:
+        clock = _FakeClock()
+        provider = _CountingSafetyProvider()
+        gateway, _ = _gateway(provider, SafetyResultCache(ttl_seconds=10, clock=clock))
+
+        gateway.run(NLU, "hello")
+        clock.now += 5
+        self.assertEqual(gateway.run(NLU, "hello").raw["cache"], "hit")
+        clock.now += 6
+        self.assertEqual(gateway.run(NLU, "hello").raw["cache"], "miss")
+        self.assertEqual(provider.calls, 2)
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        provider = _CountingSafetyProvider()
+        cache = SafetyResultCache(max_entries=2)
+        gateway, _ = _gateway(provider, cache)
+
+        gateway.run(NLU, "a")
+        gateway.run(NLU, "b")
+        gateway.run(NLU, "a")
+        gateway.run(NLU, "c")
+
+        self.assertEqual(cache.snapshot()["entries"], 2)
+        self.assertEqual(gateway.run(NLU, "a").raw["cache"], "hit")
+        self.assertEqual(gateway.run(NLU, "b").raw["cache"], "miss")
+
+    def test_concurrent_identical_requests_share_one_inference(self) -> None:
+        provider = _CountingSafetyProvider(delay_seconds=0.05)
+        cache = SafetyResultCache()
+        gateway, _ = _gateway(provider, cache)
+        statuses = []
+
+        def _worker() -> None:
+            statuses.append(gateway.run(NLU, "same message").raw["cache"])
+
+        threads = [threading.Thread(target=_worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=2)
+
+        self.assertEqual(provider.calls, 1)
+        self.assertEqual(statuses.count("miss"), 1)
+        self.assertEqual(len(statuses), 8)
+        self.assertEqual(cache.snapshot()["in_flight"], 0)
+
+    def test_followers_never_see_the_leaders_response_object(self) -> None:
+        provider = _CountingSafetyProvider()
+        request = ModelGatewayRequest(task_type=NLU, text="hello")
+        cache = SafetyResultCache()
+        key = build_cache_key(request, provider)
+        _, flight, leader = cache._claim(key)
+        self.assertTrue(leader)
+
+        response = cache._lead(key, flight, lambda: provider.infer(request))
+        response.raw["cache"] = "miss"
+        response.latency_ms = 99.0
+
+        published = flight.result()
+        self.assertIsNot(published, response)
+        self.assertNotIn("cache", published.raw)
+        self.assertEqual(published.latency_ms, 1.0)
+
+    def test_async_callers_share_one_inference(self) -> None:
+        provider = _CountingSafetyProvider(delay_seconds=0.02)
+        gateway, _ = _gateway(provider, SafetyResultCache())
+
+        async def _run():
+            return await asyncio.gather(*(gateway.arun(NLU, "same message") for _ in range(5)))
+
+        responses = asyncio.run(_run())
+        self.assertEqual(provider.calls, 1)
+        self.assertEqual(sorted(item.raw["cache"] for item in responses), ["miss"] + ["shared"] * 4)
+
+    def test_failures_are_not_cached(self) -> None:
+        provider = _CountingSafetyProvider(fail=True)
+        cache = SafetyResultCache()
+        gateway, store = _gateway(provider, cache)
+
+        for _ in range(2):
+            with self.assertRaises(RuntimeError):
+                gateway.run(NLU, "hello")
+
+        self.assertEqual(provider.calls, 2)
+        self.assertEqual(cache.snapshot()["entries"], 0)
+        self.assertFalse(store.model_invocations[-1].success)
+
+    def test_provider_version_change_invalidates_entries(self) -> None:
+        provider = _CountingSafetyProvider(version="v1")
+        cache = SafetyResultCache()
+        gateway, _ = _gateway(provider, cache)
+
+        gateway.run(NLU, "hello")
+        provider.cache_version = "v2"
+        self.assertEqual(gateway.run(NLU, "hello").raw["cache"], "miss")
+        self.assertEqual(provider.calls, 2)
+        self.assertEqual(cache.snapshot()["invalidations"], 1)
+
+    def test_unversioned_providers_and_coach_are_not_cached(self) -> None:
+        provider = _CountingSafetyProvider(version="")
+        gateway, _ = _gateway(provider, SafetyResultCache())
+        gateway.run(NLU, "hello")
+        gateway.run(NLU, "hello")
+        self.assertEqual(provider.calls, 2)
+
+        self.assertIsNone(build_cache_key(ModelGatewayRequest(task_type=COACH, text="hello"), provider))
+
+    def test_local_safety_version_tracks_lexicon(self) -> None:
+        from modules.safety.lexicon.catalog import LOCALE_LEXICONS
+        from modules.safety.lexicon.compiled import LocaleLexicons
+
+        before = LocalSafetyProvider().cache_version
+        edited = {locale: dict(tiers) for locale, tiers in LOCALE_LEXICONS.items()}
+        edited["zh-CN"][("nlu", "low")] = list(edited["zh-CN"][("nlu", "low")]) + ["新词"]
+
+        self.assertNotEqual(LocalSafetyProvider(LocaleLexicons(edited)).cache_version, before)
+        self.assertEqual(LocalSafetyProvider(LocaleLexicons(LOCALE_LEXICONS)).cache_version, before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+import random
+import unittest
+
+from backend.tests.bootstrap import configure_import_path
+
+configure_import_path()
+
+from modules.observability.invocation_log import ModelInvocationLog
+from modules.observability.models import ModelInvocationRecord
+from modules.observability.service import ModelObservabilityService
+from modules.observability.sketch import LatencySketch
+from modules.storage.in_memory import InMemoryStore
+
+
+def _record(
+    index: int,
+    task_type: str = "safety_nlu_fast",
+    provider: str = "local-heuristic-nlu",
+    latency_ms: float = 1.0,
+    success: bool = True,
+) -> ModelInvocationRecord:
+    return ModelInvocationRecord(
+        trace_id=f"trace-{index}",
+        task_type=task_type,
+        provider=provider,
+        success=success,
+        latency_ms=latency_ms,
+        estimated_cost_usd=0.001,
+        input_chars=10,
+        output_chars=5,
+        input_tokens=100,
+        cached_input_tokens=25,
+    )
+
+
+class LatencySketchTests(unittest.TestCase):
+    def test_quantiles_stay_within_relative_accuracy(self) -> None:
+        rng = random.Random(7)
+        values = [rng.lognormvariate(3.0, 1.0) for _ in range(5000)]
+        sketch = LatencySketch(relative_accuracy=0.01)
+        sketch.extend(values)
+
+        ordered = sorted(values)
+        for q in (0.5, 0.9, 0.99):
+            exact = ordered[max(0, int(q * len(ordered) + 0.999999) - 1)]
+            self.assertAlmostEqual(sketch.quantile(q), exact, delta=exact * 0.011)
+        self.assertEqual(sketch.count, 5000)
+        self.assertEqual(sketch.quantile(1.0), ordered[-1])
+
+    def test_merged_sketches_match_a_single_sketch(self) -> None:
+        values = [float(value) for value in range(1, 1001)]
+        whole = LatencySketch()
+        whole.extend(values)
+        left, right = LatencySketch(), LatencySketch()
+        left.extend(values[:300])
+        right.extend(values[300:])
+
+        left.merge(right)
+
+        self.assertEqual(left.count, whole.count)
+        for percentile in (50, 90, 99):
+            self.assertEqual(left.percentile(percentile), whole.percentile(percentile))
+
+    def test_empty_and_zero_values(self) -> None:
+        sketch = LatencySketch()
+        self.assertEqual(sketch.quantile(0.99), 0.0)
+        sketch.extend([0.0, 0.0, 4.0])
+        self.assertEqual(sketch.percentile(50), 0.0)
+        self.assertAlmostEqual(sketch.percentile(99), 4.0, delta=0.05)
+
+
+class ModelInvocationLogTests(unittest.TestCase):
+    def test_ring_is_bounded_and_evicts_oldest_in_batches(self) -> None:
+        spilled = []
+        log = ModelInvocationLog(capacity=10, spill=spilled.extend, spill_batch=4)
+
+        for index in range(25):
+            log.append(_record(index))
+
+        self.assertLessEqual(len(log), 10)
+        self.assertEqual(log[-1].trace_id, "trace-24")
+        self.assertEqual([record.trace_id for record in spilled], [f"trace-{index}" for index in range(len(spilled))])
+        self.assertEqual(len(spilled) + len(log), 25)
+        self.assertEqual(log.spilled, len(spilled))
+
+    def test_stats_cover_records_that_left_the_ring(self) -> None:
+        log = ModelInvocationLog(capacity=5, spill_batch=1)
+        for index in range(50):
+            log.append(_record(index, latency_ms=float(index + 1), success=index % 10 != 0))
+
+        stats = log.group_stats()[("safety_nlu_fast", "local-heuristic-nlu")].to_summary()
+
+        self.assertEqual(len(log), 5)
+        self.assertEqual(stats["total"], 50)
+        self.assertEqual(stats["failure"], 5)
+        self.assertAlmostEqual(stats["p50_latency_ms"], 25.0, delta=0.5)
+        self.assertAlmostEqual(stats["p99_latency_ms"], 50.0, delta=0.6)
+        self.assertEqual(stats["prefix_cache_hit_rate"], 0.25)
+
+    def test_stats_rotate_out_of_the_window(self) -> None:
+        now = [0.0]
+        log = ModelInvocationLog(capacity=100, bucket_seconds=60, window_buckets=3, clock=lambda: now[0])
+        log.extend(_record(index, latency_ms=500.0) for index in range(10))
+        now[0] = 150.0
+        log.extend(_record(index, latency_ms=2.0) for index in range(10))
+        key = ("safety_nlu_fast", "local-heuristic-nlu")
+
+        self.assertEqual(log.group_stats()[key].total, 20)
+        recent = log.group_stats(window_seconds=60)[key].to_summary()
+        self.assertEqual(recent["total"], 10)
+        self.assertAlmostEqual(recent["p99_latency_ms"], 2.0, delta=0.05)
+
+        now[0] = 200.0
+        stats = log.group_stats()[key].to_summary()
+        self.assertEqual(stats["total"], 10)
+        self.assertAlmostEqual(stats["p99_latency_ms"], 2.0, delta=0.05)
+        now[0] = 400.0
+        self.assertEqual(log.group_stats(), {})
+
+    def test_failing_spill_does_not_raise(self) -> None:
+        def _broken(records) -> None:
+            raise RuntimeError("disk full")
+
+        log = ModelInvocationLog(capacity=1, spill=_broken, spill_batch=1)
+        log.extend([_record(0), _record(1)])
+        self.assertEqual(len(log), 1)
+
+
+class ModelInvocationSummaryTests(unittest.TestCase):
+    def test_summary_merges_groups_and_applies_filters(self) -> None:
+        store = InMemoryStore(model_invocations=ModelInvocationLog(capacity=3, spill_batch=1))
+        for index in range(20):
+            store.save_model_invocation(_record(index, latency_ms=2.0))
+        for index in range(10):
+            store.save_model_invocation(
+                _record(index, task_type="coach_generation", provider="openai:gpt-4o-mini", latency_ms=400.0)
+            )
+        obs = ModelObservabilityService(store)
+
+        summary = obs.summarize_model_invocations()
+        coach_only = obs.summarize_model_invocations(provider="OPENAI")
+
+        self.assertEqual(summary["totals"]["total"], 30)
+        self.assertEqual(summary["by_task_type"]["safety_nlu_fast"]["total"], 20)
+        self.assertAlmostEqual(summary["by_provider"]["openai:gpt-4o-mini"]["p90_latency_ms"], 400.0, delta=4.0)
+        self.assertEqual(list(coach_only["by_task_type"]), ["coach_generation"])
+        self.assertEqual(coach_only["totals"]["total"], 10)
+
+    def test_limit_summarizes_the_latest_records_and_window_uses_the_sketches(self) -> None:
+        store = InMemoryStore(model_invocations=ModelInvocationLog(capacity=100, spill_batch=1))
+        for index in range(20):
+            store.save_model_invocation(_record(index, latency_ms=2.0))
+        for index in range(5):
+            store.save_model_invocation(
+                _record(index, task_type="coach_generation", provider="openai:gpt-4o-mini", latency_ms=400.0)
+            )
+        obs = ModelObservabilityService(store)
+
+        latest = obs.summarize_model_invocations(limit=5)
+        latest_safety = obs.summarize_model_invocations(limit=8, task_type="safety_nlu_fast")
+        windowed = obs.summarize_model_invocations(window_seconds=60)
+
+        self.assertEqual(latest["totals"]["total"], 5)
+        self.assertEqual(latest_safety["totals"]["total"], 8)
+        self.assertEqual(list(latest_safety["by_task_type"]), ["safety_nlu_fast"])
+        self.assertEqual(windowed["totals"]["total"], 25)
+
+
+if __name__ == "__main__":
+    unittest.main()
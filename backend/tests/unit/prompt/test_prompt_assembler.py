@@ -0,0 +1,113 @@
+import json
+import unittest
+
+from backend.tests.bootstrap import configure_import_path
+
+configure_import_path()
+
+from modules.prompt.assembly import PromptAssembler, compact_value
+from modules.prompt.assembly.tokens import heuristic_token_count
+
+
+def _context() -> dict:
+    return {
+        "user_profile": {"user_id": "u1", "email": "u1@example.com", "locale": "zh-CN"},
+        "latest_assessment_scores": {
+            "phq9_score": 12,
+            "gad7_score": 9,
+            "cssrs_positive": False,
+            "scl90_global_index": 1.23456,
+            "scl90_dimension_scores": None,
+        },
+        "latest_triage": {"level": "moderate", "channel": "coach"},
+        "neurodiversity_scores": {
+            "asrs": {"level": "high", "score": 5.0, "source_result_id": "r1", "captured_at": "2026-01-01T00:00:00"},
+        },
+        "neurodiversity_prompt_fragments": ["folded into the system prompt"],
+        "expert_qa": {"policy": "folded into the system prompt"},
+        "memory_summaries": [f"older memory number {index} about work stress" for index in range(6)],
+        "relevant_memory_summaries": ["panic before presentations"],
+        "journal_summary": {"entry_count": 3, "latest_mood": "tired", "average_energy": 2.5},
+    }
+
+
+class CompactSerializationTests(unittest.TestCase):
+    def test_compact_value_drops_empty_fields_and_formats_scalars(self) -> None:
+        rendered = compact_value(_context()["latest_assessment_scores"])
+        self.assertEqual(rendered, "phq9_score=12; gad7_score=9; cssrs_positive=no; scl90_global_index=1.23")
+
+    def test_nested_dicts_honor_omitted_fields(self) -> None:
+        rendered = compact_value(_context()["neurodiversity_scores"], ("source_result_id", "captured_at"))
+        self.assertEqual(rendered, "asrs(level=high, score=5)")
+
+    def test_heuristic_counts_cjk_per_character(self) -> None:
+        self.assertEqual(heuristic_token_count("压力很大"), 4)
+        self.assertGreater(heuristic_token_count('{"a": "b"}'), heuristic_token_count("a=b"))
+
+
+class PromptAssemblerTests(unittest.TestCase):
+    def test_generous_budget_keeps_every_section_and_saves_tokens(self) -> None:
+        prompt = PromptAssembler(token_budget=4000, estimator=heuristic_token_count).assemble("Be kind.", "warm", _context(), "I feel tense")
+
+        context_message = prompt.messages[2]["content"]
+        self.assertTrue(context_message.startswith("Context:\ntriage: level=moderate"))
+        self.assertIn("profile: locale=zh-CN", context_message)
+        self.assertNotIn("u1@example.com", context_message)
+        self.assertNotIn("folded into the system prompt", context_message)
+        self.assertEqual(prompt.dropped_sections, [])
+        self.assertLess(prompt.input_tokens, prompt.baseline_tokens)
+        self.assertEqual(prompt.report()["tokens_saved"], prompt.baseline_tokens - prompt.input_tokens)
+        self.assertEqual(prompt.messages[-1], {"role": "user", "content": "I feel tense"})
+
+    def test_tight_budget_trims_lists_then_drops_lowest_priority_sections(self) -> None:
+        fixed = PromptAssembler(token_budget=4000, estimator=heuristic_token_count).assemble("Be kind.", "", {}, "I feel tense").input_tokens
+        prompt = PromptAssembler(token_budget=fixed + 110, estimator=heuristic_token_count).assemble("Be kind.", "", _context(), "I feel tense")
+
+        self.assertLessEqual(prompt.input_tokens, prompt.token_budget)
+        self.assertEqual(prompt.included_sections[:2], ["latest_triage", "latest_assessment_scores"])
+        self.assertEqual(prompt.trimmed_sections, ["memory_summaries"])
+        self.assertEqual(prompt.dropped_sections, ["neurodiversity_scores", "user_profile"])
+        self.assertFalse(prompt.report()["over_budget"])
+
+    def test_trimmed_recent_memories_keep_the_latest_items(self) -> None:
+        context = {"memory_summaries": _context()["memory_summaries"]}
+        fixed = PromptAssembler(token_budget=4000, estimator=heuristic_token_count).assemble("", "", {}, "hi").input_tokens
+        prompt = PromptAssembler(token_budget=fixed + 30, estimator=heuristic_token_count).assemble("", "", context, "hi")
+
+        self.assertEqual(prompt.trimmed_sections, ["memory_summaries"])
+        self.assertIn("older memory number 5", prompt.messages[0]["content"])
+        self.assertNotIn("older memory number 0", prompt.messages[0]["content"])
+
+    def test_long_lists_are_trimmed_in_logarithmic_renders(self) -> None:
+        context = {"memory_summaries": [f"memory {index}" for index in range(512)]}
+        fixed = PromptAssembler(token_budget=4000, estimator=heuristic_token_count).assemble("", "", {}, "hi").input_tokens
+        calls = []
+
+        def _counting(text: str) -> int:
+            calls.append(text)
+            return heuristic_token_count(text)
+
+        prompt = PromptAssembler(token_budget=fixed + 200, estimator=_counting).assemble("", "", context, "hi")
+
+        self.assertEqual(prompt.trimmed_sections, ["memory_summaries"])
+        self.assertIn("memory 511", prompt.messages[0]["content"])
+        self.assertLessEqual(prompt.input_tokens, prompt.token_budget)
+        self.assertLess(len(calls), 30)
+
+    def test_required_messages_are_kept_even_over_budget(self) -> None:
+        prompt = PromptAssembler(token_budget=1).assemble("Be kind.", "warm", _context(), "I feel tense")
+
+        self.assertEqual([message["role"] for message in prompt.messages], ["system", "system", "user"])
+        self.assertTrue(prompt.report()["over_budget"])
+        self.assertIn("latest_triage", prompt.dropped_sections)
+
+    def test_baseline_matches_previous_json_layout(self) -> None:
+        context = {"latest_triage": {"level": "low"}}
+        prompt = PromptAssembler(token_budget=4000, estimator=len).assemble("", "", context, "hi")
+
+        legacy = f"Context payload: {json.dumps(context, ensure_ascii=True)}"
+        self.assertEqual(prompt.baseline_tokens, 3 + (len(legacy) + 4) + (len("hi") + 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
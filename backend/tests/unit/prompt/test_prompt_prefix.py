@@ -0,0 +1,84 @@
+import unittest
+
+from backend.tests.bootstrap import configure_import_path
+
+configure_import_path()
+
+from modules.coach.models import CoachSession
+from modules.coach.session_service import CoachSessionService
+from modules.prompt.assembly import (
+    PromptAssembler,
+    build_prompt_prefix,
+    compose_system_prompt,
+    prompt_prefix_cache_info,
+)
+from modules.prompt.registry.runtime import get_prompt_registry, reset_prompt_registry_for_tests
+from modules.storage.in_memory import InMemoryStore
+from modules.user.models import User
+
+CONTEXT = {
+    "expert_qa": {"policy": "Explain plainly."},
+    "neurodiversity_prompt_fragments": ["Use short, structured steps."],
+    "latest_triage": {"level": "low"},
+}
+
+
+class PromptPrefixTests(unittest.TestCase):
+    def tearDown(self) -> None:
+        reset_prompt_registry_for_tests()
+
+    def test_identical_inputs_reuse_the_memoized_prefix(self) -> None:
+        first = build_prompt_prefix("warm_guide", CONTEXT)
+        hits_before = prompt_prefix_cache_info()["hits"]
+        second = build_prompt_prefix("warm_guide", dict(CONTEXT, latest_triage={"level": "high"}))
+
+        self.assertIs(first, second)
+        self.assertEqual(prompt_prefix_cache_info()["hits"], hits_before + 1)
+        self.assertIn("Explain plainly.", first.system_prompt)
+        self.assertIn("empathic", first.style_text.lower())
+
+    def test_style_and_pack_version_change_the_prefix(self) -> None:
+        warm = build_prompt_prefix("warm_guide", CONTEXT)
+        rational = build_prompt_prefix("rational_analysis", CONTEXT)
+        self.assertNotEqual(warm.prefix_id, rational.prefix_id)
+
+        get_prompt_registry().activate("2026.02.0")
+        older = build_prompt_prefix("warm_guide", CONTEXT)
+        self.assertEqual(older.pack_version, "2026.02.0")
+        self.assertNotEqual(older.prefix_id, warm.prefix_id)
+
+    def test_single_neurodiversity_fragment_keeps_its_heading(self) -> None:
+        composed = compose_system_prompt("Base.", None, ["Use short, structured steps."])
+        self.assertEqual(
+            composed,
+            "Base.\n\nAdditional neurodiversity adaptation guidance:\nUse short, structured steps.",
+        )
+
+    def test_coach_turns_share_a_byte_identical_leading_prefix(self) -> None:
+        store = InMemoryStore()
+        store.save_user(User(user_id="u1", email="u1@example.com", locale="en-US"))
+        service = CoachSessionService(store)
+        session = CoachSession(session_id="s1", user_id="u1", style_id="warm_guide")
+        assembler = PromptAssembler(token_budget=4000)
+
+        turns = []
+        for memory in ("slept badly", "argued with manager"):
+            _, metadata = service._build_generation_metadata(session, [memory])
+            turns.append(
+                assembler.assemble(
+                    system_prompt=metadata["system_prompt"],
+                    style_text=metadata["style_prompt"]["prompt"],
+                    context=metadata["context_prompt"],
+                    user_text=f"turn about {memory}",
+                )
+            )
+
+        first, second = turns
+        self.assertEqual(first.messages[:2], second.messages[:2])
+        self.assertNotEqual(first.messages[2], second.messages[2])
+        self.assertEqual(first.prefix_tokens, second.prefix_tokens)
+        self.assertGreater(first.prefix_tokens, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
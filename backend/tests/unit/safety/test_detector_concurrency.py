@@ -0,0 +1,192 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from backend.tests.bootstrap import configure_import_path
+
+configure_import_path()
+
+from modules.model_gateway.models import ModelGatewayResponse, ModelTaskType
+from modules.safety.config import SafetyDetectionConfig
+from modules.safety.detector_service import SafetyDetectorService
+from modules.safety.service import SafetyRuntimeService
+from modules.safety.slo import SafetyLatencyMonitor
+from modules.storage.in_memory import InMemoryStore
+from modules.triage.models import RiskLevel
+
+NLU = ModelTaskType.SAFETY_NLU_FAST
+SEMANTIC = ModelTaskType.SAFETY_SEMANTIC_JUDGE
+
+
+class _TimedGateway:
+    """Gateway stand-in whose stages take a fixed time and return fixed levels."""
+
+    def __init__(self, delays: dict, levels: dict) -> None:
+        self.delays = delays
+        self.levels = levels
+        self.calls = []
+        self.cancelled = []
+        self._lock = threading.Lock()
+
+    def _response(self, task_type: str) -> ModelGatewayResponse:
+        return ModelGatewayResponse(
+            task_type=task_type,
+            provider="stub",
+            risk_level=self.levels[task_type],
+            reasons=[f"{task_type}-reason"],
+            latency_ms=self.delays[task_type] * 1000,
+        )
+
+    def run(self, task_type: str, text: str, locale: str = "en-US", timeout_ms: int = 2000, metadata=None):
+        with self._lock:
+            self.calls.append(task_type)
+        time.sleep(self.delays[task_type])
+        return self._response(task_type)
+
+    async def arun(self, task_type: str, text: str, locale: str = "en-US", timeout_ms: int = 2000, metadata=None):
+        self.calls.append(task_type)
+        try:
+            await asyncio.sleep(self.delays[task_type])
+        except asyncio.CancelledError:
+            self.cancelled.append(task_type)
+            raise
+        return self._response(task_type)
+
+
+def _detector(gateway: _TimedGateway, **overrides) -> SafetyDetectorService:
+    config = SafetyDetectionConfig(**{"nlu_timeout_ms": 1000, "semantic_timeout_ms": 2000, **overrides})
+    return SafetyDetectorService(gateway=gateway, config=config)  # type: ignore[arg-type]
+
+
+class ConcurrentDetectionTests(unittest.TestCase):
+    def test_concurrent_mode_overlaps_the_two_stages(self) -> None:
+        delays = {NLU: 0.12, SEMANTIC: 0.12}
+        levels = {NLU: RiskLevel.LOW, SEMANTIC: RiskLevel.MEDIUM}
+
+        start = time.perf_counter()
+        concurrent = _detector(_TimedGateway(delays, levels)).detect("hello")
+        concurrent_s = time.perf_counter() - start
+        start = time.perf_counter()
+        sequential = _detector(_TimedGateway(delays, levels), execution_mode="sequential").detect("hello")
+        sequential_s = time.perf_counter() - start
+
+        self.assertEqual(concurrent.level, RiskLevel.MEDIUM)
+        self.assertEqual(concurrent.source, "nlu+semantic")
+        self.assertEqual(concurrent.reasons, sequential.reasons)
+        self.assertLess(concurrent_s, 0.2)
+        self.assertGreaterEqual(sequential_s, 0.24)
+
+    def test_high_nlu_verdict_does_not_wait_for_semantic(self) -> None:
+        gateway = _TimedGateway({NLU: 0.01, SEMANTIC: 0.5}, {NLU: RiskLevel.HIGH, SEMANTIC: RiskLevel.LOW})
+
+        start = time.perf_counter()
+        result = _detector(gateway).detect("I want to kill myself")
+
+        self.assertLess(time.perf_counter() - start, 0.3)
+        self.assertEqual(result.source, "nlu-short-circuit")
+        self.assertEqual(result.semantic_latency_ms, 0.0)
+
+    def test_sequential_mode_skips_semantic_after_high_nlu(self) -> None:
+        gateway = _TimedGateway({NLU: 0.0, SEMANTIC: 0.0}, {NLU: RiskLevel.HIGH, SEMANTIC: RiskLevel.LOW})
+
+        _detector(gateway, execution_mode="sequential").detect("I want to kill myself")
+
+        self.assertEqual(gateway.calls, [NLU])
+
+    def test_stage_deadlines_fail_closed(self) -> None:
+        slow_nlu = _TimedGateway({NLU: 0.3, SEMANTIC: 0.0}, {NLU: RiskLevel.LOW, SEMANTIC: RiskLevel.LOW})
+        slow_semantic = _TimedGateway({NLU: 0.0, SEMANTIC: 0.3}, {NLU: RiskLevel.LOW, SEMANTIC: RiskLevel.LOW})
+
+        start = time.perf_counter()
+        nlu_timeout = _detector(slow_nlu, nlu_timeout_ms=50).detect("hello")
+        self.assertLess(time.perf_counter() - start, 0.25)
+        semantic_timeout = _detector(slow_semantic, semantic_timeout_ms=50).detect("hello")
+
+        self.assertTrue(nlu_timeout.fail_closed)
+        self.assertEqual(nlu_timeout.level, RiskLevel.HIGH)
+        self.assertEqual(nlu_timeout.reasons, ["detector-timeout:safety_nlu_fast exceeded 50ms"])
+        self.assertTrue(semantic_timeout.fail_closed)
+        self.assertIn("safety_semantic_judge", semantic_timeout.reasons[0])
+
+
+class AsyncDetectionTests(unittest.TestCase):
+    def test_adetect_cancels_semantic_on_high_nlu(self) -> None:
+        gateway = _TimedGateway({NLU: 0.01, SEMANTIC: 0.5}, {NLU: RiskLevel.EXTREME, SEMANTIC: RiskLevel.LOW})
+
+        async def _run():
+            result = await _detector(gateway).adetect("I will end it tonight")
+            await asyncio.sleep(0)
+            return result
+
+        result = asyncio.run(_run())
+        self.assertEqual(result.level, RiskLevel.EXTREME)
+        self.assertEqual(gateway.cancelled, [SEMANTIC])
+
+    def test_adetect_enforces_deadline(self) -> None:
+        gateway = _TimedGateway({NLU: 0.3, SEMANTIC: 0.0}, {NLU: RiskLevel.LOW, SEMANTIC: RiskLevel.LOW})
+
+        result = asyncio.run(_detector(gateway, nlu_timeout_ms=20).adetect("hello"))
+
+        self.assertTrue(result.fail_closed)
+        self.assertIn(NLU, gateway.cancelled)
+
+    def test_saturated_pool_does_not_fail_benign_messages_closed(self) -> None:
+        gateway = _TimedGateway({NLU: 0.03, SEMANTIC: 0.03}, {NLU: RiskLevel.LOW, SEMANTIC: RiskLevel.LOW})
+        monitor = SafetyLatencyMonitor()
+        # Three workers for 24 callers: the last submissions queue for far longer than the 100 ms NLU deadline.
+        config = SafetyDetectionConfig(nlu_timeout_ms=100, semantic_timeout_ms=2000, max_workers=3, queue_timeout_ms=20)
+        detector = SafetyDetectorService(gateway=gateway, config=config, monitor=monitor)  # type: ignore[arg-type]
+        results = []
+        lock = threading.Lock()
+
+        def _caller(index: int) -> None:
+            result = detector.detect(f"I feel a bit stressed about exam {index}")
+            with lock:
+                results.append(result)
+
+        threads = [threading.Thread(target=_caller, args=(index,)) for index in range(24)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 24)
+        self.assertEqual([result for result in results if result.fail_closed], [])
+        stages = monitor.snapshot()["stages"]
+        self.assertGreater(stages["nlu_queue"]["timeouts"], 0)
+        self.assertGreater(stages["nlu_queue"]["count"], 0)
+        self.assertEqual(stages["nlu"]["timeouts"], 0)
+
+    def test_overflow_stage_still_fails_closed_at_its_deadline(self) -> None:
+        gateway = _TimedGateway({NLU: 0.5, SEMANTIC: 0.5}, {NLU: RiskLevel.LOW, SEMANTIC: RiskLevel.LOW})
+        config = SafetyDetectionConfig(nlu_timeout_ms=100, semantic_timeout_ms=100, max_workers=1, queue_timeout_ms=20)
+        detector = SafetyDetectorService(gateway=gateway, config=config, monitor=SafetyLatencyMonitor())  # type: ignore[arg-type]
+        # Occupy the only worker so the next detection's stages overflow.
+        blocker = threading.Thread(target=detector.detect, args=("first message",))
+        blocker.start()
+        time.sleep(0.05)
+
+        start = time.perf_counter()
+        result = detector.detect("second message")
+        elapsed = time.perf_counter() - start
+        blocker.join()
+
+        self.assertTrue(result.fail_closed)
+        self.assertEqual(result.level, RiskLevel.HIGH)
+        self.assertLess(elapsed, 0.4)
+
+    def test_async_runtime_matches_sync_runtime(self) -> None:
+        runtime = SafetyRuntimeService(InMemoryStore())
+
+        sync_result = runtime.assess_and_respond(user_id="u-1", locale="en-US", text="I feel hopeless")
+        async_result = asyncio.run(
+            runtime.aassess_and_respond(user_id="u-1", locale="en-US", text="I feel hopeless")
+        )
+
+        self.assertEqual(sync_result["detection"]["level"], async_result["detection"]["level"])
+        self.assertEqual(sync_result["action"], async_result["action"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,219 @@
+import tempfile
+import threading
+import time
+import unittest
+
+from backend.tests.bootstrap import configure_import_path
+
+configure_import_path()
+
+from modules.safety.config import OpsAlertDispatchConfig
+from modules.safety.ops_alert.dispatcher import OpsAlertDispatcher, get_shared_ops_alert_dispatcher
+from modules.safety.service import SafetyRuntimeService
+from modules.storage.in_memory import InMemoryStore
+from modules.storage.sqlite_store import SQLiteStore
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _RecordingSink:
+    def __init__(self, delay_seconds: float = 0.0, failures: int = 0, gate: threading.Event = None) -> None:
+        self.delay_seconds = delay_seconds
+        self.failures = failures
+        self.gate = gate
+        self.delivered = []
+
+    def deliver(self, alert) -> None:
+        if self.gate is not None:
+            self.gate.wait()
+        if self.delay_seconds:
+            time.sleep(self.delay_seconds)
+        if self.failures > 0:
+            self.failures -= 1
+            raise RuntimeError("pager unavailable")
+        self.delivered.append(alert.alert_id)
+
+
+class _YieldingCondition(threading.Condition):
+    """Hands the CPU to other threads on every release, widening any gap between critical sections."""
+
+    def __exit__(self, *args):
+        released = super().__exit__(*args)
+        time.sleep(0.002)
+        return released
+
+
+class _FlakyStore(InMemoryStore):
+    """Store whose outbox write fails the first ``failures`` times a delivered alert is saved."""
+
+    def __init__(self, failures: int = 1) -> None:
+        super().__init__()
+        self.failures = failures
+
+    def save_ops_alert(self, alert) -> None:
+        if alert.status == "delivered" and self.failures > 0:
+            self.failures -= 1
+            raise RuntimeError("database is locked")
+        super().save_ops_alert(alert)
+
+
+def _config(**overrides) -> OpsAlertDispatchConfig:
+    return OpsAlertDispatchConfig(**{"retry_backoff_ms": 0, "worker_idle_seconds": 1, **overrides})
+
+
+class OpsAlertDispatcherTests(unittest.TestCase):
+    def test_duplicates_in_a_window_collapse_into_one_alert(self) -> None:
+        clock = _FakeClock()
+        store = InMemoryStore()
+        sink = _RecordingSink()
+        dispatcher = OpsAlertDispatcher(store, sink=sink, config=_config(dedupe_window_seconds=60), clock=clock)
+
+        first, first_dup = dispatcher.submit("u-1", "high", "keyword")
+        second, second_dup = dispatcher.submit("u-1", "high", "keyword again")
+        other_level, _ = dispatcher.submit("u-1", "extreme", "plan")
+        clock.now += 60
+        next_window, next_dup = dispatcher.submit("u-1", "high", "keyword")
+        self.assertTrue(dispatcher.flush())
+
+        self.assertFalse(first_dup)
+        self.assertTrue(second_dup)
+        self.assertFalse(next_dup)
+        self.assertIs(second, first)
+        self.assertEqual(first.suppressed_count, 1)
+        self.assertEqual(len({first.alert_id, other_level.alert_id, next_window.alert_id}), 3)
+        self.assertEqual(len(sink.delivered), 3)
+        self.assertEqual(len(store.list_ops_alerts(status="delivered")), 3)
+        self.assertEqual(dispatcher.snapshot()["deduplicated"], 1)
+
+    def test_concurrent_duplicates_create_one_alert(self) -> None:
+        store = InMemoryStore()
+        dispatcher = OpsAlertDispatcher(store, sink=_RecordingSink(), config=_config(dedupe_window_seconds=3600))
+        dispatcher._condition = _YieldingCondition()
+        threads = 16
+        start = threading.Barrier(threads)
+        outcomes = []
+
+        def _submit(index: int) -> None:
+            start.wait()
+            outcomes.append(dispatcher.submit(f"u-{index % 2}", "high", "keyword"))
+
+        workers = [threading.Thread(target=_submit, args=(index,)) for index in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertTrue(dispatcher.flush())
+
+        originals = [alert for alert, duplicate in outcomes if not duplicate]
+        self.assertEqual(sorted(alert.user_id for alert in originals), ["u-0", "u-1"])
+        self.assertEqual(len(store.ops_alerts), 2)
+        self.assertEqual(sum(alert.suppressed_count for alert in originals), threads - 2)
+
+    def test_slow_sink_does_not_block_submit(self) -> None:
+        store = InMemoryStore()
+        dispatcher = OpsAlertDispatcher(store, sink=_RecordingSink(delay_seconds=0.2), config=_config())
+
+        start = time.perf_counter()
+        alert, _ = dispatcher.submit("u-1", "high", "keyword")
+        self.assertLess(time.perf_counter() - start, 0.1)
+        self.assertEqual(store.ops_alerts[alert.alert_id].status, "pending")
+
+        self.assertTrue(dispatcher.flush())
+        self.assertEqual(alert.status, "delivered")
+        self.assertGreaterEqual(alert.delivery_latency_ms, 150)
+        self.assertEqual(dispatcher.snapshot()["delivery_latency_ms"]["count"], 1)
+
+    def test_failed_deliveries_are_retried_then_kept_for_redelivery(self) -> None:
+        store = InMemoryStore()
+        flaky = _RecordingSink(failures=1)
+        dispatcher = OpsAlertDispatcher(store, sink=flaky, config=_config(max_attempts=2))
+        recovered, _ = dispatcher.submit("u-1", "high", "keyword")
+        self.assertTrue(dispatcher.flush())
+        self.assertEqual((recovered.status, recovered.attempts), ("delivered", 2))
+
+        down = _RecordingSink(failures=10)
+        dispatcher = OpsAlertDispatcher(InMemoryStore(), sink=down, config=_config(max_attempts=2))
+        lost, _ = dispatcher.submit("u-2", "high", "keyword")
+        self.assertTrue(dispatcher.flush())
+        self.assertEqual((lost.status, lost.last_error), ("failed", "pager unavailable"))
+
+        down.failures = 0
+        self.assertEqual(dispatcher.retry_failed(), 1)
+        self.assertTrue(dispatcher.flush())
+        self.assertEqual(down.delivered, [lost.alert_id])
+
+    def test_pending_alerts_survive_a_restart(self) -> None:
+        gate = threading.Event()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = f"{temp_dir}/alerts.db"
+            crashed = OpsAlertDispatcher(SQLiteStore(db_path=db_path), sink=_RecordingSink(gate=gate), config=_config())
+            alert, _ = crashed.submit("u-1", "extreme", "plan")
+
+            reopened = SQLiteStore(db_path=db_path)
+            sink = _RecordingSink()
+            dispatcher = OpsAlertDispatcher(reopened, sink=sink, config=_config())
+            self.assertTrue(dispatcher.flush())
+            gate.set()
+            crashed.flush()
+
+            self.assertEqual(sink.delivered, [alert.alert_id])
+            self.assertEqual([item.status for item in reopened.list_ops_alerts()], ["delivered"])
+            self.assertEqual(reopened.erase_user_data("u-1")["ops_alerts"], 1)
+            reopened.close()
+
+    def test_store_errors_in_the_worker_do_not_strand_later_alerts(self) -> None:
+        store = _FlakyStore(failures=1)
+        sink = _RecordingSink()
+        dispatcher = OpsAlertDispatcher(store, sink=sink, config=_config())
+
+        with self.assertLogs("modules.safety.ops_alert.dispatcher", level="ERROR"):
+            first, _ = dispatcher.submit("u-1", "high", "keyword")
+            self.assertTrue(dispatcher.flush())
+        second, _ = dispatcher.submit("u-2", "extreme", "plan")
+        self.assertTrue(dispatcher.flush())
+
+        self.assertEqual(sink.delivered, [first.alert_id, second.alert_id])
+        self.assertEqual([item.status for item in store.list_ops_alerts()], ["delivered", "delivered"])
+        snapshot = dispatcher.snapshot()
+        self.assertEqual((snapshot["store_errors"], snapshot["queued"], snapshot["delivered"]), (1, 0, 2))
+
+    def test_suppressed_duplicates_are_persisted(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = f"{temp_dir}/alerts.db"
+            store = SQLiteStore(db_path=db_path)
+            dispatcher = OpsAlertDispatcher(store, sink=_RecordingSink(), config=_config())
+            alert, _ = dispatcher.submit("u-1", "high", "keyword")
+            self.assertTrue(dispatcher.flush())
+            dispatcher.submit("u-1", "high", "keyword again")
+            dispatcher.submit("u-1", "high", "keyword once more")
+            store.close()
+
+            reopened = SQLiteStore(db_path=db_path)
+            [persisted] = reopened.list_ops_alerts()
+            self.assertEqual((persisted.alert_id, persisted.suppressed_count), (alert.alert_id, 2))
+            self.assertEqual(persisted.status, "delivered")
+            reopened.close()
+
+    def test_runtime_queues_one_alert_per_repeated_high_risk_message(self) -> None:
+        store = InMemoryStore()
+        runtime = SafetyRuntimeService(store)
+
+        first = runtime.assess_and_respond(user_id="u-1", locale="en-US", text="I want to kill myself")
+        second = runtime.assess_and_respond(user_id="u-1", locale="en-US", text="I want to kill myself")
+        self.assertTrue(get_shared_ops_alert_dispatcher(store).flush())
+
+        self.assertEqual(first["ops_event"]["delivery"], "queued")
+        self.assertEqual(second["ops_event"]["delivery"], "deduplicated")
+        self.assertEqual(second["ops_event"]["alert_id"], first["ops_event"]["alert_id"])
+        events = [event for event in store.list_tool_events("u-1") if event["tool"] == "ops-alert"]
+        self.assertEqual(len(events), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+from backend.tests.bootstrap import configure_import_path
+
+configure_import_path()
+
+from modules.safety.emergency.service import EmergencyService
+from modules.safety.hotline.resolver import HotlineResolver
+from modules.safety.interruption_service import SafetyInterruptionService
+from modules.safety.models import SafetyDetectionResult
+from modules.safety.policy.decision_table import SafetyDecisionTable
+from modules.safety.policy.engine import SafetyPolicyEngine
+from modules.storage.in_memory import InMemoryStore
+from modules.triage.models import RiskLevel
+
+
+class SafetyDecisionTableTests(unittest.TestCase):
+    def test_every_entry_matches_the_policy_services(self) -> None:
+        table = SafetyDecisionTable()
+        policy, hotline, emergency = SafetyPolicyEngine(), HotlineResolver(), EmergencyService()
+        for level in RiskLevel:
+            for locale in ("en-US", "zh-CN", "fr-FR", ""):
+                for legal_policy_enabled in (False, True):
+                    decision = table.lookup(level, locale, legal_policy_enabled)
+                    action = policy.resolve(level)
+                    label = (level, locale, legal_policy_enabled)
+                    self.assertEqual(decision.action_payload, action.to_dict(), label)
+                    self.assertEqual(decision.hotline, hotline.resolve(locale) if action.show_hotline else None, label)
+                    self.assertEqual(decision.notify_ops, action.notify_ops, label)
+                    self.assertEqual(
+                        decision.emergency_contact_notified,
+                        emergency.should_notify_emergency_contact(level, legal_policy_enabled),
+                        label,
+                    )
+
+    def test_lookups_reuse_prebuilt_entries(self) -> None:
+        table = SafetyDecisionTable()
+        self.assertEqual(len(table), len(RiskLevel) * 3 * 2)
+        self.assertIs(table.lookup(RiskLevel.HIGH, "de-DE"), table.lookup(RiskLevel.HIGH, "ja-JP"))
+        self.assertIs(
+            table.lookup(RiskLevel.MEDIUM, "en-US").action_payload,
+            table.lookup(RiskLevel.MEDIUM, "zh-CN").action_payload,
+        )
+
+    def test_prebuilt_fragments_are_read_only(self) -> None:
+        decision = SafetyDecisionTable().lookup(RiskLevel.HIGH, "en-US")
+        with self.assertRaises(TypeError):
+            decision.action_payload["mode"] = "continue"  # type: ignore[index]
+        with self.assertRaises(TypeError):
+            decision.hotline["phone"] = "000"  # type: ignore[index]
+
+    def test_interruption_responses_do_not_share_mutable_fragments(self) -> None:
+        service = SafetyInterruptionService(InMemoryStore())
+        detection = SafetyDetectionResult(level=RiskLevel.MEDIUM, source="nlu+semantic", reasons=["low-distress"])
+
+        first = service.handle(user_id="u-1", locale="zh-CN", detection=detection)
+        self.assertEqual(first["action"]["mode"], "safety_pause")
+        self.assertIsNone(first["ops_event"])
+        expected_hotline = dict(first["hotline"])
+        first["action"]["mode"] = "tampered"
+        first["action"]["message"] = ""
+        first["hotline"]["phone"] = "000"
+
+        second = service.handle(user_id="u-2", locale="zh-CN", detection=detection)
+
+        self.assertIsInstance(second["action"], dict)
+        self.assertEqual(second["action"]["mode"], "safety_pause")
+        self.assertNotEqual(second["action"]["message"], "")
+        self.assertEqual(second["hotline"], expected_hotline)
+        self.assertIsNot(first["detection"], second["detection"])
+
+
+if __name__ == "__main__":
+    unittest.main()
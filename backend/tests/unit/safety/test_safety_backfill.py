@@ -0,0 +1,133 @@
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from backend.tests.bootstrap import configure_import_path
+
+configure_import_path()
+
+from modules.coach.models import CoachSession, CoachTurn
+from modules.journal.models import JournalEntry
+from modules.safety.backfill.service import SafetyBackfillJob
+from modules.safety.config import SafetyBackfillConfig
+from modules.safety.detector_service import SafetyDetectorService
+from modules.storage.in_memory import InMemoryStore
+from modules.storage.sqlite_store import SQLiteStore
+from modules.user.models import User
+
+_BASE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+_TEXTS = [
+    "Feeling calm after a walk",
+    "I want to kill myself",
+    "Work was stressful but manageable",
+    "I feel hopeless and cannot go on",
+]
+
+
+def _seed(store: InMemoryStore) -> None:
+    store.save_user(User(user_id="u-1", email="u1@example.com", locale="en-US"))
+    for index, note in enumerate(_TEXTS):
+        store.save_journal_entry(
+            JournalEntry(
+                entry_id=f"j-{index}",
+                user_id="u-1",
+                mood="low",
+                energy=3,
+                note=note,
+                created_at=_BASE + timedelta(minutes=index),
+            )
+        )
+    for index in range(3):
+        session = CoachSession(
+            session_id=f"s-{index}",
+            user_id="u-1",
+            style_id="warm",
+            started_at=_BASE + timedelta(hours=index),
+            active=False,
+        )
+        session.turns.append(CoachTurn(role="user", message=_TEXTS[index]))
+        session.turns.append(CoachTurn(role="coach", message="I hear you."))
+        session.turns.append(CoachTurn(role="user", message=_TEXTS[index + 1]))
+        store.save_coach_session(session)
+
+
+def _config(**overrides) -> SafetyBackfillConfig:
+    return SafetyBackfillConfig(**{"max_parallelism": 2, "chunk_size": 3, **overrides})
+
+
+class SafetyBackfillTests(unittest.TestCase):
+    def test_detect_batch_matches_single_detection(self) -> None:
+        detector = SafetyDetectorService(store=InMemoryStore())
+        items = [(text, "en-US") for text in _TEXTS]
+
+        batch = detector.detect_batch(items, max_parallelism=2, chunk_size=2)
+        single = [detector.detect(text=text, locale=locale) for text, locale in items]
+
+        self.assertEqual([item.level for item in batch], [item.level for item in single])
+        self.assertEqual([item.reasons for item in batch], [item.reasons for item in single])
+
+    def test_run_rescores_journal_and_user_turns(self) -> None:
+        store = InMemoryStore()
+        _seed(store)
+        run = SafetyBackfillJob(store, config=_config()).run()
+
+        self.assertEqual(run.status, "completed")
+        self.assertEqual(run.processed, len(_TEXTS) + 6)
+        self.assertEqual(run.completed_sources, ["journal", "coach"])
+        self.assertGreater(run.items_per_second, 0)
+        results = store.list_safety_backfill_results(run.run_id)
+        keys = {item.item_key for item in results}
+        self.assertIn("journal:j-1", keys)
+        self.assertIn("coach:s-0:2", keys)
+        self.assertNotIn("coach:s-0:1", keys)
+        self.assertEqual(sum(run.level_counts.values()), run.processed)
+        flagged = {item.item_key: item.risk_level for item in results}
+        self.assertNotEqual(flagged["journal:j-1"], "low")
+
+    def test_paused_run_resumes_without_duplicates(self) -> None:
+        store = InMemoryStore()
+        _seed(store)
+        job = SafetyBackfillJob(store, config=_config())
+
+        paused = job.run(limit=5)
+        self.assertEqual((paused.status, paused.processed), ("paused", 5))
+        self.assertEqual(paused.completed_sources, ["journal"])
+
+        resumed = job.run(resume_run_id=paused.run_id)
+        self.assertEqual((resumed.status, resumed.processed), ("completed", len(_TEXTS) + 6))
+        keys = [item.item_key for item in store.list_safety_backfill_results(paused.run_id)]
+        self.assertEqual(len(keys), len(set(keys)))
+        with self.assertRaises(ValueError):
+            job.run(resume_run_id=paused.run_id)
+
+    def test_sqlite_run_resumes_after_reopen(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = f"{temp_dir}/backfill.db"
+            store = SQLiteStore(db_path=db_path)
+            _seed(store)
+            paused = SafetyBackfillJob(store, config=_config()).run(sources=["coach"], limit=4)
+            store.close()
+
+            reopened = SQLiteStore(db_path=db_path)
+            self.assertEqual(reopened.get_safety_backfill_run(paused.run_id).cursors["coach"], paused.cursors["coach"])
+            job = SafetyBackfillJob(reopened, config=_config())
+            job.start(resume_run_id=paused.run_id)
+            finished = job.wait(paused.run_id, timeout=10)
+
+            self.assertEqual((finished.status, finished.processed), ("completed", 6))
+            self.assertEqual(len(reopened.list_safety_backfill_results(paused.run_id)), 6)
+            self.assertEqual(reopened.safety_backfill_results, {})
+            self.assertEqual(reopened.safety_backfill_runs, {})
+            self.assertEqual(reopened.erase_user_data("u-1")["safety_backfill_results"], 6)
+            reopened.close()
+
+    def test_unknown_source_is_rejected(self) -> None:
+        job = SafetyBackfillJob(InMemoryStore(), config=_config())
+        with self.assertRaises(ValueError):
+            job.run(sources=["email"])
+        with self.assertRaises(ValueError):
+            job.run(resume_run_id="missing")
+
+
+if __name__ == "__main__":
+    unittest.main()
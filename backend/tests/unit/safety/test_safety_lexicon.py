@@ -0,0 +1,136 @@
+import unittest
+
+from backend.tests.bootstrap import configure_import_path
+
+configure_import_path()
+
+from modules.journal.service import JournalService
+from modules.safety.detector_service import SafetyDetectorService
+from modules.safety.lexicon.automaton import PatternAutomaton
+from modules.safety.lexicon.catalog import EN_US_LEXICON
+from modules.safety.lexicon.compiled import CompiledLexicon, LocaleLexicons, get_safety_lexicon
+from modules.safety.lexicon.normalize import normalize_text
+from modules.safety.nlu.classifier import NLUClassifier
+from modules.safety.semantic.evaluator import SemanticRiskEvaluator
+from modules.storage.in_memory import InMemoryStore
+from modules.triage.models import RiskLevel
+from modules.user.models import User
+
+
+class PatternAutomatonTests(unittest.TestCase):
+    def test_finds_overlapping_and_nested_patterns_in_one_pass(self) -> None:
+        automaton = PatternAutomaton(["he", "she", "his", "hers", "sad", "sadness"])
+        found = {automaton.patterns[index] for index in automaton.search("ushers feel sadness")}
+        self.assertEqual(found, {"she", "he", "hers", "sad", "sadness"})
+
+    def test_no_match_and_empty_patterns(self) -> None:
+        automaton = PatternAutomaton(["", "abc"])
+        self.assertEqual(automaton.search("ab ac bc"), set())
+        self.assertEqual(automaton.search(""), set())
+
+    def test_cjk_patterns(self) -> None:
+        automaton = PatternAutomaton(["不想活", "活下去"])
+        self.assertEqual(automaton.search("我真的不想活下去了"), {0, 1})
+
+
+class CompiledLexiconTests(unittest.TestCase):
+    def test_first_match_follows_tier_order_not_text_position(self) -> None:
+        scan = get_safety_lexicon().scan("Suicide... I want to kill myself")
+        self.assertEqual(scan.first("nlu", "high"), "kill myself")
+        self.assertEqual(scan.phrases("nlu", "high"), ["kill myself", "suicide"])
+        self.assertTrue(scan.has("journal", "high"))
+        self.assertIsNone(scan.first("nlu", "low"))
+
+    def test_shared_phrases_belong_to_every_group(self) -> None:
+        scan = get_safety_lexicon().scan("everything feels hopeless")
+        self.assertEqual(scan.first("nlu", "medium"), "hopeless")
+        self.assertEqual(scan.first("journal", "medium"), "hopeless")
+
+    def test_version_changes_with_content(self) -> None:
+        edited = dict(EN_US_LEXICON)
+        edited[("semantic", "medium")] = list(edited[("semantic", "medium")]) + ["falling apart"]
+        self.assertEqual(CompiledLexicon(EN_US_LEXICON).version, CompiledLexicon(dict(EN_US_LEXICON)).version)
+        self.assertNotEqual(CompiledLexicon(edited).version, CompiledLexicon(EN_US_LEXICON).version)
+
+
+class LexiconCallSiteTests(unittest.TestCase):
+    def test_nlu_classifier_levels_and_reasons(self) -> None:
+        classifier = NLUClassifier()
+        self.assertEqual(classifier.classify("I might hurt myself").reasons, ["high-keyword:hurt myself"])
+        self.assertEqual(classifier.classify("I feel WORTHLESS").level, RiskLevel.MEDIUM)
+        self.assertEqual(classifier.classify("so tired").reasons, ["low-keyword:tired"])
+        self.assertEqual(classifier.classify("a calm day").reasons, ["no-risk-keyword"])
+
+    def test_semantic_evaluator_tiers(self) -> None:
+        evaluator = SemanticRiskEvaluator()
+        self.assertEqual(evaluator.evaluate("I want to die tonight").level, RiskLevel.EXTREME)
+        self.assertEqual(evaluator.evaluate("I want to die").level, RiskLevel.HIGH)
+        self.assertEqual(evaluator.evaluate("Nothing matters").reasons, ["moderate-distress"])
+        self.assertEqual(evaluator.evaluate("right now I am fine").level, RiskLevel.LOW)
+
+    def test_journal_risk_detection(self) -> None:
+        service = JournalService(InMemoryStore())
+        high = service.add_entry("u-1", mood="low", energy=2, note="thinking about self-harm")
+        medium = service.add_entry("u-1", mood="hopeless", energy=3, note="")
+        calm = service.add_entry("u-1", mood="ok", energy=6, note="went for a walk")
+
+        self.assertEqual(high["risk_signal"], {"risk_level": "high", "reason": "keyword:self-harm"})
+        self.assertEqual(medium["risk_signal"]["risk_level"], "medium")
+        self.assertIsNone(calm["risk_signal"])
+
+
+class LocaleLexiconTests(unittest.TestCase):
+    def test_normalization_folds_width_case_and_traditional_script(self) -> None:
+        self.assertEqual(normalize_text("Ｉ　ＷＡＮＴ  to DIE"), "i want to die")
+        self.assertEqual(normalize_text("我想傷害自己，不想活了"), "我想伤害自己,不想活了")
+
+    def test_locales_resolve_by_language_then_base(self) -> None:
+        lexicons = LocaleLexicons()
+        self.assertEqual(lexicons.resolve_locale("zh-CN"), "zh-CN")
+        self.assertEqual(lexicons.resolve_locale("zh_TW"), "zh-CN")
+        self.assertEqual(lexicons.resolve_locale("en-GB"), "en-US")
+        self.assertEqual(lexicons.resolve_locale("fr-FR"), "en-US")
+        self.assertEqual(lexicons.resolve_locale(None), "en-US")
+
+    def test_zh_matcher_covers_chinese_and_base_phrases(self) -> None:
+        classifier = NLUClassifier()
+        self.assertEqual(classifier.classify("我真的不想活了", locale="zh-CN").reasons, ["high-keyword:不想活"])
+        self.assertEqual(classifier.classify("我覺得很絕望", locale="zh-CN").level, RiskLevel.MEDIUM)
+        self.assertEqual(classifier.classify("I feel hopeless", locale="zh-CN").level, RiskLevel.MEDIUM)
+        self.assertEqual(classifier.classify("我覺得很絕望", locale="en-US").reasons, ["no-risk-keyword"])
+
+    def test_detector_selects_matcher_by_locale(self) -> None:
+        detector = SafetyDetectorService(store=InMemoryStore())
+
+        zh = detector.detect("我想死，今晚就结束", locale="zh-CN")
+        en = detector.detect("我想死，今晚就结束", locale="en-US")
+
+        self.assertEqual(zh.level, RiskLevel.HIGH)
+        self.assertEqual(zh.source, "nlu-short-circuit")
+        self.assertEqual(en.level, RiskLevel.HIGH)
+        self.assertEqual(SemanticRiskEvaluator().evaluate("我想死，今晚就结束", locale="zh-CN").level, RiskLevel.EXTREME)
+
+    def test_crisis_phrases_are_matched_in_every_locale(self) -> None:
+        detector = SafetyDetectorService(store=InMemoryStore())
+        classifier = NLUClassifier()
+        evaluator = SemanticRiskEvaluator()
+
+        for locale in ("en-US", "fr-FR", "zh-CN", None):
+            self.assertEqual(detector.detect("我想自杀", locale=locale).level, RiskLevel.HIGH, locale)
+            self.assertEqual(detector.detect("I want to kill myself", locale=locale).level, RiskLevel.HIGH, locale)
+            self.assertEqual(classifier.classify("我想自杀", locale=locale).reasons, ["high-keyword:自杀"], locale)
+            self.assertEqual(evaluator.evaluate("我要自杀，今晚", locale=locale).level, RiskLevel.EXTREME, locale)
+        self.assertEqual(classifier.classify("我覺得很絕望", locale="fr-FR").level, RiskLevel.LOW)
+
+    def test_journal_uses_the_user_locale(self) -> None:
+        store = InMemoryStore()
+        store.save_user(User(user_id="u-zh", email="zh@example.com", locale="zh-CN"))
+        service = JournalService(store)
+
+        result = service.add_entry("u-zh", mood="低落", energy=2, note="有时会想到自残")
+
+        self.assertEqual(result["risk_signal"], {"risk_level": "high", "reason": "keyword:自残"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import asyncio
+import time
+import unittest
+
+from backend.tests.bootstrap import configure_import_path
+
+configure_import_path()
+
+from modules.api.admin_endpoints import AdminAPI
+from modules.model_gateway.models import ModelGatewayResponse, ModelTaskType
+from modules.safety.config import SafetyDetectionConfig, SafetySLOConfig
+from modules.safety.detector_service import SafetyDetectorService
+from modules.safety.service import SafetyRuntimeService
+from modules.safety.slo import SafetyLatencyMonitor
+from modules.storage.in_memory import InMemoryStore
+from modules.triage.models import RiskLevel
+
+NLU = ModelTaskType.SAFETY_NLU_FAST
+SEMANTIC = ModelTaskType.SAFETY_SEMANTIC_JUDGE
+
+
+class _FixedGateway:
+    """Gateway stand-in that reports fixed stage latencies and sleeps ``delays`` seconds."""
+
+    def __init__(self, latencies: dict, levels: dict, delays: dict = None) -> None:
+        self.latencies = latencies
+        self.levels = levels
+        self.delays = delays or {}
+
+    def _response(self, task_type: str) -> ModelGatewayResponse:
+        time.sleep(self.delays.get(task_type, 0.0))
+        return ModelGatewayResponse(
+            task_type=task_type,
+            provider="stub",
+            risk_level=self.levels[task_type],
+            reasons=[],
+            latency_ms=self.latencies[task_type],
+        )
+
+    def run(self, task_type: str, text: str, locale: str = "en-US", timeout_ms: int = 2000, metadata=None):
+        return self._response(task_type)
+
+    async def arun(self, task_type: str, text: str, locale: str = "en-US", timeout_ms: int = 2000, metadata=None):
+        return self._response(task_type)
+
+
+def _detector(gateway: _FixedGateway, monitor: SafetyLatencyMonitor, **overrides) -> SafetyDetectorService:
+    config = SafetyDetectionConfig(**{"nlu_timeout_ms": 1000, "semantic_timeout_ms": 2000, **overrides})
+    return SafetyDetectorService(gateway=gateway, config=config, monitor=monitor)  # type: ignore[arg-type]
+
+
+class SafetyLatencyMonitorTests(unittest.TestCase):
+    def test_percentiles_and_budget_violations_per_stage(self) -> None:
+        monitor = SafetyLatencyMonitor(SafetySLOConfig(nlu_budget_ms=100))
+        for value in range(1, 1001):
+            monitor.observe("nlu", value / 5.0)
+
+        nlu = monitor.snapshot()["stages"]["nlu"]
+        self.assertEqual(nlu["count"], 1000)
+        self.assertAlmostEqual(nlu["p50_ms"], 100.0, delta=2.0)
+        self.assertAlmostEqual(nlu["p99_ms"], 198.0, delta=4.0)
+        self.assertGreaterEqual(nlu["p999_ms"], nlu["p99_ms"])
+        self.assertEqual(nlu["budget_violations"], 500)
+        self.assertEqual(nlu["violation_rate"], 0.5)
+
+        monitor.reset()
+        self.assertEqual(monitor.snapshot()["stages"]["nlu"]["count"], 0)
+
+    def test_detector_reports_stages_and_skips_semantic_on_short_circuit(self) -> None:
+        monitor = SafetyLatencyMonitor()
+        low = _FixedGateway({NLU: 150.0, SEMANTIC: 400.0}, {NLU: RiskLevel.LOW, SEMANTIC: RiskLevel.LOW})
+        high = _FixedGateway({NLU: 20.0, SEMANTIC: 400.0}, {NLU: RiskLevel.HIGH, SEMANTIC: RiskLevel.LOW})
+        _detector(low, monitor).detect("hello")
+        asyncio.run(_detector(high, monitor).adetect("I want to kill myself"))
+
+        snapshot = monitor.snapshot()
+        self.assertEqual(snapshot["detections"], 2)
+        self.assertEqual(snapshot["stages"]["nlu"]["count"], 2)
+        self.assertEqual(snapshot["stages"]["nlu"]["budget_violations"], 1)
+        self.assertEqual(snapshot["stages"]["semantic"]["count"], 1)
+        self.assertEqual(snapshot["stages"]["detection"]["count"], 2)
+        self.assertEqual(snapshot["fail_closed"]["total"], 0)
+
+    def test_stage_timeouts_count_as_fail_closed_violations(self) -> None:
+        monitor = SafetyLatencyMonitor()
+        slow = _FixedGateway({NLU: 1.0, SEMANTIC: 1.0}, {NLU: RiskLevel.LOW, SEMANTIC: RiskLevel.LOW}, {NLU: 0.3})
+        result = _detector(slow, monitor, nlu_timeout_ms=30).detect("hello")
+
+        snapshot = monitor.snapshot()
+        self.assertTrue(result.fail_closed)
+        self.assertEqual(snapshot["fail_closed"], {"timeout": 1, "error": 0, "total": 1, "rate": 1.0})
+        self.assertEqual(snapshot["stages"]["nlu"]["timeouts"], 1)
+        self.assertEqual(snapshot["stages"]["nlu"]["budget_violations"], 1)
+        self.assertEqual(snapshot["stages"]["nlu"]["count"], 0)
+
+    def test_runtime_records_policy_and_interruption_and_admin_exposes_them(self) -> None:
+        monitor = SafetyLatencyMonitor()
+        store = InMemoryStore()
+        SafetyRuntimeService(store, monitor=monitor).assess_and_respond(user_id="u-1", locale="en-US", text="hello")
+
+        admin = AdminAPI(store=store, safety_monitor=monitor)
+        status, body = admin.get_safety_slo(session_id=None)
+        self.assertEqual(status, 401)
+        _, _, session_id = admin.post_login({"username": "admin", "password": "admin"})
+        status, body = admin.get_safety_slo(session_id=session_id, reset=True)
+
+        self.assertEqual(status, 200)
+        self.assertEqual(body["data"]["stages"]["policy"]["count"], 1)
+        self.assertEqual(body["data"]["stages"]["interruption"]["count"], 1)
+        self.assertEqual(body["data"]["stages"]["interruption"]["budget_ms"], 50)
+        self.assertEqual(monitor.snapshot()["detections"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,7 +9,8 @@ configure_import_path()
 
 from modules.assessment.models import AssessmentScoreSet, AssessmentSubmission, ReassessmentSchedule
 from modules.coach.models import CoachSession, CoachTurn
-from modules.observability.models import APIAuditLogRecord
+from modules.observability.invocation_log import ModelInvocationLog
+from modules.observability.models import APIAuditLogRecord, ModelInvocationRecord
 from modules.storage.sqlite_store import SQLiteStore
 from modules.tests.models import TestResult
 from modules.triage.models import RiskLevel, TriageChannel, TriageDecision
@@ -40,7 +41,7 @@ class SQLiteStorePersistenceTests(unittest.TestCase):
                 connection.close()
 
             versions = [int(version) for version, _ in rows]
-            self.assertEqual(versions, [1, 2, 3, 4, 5, 6, 7])
+            self.assertEqual(versions, [1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
             self.assertEqual(rows[0][1], "baseline_schema")
             self.assertEqual(rows[1][1], "api_audit_logs")
             self.assertEqual(rows[2][1], "user_password_auth_fields")
@@ -48,6 +49,7 @@ class SQLiteStorePersistenceTests(unittest.TestCase):
             self.assertEqual(rows[4][1], "encrypted_sensitive_storage")
             self.assertEqual(rows[5][1], "user_email_verification_fields")
             self.assertEqual(rows[6][1], "user_password_reset_fields")
+            self.assertEqual(rows[7][1], "model_invocation_history")
 
     def test_user_email_verification_fields_persist_across_store_instances(self) -> None:
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -433,5 +435,41 @@ class SQLiteStorePersistenceTests(unittest.TestCase):
             restored.close()
 
 
+    def test_evicted_model_invocations_spill_to_sqlite(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = f"{temp_dir}/mimind.db"
+            store = SQLiteStore(db_path=db_path)
+            store.model_invocations = ModelInvocationLog(capacity=4, spill_batch=2)
+            store.model_invocations.set_spill(store._spill_model_invocations)
+            for index in range(7):
+                store.save_model_invocation(
+                    ModelInvocationRecord(
+                        trace_id=f"trace-{index}",
+                        task_type="safety_nlu_fast",
+                        provider="local-heuristic-nlu",
+                        success=True,
+                        latency_ms=float(index),
+                        estimated_cost_usd=0.0,
+                        input_chars=10,
+                        output_chars=0,
+                        metadata={"user_id": "u-spill"},
+                    )
+                )
+            recent = [record.trace_id for record in store.list_model_invocations()]
+            store.close()
+
+            connection = sqlite3.connect(db_path)
+            try:
+                spilled = [
+                    row[0]
+                    for row in connection.execute("SELECT trace_id FROM model_invocations ORDER BY id ASC").fetchall()
+                ]
+            finally:
+                connection.close()
+
+            self.assertEqual(spilled, ["trace-0", "trace-1", "trace-2", "trace-3"])
+            self.assertEqual(recent, ["trace-4", "trace-5", "trace-6"])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,8 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+if command -v uv >/dev/null 2>&1 && [[ -f "pyproject.toml" ]]; then
+  PYTHONPATH="backend/src:${PYTHONPATH:-}" uv run -- python -m backend.tests.benchmark.memory.harness "$@"
+else
+  PYTHONPATH="backend/src:${PYTHONPATH:-}" python3 -m backend.tests.benchmark.memory.harness "$@"
+fi